@@ -0,0 +1,86 @@
+"""add_job_queue_columns
+
+Revision ID: 20260216_001
+Revises: 20260215_002
+Create Date: 2026-02-16 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260216_001"
+down_revision: Union[str, Sequence[str], None] = "20260215_002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("queue_requests", sa.Column("job_type", sa.String(), nullable=True))
+    op.add_column(
+        "queue_requests",
+        sa.Column("priority", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "queue_requests",
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "queue_requests",
+        sa.Column("max_attempts", sa.Integer(), server_default="3", nullable=False),
+    )
+    op.add_column(
+        "queue_requests",
+        sa.Column(
+            "available_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+    )
+    op.add_column("queue_requests", sa.Column("worker_id", sa.String(), nullable=True))
+    op.add_column(
+        "queue_requests", sa.Column("heartbeat_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "queue_requests", sa.Column("started_at", sa.DateTime(), nullable=True)
+    )
+    op.add_column(
+        "queue_requests", sa.Column("completed_at", sa.DateTime(), nullable=True)
+    )
+
+    op.create_index(
+        op.f("ix_queue_requests_job_type"), "queue_requests", ["job_type"], unique=False
+    )
+    op.create_index(
+        op.f("ix_queue_requests_available_at"),
+        "queue_requests",
+        ["available_at"],
+        unique=False,
+    )
+    # Claim query: pending jobs ordered by priority then age
+    op.create_index(
+        "ix_queue_requests_claim",
+        "queue_requests",
+        ["status", "priority", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_queue_requests_claim", table_name="queue_requests")
+    op.drop_index(op.f("ix_queue_requests_available_at"), table_name="queue_requests")
+    op.drop_index(op.f("ix_queue_requests_job_type"), table_name="queue_requests")
+
+    op.drop_column("queue_requests", "completed_at")
+    op.drop_column("queue_requests", "started_at")
+    op.drop_column("queue_requests", "heartbeat_at")
+    op.drop_column("queue_requests", "worker_id")
+    op.drop_column("queue_requests", "available_at")
+    op.drop_column("queue_requests", "max_attempts")
+    op.drop_column("queue_requests", "attempts")
+    op.drop_column("queue_requests", "priority")
+    op.drop_column("queue_requests", "job_type")
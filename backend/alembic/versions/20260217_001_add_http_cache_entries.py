@@ -0,0 +1,53 @@
+"""add_http_cache_entries
+
+Revision ID: 20260217_001
+Revises: 20260216_001
+Create Date: 2026-02-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260217_001"
+down_revision: Union[str, Sequence[str], None] = "20260216_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "http_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("scope", sa.String(100), nullable=False),
+        sa.Column("url", sa.Text(), nullable=False),
+        sa.Column("etag", sa.String(500), nullable=True),
+        sa.Column("last_modified", sa.String(100), nullable=True),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column("content_length", sa.Integer(), nullable=True),
+        sa.Column("meta", sa.JSON(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "checked_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("scope", "url", name="uq_http_cache_entries_scope_url"),
+    )
+    op.create_index(
+        op.f("ix_http_cache_entries_id"), "http_cache_entries", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_http_cache_entries_scope"),
+        "http_cache_entries",
+        ["scope"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_http_cache_entries_scope"), table_name="http_cache_entries")
+    op.drop_index(op.f("ix_http_cache_entries_id"), table_name="http_cache_entries")
+    op.drop_table("http_cache_entries")
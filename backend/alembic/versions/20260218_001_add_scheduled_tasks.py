@@ -0,0 +1,65 @@
+"""add_scheduled_tasks
+
+Revision ID: 20260218_001
+Revises: 20260217_001
+Create Date: 2026-02-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260218_001"
+down_revision: Union[str, Sequence[str], None] = "20260217_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("lock_group", sa.String(100), nullable=False),
+        sa.Column("schedule", sa.String(200), nullable=False),
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("lease_owner", sa.String(200), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_status", sa.String(20), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("last_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("avg_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("run_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("failure_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_scheduled_tasks_id"), "scheduled_tasks", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_scheduled_tasks_name"), "scheduled_tasks", ["name"], unique=True
+    )
+    op.create_index(
+        op.f("ix_scheduled_tasks_lock_group"),
+        "scheduled_tasks",
+        ["lock_group"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_scheduled_tasks_lock_group"), table_name="scheduled_tasks")
+    op.drop_index(op.f("ix_scheduled_tasks_name"), table_name="scheduled_tasks")
+    op.drop_index(op.f("ix_scheduled_tasks_id"), table_name="scheduled_tasks")
+    op.drop_table("scheduled_tasks")
@@ -0,0 +1,26 @@
+"""add_harvest_job_checkpoint
+
+Revision ID: 20260219_001
+Revises: 20260218_001
+Create Date: 2026-02-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260219_001"
+down_revision: Union[str, Sequence[str], None] = "20260218_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("harvest_jobs", sa.Column("checkpoint", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("harvest_jobs", "checkpoint")
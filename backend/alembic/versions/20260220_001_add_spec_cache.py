@@ -0,0 +1,69 @@
+"""add_spec_cache
+
+Revision ID: 20260220_001
+Revises: 20260219_001
+Create Date: 2026-02-20 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260220_001"
+down_revision: Union[str, Sequence[str], None] = "20260219_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "http_cache_entries", sa.Column("body", sa.LargeBinary(), nullable=True)
+    )
+    op.create_table(
+        "spec_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("cache_key", sa.String(64), nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=False),
+        sa.Column("ingestor_version", sa.String(20), nullable=False),
+        sa.Column("source", sa.String(20), nullable=False),
+        sa.Column("api_name", sa.String(200), nullable=True),
+        sa.Column("api_spec", sa.JSON(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column(
+            "last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_spec_cache_entries_id"), "spec_cache_entries", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_spec_cache_entries_cache_key"),
+        "spec_cache_entries",
+        ["cache_key"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_spec_cache_entries_content_hash"),
+        "spec_cache_entries",
+        ["content_hash"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_spec_cache_entries_content_hash"), table_name="spec_cache_entries"
+    )
+    op.drop_index(
+        op.f("ix_spec_cache_entries_cache_key"), table_name="spec_cache_entries"
+    )
+    op.drop_index(op.f("ix_spec_cache_entries_id"), table_name="spec_cache_entries")
+    op.drop_table("spec_cache_entries")
+    op.drop_column("http_cache_entries", "body")
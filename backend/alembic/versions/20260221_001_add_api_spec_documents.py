@@ -0,0 +1,49 @@
+"""add_api_spec_documents
+
+Revision ID: 20260221_001
+Revises: 20260220_001
+Create Date: 2026-02-21 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260221_001"
+down_revision: Union[str, Sequence[str], None] = "20260220_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "api_spec_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("sha256", sa.String(64), nullable=False),
+        sa.Column("api_name", sa.String(200), nullable=True),
+        sa.Column("endpoint_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("size_bytes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("spec", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_api_spec_documents_id"), "api_spec_documents", ["id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_api_spec_documents_sha256"),
+        "api_spec_documents",
+        ["sha256"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_api_spec_documents_sha256"), table_name="api_spec_documents")
+    op.drop_index(op.f("ix_api_spec_documents_id"), table_name="api_spec_documents")
+    op.drop_table("api_spec_documents")
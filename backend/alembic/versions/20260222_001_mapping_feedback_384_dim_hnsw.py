@@ -0,0 +1,94 @@
+"""mapping_feedback_384_dim_hnsw
+
+Revision ID: 20260222_001
+Revises: 20260221_001
+Create Date: 2026-02-22 09:00:00.000000
+
+The mapping_feedback table was only ever created by ``init_vectors`` with
+vector(1536) columns, which the 384-dimensional MiniLM embeddings cannot be
+stored in. Creates the table when missing, otherwise converts the embedding
+columns to vector(384) (existing embeddings cannot be converted and are
+cleared), and adds HNSW cosine indexes.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20260222_001"
+down_revision: Union[str, Sequence[str], None] = "20260221_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIMENSIONS = 384
+EMBEDDING_COLUMNS = ("source_embedding", "dest_embedding")
+
+
+def _create_hnsw_indexes() -> None:
+    for column in EMBEDDING_COLUMNS:
+        op.create_index(
+            f"ix_mapping_feedback_{column}",
+            "mapping_feedback",
+            [column],
+            unique=False,
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={column: "vector_cosine_ops"},
+        )
+
+
+def _drop_indexes() -> None:
+    for column in EMBEDDING_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_mapping_feedback_{column}")
+
+
+def _set_dimensions(dimensions: int) -> None:
+    for column in EMBEDDING_COLUMNS:
+        op.execute(
+            f"ALTER TABLE mapping_feedback ALTER COLUMN {column} "
+            f"TYPE vector({dimensions}) USING NULL"
+        )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    if not sa.inspect(op.get_bind()).has_table("mapping_feedback"):
+        op.create_table(
+            "mapping_feedback",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("source_field_name", sa.String(), nullable=False),
+            sa.Column("source_field_type", sa.String(), nullable=False),
+            sa.Column("source_field_description", sa.String(), nullable=True),
+            sa.Column("dest_field_name", sa.String(), nullable=False),
+            sa.Column("dest_field_type", sa.String(), nullable=False),
+            sa.Column("dest_field_description", sa.String(), nullable=True),
+            sa.Column(
+                "transformation_logic",
+                postgresql.JSONB(astext_type=sa.Text()),
+                nullable=False,
+            ),
+            sa.Column("confidence_score", sa.Float(), nullable=False),
+            sa.Column("user_corrected", sa.Boolean(), nullable=False),
+            sa.Column("verification_success", sa.Boolean(), nullable=False),
+            sa.Column("source_embedding", Vector(DIMENSIONS), nullable=True),
+            sa.Column("dest_embedding", Vector(DIMENSIONS), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+    else:
+        _drop_indexes()
+        _set_dimensions(DIMENSIONS)
+
+    _create_hnsw_indexes()
+
+
+def downgrade() -> None:
+    _drop_indexes()
+    _set_dimensions(1536)
+    _create_hnsw_indexes()
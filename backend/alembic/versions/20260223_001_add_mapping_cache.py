@@ -0,0 +1,71 @@
+"""add_mapping_cache
+
+Revision ID: 20260223_001
+Revises: 20260222_001
+Create Date: 2026-02-23 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "20260223_001"
+down_revision: Union[str, Sequence[str], None] = "20260222_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "mapping_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("fingerprint", sa.String(64), nullable=False),
+        sa.Column("source_api", sa.String(200), nullable=False),
+        sa.Column("dest_api", sa.String(200), nullable=False),
+        sa.Column("mapping_version", sa.String(64), nullable=False),
+        sa.Column("transformations", sa.JSON(), nullable=False),
+        sa.Column("hit_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.Column(
+            "last_used_at", sa.DateTime(timezone=True), server_default=sa.func.now()
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_mapping_cache_entries_id"),
+        "mapping_cache_entries",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_mapping_cache_entries_fingerprint"),
+        "mapping_cache_entries",
+        ["fingerprint"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_mapping_cache_entries_source_api"),
+        "mapping_cache_entries",
+        ["source_api"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_mapping_cache_entries_dest_api"),
+        "mapping_cache_entries",
+        ["dest_api"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    for column in ("dest_api", "source_api", "fingerprint", "id"):
+        op.drop_index(
+            op.f(f"ix_mapping_cache_entries_{column}"),
+            table_name="mapping_cache_entries",
+        )
+    op.drop_table("mapping_cache_entries")
@@ -13,9 +13,15 @@ from app.agents.base import VitesseAgent, AgentContext
 from aether.protocols.intelligence import IntelligenceProvider
 from app.schemas.integration import HealthScore, TestResult
 from app.services.drift.detector import SchemaDriftDetector, SchemaDriftReport
+from app.services.mapping_cache import mapping_cache
+from app.services.spec_store import spec_store
+from app.services.transform_compiler import compile_mapping
 
 logger = structlog.get_logger(__name__)
 
+# Transformed records returned with the test results
+MAPPING_PREVIEW_RECORDS = 5
+
 
 class VitesseGuardian(VitesseAgent):
     """
@@ -53,6 +59,7 @@ class VitesseGuardian(VitesseAgent):
             - health_score: HealthScore object
             - test_results: List of TestResult objects
             - critical_issues: List of issues found
+            - mapping_preview: First records as transformed by mapping_logic
         """
         integration = input_data.get("integration_instance")
         test_count = input_data.get("test_count", 100)
@@ -75,8 +82,10 @@ class VitesseGuardian(VitesseAgent):
             self.test_results = []
 
             # Step 1: Extract API specs
-            source_spec = integration.get("source_api_spec", {})
-            dest_spec = integration.get("dest_api_spec", {})
+            source_spec = await spec_store.expand(
+                integration.get("source_api_spec", {})
+            )
+            dest_spec = await spec_store.expand(integration.get("dest_api_spec", {}))
 
             # --- START SELF-HEALING CHECK ---
             # Check for passed "latest_source_spec" to detect drift
@@ -94,6 +103,7 @@ class VitesseGuardian(VitesseAgent):
                         type=drift_report.drift_type,
                         severity=drift_report.severity,
                     )
+                    await mapping_cache.invalidate_api(source_spec.get("api_name"))
 
                     if drift_report.drift_type == "breaking":
                         input_data["drift_detected"] = True
@@ -113,6 +123,11 @@ class VitesseGuardian(VitesseAgent):
                 data_count=len(synthetic_data),
             )
 
+            # Destination calls get the records the deployed mapping would send
+            mapped_data = self._preview_mapping(
+                integration.get("mapping_logic"), synthetic_data
+            )
+
             # Step 3: Run shadow calls
             await self._run_shadow_calls(
                 integration_id=integration_id,
@@ -121,6 +136,7 @@ class VitesseGuardian(VitesseAgent):
                 source_endpoint=source_endpoint,
                 dest_endpoint=dest_endpoint,
                 test_data=synthetic_data,
+                dest_data=mapped_data,
             )
 
             # Step 4: Analyze results
@@ -157,6 +173,7 @@ class VitesseGuardian(VitesseAgent):
                 "success_rate": health_score.success_rate,
                 "critical_issues": critical_issues,
                 "drift_report": drift_report.model_dump() if drift_report else None,
+                "mapping_preview": (mapped_data or [])[:MAPPING_PREVIEW_RECORDS],
                 "testing_time_seconds": (
                     datetime.utcnow() - context.get("start_time", datetime.utcnow())
                 ).total_seconds(),
@@ -287,6 +304,20 @@ class VitesseGuardian(VitesseAgent):
 
         return headers
 
+    def _preview_mapping(
+        self,
+        mapping_logic: Optional[Dict[str, Any]],
+        records: List[Dict[str, Any]],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Transform ``records`` with the compiled mapping, if there is one."""
+        if not mapping_logic or not mapping_logic.get("transformations"):
+            return None
+        try:
+            return compile_mapping(mapping_logic).transform_batch(records)
+        except Exception as e:
+            logger.warning("Mapping preview failed", error=str(e))
+            return None
+
     async def _run_shadow_calls(
         self,
         integration_id: str,
@@ -295,8 +326,12 @@ class VitesseGuardian(VitesseAgent):
         source_endpoint: str,
         dest_endpoint: str,
         test_data: List[Dict[str, Any]],
+        dest_data: Optional[List[Dict[str, Any]]] = None,
     ):
-        """Execute shadow calls to both APIs."""
+        """
+        Execute shadow calls to both APIs. Destination calls send
+        ``dest_data`` (the mapped records) when given, else ``test_data``.
+        """
         # Rate limiting configuration (requests per second)
         rps = 5.0
         delay = 1.0 / rps
@@ -333,7 +368,7 @@ class VitesseGuardian(VitesseAgent):
                         spec=dest_spec,
                         endpoint=dest_endpoint,
                         method="POST",
-                        data=data,
+                        data=dest_data[idx] if dest_data else data,
                         is_source=False,
                         headers=dest_headers,
                     )
@@ -0,0 +1,290 @@
+"""
+Harvest execution engine.
+
+Runs independent harvest stages concurrently, fans work out inside a stage
+through a bounded worker pool, rate-limits outbound requests per host and
+folds per-stage progress into the single percentage expected by the
+harvester's ``on_progress`` callback. A :class:`HarvestCheckpoint` lets an
+interrupted harvest skip the stages and items it already completed.
+"""
+
+import asyncio
+import copy
+import time
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+from urllib.parse import urlparse
+
+import structlog
+
+from app.core.config import settings
+from app.core.harvest_metrics import harvest_stage, record_stage
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+# Stage-scoped progress callback: receives the fraction (0.0-1.0) completed
+StageProgressCallback = Callable[[float], Awaitable[None]]
+
+
+def scaled_progress(
+    progress: Optional[StageProgressCallback], start: float, end: float
+) -> Optional[StageProgressCallback]:
+    """Map a sub-step's 0-1 fraction onto the ``[start, end]`` slice of a stage."""
+    if progress is None:
+        return None
+
+    async def _report(fraction: float) -> None:
+        await progress(start + (end - start) * fraction)
+
+    return _report
+
+
+class HostRateLimiter:
+    """Caps concurrent requests and enforces a minimum spacing per host."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        min_interval: Optional[float] = None,
+    ):
+        self.max_concurrency = max_concurrency or settings.HARVEST_HOST_CONCURRENCY
+        self.min_interval = (
+            settings.HARVEST_HOST_MIN_INTERVAL if min_interval is None else min_interval
+        )
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_request: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        host = urlparse(url).netloc or url
+        semaphore = self._semaphores.setdefault(
+            host, asyncio.Semaphore(self.max_concurrency)
+        )
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        async with semaphore:
+            async with lock:
+                wait = self._last_request.get(host, 0.0) + self.min_interval
+                delay = wait - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._last_request[host] = time.monotonic()
+            yield
+
+
+async def bounded_map(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[Any]],
+    concurrency: Optional[int] = None,
+    progress: Optional[StageProgressCallback] = None,
+) -> List[Any]:
+    """
+    Run ``worker`` over ``items`` with at most ``concurrency`` in flight.
+
+    Results are returned in input order. A worker exception is returned in
+    place of its result rather than cancelling the remaining items.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    semaphore = asyncio.Semaphore(concurrency or settings.HARVEST_ITEM_CONCURRENCY)
+    done = 0
+
+    async def _run(item: T) -> Any:
+        nonlocal done
+        async with semaphore:
+            try:
+                return await worker(item)
+            finally:
+                done += 1
+                if progress:
+                    await progress(done / len(items))
+
+    return await asyncio.gather(*(_run(item) for item in items), return_exceptions=True)
+
+
+class StageProgress:
+    """Aggregates weighted per-stage fractions into an overall percentage."""
+
+    def __init__(
+        self,
+        weights: Dict[str, float],
+        on_progress: Optional[Callable[[float], Awaitable[None]]] = None,
+        min_step: float = 1.0,
+    ):
+        self.weights = weights
+        self.on_progress = on_progress
+        self.min_step = min_step
+        self._fractions: Dict[str, float] = {name: 0.0 for name in weights}
+        self._reported = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def percentage(self) -> float:
+        total = sum(self.weights.values()) or 1.0
+        done = sum(self.weights[n] * f for n, f in self._fractions.items())
+        return round(100.0 * done / total, 1)
+
+    def for_stage(self, name: str) -> StageProgressCallback:
+        async def _report(fraction: float) -> None:
+            self._fractions[name] = max(
+                self._fractions[name], min(max(fraction, 0.0), 1.0)
+            )
+            await self._emit()
+
+        return _report
+
+    async def _emit(self) -> None:
+        if not self.on_progress:
+            return
+        async with self._lock:
+            current = self.percentage
+            # Throttle callback writes (each one is a DB update for harvest jobs)
+            if current - self._reported >= self.min_step or (
+                current >= 100.0 > self._reported
+            ):
+                self._reported = current
+                try:
+                    await self.on_progress(current)
+                except Exception as e:
+                    logger.warning("Harvest progress callback failed", error=str(e))
+
+
+class HarvestCheckpoint:
+    """
+    Resumable harvest state, persisted through ``save`` whenever it changes.
+
+    The state is plain JSON: the names of completed stages plus a free-form
+    cursor per stage (e.g. how far the APIs.guru directory was processed).
+    Without ``save`` it only lives in memory.
+    """
+
+    def __init__(
+        self,
+        state: Optional[Dict[str, Any]] = None,
+        save: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    ):
+        state = copy.deepcopy(state or {})
+        self.resumed = bool(state.get("completed_stages") or state.get("stages"))
+        self.state: Dict[str, Any] = {
+            "completed_stages": list(state.get("completed_stages", [])),
+            "stages": dict(state.get("stages", {})),
+        }
+        self._save = save
+        self._lock = asyncio.Lock()
+
+    def is_stage_done(self, name: str) -> bool:
+        return name in self.state["completed_stages"]
+
+    def get(self, stage: str) -> Dict[str, Any]:
+        return copy.deepcopy(self.state["stages"].get(stage, {}))
+
+    async def update(self, stage: str, **values: Any) -> None:
+        """Merge ``values`` into the stage's cursor and persist."""
+        self.state["stages"][stage] = {**self.state["stages"].get(stage, {}), **values}
+        await self._persist()
+
+    async def complete_stage(self, stage: str) -> None:
+        if stage not in self.state["completed_stages"]:
+            self.state["completed_stages"].append(stage)
+        self.state["stages"].pop(stage, None)
+        await self._persist()
+
+    async def _persist(self) -> None:
+        if self._save is None:
+            return
+        async with self._lock:
+            snapshot = copy.deepcopy(self.state)
+            snapshot["saved_at"] = datetime.now(timezone.utc).isoformat()
+            try:
+                await self._save(snapshot)
+            except Exception as e:
+                # A missed checkpoint only means more work after a crash
+                logger.warning("Failed to save harvest checkpoint", error=str(e))
+
+
+class HarvestStage:
+    """One independent unit of a harvest (e.g. APIs.guru, GitHub repos)."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[StageProgressCallback], Awaitable[List[Dict[str, Any]]]],
+        collection: str,
+        weight: float = 1.0,
+    ):
+        self.name = name
+        self.run = run
+        self.collection = collection
+        self.weight = weight
+
+
+class HarvestEngine:
+    """Runs harvest stages concurrently under a stage-level semaphore."""
+
+    def __init__(self, stage_concurrency: Optional[int] = None):
+        self.stage_concurrency = stage_concurrency or settings.HARVEST_STAGE_CONCURRENCY
+
+    async def run(
+        self,
+        stages: List[HarvestStage],
+        on_progress: Optional[Callable[[float], Awaitable[None]]] = None,
+        checkpoint: Optional[HarvestCheckpoint] = None,
+    ) -> List[Tuple[HarvestStage, Any]]:
+        """
+        Execute ``stages`` and return ``(stage, result_or_exception)`` pairs in
+        declaration order. A failing stage does not cancel the others.
+
+        Stages already completed in ``checkpoint`` are skipped (and left out
+        of the result); stages that succeed are recorded in it.
+        """
+        if checkpoint is not None:
+            stages = [s for s in stages if not checkpoint.is_stage_done(s.name)]
+        progress = StageProgress({s.name: s.weight for s in stages}, on_progress)
+        semaphore = asyncio.Semaphore(self.stage_concurrency)
+
+        async def _run_stage(stage: HarvestStage) -> Any:
+            async with semaphore:
+                started = time.monotonic()
+                report = progress.for_stage(stage.name)
+                result, status = None, "error"
+                try:
+                    with harvest_stage(stage.name):
+                        result = await stage.run(report)
+                    status = "success"
+                    if checkpoint is not None:
+                        await checkpoint.complete_stage(stage.name)
+                    return result
+                finally:
+                    await report(1.0)
+                    record_stage(
+                        stage.name,
+                        time.monotonic() - started,
+                        len(result) if isinstance(result, list) else 0,
+                        status,
+                    )
+                    logger.info(
+                        "Harvest stage finished",
+                        stage=stage.name,
+                        duration_seconds=round(time.monotonic() - started, 2),
+                    )
+
+        outcomes = await asyncio.gather(
+            *(_run_stage(stage) for stage in stages), return_exceptions=True
+        )
+        return list(zip(stages, outcomes))
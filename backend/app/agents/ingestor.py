@@ -3,18 +3,55 @@ Ingestor Agent: Discovers and parses API specifications.
 Converts Swagger/OpenAPI docs into standardized APISpecification objects.
 """
 
-import httpx
-import json
-from typing import Any, Dict, Optional, List
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple
 from datetime import datetime
+from urllib.parse import urlsplit
+import httpx
 import structlog
 from app.agents.base import VitesseAgent, AgentContext
+from app.core.config import settings
+from app.core.http_clients import http_clients
+from app.core.http_fetch import FetchResult, conditional_fetcher
+from app.core.openapi_loader import (
+    SpecFormatError,
+    detect_spec_format,
+    iter_operations,
+    load_spec_document,
+)
 from aether.protocols.intelligence import IntelligenceProvider
 from app.schemas.integration import APISpecification, APIEndpoint, APIAuthType
 from app.services.llm_provider import LLMProviderService
+from app.services.spec_cache import (
+    NAME_SOURCE,
+    content_hash,
+    spec_cache,
+    spec_cache_key,
+)
 
 logger = structlog.get_logger(__name__)
 
+# Bump when the way specs are parsed or synthesized changes; invalidates the
+# spec cache
+INGESTOR_VERSION = "2026.02.2"
+
+# Conditional-fetch scope for spec and documentation downloads
+SPEC_FETCH_SCOPE = "ingestor"
+
+# host -> path that last served a spec there; probed first next time
+_spec_paths_by_host: "OrderedDict[str, str]" = OrderedDict()
+# Hosts remembered, least recently used dropped first
+SPEC_PATH_HOSTS_MAX = 1024
+
+
+def _remember_spec_path(url: str) -> None:
+    parts = urlsplit(url)
+    _spec_paths_by_host[parts.netloc] = parts.path
+    _spec_paths_by_host.move_to_end(parts.netloc)
+    while len(_spec_paths_by_host) > SPEC_PATH_HOSTS_MAX:
+        _spec_paths_by_host.popitem(last=False)
+
 
 class VitesseIngestor(VitesseAgent):
     """
@@ -85,21 +122,25 @@ class VitesseIngestor(VitesseAgent):
                 doc_url = input_data.get("documentation_url", api_url)
                 if not self._is_placeholder_url(doc_url):
                     spec_content = await self._fetch_spec(doc_url, None)
-                    api_spec = await self._synthesize_spec_from_html(
-                        html_content=spec_content,
-                        api_url=api_url,
-                        api_name=api_name,
-                        auth_details=auth_details,
+
+                    async def _from_html() -> Tuple[str, APISpecification]:
+                        return "html", await self._synthesize_spec_from_html(
+                            html_content=spec_content,
+                            api_url=api_url,
+                            api_name=api_name,
+                            auth_details={},
+                        )
+
+                    api_spec = await self._cached_spec(
+                        spec_content, api_url, api_name, auth_details, _from_html
                     )
                 else:
                     # Even the doc URL is a placeholder, use LLM with minimal context
                     logger.warning(
                         "All URLs are placeholders, synthesizing from API name only"
                     )
-                    api_spec = await self._synthesize_spec_from_name(
-                        api_name=api_name,
-                        api_url=api_url,
-                        auth_details=auth_details,
+                    api_spec = await self._cached_spec_from_name(
+                        api_name, api_url, auth_details
                     )
 
                 endpoints = api_spec.endpoints
@@ -115,10 +156,8 @@ class VitesseIngestor(VitesseAgent):
                         "Failed to fetch spec/docs, falling back to autonomous synthesis",
                         error=str(e),
                     )
-                    api_spec = await self._synthesize_spec_from_name(
-                        api_name=api_name,
-                        api_url=api_url,
-                        auth_details=auth_details,
+                    api_spec = await self._cached_spec_from_name(
+                        api_name, api_url, auth_details
                     )
 
                     endpoints = api_spec.endpoints
@@ -135,44 +174,15 @@ class VitesseIngestor(VitesseAgent):
                         ).total_seconds(),
                     }
 
-            # Step 2: Try to parse as Swagger/OpenAPI JSON
-            try:
-                parsed_spec = self._parse_openapi_spec(spec_content)
-                logger.info("Successfully parsed as OpenAPI/Swagger JSON")
-
-                # Standard extraction path
-                endpoints = self._extract_endpoints(parsed_spec)
-                auth_type, auth_config = self._extract_auth(parsed_spec, auth_details)
-                rate_limits = self._extract_rate_limits(parsed_spec)
-                headers = self._extract_headers(parsed_spec)
-                pagination = self._detect_pagination(endpoints)
-
-                api_spec = APISpecification(
-                    source_url=api_url,
-                    api_name=api_name,
-                    api_version=parsed_spec.get("info", {}).get("version", "1.0.0"),
-                    base_url=self._extract_base_url(parsed_spec, api_url),
-                    auth_type=auth_type,
-                    auth_config=auth_config,
-                    endpoints=endpoints,
-                    headers=headers,
-                    rate_limits=rate_limits,
-                    pagination_style=pagination,
-                )
-
-            except json.JSONDecodeError:
-                # Fallback: Synthesize spec from HTML using LLM
-                logger.warning(
-                    "Failed to parse as JSON, triggering LLM synthesis from HTML"
+            if not is_placeholder:
+                # Step 2: Parse as Swagger/OpenAPI JSON, or synthesize from HTML
+                api_spec = await self._cached_spec(
+                    spec_content,
+                    api_url,
+                    api_name,
+                    auth_details,
+                    lambda: self._spec_from_content(spec_content, api_url, api_name),
                 )
-
-                api_spec = await self._synthesize_spec_from_html(
-                    html_content=spec_content,
-                    api_url=api_url,
-                    api_name=api_name,
-                    auth_details=auth_details,
-                )
-
                 endpoints = api_spec.endpoints
                 auth_type = api_spec.auth_type
 
@@ -193,6 +203,101 @@ class VitesseIngestor(VitesseAgent):
                 "error": str(e),
             }
 
+    async def _spec_from_content(
+        self, spec_content: str, api_url: str, api_name: str
+    ) -> Tuple[str, APISpecification]:
+        """Build a spec from fetched content; returns ``(source, spec)``."""
+        try:
+            parsed_spec = self._parse_openapi_spec(spec_content)
+        except SpecFormatError:
+            # Fallback: Synthesize spec from HTML using LLM
+            logger.warning(
+                "Not an OpenAPI document, triggering LLM synthesis from HTML"
+            )
+            api_spec = await self._synthesize_spec_from_html(
+                html_content=spec_content,
+                api_url=api_url,
+                api_name=api_name,
+                auth_details={},
+            )
+            return "html", api_spec
+
+        logger.info("Successfully parsed as OpenAPI/Swagger")
+        endpoints = self._extract_endpoints(parsed_spec)
+        auth_type, auth_config = self._extract_auth(parsed_spec, {})
+        api_spec = APISpecification(
+            source_url=api_url,
+            api_name=api_name,
+            api_version=parsed_spec.get("info", {}).get("version", "1.0.0"),
+            base_url=self._extract_base_url(parsed_spec, api_url),
+            auth_type=auth_type,
+            auth_config=auth_config,
+            endpoints=endpoints,
+            headers=self._extract_headers(parsed_spec),
+            rate_limits=self._extract_rate_limits(parsed_spec),
+            pagination_style=self._detect_pagination(endpoints),
+        )
+        return "openapi", api_spec
+
+    async def _cached_spec(
+        self,
+        content: str,
+        api_url: str,
+        api_name: str,
+        auth_details: Dict[str, Any],
+        build: Callable[[], Awaitable[Tuple[str, APISpecification]]],
+    ) -> APISpecification:
+        """
+        Look the spec for ``content`` up in the spec cache, or ``build`` it and
+        cache it. Builders are given no credentials, so cached specs hold
+        none; ``auth_details`` are applied to the result either way.
+        """
+        if not settings.SPEC_CACHE_ENABLED:
+            _, api_spec = await build()
+            return self._apply_provided_auth(api_spec, auth_details)
+
+        content_sha256 = content_hash(content)
+        key = spec_cache_key(INGESTOR_VERSION, content_sha256, api_url, api_name)
+        api_spec = await spec_cache.get(key)
+        if api_spec is not None:
+            logger.info(
+                "Spec cache hit",
+                api_name=api_name,
+                endpoints_count=len(api_spec.endpoints),
+            )
+        else:
+            source, api_spec = await build()
+            # An empty spec is the fallback of a failed synthesis; retry next time
+            if api_spec.endpoints:
+                await spec_cache.put(
+                    key, api_spec, content_sha256, INGESTOR_VERSION, source
+                )
+        return self._apply_provided_auth(api_spec, auth_details)
+
+    async def _cached_spec_from_name(
+        self, api_name: str, api_url: str, auth_details: Dict[str, Any]
+    ) -> APISpecification:
+        async def _from_name() -> Tuple[str, APISpecification]:
+            api_spec = await self._synthesize_spec_from_name(
+                api_name=api_name, api_url=api_url, auth_details={}
+            )
+            return NAME_SOURCE, api_spec
+
+        return await self._cached_spec(
+            f"{NAME_SOURCE}:{api_name}", api_url, api_name, auth_details, _from_name
+        )
+
+    def _apply_provided_auth(
+        self, api_spec: APISpecification, auth_details: Dict[str, Any]
+    ) -> APISpecification:
+        """Caller-provided auth takes precedence over what the spec declares."""
+        if auth_details:
+            auth_type, auth_config = self._extract_auth({}, auth_details)
+            if auth_type != APIAuthType.NONE:
+                api_spec.auth_type = auth_type
+                api_spec.auth_config = auth_config
+        return api_spec
+
     async def _synthesize_spec_from_html(
         self,
         html_content: str,
@@ -273,171 +378,164 @@ class VitesseIngestor(VitesseAgent):
             logger.error("LLM synthesis failed", error=str(e))
             raise ValueError(f"Failed to synthesize API spec from HTML: {str(e)}")
 
+    async def _get(
+        self, client: httpx.AsyncClient, url: str, headers: Dict[str, str]
+    ) -> FetchResult:
+        """
+        GET ``url``. With the spec cache on, the fetch is conditional and the
+        body is kept with its validators, so an unchanged document is served
+        from the cache after a ``304``.
+        """
+        if settings.SPEC_CACHE_ENABLED:
+            return await conditional_fetcher.get(
+                url, SPEC_FETCH_SCOPE, client=client, headers=headers, keep_body=True
+            )
+        response = await client.get(url, headers=headers)
+        return FetchResult(
+            url=url,
+            scope=SPEC_FETCH_SCOPE,
+            status_code=response.status_code,
+            content=response.content,
+        )
+
+    def _spec_candidates(self, api_url: str, spec_url: Optional[str]) -> List[str]:
+        """URLs that may serve the spec, highest priority first."""
+        candidates = [
+            spec_url,
+            api_url,
+            # Common Swagger/OpenAPI paths
+            f"{api_url.rstrip('/')}/swagger.json",
+            f"{api_url.rstrip('/')}/openapi.json",
+            f"{api_url.rstrip('/swagger.json')}/openapi.json",
+        ]
+        # The path that served a spec for this host last time goes first
+        for url in (spec_url, api_url):
+            parsed = urlsplit(url or "")
+            known_path = _spec_paths_by_host.get(parsed.netloc)
+            if known_path:
+                _spec_paths_by_host.move_to_end(parsed.netloc)
+                candidates.insert(0, f"{parsed.scheme}://{parsed.netloc}{known_path}")
+                break
+        return list(dict.fromkeys(url for url in candidates if url))
+
+    @staticmethod
+    def _looks_like_spec(content: str) -> bool:
+        """Machine-readable spec, as opposed to a documentation page."""
+        return detect_spec_format(content) is not None
+
+    async def _probe(
+        self, client: httpx.AsyncClient, url: str, headers: Dict[str, str]
+    ) -> str:
+        response = await self._get(client, url, headers)
+        if response.status_code == 200 or response.not_modified:
+            return response.text
+        raise ValueError(str(response.status_code))
+
     async def _fetch_spec(self, api_url: str, spec_url: Optional[str] = None) -> str:
-        """Fetch API specification from URL."""
+        """
+        Fetch the API specification, or failing that its documentation page.
+
+        All candidate URLs are probed at once under a shared deadline. The
+        highest-priority candidate that serves a spec wins as soon as every
+        candidate above it has failed or returned a page, and the remaining
+        probes are cancelled. Once any spec or page is in hand, slower probes
+        only get ``SPEC_PROBE_GRACE_SECONDS`` more to beat it. Without any
+        spec, the highest-priority page (usually the docs at ``api_url``) is
+        returned for synthesis.
+        """
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        async with httpx.AsyncClient(
-            timeout=30.0, follow_redirects=True, headers=headers
-        ) as client:
-            errors = []
-            try:
-                # If spec_url is provided, use it directly
-                if spec_url:
-                    logger.info("Fetching spec from provided spec_url", url=spec_url)
-                    try:
-                        response = await client.get(spec_url)
-                        if response.status_code == 200:
-                            return response.text
-                        errors.append(f"{spec_url}: {response.status_code}")
-                    except Exception as e:
-                        logger.warning(
-                            "Error fetching from spec_url", url=spec_url, error=str(e)
-                        )
-                        errors.append(f"{spec_url}: {str(e)}")
-
-                # Check if api_url itself returns JSON (it might be the spec)
-                try:
-                    response = await client.get(api_url)
-                    if response.status_code == 200:
-                        content_type = response.headers.get("content-type", "")
-                        if (
-                            "application/json" in content_type
-                            or response.text.strip().startswith("{")
-                        ):
-                            return response.text
-                        # If HTML, we return it for synthesis
-                        return response.text
-                    errors.append(f"{api_url}: {response.status_code}")
-                except Exception as e:
-                    logger.warning("Error fetching api_url", url=api_url, error=str(e))
-                    errors.append(f"{api_url}: {str(e)}")
-
-                # Try common Swagger/OpenAPI paths
-                swagger_paths = [
-                    f"{api_url.rstrip('/')}/swagger.json",
-                    f"{api_url.rstrip('/')}/openapi.json",
-                    f"{api_url.rstrip('/swagger.json')}/openapi.json",
+        client = http_clients.get()
+        candidates = self._spec_candidates(api_url, spec_url)
+        logger.info("Probing spec candidates", candidates=len(candidates))
+        probes = [
+            asyncio.create_task(self._probe(client, url, headers)) for url in candidates
+        ]
+        errors = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SPEC_PROBE_DEADLINE_SECONDS
+        settle_by = deadline
+        try:
+            # Woken per completed probe; stops at a decisive spec, the grace
+            # period after the first answer, or the deadline
+            pending = set(probes)
+            while pending and loop.time() < settle_by:
+                _, pending = await asyncio.wait(
+                    pending,
+                    timeout=settle_by - loop.time(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                answered = [
+                    probe.done() and probe.exception() is None for probe in probes
                 ]
+                spec_at = next(
+                    (
+                        i
+                        for i, probe in enumerate(probes)
+                        if answered[i] and self._looks_like_spec(probe.result())
+                    ),
+                    None,
+                )
+                if spec_at is not None and all(p.done() for p in probes[:spec_at]):
+                    break
+                if any(answered) and settle_by == deadline:
+                    settle_by = min(
+                        deadline, loop.time() + settings.SPEC_PROBE_GRACE_SECONDS
+                    )
+            if pending and loop.time() >= deadline:
+                errors.append(
+                    f"deadline of {settings.SPEC_PROBE_DEADLINE_SECONDS}s exceeded"
+                )
 
-                for path in swagger_paths:
-                    try:
-                        response = await client.get(path)
-                        if response.status_code == 200:
-                            return response.text
-                        errors.append(f"{path}: {response.status_code}")
-                    except Exception as e:
-                        logger.debug(
-                            "Failed to fetch from path", path=path, error=str(e)
-                        )
-                        errors.append(f"{path}: {str(e)}")
+            pages = []
+            for url, probe in zip(candidates, probes):
+                if not probe.done():
+                    continue
+                if probe.exception() is not None:
+                    errors.append(f"{url}: {probe.exception()}")
+                    continue
+                content = probe.result()
+                if self._looks_like_spec(content):
+                    _remember_spec_path(url)
+                    logger.info("Specification found", url=url)
+                    return content
+                pages.append(content)
 
-                # If we have content from api_url (likely HTML), return it
-                # The _execute method will try to parse as JSON, fail, and then trigger synthesis
-                raise Exception(f"Could not fetch data. Details: {'; '.join(errors)}")
+            if pages:
+                return pages[0]
+            raise Exception(f"Could not fetch data. Details: {'; '.join(errors)}")
 
-            except Exception as e:
-                logger.error("Fetch spec failed", error=str(e))
-                raise
+        except Exception as e:
+            logger.error("Fetch spec failed", error=str(e))
+            raise
+        finally:
+            for probe in probes:
+                probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
 
     def _parse_openapi_spec(self, spec_content: str) -> Dict[str, Any]:
-        """Parse OpenAPI/Swagger JSON specification."""
+        """Parse an OpenAPI/Swagger document, JSON or YAML."""
         try:
-            spec = json.loads(spec_content)
-            return spec
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse JSON", error=str(e))
+            return load_spec_document(spec_content)
+        except SpecFormatError as e:
+            logger.info("Content is not an OpenAPI/Swagger document", reason=str(e))
             raise
 
     def _extract_endpoints(self, spec: Dict[str, Any]) -> List[APIEndpoint]:
-        """Extract API endpoints from OpenAPI spec."""
-        endpoints = []
-
-        paths = spec.get("paths", {})
-        for path, path_item in paths.items():
-            # Skip if path_item is not a dict (could be None, list, etc.)
-            if not isinstance(path_item, dict):
-                logger.debug(
-                    "Skipping non-dict path item", path=path, type=type(path_item)
-                )
-                continue
-
-            for method, operation in path_item.items():
-                # Skip non-dict operations
-                if not isinstance(operation, dict):
-                    continue
-
-                if method.lower() in ["get", "post", "put", "delete", "patch"]:
-                    endpoint = APIEndpoint(
-                        path=path,
-                        method=method.upper(),
-                        description=operation.get("summary", "")
-                        or operation.get("description", ""),
-                        parameters=self._extract_parameters(operation),
-                        request_schema=self._extract_request_schema(operation),
-                        response_schema=self._extract_response_schema(operation),
-                        auth_required=self._is_auth_required(operation, spec),
-                    )
-                    endpoints.append(endpoint)
-
-        return endpoints
-
-    def _extract_parameters(self, operation: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract path/query parameters."""
-        params = {}
-        for param in operation.get("parameters", []):
-            if not isinstance(param, dict):
-                continue
-            param_name = param.get("name")
-            param_in = param.get("in", "query")
-            if param_name:
-                params[param_name] = {
-                    "in": param_in,
-                    "required": param.get("required", False),
-                    "type": param.get("schema", {}).get("type", "string"),
-                }
-        return params
-
-    def _extract_request_schema(
-        self, operation: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Extract request body schema."""
-        request_body = operation.get("requestBody", {})
-        if not isinstance(request_body, dict):
-            return None
-        content = request_body.get("content", {})
-        if not isinstance(content, dict):
-            return None
-        json_content = content.get("application/json", {})
-        if not isinstance(json_content, dict):
-            return None
-        return json_content.get("schema", None)
-
-    def _extract_response_schema(
-        self, operation: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
-        """Extract response schema (200 status)."""
-        responses = operation.get("responses", {})
-        if not isinstance(responses, dict):
-            return None
-        ok_response = responses.get("200", {})
-        if not isinstance(ok_response, dict):
-            return None
-        content = ok_response.get("content", {})
-        if not isinstance(content, dict):
-            return None
-        json_content = content.get("application/json", {})
-        if not isinstance(json_content, dict):
-            return None
-        return json_content.get("schema", None)
-
-    def _is_auth_required(
-        self, operation: Dict[str, Any], spec: Dict[str, Any]
-    ) -> bool:
-        """Check if authentication is required for endpoint."""
-        security = operation.get("security", spec.get("security", []))
-        return len(security) > 0
+        """Extract API endpoints from OpenAPI spec, with $refs resolved."""
+        return [
+            APIEndpoint(
+                path=operation.path,
+                method=operation.method,
+                description=operation.description,
+                parameters=operation.parameters,
+                request_schema=operation.request_schema,
+                response_schema=operation.response_schema,
+                auth_required=operation.auth_required,
+            )
+            for operation in iter_operations(spec)
+        ]
 
     def _extract_auth(
         self,
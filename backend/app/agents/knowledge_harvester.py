@@ -12,15 +12,34 @@ This enables the system to extend its capabilities without manual updates.
 """
 
 import structlog
-from typing import Any, Dict, Optional, List, Set
+from typing import Any, Callable, Dict, Optional, List, Set, Tuple
 from datetime import datetime
 import uuid
 import asyncio
+import functools
 import httpx
 import hashlib
 import json
 
 from app.agents.base import VitesseAgent, AgentContext
+from app.agents.harvest_engine import (
+    HarvestCheckpoint,
+    HarvestEngine,
+    HarvestStage,
+    HostRateLimiter,
+    StageProgressCallback,
+    bounded_map,
+    scaled_progress,
+)
+from app.core.config import settings
+from app.core.harvest_metrics import (
+    HARVEST_PARSE_SECONDS,
+    observe_seconds,
+    record_dedup_check,
+)
+from app.core.http_fetch import conditional_fetcher
+from app.core.openapi_loader import load_spec_document
+from app.core.json_stream import iter_object_items
 from aether.protocols.intelligence import IntelligenceProvider
 from app.core.knowledge_db import (
     get_knowledge_db,
@@ -28,7 +47,9 @@ from app.core.knowledge_db import (
     FINANCIAL_SCHEMAS_COLLECTION,
     FINANCIAL_STANDARDS_COLLECTION,
     API_SPECS_COLLECTION,
+    API_ENDPOINTS_COLLECTION,
     HARVEST_SOURCES_COLLECTION,
+    INTEGRATION_PATTERNS_COLLECTION,
 )
 from app.core.financial_services import (
     PLAID_API_KNOWLEDGE,
@@ -41,6 +62,24 @@ from app.core.financial_services import (
 logger = structlog.get_logger(__name__)
 
 
+class HarvestRun:
+    """
+    State of one harvest run, passed down to its stages.
+
+    Kept off the agent so that runs sharing a ``KnowledgeHarvester`` (e.g. a
+    manual harvest overlapping a scheduled one) never see each other's
+    checkpoint or deep spec targets.
+    """
+
+    def __init__(self, checkpoint: Optional[HarvestCheckpoint] = None):
+        # The caller's checkpoint when resuming a job, else in-memory only
+        self.checkpoint = checkpoint or HarvestCheckpoint()
+        # Set by the APIs.guru stage for the deep spec stage (when enabled)
+        self.deep_spec_targets: Optional[asyncio.Future] = None
+        # Items each stage skipped because they had not changed
+        self.skipped_unchanged: Dict[str, int] = {}
+
+
 class KnowledgeHarvester(VitesseAgent):
     """
     Autonomous agent that harvests API knowledge and integration patterns.
@@ -66,6 +105,9 @@ class KnowledgeHarvester(VitesseAgent):
         )
         self.context = context
         self.knowledge_db = None
+        self.engine = HarvestEngine()
+        self.rate_limiter = HostRateLimiter()
+        self._spec_parser = None
 
         # Knowledge sources to harvest - expanded beyond financial APIs
         self.harvest_sources = {
@@ -160,6 +202,7 @@ class KnowledgeHarvester(VitesseAgent):
             if existing_state is None:
                 # New source - should process
                 logger.debug("New source, will process", source_key=source_key)
+                record_dedup_check(unchanged=False)
                 return True
 
             existing_hash = existing_state.get("content_hash")
@@ -171,10 +214,12 @@ class KnowledgeHarvester(VitesseAgent):
                     old_hash=existing_hash[:8] if existing_hash else "none",
                     new_hash=content_hash[:8],
                 )
+                record_dedup_check(unchanged=False)
                 return True
 
             # Source exists and hasn't changed - skip processing
             logger.debug("Source unchanged, skipping", source_key=source_key)
+            record_dedup_check(unchanged=True)
             return False
 
         except Exception as e:
@@ -204,6 +249,108 @@ class KnowledgeHarvester(VitesseAgent):
                 "Failed to update source state", source_key=source_key, error=str(e)
             )
 
+    async def _update_source_states(
+        self, states: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> None:
+        """Record many processed sources in one bulk upsert."""
+        if not states:
+            return
+        try:
+            await self.knowledge_db.update_harvest_source_states(states)
+        except Exception as e:
+            logger.warning(
+                "Failed to update source states", count=len(states), error=str(e)
+            )
+
+    def _knowledge_document_id(self, collection: str, source_key: str) -> str:
+        """Stable point id, so a changed item overwrites its previous version."""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{collection}#{source_key}"))
+
+    async def _store_static_knowledge(
+        self,
+        source_type: str,
+        items: List[Dict[str, Any]],
+        name_field: str,
+        collection: str,
+        to_document: Callable[[Dict[str, Any]], Dict[str, Any]],
+        state_metadata: Callable[[Dict[str, Any]], Dict[str, Any]],
+        progress: Optional[StageProgressCallback] = None,
+    ) -> Tuple[List[Tuple[Dict[str, Any], str]], int]:
+        """
+        Store the new or changed items of a built-in knowledge list.
+
+        Change checks run concurrently; all changed items are then embedded
+        and upserted in a single ``add_documents`` call and their states
+        recorded in one bulk update. Returns ``(item, doc_id)`` pairs for the
+        stored items and the number skipped as unchanged.
+        """
+        candidates = []
+        for item in items:
+            if not item.get(name_field):
+                logger.warning(
+                    "Skipping item with missing name",
+                    source_type=source_type,
+                    item=item,
+                )
+                continue
+            source_key = self._get_source_key(source_type, item[name_field])
+            candidates.append((item, source_key, self._compute_content_hash(item)))
+
+        checks = await bounded_map(
+            candidates,
+            lambda c: self._should_process_source(c[1], c[2]),
+            progress=scaled_progress(progress, 0.0, 0.5),
+        )
+        changed = [c for c, should in zip(candidates, checks) if should is True]
+        skipped_unchanged = len(candidates) - len(changed)
+        if not changed:
+            return [], skipped_unchanged
+
+        ids = [
+            self._knowledge_document_id(collection, source_key)
+            for _, source_key, _ in changed
+        ]
+        try:
+            stored_ids = await self.knowledge_db.add_documents(
+                collection=collection,
+                documents=[to_document(item) for item, _, _ in changed],
+                ids=ids,
+            )
+        except Exception as e:
+            # States stay unrecorded, so these items are retried next run
+            logger.error(
+                "Failed to store knowledge",
+                source_type=source_type,
+                count=len(changed),
+                error=str(e),
+            )
+            return [], skipped_unchanged
+
+        # add_documents reports failures by leaving ids out (an empty list
+        # when the whole upsert failed)
+        stored = set(stored_ids or [])
+        states = []
+        for (item, source_key, content_hash), doc_id in zip(changed, ids):
+            if doc_id not in stored:
+                # No state is recorded, so the item is retried next run
+                logger.warning(
+                    "Failed to store knowledge document",
+                    source_type=source_type,
+                    name=item[name_field],
+                )
+                continue
+            metadata = {"source_type": source_type, **state_metadata(item)}
+            states.append((source_key, content_hash, metadata))
+        await self._update_source_states(states)
+        if progress:
+            await progress(1.0)
+
+        return [
+            (item, doc_id)
+            for (item, _, _), doc_id in zip(changed, ids)
+            if doc_id in stored
+        ], skipped_unchanged
+
     async def _execute(
         self,
         context: Dict[str, Any],
@@ -222,15 +369,20 @@ class KnowledgeHarvester(VitesseAgent):
 
         # Determine what to harvest
         harvest_type = input_data.get("harvest_type", "full")
+        run = HarvestRun(input_data.get("checkpoint"))
 
-        result = await self._harvest_knowledge(harvest_type, on_progress)
+        result = await self._harvest_knowledge(harvest_type, on_progress, run)
 
         return result
 
     async def _harvest_knowledge(
-        self, harvest_type: str, on_progress: Optional[Any] = None
+        self,
+        harvest_type: str,
+        on_progress: Optional[Any] = None,
+        run: Optional[HarvestRun] = None,
     ) -> Dict[str, Any]:
         """Main harvest logic - expanded to cover broader API ecosystem with smart deduplication."""
+        run = run or HarvestRun()
         results = {
             "status": "success",
             "harvest_type": harvest_type,
@@ -242,51 +394,109 @@ class KnowledgeHarvester(VitesseAgent):
         }
 
         try:
-            if harvest_type in ["full", "financial"]:
-                # Harvest financial services knowledge
-                harvested = await self._harvest_financial_apis()
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("financial_apis")
-                results["sources_harvested"].append("financial_apis")
-                if on_progress:
-                    await on_progress(15.0)  # Approx 15% done
-
-            if harvest_type in ["full", "standards"]:
-                # Harvest regulatory standards
-                harvested = await self._harvest_standards()
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("financial_standards")
-                results["sources_harvested"].append("regulatory_standards")
-                if on_progress:
-                    await on_progress(30.0)  # Approx 30% done
-
-            if harvest_type in ["full", "api_directory"]:
-                # Harvest from APIs.guru directory
-                harvested = await self._harvest_api_directory(on_progress)
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("api_specifications")
-                results["sources_harvested"].append("apis_guru")
-
-            if harvest_type in ["full", "marketplaces"]:
-                # Harvest from API marketplaces
-                harvested = await self._harvest_api_marketplaces()
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("api_specifications")
-                results["sources_harvested"].append("api_marketplaces")
-
-            if harvest_type in ["full", "github"]:
-                # Harvest from GitHub API repositories
-                harvested = await self._harvest_github_apis()
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("api_specifications")
-                results["sources_harvested"].append("github_repos")
-
-            if harvest_type in ["full", "patterns"]:
-                # Harvest integration patterns
-                harvested = await self._harvest_patterns()
-                results["total_harvested"] += len(harvested)
-                results["collections_updated"].append("integration_patterns")
-                results["sources_harvested"].append("integration_patterns")
+            # (harvest types, stage name, runner, collection, source label, weight)
+            stage_specs = [
+                (
+                    ["full", "financial"],
+                    "financial_apis",
+                    self._harvest_financial_apis,
+                    "financial_apis",
+                    1.0,
+                ),
+                (
+                    ["full", "standards"],
+                    "regulatory_standards",
+                    self._harvest_standards,
+                    "financial_standards",
+                    1.0,
+                ),
+                (
+                    ["full", "api_directory"],
+                    "apis_guru",
+                    self._harvest_api_directory,
+                    "api_specifications",
+                    10.0,  # thousands of APIs; dominates a full harvest
+                ),
+                (
+                    ["full", "marketplaces"],
+                    "api_marketplaces",
+                    self._harvest_api_marketplaces,
+                    "api_specifications",
+                    1.0,
+                ),
+                (
+                    ["full", "github"],
+                    "github_repos",
+                    self._harvest_github_apis,
+                    "api_specifications",
+                    2.0,
+                ),
+                (
+                    ["full", "patterns"],
+                    "integration_patterns",
+                    self._harvest_patterns,
+                    "integration_patterns",
+                    1.0,
+                ),
+            ]
+            stages = [
+                HarvestStage(
+                    name=name,
+                    run=functools.partial(runner, run=run),
+                    collection=collection,
+                    weight=weight,
+                )
+                for types, name, runner, collection, weight in stage_specs
+                if harvest_type in types
+            ]
+
+            # Deep spec harvesting consumes the entries seen by the APIs.guru
+            # stage. It is listed after that stage, so the engine's FIFO stage
+            # semaphore always admits the producer first.
+            if (
+                settings.HARVEST_DEEP_SPECS_ENABLED
+                and any(stage.name == "apis_guru" for stage in stages)
+                and not run.checkpoint.is_stage_done("apis_guru")
+            ):
+                run.deep_spec_targets = asyncio.get_running_loop().create_future()
+                stages.append(
+                    HarvestStage(
+                        name="apis_guru_specs",
+                        run=functools.partial(self._harvest_deep_specs, run=run),
+                        collection=API_ENDPOINTS_COLLECTION,
+                        weight=5.0,
+                    )
+                )
+
+            if run.checkpoint.resumed:
+                results["resumed_stages"] = [
+                    stage.name
+                    for stage in stages
+                    if run.checkpoint.is_stage_done(stage.name)
+                ]
+                logger.info(
+                    "Resuming harvest from checkpoint",
+                    completed_stages=results["resumed_stages"],
+                )
+
+            # Stages are independent, so they run concurrently
+            outcomes = await self.engine.run(stages, on_progress, run.checkpoint)
+            for stage, outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        "Harvest stage failed", stage=stage.name, error=str(outcome)
+                    )
+                    results["status"] = "error"
+                    results.setdefault("error", str(outcome))
+                    results.setdefault("failed_stages", []).append(stage.name)
+                    continue
+
+                results["total_harvested"] += len(outcome)
+                results["total_skipped_unchanged"] += run.skipped_unchanged.get(
+                    stage.name, 0
+                )
+                results["collections_updated"].append(stage.collection)
+                results["sources_harvested"].append(stage.name)
 
             logger.info(
                 "Knowledge harvest completed",
@@ -303,10 +513,13 @@ class KnowledgeHarvester(VitesseAgent):
             results["error"] = str(e)
             return results
 
-    async def _harvest_financial_apis(self) -> List[Dict[str, Any]]:
+    async def _harvest_financial_apis(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
         """Harvest financial API knowledge with validation and smart deduplication."""
         harvested = []
-        skipped_unchanged = 0
 
         logger.info("Harvesting financial APIs...")
 
@@ -317,92 +530,32 @@ class KnowledgeHarvester(VitesseAgent):
             YODLEE_API_KNOWLEDGE,
         ]
 
-        for api_knowledge in financial_apis:
-            try:
-                # Validate API knowledge structure
-                if not api_knowledge.get("api_name"):
-                    logger.warning("Skipping API with missing name", api=api_knowledge)
-                    continue
-
-                # Compute content hash for change detection
-                content_hash = self._compute_content_hash(api_knowledge)
-                source_key = self._get_source_key(
-                    "financial_api", api_knowledge["api_name"]
-                )
-
-                # Check if we should process this source (new or changed)
-                if not await self._should_process_source(source_key, content_hash):
-                    skipped_unchanged += 1
-                    logger.debug(
-                        "Skipping unchanged financial API",
-                        api=api_knowledge["api_name"],
-                    )
-                    continue
-
-                # Store in knowledge DB
-                doc_id = await self.knowledge_db.add_documents(
-                    collection=FINANCIAL_APIS_COLLECTION,
-                    documents=[
-                        {
-                            "content": str(api_knowledge),
-                            "api_name": api_knowledge["api_name"],
-                            "category": api_knowledge["category"],
-                            "region": str(api_knowledge.get("region")),
-                            "tags": ",".join(api_knowledge.get("tags", [])),
-                        }
-                    ],
-                )
-
-                # Validate doc_id is a non-empty list
-                if not doc_id or not isinstance(doc_id, list) or len(doc_id) == 0:
-                    logger.warning(
-                        "Failed to store API document",
-                        api=api_knowledge.get("api_name"),
-                    )
-                    # Still update source state to avoid retrying failed docs
-                    await self._update_source_state(
-                        source_key=source_key,
-                        content_hash=content_hash,
-                        metadata={
-                            "source_type": "financial_api",
-                            "api_name": api_knowledge["api_name"],
-                            "category": api_knowledge["category"],
-                            "store_failed": True,
-                        },
-                    )
-                    continue
-
-                # Update source state after successful processing
-                await self._update_source_state(
-                    source_key=source_key,
-                    content_hash=content_hash,
-                    metadata={
-                        "source_type": "financial_api",
-                        "api_name": api_knowledge["api_name"],
-                        "category": api_knowledge["category"],
-                    },
-                )
-
-                harvested.append(
-                    {
-                        "api": api_knowledge["api_name"],
-                        "doc_id": doc_id[0],
-                        "endpoints": len(api_knowledge.get("endpoints", [])),
-                    }
-                )
-
-                logger.info(
-                    "Financial API harvested",
-                    api=api_knowledge["api_name"],
-                    endpoints=len(api_knowledge.get("endpoints", [])),
-                )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to harvest financial API",
-                    api=api_knowledge.get("api_name"),
-                    error=str(e),
-                )
+        stored, skipped_unchanged = await self._store_static_knowledge(
+            source_type="financial_api",
+            items=financial_apis,
+            name_field="api_name",
+            collection=FINANCIAL_APIS_COLLECTION,
+            to_document=lambda api_knowledge: {
+                "content": str(api_knowledge),
+                "api_name": api_knowledge["api_name"],
+                "category": api_knowledge["category"],
+                "region": str(api_knowledge.get("region")),
+                "tags": ",".join(api_knowledge.get("tags", [])),
+            },
+            state_metadata=lambda api_knowledge: {
+                "api_name": api_knowledge["api_name"],
+                "category": api_knowledge["category"],
+            },
+            progress=progress,
+        )
+        for api_knowledge, doc_id in stored:
+            harvested.append(
+                {
+                    "api": api_knowledge["api_name"],
+                    "doc_id": doc_id,
+                    "endpoints": len(api_knowledge.get("endpoints", [])),
+                }
+            )
 
         # Log summary with smart harvesting stats
         logger.info(
@@ -412,12 +565,17 @@ class KnowledgeHarvester(VitesseAgent):
             total_sources=len(financial_apis),
         )
 
+        if run is not None:
+            run.skipped_unchanged["financial_apis"] = skipped_unchanged
         return harvested
 
-    async def _harvest_standards(self) -> List[Dict[str, Any]]:
+    async def _harvest_standards(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
         """Harvest regulatory standards and compliance knowledge with validation and smart deduplication."""
         harvested = []
-        skipped_unchanged = 0
 
         logger.info("Harvesting financial standards...")
 
@@ -426,88 +584,31 @@ class KnowledgeHarvester(VitesseAgent):
             FDX_STANDARD,
         ]
 
-        for standard in standards:
-            try:
-                # Validate standard structure
-                if not standard.get("standard"):
-                    logger.warning(
-                        "Skipping standard with missing name", standard=standard
-                    )
-                    continue
-
-                # Compute content hash for change detection
-                content_hash = self._compute_content_hash(standard)
-                source_key = self._get_source_key("standard", standard["standard"])
-
-                # Check if we should process this source (new or changed)
-                if not await self._should_process_source(source_key, content_hash):
-                    skipped_unchanged += 1
-                    logger.debug(
-                        "Skipping unchanged standard", standard=standard.get("standard")
-                    )
-                    continue
-
-                doc_id = await self.knowledge_db.add_documents(
-                    collection=FINANCIAL_STANDARDS_COLLECTION,
-                    documents=[
-                        {
-                            "content": str(standard),
-                            "standard": standard.get("standard"),
-                            "region": standard.get("region"),
-                            "version": standard.get("version"),
-                        }
-                    ],
-                )
-
-                # Validate doc_id is a non-empty list
-                if not doc_id or not isinstance(doc_id, list) or len(doc_id) == 0:
-                    logger.warning(
-                        "Failed to store standard document",
-                        standard=standard.get("standard"),
-                    )
-                    # Still update source state to avoid retrying failed documents
-                    await self._update_source_state(
-                        source_key=source_key,
-                        content_hash=content_hash,
-                        metadata={
-                            "source_type": "standard",
-                            "standard": standard.get("standard"),
-                            "region": standard.get("region"),
-                            "store_failed": True,
-                        },
-                    )
-                    continue
-
-                # Update source state after successful processing
-                await self._update_source_state(
-                    source_key=source_key,
-                    content_hash=content_hash,
-                    metadata={
-                        "source_type": "standard",
-                        "standard": standard.get("standard"),
-                        "region": standard.get("region"),
-                    },
-                )
-
-                harvested.append(
-                    {
-                        "standard": standard.get("standard"),
-                        "doc_id": doc_id[0],
-                        "requirements": len(standard.get("key_requirements", [])),
-                    }
-                )
-
-                logger.info(
-                    "Standard harvested",
-                    standard=standard.get("standard"),
-                )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to harvest standard",
-                    standard=standard.get("standard"),
-                    error=str(e),
-                )
+        stored, skipped_unchanged = await self._store_static_knowledge(
+            source_type="standard",
+            items=standards,
+            name_field="standard",
+            collection=FINANCIAL_STANDARDS_COLLECTION,
+            to_document=lambda standard: {
+                "content": str(standard),
+                "standard": standard.get("standard"),
+                "region": standard.get("region"),
+                "version": standard.get("version"),
+            },
+            state_metadata=lambda standard: {
+                "standard": standard.get("standard"),
+                "region": standard.get("region"),
+            },
+            progress=progress,
+        )
+        for standard, doc_id in stored:
+            harvested.append(
+                {
+                    "standard": standard.get("standard"),
+                    "doc_id": doc_id,
+                    "requirements": len(standard.get("key_requirements", [])),
+                }
+            )
 
         # Log summary with smart harvesting stats
         logger.info(
@@ -517,12 +618,17 @@ class KnowledgeHarvester(VitesseAgent):
             total_sources=len(standards),
         )
 
+        if run is not None:
+            run.skipped_unchanged["regulatory_standards"] = skipped_unchanged
         return harvested
 
-    async def _harvest_patterns(self) -> List[Dict[str, Any]]:
+    async def _harvest_patterns(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
         """Identify and harvest common integration patterns with validation and smart deduplication."""
         harvested = []
-        skipped_unchanged = 0
 
         logger.info("Harvesting integration patterns...")
 
@@ -573,91 +679,31 @@ class KnowledgeHarvester(VitesseAgent):
             },
         ]
 
-        for pattern in patterns:
-            try:
-                # Validate pattern structure
-                if not pattern.get("pattern_name"):
-                    logger.warning(
-                        "Skipping pattern with missing name", pattern=pattern
-                    )
-                    continue
-
-                # Compute content hash for change detection
-                content_hash = self._compute_content_hash(pattern)
-                source_key = self._get_source_key("pattern", pattern["pattern_name"])
-
-                # Check if we should process this source (new or changed)
-                if not await self._should_process_source(source_key, content_hash):
-                    skipped_unchanged += 1
-                    logger.debug(
-                        "Skipping unchanged pattern", pattern=pattern["pattern_name"]
-                    )
-                    continue
-
-                from app.core.knowledge_db import INTEGRATION_PATTERNS_COLLECTION
-
-                doc_id = await self.knowledge_db.add_documents(
-                    collection=INTEGRATION_PATTERNS_COLLECTION,
-                    documents=[
-                        {
-                            "content": str(pattern),
-                            "pattern_name": pattern["pattern_name"],
-                            "pattern_type": pattern["pattern_type"],
-                            "success_rate": pattern.get("success_rate", 0),
-                        }
-                    ],
-                )
-
-                # Validate doc_id is a non-empty list
-                if not doc_id or not isinstance(doc_id, list) or len(doc_id) == 0:
-                    logger.warning(
-                        "Failed to store pattern document",
-                        pattern=pattern.get("pattern_name"),
-                    )
-                    # Still update source state to avoid retrying
-                    await self._update_source_state(
-                        source_key=source_key,
-                        content_hash=content_hash,
-                        metadata={
-                            "source_type": "pattern",
-                            "pattern_name": pattern["pattern_name"],
-                            "pattern_type": pattern["pattern_type"],
-                            "store_failed": True,
-                        },
-                    )
-                    continue
-
-                # Update source state after successful processing
-                await self._update_source_state(
-                    source_key=source_key,
-                    content_hash=content_hash,
-                    metadata={
-                        "source_type": "pattern",
-                        "pattern_name": pattern["pattern_name"],
-                        "pattern_type": pattern["pattern_type"],
-                    },
-                )
-
-                harvested.append(
-                    {
-                        "pattern": pattern["pattern_name"],
-                        "doc_id": doc_id[0],
-                        "type": pattern["pattern_type"],
-                    }
-                )
-
-                logger.info(
-                    "Pattern harvested",
-                    pattern=pattern["pattern_name"],
-                    type=pattern["pattern_type"],
-                )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to harvest pattern",
-                    pattern=pattern.get("pattern_name"),
-                    error=str(e),
-                )
+        stored, skipped_unchanged = await self._store_static_knowledge(
+            source_type="pattern",
+            items=patterns,
+            name_field="pattern_name",
+            collection=INTEGRATION_PATTERNS_COLLECTION,
+            to_document=lambda pattern: {
+                "content": str(pattern),
+                "pattern_name": pattern["pattern_name"],
+                "pattern_type": pattern["pattern_type"],
+                "success_rate": pattern.get("success_rate", 0),
+            },
+            state_metadata=lambda pattern: {
+                "pattern_name": pattern["pattern_name"],
+                "pattern_type": pattern["pattern_type"],
+            },
+            progress=progress,
+        )
+        for pattern, doc_id in stored:
+            harvested.append(
+                {
+                    "pattern": pattern["pattern_name"],
+                    "doc_id": doc_id,
+                    "type": pattern["pattern_type"],
+                }
+            )
 
         # Log summary with smart harvesting stats
         logger.info(
@@ -667,219 +713,347 @@ class KnowledgeHarvester(VitesseAgent):
             total_sources=len(patterns),
         )
 
+        if run is not None:
+            run.skipped_unchanged["integration_patterns"] = skipped_unchanged
         return harvested
 
+    def _parse_directory_entry(
+        self, provider: str, version: str, spec_info: Any
+    ) -> Optional[Dict[str, Any]]:
+        """Build API info from one APIs.guru entry, or None if it is unusable."""
+        # Skip if spec_info is not a dict (malformed data)
+        if not isinstance(spec_info, dict):
+            return None
+
+        # Validate required fields exist
+        if not spec_info.get("info") or not isinstance(spec_info.get("info"), dict):
+            return None
+
+        # Extract basic API information
+        api_info = {
+            "api_name": spec_info.get("info", {}).get("title", provider),
+            "provider": provider,
+            "version": version,
+            "description": spec_info.get("info", {}).get("description", ""),
+            "swagger_url": spec_info.get("swaggerUrl"),
+            "openapi_url": spec_info.get("openapiUrl"),
+            "categories": spec_info.get("categories", []),
+            "source": "apis_guru",
+        }
+
+        # Skip if description is empty (will cause vector dimension issues)
+        if not api_info.get("description", "").strip():
+            return None
+
+        return api_info
+
+    async def _directory_api_changed(
+        self, api_info: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """Return (source_key, hash, info) if this APIs.guru entry is new or changed."""
+        api_content_hash = self._compute_content_hash(api_info)
+        api_source_key = self._get_source_key(
+            "apis_guru", f"{api_info['provider']}:{api_info['version']}"
+        )
+        if await self._should_process_source(api_source_key, api_content_hash):
+            return (api_source_key, api_content_hash, api_info)
+        return None
+
+    async def _store_directory_batch(
+        self, batch: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Embed and upsert one batch of APIs.guru entries, then record their state."""
+        doc_ids = await self.knowledge_db.add_documents(
+            collection=API_SPECS_COLLECTION,
+            documents=[
+                {
+                    "content": f"{info['description']} API: {info['api_name']}",
+                    "api_name": info["api_name"],
+                    "provider": info["provider"],
+                    "categories": info["categories"],
+                    "source": "apis_guru",
+                    "spec_urls": {
+                        "swagger": info.get("swagger_url"),
+                        "openapi": info.get("openapi_url"),
+                    },
+                }
+                for _, _, info in batch
+            ],
+        )
+        if not doc_ids or not isinstance(doc_ids, list):
+            return []
+
+        # Update state for successfully harvested APIs
+        stored = [
+            (entry, doc_ids[i])
+            for i, entry in enumerate(batch)
+            if i < len(doc_ids) and doc_ids[i]
+        ]
+        await self._update_source_states(
+            [
+                (
+                    key,
+                    h,
+                    {
+                        "source_type": "apis_guru",
+                        "api_name": info["api_name"],
+                        "provider": info["provider"],
+                        "version": info["version"],
+                    },
+                )
+                for (key, h, info), _ in stored
+            ]
+        )
+        return [
+            {
+                "api": info["api_name"],
+                "provider": info["provider"],
+                "doc_id": doc_id,
+                "source": "apis_guru",
+            }
+            for (_, _, info), doc_id in stored
+        ]
+
     async def _harvest_api_directory(
-        self, on_progress: Optional[Any] = None
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
     ) -> List[Dict[str, Any]]:
-        """Harvest APIs from APIs.guru directory with validation and smart deduplication."""
+        """Harvest APIs from APIs.guru directory with validation and smart deduplication.
+
+        The directory (tens of MB) is parsed incrementally while it downloads.
+        Entries are collected into windows; each window's state checks and
+        embedding batches run in the background while the download continues,
+        with at most ``HARVEST_UPSERT_CONCURRENCY`` windows in flight.
+
+        As windows complete, the index of the last provider before which all
+        work is done is saved to the harvest checkpoint together with the
+        directory's ETag. A resumed job skips the state checks for those
+        providers if the directory has not changed since.
+        """
         harvested = []
         skipped_count = 0
         skipped_unchanged = 0
         error_count = 0
+        batch_size = 20
+        window_size = 10 * batch_size
+        # Entries for the deep spec stage: new/changed first, then the rest
+        deep_changed: List[Dict[str, Any]] = []
+        deep_unchanged: List[Dict[str, Any]] = []
+        run = run or HarvestRun()
+        collect_deep = run.deep_spec_targets is not None
+        cursors = run.checkpoint.get("apis_guru").get("directories", {})
+        resumed_count = 0
+        failed_directories: List[str] = []
 
         logger.info("Harvesting from APIs.guru directory...")
 
-        for directory_url in self.harvest_sources["api_directories"]:
-            try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(directory_url)
-                    response.raise_for_status()
-
-                    api_data = response.json()
-
-                    # Compute hash of the entire API list for change detection at directory level
-                    directory_hash = self._compute_content_hash(api_data)
-                    source_key = self._get_source_key("api_directory", directory_url)
+        async def _process_window(candidates: List[Dict[str, Any]]) -> None:
+            nonlocal skipped_count, skipped_unchanged, error_count
+            # Per-API state checks are independent Qdrant lookups
+            checked = await bounded_map(candidates, self._directory_api_changed)
+            skipped_unchanged += checked.count(None)
+            changed = [c for c in checked if c and not isinstance(c, Exception)]
+            skipped_count += len(candidates) - len(changed)
+            if collect_deep:
+                for info, outcome in zip(candidates, checked):
+                    if outcome and not isinstance(outcome, Exception):
+                        deep_changed.append(info)
+                    else:
+                        deep_unchanged.append(info)
+
+            batches = [
+                changed[i : i + batch_size] for i in range(0, len(changed), batch_size)
+            ]
+            for outcome in await bounded_map(batches, self._store_directory_batch):
+                if isinstance(outcome, Exception):
+                    error_count += 1
+                    logger.warning(
+                        "Failed to store APIs.guru batch", error=str(outcome)
+                    )
+                else:
+                    harvested.extend(outcome)
 
-                    # Check if we should process this directory (new or changed)
-                    if not await self._should_process_source(
-                        source_key, directory_hash
-                    ):
-                        skipped_unchanged = len(api_data)  # Estimate all APIs unchanged
-                        logger.info(
-                            "Skipping unchanged API directory",
-                            url=directory_url,
-                            estimated_apis=skipped_unchanged,
+        try:
+            for directory_url in self.harvest_sources["api_directories"]:
+                try:
+                    window_slots = asyncio.Semaphore(
+                        settings.HARVEST_UPSERT_CONCURRENCY
+                    )
+                    window_tasks: List[asyncio.Task] = []
+                    # [provider_index, provider, done] per window, in stream order
+                    open_windows: List[List[Any]] = []
+                    directory_version: Optional[str] = None
+
+                    async def _advance_cursor(marker: List[Any]) -> None:
+                        # Windows finish out of order; the cursor only moves
+                        # past a contiguous run of completed ones
+                        marker[2] = True
+                        committed = None
+                        while open_windows and open_windows[0][2]:
+                            committed = open_windows.pop(0)
+                        if committed is None or directory_version is None:
+                            return
+                        cursors[directory_url] = {
+                            "version": directory_version,
+                            "provider_index": committed[0],
+                            "last_provider": committed[1],
+                        }
+                        await run.checkpoint.update(
+                            "apis_guru", directories=dict(cursors)
                         )
-                        continue
-
-                    batch_size = 20
-                    docs_batch = []
-                    api_infos_batch = []
-
-                    # APIs.guru returns a nested structure
-                    provider_count = len(api_data)
-                    providers_processed = 0
-
-                    for provider, versions in api_data.items():
-                        providers_processed += 1
-                        # Update progress based on directory crawl (from 30% to 80%)
-                        if on_progress and providers_processed % 50 == 0:
-                            p = 30.0 + (providers_processed / provider_count) * 50.0
-                            await on_progress(p)
 
-                        # Skip if versions is not a dict (malformed data)
-                        if not isinstance(versions, dict):
-                            skipped_count += 1
-                            continue
-
-                        for version, spec_info in versions.items():
+                    async def _dispatch(
+                        candidates: List[Dict[str, Any]],
+                        provider_index: int,
+                        provider: str,
+                    ) -> None:
+                        # Blocks the parser (and so the download) when processing lags
+                        await window_slots.acquire()
+                        marker = [provider_index, provider, False]
+                        open_windows.append(marker)
+
+                        async def _run() -> None:
                             try:
-                                # Skip if spec_info is not a dict (malformed data)
-                                if not isinstance(spec_info, dict):
-                                    skipped_count += 1
-                                    continue
-
-                                # Validate required fields exist
-                                if not spec_info.get("info") or not isinstance(
-                                    spec_info.get("info"), dict
-                                ):
-                                    skipped_count += 1
-                                    continue
-
-                                # Extract basic API information
-                                api_info = {
-                                    "api_name": spec_info.get("info", {}).get(
-                                        "title", provider
-                                    ),
-                                    "provider": provider,
-                                    "version": version,
-                                    "description": spec_info.get("info", {}).get(
-                                        "description", ""
-                                    ),
-                                    "swagger_url": spec_info.get("swaggerUrl"),
-                                    "openapi_url": spec_info.get("openapiUrl"),
-                                    "categories": spec_info.get("categories", []),
-                                    "source": "apis_guru",
-                                }
-
-                                # Skip if description is empty (will cause vector dimension issues)
-                                description = api_info.get("description", "").strip()
-                                if not description:
-                                    skipped_count += 1
-                                    continue
-
-                                # Compute hash for individual API
-                                api_content_hash = self._compute_content_hash(api_info)
-                                api_source_key = self._get_source_key(
-                                    "apis_guru", f"{provider}:{version}"
-                                )
-
-                                # Check if this specific API needs processing
-                                if not await self._should_process_source(
-                                    api_source_key, api_content_hash
-                                ):
-                                    skipped_count += 1
-                                    continue
-
-                                # Add to batch instead of immediate store
-                                docs_batch.append(
-                                    {
-                                        "content": f"{description} API: {api_info['api_name']}",
-                                        "api_name": api_info["api_name"],
-                                        "provider": api_info["provider"],
-                                        "categories": api_info["categories"],
-                                        "source": "apis_guru",
-                                        "spec_urls": {
-                                            "swagger": api_info.get("swagger_url"),
-                                            "openapi": api_info.get("openapi_url"),
-                                        },
-                                    }
+                                await _process_window(candidates)
+                                await _advance_cursor(marker)
+                            finally:
+                                window_slots.release()
+
+                        window_tasks.append(asyncio.create_task(_run()))
+
+                    async with self.rate_limiter.limit(directory_url):
+                        # Validators are only recorded once the directory has been
+                        # fully processed, so an interrupted harvest is redone
+                        async with conditional_fetcher.stream(
+                            directory_url, scope="harvest:api_directory"
+                        ) as fetched:
+                            if fetched.not_modified:
+                                estimated = fetched.meta.get("api_count", 0)
+                                skipped_unchanged += estimated
+                                logger.info(
+                                    "Skipping unchanged API directory",
+                                    url=directory_url,
+                                    estimated_apis=estimated,
                                 )
-                                api_infos_batch.append(
-                                    (api_source_key, api_content_hash, api_info)
+                                continue
+                            if fetched.status_code != 200:
+                                raise ValueError(f"HTTP {fetched.status_code}")
+
+                            directory_version = fetched.validator
+                            cursor = cursors.get(directory_url) or {}
+                            resume_after = 0
+                            if directory_version and (
+                                cursor.get("version") == directory_version
+                            ):
+                                resume_after = cursor.get("provider_index", 0)
+                                logger.info(
+                                    "Resuming APIs.guru directory from checkpoint",
+                                    url=directory_url,
+                                    provider_index=resume_after,
+                                    last_provider=cursor.get("last_provider"),
                                 )
 
-                                # Process batch if reached size
-                                if len(docs_batch) >= batch_size:
-                                    doc_ids = await self.knowledge_db.add_documents(
-                                        collection=API_SPECS_COLLECTION,
-                                        documents=docs_batch,
-                                    )
-
-                                    # Update state for successfully harvested APIs
-                                    if doc_ids and isinstance(doc_ids, list):
-                                        for i, (key, h, info) in enumerate(
-                                            api_infos_batch
+                            provider_count = 0
+                            window: List[Dict[str, Any]] = []
+                            try:
+                                # APIs.guru returns {provider: {version: spec_info}}
+                                async for provider, versions in iter_object_items(
+                                    fetched.iter_bytes()
+                                ):
+                                    provider_count += 1
+                                    # Skip if versions is not a dict (malformed data)
+                                    if not isinstance(versions, dict):
+                                        skipped_count += 1
+                                        continue
+
+                                    if provider_count <= resume_after:
+                                        # Done before the interruption; only
+                                        # keep the entries for deep spec targets
+                                        resumed_count += 1
+                                        if collect_deep:
+                                            for version, spec_info in versions.items():
+                                                try:
+                                                    info = self._parse_directory_entry(
+                                                        provider, version, spec_info
+                                                    )
+                                                except Exception:
+                                                    continue
+                                                if info is not None:
+                                                    deep_unchanged.append(info)
+                                        continue
+
+                                    for version, spec_info in versions.items():
+                                        try:
+                                            api_info = self._parse_directory_entry(
+                                                provider, version, spec_info
+                                            )
+                                        except Exception as e:
+                                            # Only log at debug level to reduce noise
+                                            error_count += 1
+                                            logger.debug(
+                                                "Skipped malformed API entry",
+                                                provider=provider,
+                                                version=version,
+                                                error_type=type(e).__name__,
+                                            )
+                                            continue
+
+                                        if api_info is None:
+                                            skipped_count += 1
+                                            continue
+                                        window.append(api_info)
+
+                                    if len(window) >= window_size:
+                                        await _dispatch(
+                                            window, provider_count, provider
+                                        )
+                                        window = []
+                                        if (
+                                            progress
+                                            and fetched.fraction_read is not None
                                         ):
-                                            if i < len(doc_ids) and doc_ids[i]:
-                                                await self._update_source_state(
-                                                    source_key=key,
-                                                    content_hash=h,
-                                                    metadata={
-                                                        "source_type": "apis_guru",
-                                                        "api_name": info["api_name"],
-                                                        "provider": info["provider"],
-                                                        "version": info["version"],
-                                                    },
-                                                )
-                                                harvested.append(
-                                                    {
-                                                        "api": info["api_name"],
-                                                        "provider": info["provider"],
-                                                        "doc_id": doc_ids[i],
-                                                        "source": "apis_guru",
-                                                    }
-                                                )
-
-                                    docs_batch = []
-                                    api_infos_batch = []
-
-                            except Exception as e:
-                                # Only log at debug level to reduce noise
-                                error_count += 1
-                                logger.debug(
-                                    "Skipped malformed API entry",
-                                    provider=provider,
-                                    version=version,
-                                    error_type=type(e).__name__,
+                                            await progress(0.95 * fetched.fraction_read)
+
+                                if window:
+                                    await _dispatch(window, provider_count, provider)
+                                await asyncio.gather(*window_tasks)
+                            except BaseException:
+                                for task in window_tasks:
+                                    task.cancel()
+                                await asyncio.gather(
+                                    *window_tasks, return_exceptions=True
                                 )
+                                raise
 
-                    # Process remaining batch
-                    if docs_batch:
-                        doc_ids = await self.knowledge_db.add_documents(
-                            collection=API_SPECS_COLLECTION,
-                            documents=docs_batch,
-                        )
-                        if doc_ids and isinstance(doc_ids, list):
-                            for i, (key, h, info) in enumerate(api_infos_batch):
-                                if i < len(doc_ids) and doc_ids[i]:
-                                    await self._update_source_state(
-                                        source_key=key,
-                                        content_hash=h,
-                                        metadata={
-                                            "source_type": "apis_guru",
-                                            "api_name": info["api_name"],
-                                            "provider": info["provider"],
-                                            "version": info["version"],
-                                        },
-                                    )
-                                    harvested.append(
-                                        {
-                                            "api": info["api_name"],
-                                            "provider": info["provider"],
-                                            "doc_id": doc_ids[i],
-                                            "source": "apis_guru",
-                                        }
-                                    )
-
-                    # Update directory-level hash after processing all APIs
+                            result = fetched.result()
+
+                    # Raw-body hash replaces hashing the re-serialized tree
+                    source_key = self._get_source_key("api_directory", directory_url)
                     await self._update_source_state(
                         source_key=source_key,
-                        content_hash=directory_hash,
+                        content_hash=result.content_hash,
                         metadata={
                             "source_type": "api_directory",
                             "url": directory_url,
                             "apis_processed": len(harvested),
                         },
                     )
+                    await conditional_fetcher.record(
+                        result, meta={"api_count": provider_count}
+                    )
 
-            except Exception as e:
-                logger.error(
-                    "Failed to harvest from APIs.guru",
-                    url=directory_url,
-                    error=str(e),
+                except Exception as e:
+                    failed_directories.append(directory_url)
+                    logger.error(
+                        "Failed to harvest from APIs.guru",
+                        url=directory_url,
+                        error=str(e),
+                    )
+        finally:
+            if collect_deep and not run.deep_spec_targets.done():
+                run.deep_spec_targets.set_result(
+                    self._select_deep_spec_targets(deep_changed + deep_unchanged)
                 )
 
         # Log summary instead of individual errors
@@ -888,12 +1062,165 @@ class KnowledgeHarvester(VitesseAgent):
             harvested=len(harvested),
             skipped=skipped_count,
             skipped_unchanged=skipped_unchanged,
+            resumed_providers=resumed_count,
             errors=error_count,
         )
 
+        # Fail the stage so it is not checkpointed as done and runs again
+        if failed_directories:
+            raise RuntimeError(
+                f"Failed to harvest API directories: {', '.join(failed_directories)}"
+            )
+
+        run.skipped_unchanged["apis_guru"] = skipped_unchanged
         return harvested
 
-    async def _harvest_api_marketplaces(self) -> List[Dict[str, Any]]:
+    def _select_deep_spec_targets(
+        self, entries: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Pick the APIs.guru entries whose full specs the deep stage fetches."""
+        wanted = {c.lower() for c in settings.HARVEST_DEEP_SPECS_CATEGORIES}
+        targets = []
+        seen_urls: Set[str] = set()
+        for info in entries:
+            spec_url = info.get("openapi_url") or info.get("swagger_url")
+            if not spec_url or spec_url in seen_urls:
+                continue
+            categories = {str(c).lower() for c in info.get("categories") or []}
+            if wanted and not wanted & categories:
+                continue
+            seen_urls.add(spec_url)
+            targets.append({**info, "spec_url": spec_url})
+            if len(targets) >= settings.HARVEST_DEEP_SPECS_MAX:
+                break
+        return targets
+
+    def _endpoint_document_id(self, spec_url: str, method: str, path: str) -> str:
+        """Stable point id, so re-harvesting a spec overwrites its endpoints."""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{spec_url}#{method} {path}"))
+
+    async def _harvest_spec_document(
+        self, api_info: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch one OpenAPI document and index one knowledge doc per endpoint."""
+        spec_url = api_info["spec_url"]
+        async with self.rate_limiter.limit(spec_url):
+            fetched = await conditional_fetcher.get(
+                spec_url, scope="harvest:deep_spec", record=False
+            )
+        if fetched.unchanged:
+            if not fetched.not_modified:
+                await conditional_fetcher.record(fetched)
+            return None
+        if fetched.status_code != 200:
+            raise ValueError(f"HTTP {fetched.status_code} for {spec_url}")
+
+        if self._spec_parser is None:
+            from app.agents.ingestor import VitesseIngestor
+
+            self._spec_parser = VitesseIngestor(
+                context=self.context, intelligence=self.intelligence
+            )
+        # Specs run to several MB; keep decoding and extraction off the loop
+        with observe_seconds(HARVEST_PARSE_SECONDS):
+            spec = await asyncio.to_thread(load_spec_document, fetched.content)
+            endpoints = await asyncio.to_thread(
+                self._spec_parser._extract_endpoints, spec
+            )
+
+        documents, ids = [], []
+        for endpoint in endpoints:
+            ids.append(
+                self._endpoint_document_id(spec_url, endpoint.method, endpoint.path)
+            )
+            documents.append(
+                {
+                    "content": (
+                        f"{endpoint.method} {endpoint.path} "
+                        f"{endpoint.description or ''} API: {api_info['api_name']}"
+                    ),
+                    "api_name": api_info["api_name"],
+                    "provider": api_info["provider"],
+                    "version": api_info["version"],
+                    "method": endpoint.method,
+                    "path": endpoint.path,
+                    "spec_url": spec_url,
+                    "source": "apis_guru_spec",
+                    "endpoint": endpoint.model_dump_json(),
+                }
+            )
+
+        stored_ids: List[str] = []
+        for i in range(0, len(documents), 50):
+            stored_ids.extend(
+                await self.knowledge_db.add_documents(
+                    collection=API_ENDPOINTS_COLLECTION,
+                    documents=documents[i : i + 50],
+                    ids=ids[i : i + 50],
+                )
+                or []
+            )
+
+        if len(stored_ids) < len(documents):
+            # Leave validators unrecorded so the spec is retried next run
+            raise ValueError(
+                f"Indexed {len(stored_ids)}/{len(documents)} endpoints for {spec_url}"
+            )
+
+        # Endpoints dropped from a new spec version would otherwise linger
+        stale = set(fetched.meta.get("endpoint_ids", [])) - set(ids)
+        for doc_id in stale:
+            await self.knowledge_db.delete_document(API_ENDPOINTS_COLLECTION, doc_id)
+
+        await conditional_fetcher.record(fetched, meta={"endpoint_ids": ids})
+        return {
+            "api": api_info["api_name"],
+            "provider": api_info["provider"],
+            "spec_url": spec_url,
+            "endpoints": len(stored_ids),
+            "source": "apis_guru_spec",
+        }
+
+    async def _harvest_deep_specs(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
+        """Download full OpenAPI documents for APIs.guru entries and index endpoints.
+
+        Targets come from the APIs.guru stage (new or changed entries first,
+        limited to ``HARVEST_DEEP_SPECS_CATEGORIES`` and
+        ``HARVEST_DEEP_SPECS_MAX``). Specs are fetched conditionally, so an
+        unchanged spec costs one 304.
+        """
+        run = run or HarvestRun()
+        targets = await run.deep_spec_targets if run.deep_spec_targets else []
+        logger.info("Harvesting full API specs", targets=len(targets))
+
+        outcomes = await bounded_map(
+            targets, self._harvest_spec_document, progress=progress
+        )
+
+        harvested = [o for o in outcomes if o and not isinstance(o, Exception)]
+        failed = [o for o in outcomes if isinstance(o, Exception)]
+        for error in failed[:5]:
+            logger.debug("Deep spec harvest failed", error=str(error))
+
+        logger.info(
+            "Deep spec harvest complete",
+            harvested=len(harvested),
+            endpoints=sum(h["endpoints"] for h in harvested),
+            skipped_unchanged=outcomes.count(None),
+            errors=len(failed),
+        )
+        run.skipped_unchanged["apis_guru_specs"] = outcomes.count(None)
+        return harvested
+
+    async def _harvest_api_marketplaces(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
         """Harvest APIs from marketplaces like RapidAPI, Postman, etc. with smart deduplication."""
         harvested = []
         skipped_unchanged = 0
@@ -965,7 +1292,9 @@ class KnowledgeHarvester(VitesseAgent):
             },
         ]
 
-        for api in marketplace_apis:
+        async def _harvest_one(api) -> None:
+            nonlocal skipped_unchanged
+
             try:
                 # Compute content hash for change detection
                 content_hash = self._compute_content_hash(api)
@@ -977,7 +1306,7 @@ class KnowledgeHarvester(VitesseAgent):
                     logger.debug(
                         "Skipping unchanged marketplace source", api=api["name"]
                     )
-                    continue
+                    return
 
                 doc_id = await self.knowledge_db.add_documents(
                     collection=API_SPECS_COLLECTION,
@@ -994,23 +1323,12 @@ class KnowledgeHarvester(VitesseAgent):
 
                 # Validate doc_id is a non-empty list
                 if not doc_id or not isinstance(doc_id, list) or len(doc_id) == 0:
+                    # No state is recorded, so the API is retried next run
                     logger.warning(
                         "Failed to store marketplace API document",
                         api=api["name"],
                     )
-                    # Still update source state to avoid retrying
-                    await self._update_source_state(
-                        source_key=source_key,
-                        content_hash=content_hash,
-                        metadata={
-                            "source_type": "marketplace",
-                            "api_name": api["name"],
-                            "marketplace": api["marketplace"],
-                            "category": api["category"],
-                            "store_failed": True,
-                        },
-                    )
-                    continue
+                    return
 
                 # Update source state after successful processing
                 await self._update_source_state(
@@ -1047,6 +1365,8 @@ class KnowledgeHarvester(VitesseAgent):
                     error=str(e),
                 )
 
+        await bounded_map(marketplace_apis, _harvest_one, progress=progress)
+
         # Log summary with smart harvesting stats
         logger.info(
             "Marketplace API harvest complete",
@@ -1055,9 +1375,15 @@ class KnowledgeHarvester(VitesseAgent):
             total_sources=len(marketplace_apis),
         )
 
+        if run is not None:
+            run.skipped_unchanged["api_marketplaces"] = skipped_unchanged
         return harvested
 
-    async def _harvest_github_apis(self) -> List[Dict[str, Any]]:
+    async def _harvest_github_apis(
+        self,
+        progress: Optional[StageProgressCallback] = None,
+        run: Optional[HarvestRun] = None,
+    ) -> List[Dict[str, Any]]:
         """Harvest API information from GitHub repositories with validation and smart deduplication."""
         harvested = []
         skipped_unchanged = 0
@@ -1065,7 +1391,9 @@ class KnowledgeHarvester(VitesseAgent):
 
         logger.info("Harvesting from GitHub API repositories...")
 
-        for repo in self.harvest_sources["github_api_repos"]:
+        async def _harvest_one(repo) -> None:
+            nonlocal skipped_unchanged, skipped_error
+
             try:
                 # Extract provider and repo name
                 provider, repo_name = repo.split("/", 1)
@@ -1093,7 +1421,7 @@ class KnowledgeHarvester(VitesseAgent):
                 if not await self._should_process_source(source_key, content_hash):
                     skipped_unchanged += 1
                     logger.debug("Skipping unchanged GitHub source", repo=repo)
-                    continue
+                    return
 
                 doc_id = await self.knowledge_db.add_documents(
                     collection=API_SPECS_COLLECTION,
@@ -1117,20 +1445,9 @@ class KnowledgeHarvester(VitesseAgent):
                         repo=repo,
                         provider=provider,
                     )
+                    # No state is recorded, so the repo is retried next run
                     skipped_error += 1
-                    # Still update source state to avoid retrying
-                    await self._update_source_state(
-                        source_key=source_key,
-                        content_hash=content_hash,
-                        metadata={
-                            "source_type": "github",
-                            "api_name": api_info["name"],
-                            "provider": provider,
-                            "category": category,
-                            "store_failed": True,
-                        },
-                    )
-                    continue
+                    return
 
                 # Update source state after successful processing
                 await self._update_source_state(
@@ -1170,6 +1487,10 @@ class KnowledgeHarvester(VitesseAgent):
                 )
                 skipped_error += 1
 
+        await bounded_map(
+            self.harvest_sources["github_api_repos"], _harvest_one, progress=progress
+        )
+
         # Log summary with smart harvesting stats
         logger.info(
             "GitHub API harvest complete",
@@ -1179,6 +1500,8 @@ class KnowledgeHarvester(VitesseAgent):
             total_sources=len(self.harvest_sources["github_api_repos"]),
         )
 
+        if run is not None:
+            run.skipped_unchanged["github_repos"] = skipped_unchanged
         return harvested
 
     def _infer_api_category(self, repo_name: str) -> str:
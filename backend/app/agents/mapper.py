@@ -11,12 +11,14 @@ from aether.protocols.intelligence import IntelligenceProvider
 from app.schemas.integration import (
     MappingLogic,
     DataTransformation,
-    APISpecification,
 )
 
 logger = structlog.get_logger(__name__)
 
-from app.services.semantic.layer import SemanticLayer
+from app.core.config import settings
+from app.services.mapping_cache import mapping_cache, mapping_fingerprint
+from app.services.semantic.layer import SemanticLayer, flatten_schema, mapping_version
+from app.services.spec_store import spec_store
 from app.db.session import async_session_factory
 
 
@@ -76,15 +78,12 @@ class VitesseMapper(VitesseAgent):
         )
 
         try:
-            # Convert dicts to APISpecification objects if needed
-            if isinstance(source_spec, dict):
-                source_spec = APISpecification(**source_spec)
-            if isinstance(dest_spec, dict):
-                dest_spec = APISpecification(**dest_spec)
-
-            # Step 1: Find endpoints
-            source_ep = self._find_endpoint(source_spec.endpoints, source_endpoint)
-            dest_ep = self._find_endpoint(dest_spec.endpoints, dest_endpoint)
+            # Step 1: Find endpoints. Only the two endpoints used are built into
+            # models; compact specs are indexed from the spec store.
+            source_index = await spec_store.endpoint_index(source_spec)
+            dest_index = await spec_store.endpoint_index(dest_spec)
+            source_ep = source_index.get(source_endpoint)
+            dest_ep = dest_index.get(dest_endpoint)
 
             if not source_ep or not dest_ep:
                 raise ValueError(
@@ -100,14 +99,14 @@ class VitesseMapper(VitesseAgent):
                 user_intent=user_intent,
                 source_schema=source_schema,
                 dest_schema=dest_schema,
-                source_api_name=source_spec.api_name,
-                dest_api_name=dest_spec.api_name,
+                source_api_name=source_spec.get("api_name"),
+                dest_api_name=dest_spec.get("api_name"),
             )
 
             # Step 4: Create mapping logic
             mapping_logic = MappingLogic(
-                source_api=source_spec.api_name,
-                dest_api=dest_spec.api_name,
+                source_api=source_spec.get("api_name"),
+                dest_api=dest_spec.get("api_name"),
                 source_endpoint=source_endpoint,
                 dest_endpoint=dest_endpoint,
                 transformations=transformations,
@@ -137,21 +136,6 @@ class VitesseMapper(VitesseAgent):
                 "error": str(e),
             }
 
-    def _find_endpoint(
-        self,
-        endpoints: List[Dict[str, Any]],
-        endpoint_path: str,
-    ) -> Optional[Any]:
-        """Find endpoint by path."""
-        for ep in endpoints:
-            if isinstance(ep, dict):
-                if ep.get("path") == endpoint_path:
-                    return ep
-            else:
-                if ep.path == endpoint_path:
-                    return ep
-        return None
-
     async def _generate_transformations(
         self,
         user_intent: str,
@@ -162,18 +146,51 @@ class VitesseMapper(VitesseAgent):
     ) -> List[DataTransformation]:
         """
         Generate semantic transformations using SemanticLayer (LLM + Vector Search).
+        Mappings already generated for the same schemas and intent come from
+        the mapping cache.
         """
+        fingerprint = None
+        if settings.MAPPING_CACHE_ENABLED:
+            version = mapping_version()
+            fingerprint = mapping_fingerprint(
+                flatten_schema(source_schema),
+                flatten_schema(dest_schema),
+                user_intent,
+                version,
+            )
+            cached = await mapping_cache.get(fingerprint)
+            if cached is not None:
+                logger.info(
+                    "Mapping cache hit",
+                    source_api=source_api_name,
+                    dest_api=dest_api_name,
+                    transformation_count=len(cached),
+                )
+                return cached
+
         # Initialize Semantic Layer with a DB session
         async with async_session_factory() as db:
             semantic_layer = SemanticLayer(db)
 
             # Use the new semantic layer to map the schemas
-            transformations = await semantic_layer.map_schema(
+            transformations, complete = await semantic_layer.map_schema_with_status(
                 source_schema=source_schema,
                 dest_schema=dest_schema,
                 user_intent=user_intent,
             )
 
+            # Only complete semantic mappings are cached: a group whose LLM
+            # call failed is left unmapped and should be retried next time.
+            # The naive fallback is cheap and not cached either.
+            if transformations and complete and fingerprint:
+                await mapping_cache.put(
+                    fingerprint,
+                    transformations,
+                    source_api=source_api_name,
+                    dest_api=dest_api_name,
+                    mapping_version=version,
+                )
+
             # Fallback to naive matching if semantic layer returns nothing or fails
             # (Optional: implementation detail, for now we trust semantic layer or it returns empty)
             if not transformations:
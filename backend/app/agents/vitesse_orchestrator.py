@@ -4,6 +4,8 @@ Coordinates Discovery, Ingestor, Mapper, Guardian, and Deployer agents.
 Manages the complete integration lifecycle.
 """
 
+import asyncio
+import time
 import uuid
 import json
 from typing import Any, Dict, Optional, List
@@ -97,39 +99,27 @@ class VitesseOrchestrator:
         )
 
         try:
-            # Step 1: Ingest source API
-            logger.info("Step 1/5: Ingesting source API", integration_id=integration_id)
-            source_ingest_result = await self._ingest_api(
-                api_url=source_api_url,
-                api_name=source_api_name,
-                auth_details=source_auth,
-                spec_url=source_spec_url,
-            )
-
-            if source_ingest_result["status"] != "success":
-                raise Exception(
-                    f"Source API ingestion failed: {source_ingest_result.get('error')}"
-                )
-
-            source_spec = source_ingest_result["api_spec"]
-
-            # Step 2: Ingest destination API
+            # Steps 1-2: Ingest source and destination APIs concurrently
             logger.info(
-                "Step 2/5: Ingesting destination API", integration_id=integration_id
+                "Steps 1-2/5: Ingesting source and destination APIs",
+                integration_id=integration_id,
             )
-            dest_ingest_result = await self._ingest_api(
-                api_url=dest_api_url,
-                api_name=dest_api_name,
-                auth_details=dest_auth,
-                spec_url=dest_spec_url,
+            ingested = await self._ingest_both(
+                source={
+                    "api_url": source_api_url,
+                    "api_name": source_api_name,
+                    "auth_details": source_auth,
+                    "spec_url": source_spec_url,
+                },
+                dest={
+                    "api_url": dest_api_url,
+                    "api_name": dest_api_name,
+                    "auth_details": dest_auth,
+                    "spec_url": dest_spec_url,
+                },
             )
-
-            if dest_ingest_result["status"] != "success":
-                raise Exception(
-                    f"Dest API ingestion failed: {dest_ingest_result.get('error')}"
-                )
-
-            dest_spec = dest_ingest_result["api_spec"]
+            source_spec = ingested["source"]["api_spec"]
+            dest_spec = ingested["dest"]["api_spec"]
 
             # Step 3: Generate mapping logic
             logger.info(
@@ -255,6 +245,7 @@ class VitesseOrchestrator:
                     IntegrationStatusEnum,
                     DeploymentTargetEnum,
                 )
+                from app.services.spec_store import spec_store
 
                 # Helper to ensure all fields are JSON serializable
                 def make_json_serializable(obj):
@@ -311,8 +302,13 @@ class VitesseOrchestrator:
                         id=integration.id,
                         name=integration.name,
                         status=status_val,
-                        source_api_spec=make_json_serializable(source_spec_data),
-                        dest_api_spec=make_json_serializable(dest_spec_data),
+                        # Full specs go to the spec store, rows keep compact copies
+                        source_api_spec=await spec_store.put(
+                            make_json_serializable(source_spec_data)
+                        ),
+                        dest_api_spec=await spec_store.put(
+                            make_json_serializable(dest_spec_data)
+                        ),
                         mapping_logic=make_json_serializable(mapping_logic_data),
                         deployment_config=make_json_serializable(
                             deployment_config_data
@@ -344,6 +340,7 @@ class VitesseOrchestrator:
                     if isinstance(health_score, dict)
                     else (health_score.model_dump() if health_score else None)
                 ),
+                "ingestion_timings": ingested["timings"],
             }
 
         except Exception as e:
@@ -386,6 +383,51 @@ class VitesseOrchestrator:
                 "error": str(e),
             }
 
+    async def _ingest_both(
+        self, source: Dict[str, Any], dest: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Ingest the source and destination APIs concurrently.
+
+        ``source`` and ``dest`` are keyword arguments for ``_ingest_api``. Both
+        sides run in one task group, so when one fails the other is cancelled
+        and the failure is raised. Returns both ingest results and the wall
+        time of each side in seconds under ``timings``.
+        """
+        timings: Dict[str, float] = {}
+
+        async def _ingest_side(side: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            started = time.monotonic()
+            try:
+                result = await self._ingest_api(**kwargs)
+            finally:
+                timings[side] = round(time.monotonic() - started, 3)
+            if result["status"] != "success":
+                raise Exception(
+                    f"{side.capitalize()} API ingestion failed: {result.get('error')}"
+                )
+            logger.info(
+                "API ingested",
+                side=side,
+                api_name=kwargs.get("api_name"),
+                duration_seconds=timings[side],
+            )
+            return result
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                source_task = group.create_task(_ingest_side("source", source))
+                dest_task = group.create_task(_ingest_side("dest", dest))
+        except ExceptionGroup as eg:
+            logger.warning("API ingestion aborted", timings=timings)
+            raise eg.exceptions[0]
+
+        return {
+            "source": source_task.result(),
+            "dest": dest_task.result(),
+            "timings": timings,
+        }
+
     async def _generate_mappings(
         self,
         source_spec: Dict[str, Any],
@@ -800,36 +842,28 @@ class VitesseOrchestrator:
         try:
             logger.info("Ingesting API specifications")
 
-            # TODO: Implement actual spec fetching from URLs
-            # For now, return mock specifications
-            source_api_spec = {
-                "api_name": source_discovery["api_name"],
-                "base_url": source_discovery.get("base_url", ""),
-                "endpoints": [
-                    {
-                        "path": "/customers",
-                        "method": "GET",
-                        "response_schema": {"type": "object", "properties": {}},
-                    }
-                ],
-            }
+            def _ingest_args(
+                discovery: Dict[str, Any], spec_url: Optional[str]
+            ) -> Dict[str, Any]:
+                spec_url = spec_url or discovery.get("spec_url")
+                return {
+                    "api_url": discovery.get("base_url")
+                    or discovery.get("documentation_url")
+                    or spec_url,
+                    "api_name": discovery["api_name"],
+                    "spec_url": spec_url,
+                }
 
-            dest_api_spec = {
-                "api_name": dest_discovery["api_name"],
-                "base_url": dest_discovery.get("base_url", ""),
-                "endpoints": [
-                    {
-                        "path": "/contacts",
-                        "method": "POST",
-                        "request_schema": {"type": "object", "properties": {}},
-                    }
-                ],
-            }
+            ingested = await self._ingest_both(
+                source=_ingest_args(source_discovery, source_spec_url),
+                dest=_ingest_args(dest_discovery, dest_spec_url),
+            )
 
             return {
                 "status": "success",
-                "source_api_spec": source_api_spec,
-                "dest_api_spec": dest_api_spec,
+                "source_api_spec": ingested["source"]["api_spec"],
+                "dest_api_spec": ingested["dest"]["api_spec"],
+                "ingestion_timings": ingested["timings"],
             }
         except Exception as e:
             logger.error("Ingest failed", error=str(e))
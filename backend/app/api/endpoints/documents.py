@@ -3,6 +3,7 @@
 from typing import List, Dict, Any, Optional
 import shutil
 import os
+import mimetypes
 import uuid
 import json
 import asyncio
@@ -13,7 +14,6 @@ from fastapi import (
     HTTPException,
     Form,
     Depends,
-    BackgroundTasks,
 )
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -22,11 +22,15 @@ from sqlalchemy import select, update
 from app import models
 from app.api import deps
 from app.core.config import settings
-from app.db.session import get_db, async_session_factory
+from app.core.uploads import stream_upload_to_disk
+from app.db.session import get_db
 from app.services.knowledge_base import knowledge_base_manager
 from app.services.metadata_service import get_metadata_service
 from app.services.vectorization import get_vectorization_service
 from app.models.document import Document, ExtractionStatus
+from app.models.queue_request import QueuePriority
+from app.services.job_queue import job_queue
+from app.tasks.document_jobs import INGEST_DOCUMENT_JOB, REVECTORIZE_DOCUMENT_JOB
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -119,6 +123,116 @@ async def read_documents(
         )
 
 
+async def _store_and_enqueue_upload(
+    file: UploadFile,
+    doc_type: str,
+    product_id: Optional[str],
+    deployment_type: Optional[str],
+    db: AsyncSession,
+    user_id: int,
+    priority: int = QueuePriority.NORMAL,
+) -> Dict[str, Any]:
+    """Persist an uploaded file and enqueue its ingestion job."""
+    os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+
+    # Generate safe filename and ID
+    file_id = str(uuid.uuid4())
+    file_ext = file.filename.split(".")[-1] if "." in file.filename else ""
+    safe_filename = f"{file_id}.{file_ext}" if file_ext else file_id
+    file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
+
+    logger.info(f"Uploading file: {file.filename} for user {user_id}")
+
+    # 1. Create SQL record first
+    new_doc = Document(
+        id=file_id,
+        name=file.filename,
+        type=file_ext,
+        location=file_path,
+        size=file.size,
+        user_id=user_id,
+        doc_type=doc_type,
+        category=doc_type,
+        extraction_status=ExtractionStatus.PENDING,
+        uploaded_at=None,  # Will use DB default
+        product_id=product_id,
+        deployment_type=deployment_type,
+    )
+    db.add(new_doc)
+    await db.commit()
+    await db.refresh(new_doc)
+    logger.info(
+        f"Document saved to DB with ID: {file_id}, Status: {new_doc.extraction_status}"
+    )
+
+    # 2. Stream file to disk chunk by chunk (never holds the whole body in memory)
+    try:
+        stored = await stream_upload_to_disk(
+            file,
+            file_path,
+            compute_hash=settings.UPLOAD_COMPUTE_HASH,
+            max_size=settings.MAX_UPLOAD_SIZE,
+        )
+    except BaseException:
+        # Also on disconnects and disk errors: no file, so no document
+        try:
+            await db.rollback()
+            await db.delete(new_doc)
+            await db.commit()
+        except Exception as cleanup_error:
+            logger.error(
+                f"Failed to remove document {file_id} after a failed upload",
+                error=str(cleanup_error),
+            )
+        raise
+
+    new_doc.size = stored.size
+    if stored.sha256:
+        new_doc.custom_metadata = {
+            **(new_doc.custom_metadata or {}),
+            "sha256": stored.sha256,
+        }
+    logger.info(
+        f"File saved to disk: {file_path}",
+        size=stored.size,
+        sha256=stored.sha256,
+    )
+
+    # 3. Prepare metadata
+    metadata = {
+        "original_filename": file.filename,
+        "doc_type": doc_type,
+        "category": doc_type,
+        "db_id": file_id,
+        "product_id": product_id,
+        "deployment_type": deployment_type,
+    }
+
+    # 4. Enqueue durable ingestion job (processed by the job worker pool)
+    job = await job_queue.enqueue(
+        db,
+        INGEST_DOCUMENT_JOB,
+        payload={
+            "document_id": file_id,
+            "file_path": file_path,
+            "file_type": file_ext,
+            "metadata": metadata,
+        },
+        priority=priority,
+        requestor_id=user_id,
+        workflow_id=f"document:{file_id}",
+    )
+
+    logger.info(f"File upload successful: {file_id} ({file.filename})", job_id=job.id)
+    return {
+        "id": file_id,
+        "job_id": job.id,
+        "filename": file.filename,
+        "status": "success",
+        "message": "Upload successful, processing queued",
+    }
+
+
 @router.post("/")
 async def upload_document(
     file: UploadFile = File(...),
@@ -126,98 +240,24 @@ async def upload_document(
     product_id: str = Form(None),
     deployment_type: str = Form(None),
     db: AsyncSession = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
     current_user: models.User = Depends(deps.get_current_user),
 ):
-    """Upload and process a document."""
+    """Upload a document and queue it for processing."""
     # Capture user_id early to avoid lazy loading issues in error handler
     user_id = current_user.id
 
     try:
-        os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
-
-        # Generate safe filename and ID
-        file_id = str(uuid.uuid4())
-        file_ext = file.filename.split(".")[-1] if "." in file.filename else ""
-        safe_filename = f"{file_id}.{file_ext}" if file_ext else file_id
-        file_path = os.path.join(settings.UPLOAD_DIR, safe_filename)
-
-        logger.info(f"Uploading file: {file.filename} for user {user_id}")
-
-        # 1. Create SQL record first
-        new_doc = Document(
-            id=file_id,
-            name=file.filename,
-            type=file_ext,
-            location=file_path,
-            size=file.size,
-            user_id=user_id,
+        return await _store_and_enqueue_upload(
+            file=file,
             doc_type=doc_type,
-            category=doc_type,
-            extraction_status=ExtractionStatus.PENDING,
-            uploaded_at=None,  # Will use DB default
             product_id=product_id,
             deployment_type=deployment_type,
+            db=db,
+            user_id=user_id,
         )
-        db.add(new_doc)
-        await db.commit()
-        await db.refresh(new_doc)
-        logger.info(
-            f"Document saved to DB with ID: {file_id}, Status: {new_doc.extraction_status}"
-        )
-
-        # 2. Save file locally
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        logger.info(f"File saved to disk: {file_path}")
-
-        # 3. Prepare metadata
-        metadata = {
-            "original_filename": file.filename,
-            "doc_type": doc_type,
-            "category": doc_type,
-            "db_id": file_id,
-            "product_id": product_id,
-            "deployment_type": deployment_type,
-        }
-
-        # 4. Trigger ingestion with database session management
-        async def process_document_with_db():
-            """Wrapper to handle db session for background task."""
-            async with async_session_factory() as db:
-                await knowledge_base_manager.add_document(
-                    file_path=file_path,
-                    file_type=file_ext,
-                    document_id=file_id,
-                    metadata=metadata,
-                    db_session=db,
-                )
-
-        if background_tasks:
-            background_tasks.add_task(process_document_with_db)
-            logger.info(f"Background task queued for document {file_id}")
-        else:
-            logger.warning(
-                f"No background tasks available, processing synchronously for {file_id}"
-            )
-            async with async_session_factory() as db:
-                await knowledge_base_manager.add_document(
-                    file_path=file_path,
-                    file_type=file_ext,
-                    document_id=file_id,
-                    metadata=metadata,
-                    db_session=db,
-                )
-
-        logger.info(f"File upload successful: {file_id} ({file.filename})")
-        return {
-            "id": file_id,
-            "filename": file.filename,
-            "status": "success",
-            "message": "Upload successful, processing started in background",
-        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         try:
             await db.rollback()
@@ -235,26 +275,32 @@ async def upload_multiple(
     product_id: str = Form(None),
     deployment_type: str = Form(None),
     db: AsyncSession = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
     current_user: models.User = Depends(deps.get_current_user),
 ):
-    """Upload and process multiple documents."""
+    """Upload multiple documents; bulk ingestion is queued at low priority."""
+    user_id = current_user.id
     results = []
     for file in files:
         try:
-            res = await upload_document(
+            res = await _store_and_enqueue_upload(
                 file=file,
                 doc_type=doc_type,
                 product_id=product_id,
                 deployment_type=deployment_type,
                 db=db,
-                background_tasks=background_tasks,
-                current_user=current_user,
+                user_id=user_id,
+                priority=QueuePriority.LOW,
             )
             results.append(res)
         except Exception as e:
+            try:
+                await db.rollback()
+            except Exception:
+                pass  # Ignore rollback errors
+            logger.error(f"File upload failed: {str(e)}", user_id=user_id)
+            error = e.detail if isinstance(e, HTTPException) else str(e)
             results.append(
-                {"filename": file.filename, "status": "failed", "error": str(e)}
+                {"filename": file.filename, "status": "failed", "error": error}
             )
 
     return {"status": "completed", "results": results}
@@ -730,7 +776,6 @@ async def get_all_tags(
 @router.post("/{document_id}/revectorize/")
 async def revectorize_document(
     document_id: str,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     current_user: models.User = Depends(deps.get_current_user),
 ):
@@ -767,25 +812,28 @@ async def revectorize_document(
             "revectorization": True,  # Flag to indicate this is a re-vectorization
         }
 
-        # Queue background task for revectorization with database session
-        async def revectorize_with_db():
-            """Wrapper to handle db session for revectorization task."""
-            async with async_session_factory() as new_db:
-                await knowledge_base_manager.revectorize_document(
-                    document_id=document_id,
-                    file_path=doc_record.location,
-                    file_type=doc_record.type,
-                    metadata=metadata,
-                    db_session=new_db,
-                )
-
-        background_tasks.add_task(revectorize_with_db)
-        logger.info(f"Revectorization task queued for document {document_id}")
+        # Enqueue durable re-vectorization job
+        job = await job_queue.enqueue(
+            db,
+            REVECTORIZE_DOCUMENT_JOB,
+            payload={
+                "document_id": document_id,
+                "file_path": doc_record.location,
+                "file_type": doc_record.type,
+                "metadata": metadata,
+            },
+            requestor_id=current_user.id,
+            workflow_id=f"document:{document_id}",
+        )
+        logger.info(
+            f"Revectorization job queued for document {document_id}", job_id=job.id
+        )
 
         return {
             "status": "success",
             "message": f"Document {doc_record.name} queued for re-vectorization",
             "document_id": document_id,
+            "job_id": job.id,
         }
 
     except HTTPException:
@@ -826,17 +874,10 @@ async def download_document(
             raise HTTPException(status_code=404, detail="File not found on disk")
 
         # Determine media type
-        media_type = "application/octet-stream"
-        ext = filename.split(".")[-1].lower() if "." in filename else ""
-        if ext == "pdf":
-            media_type = "application/pdf"
-        elif ext in ["jpg", "jpeg"]:
-            media_type = "image/jpeg"
-        elif ext == "png":
-            media_type = "image/png"
-        elif ext == "txt":
-            media_type = "text/plain"
+        media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
 
+        # FileResponse streams the file in chunks and honours Range requests
+        # (206 Partial Content), so large files are never loaded into memory.
         return FileResponse(file_path, media_type=media_type, filename=filename)
 
     except HTTPException:
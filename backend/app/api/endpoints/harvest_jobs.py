@@ -6,16 +6,11 @@ REST API for managing and monitoring knowledge harvesting jobs.
 
 import structlog
 from typing import List, Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-import uuid
-import asyncio
 
-from app.db.session import get_db, async_session_factory
-from app.agents.knowledge_harvester import KnowledgeHarvester
-from app.agents.base import AgentContext
+from app.db.session import get_db
 from app.services.harvest_collaboration_integration import HarvestJobService
 from app.schemas.harvest_job import (
     HarvestJobCreate,
@@ -88,27 +83,28 @@ async def list_harvest_jobs(
 @router.post("/", response_model=HarvestJobResponse, status_code=201)
 async def create_harvest_job(
     job_data: HarvestJobCreate,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """Create and start a new harvest job."""
+    from app.services.knowledge_harvester_scheduler import knowledge_harvester_scheduler
+
     try:
-        # Generate unique job ID
-        job_id = (
-            f"job-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        # Runs under the scheduler's lease, so it never overlaps another harvest
+        result = await knowledge_harvester_scheduler.trigger_manual_harvest(
+            job_data.harvest_type, job_data.source_ids
         )
-
-        # Check if any job is already running
-        if await HarvestJobService.is_any_job_running(db):
+        if result["status"] == "already_running":
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="A harvest job is already in progress. Please wait for it to complete.",
             )
+        if result["status"] != "queued":
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=result.get("error") or "Harvester is not available",
+            )
 
-        # Create job in database
-        job = await HarvestJobService.create_harvest_job(
-            db, job_id, job_data.harvest_type, job_data.source_ids
-        )
+        job = await HarvestJobService.get_harvest_job_by_id(db, result["job_id"])
 
         # Convert datetime fields to strings for response
         job_response = {
@@ -127,14 +123,6 @@ async def create_harvest_job(
             "error_message": job.error_message,
         }
 
-        # Start harvest in background
-        background_tasks.add_task(
-            run_harvest_job,
-            job_id,
-            job_data.harvest_type,
-            job_data.source_ids,
-        )
-
         return job_response
 
     except HTTPException:
@@ -186,8 +174,10 @@ async def get_harvest_dashboard(db: AsyncSession = Depends(get_db)):
     - Scheduler status and next run times
     - Recent harvest jobs
     - Statistics and health metrics
+    - Per-stage throughput and cost metrics since process start
     - Configuration status
     """
+    from app.core.harvest_metrics import harvest_metrics_snapshot
     from app.services.knowledge_harvester_scheduler import knowledge_harvester_scheduler
 
     try:
@@ -208,6 +198,7 @@ async def get_harvest_dashboard(db: AsyncSession = Depends(get_db)):
                 "harvest_schedule": scheduler_status["harvest_schedule"],
             },
             "statistics": stats,
+            "metrics": harvest_metrics_snapshot(),
             "recent_jobs": [
                 {
                     "id": job.id,
@@ -434,7 +425,6 @@ async def stop_scheduler():
 async def trigger_harvest(
     harvest_type: str = "incremental",
     source_ids: Optional[List[int]] = None,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
 ):
     """
     Manually trigger a harvest job.
@@ -448,6 +438,15 @@ async def trigger_harvest(
     """
     from app.services.knowledge_harvester_scheduler import knowledge_harvester_scheduler
 
+    if harvest_type not in knowledge_harvester_scheduler.HARVEST_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"harvest_type must be one of: "
+                f"{', '.join(knowledge_harvester_scheduler.HARVEST_TYPES)}"
+            ),
+        )
+
     try:
         logger.info(
             "Manual harvest triggered via API",
@@ -455,142 +454,29 @@ async def trigger_harvest(
             source_ids=source_ids,
         )
 
-        # Generate unique job ID
-        job_id = (
-            f"manual-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        result = await knowledge_harvester_scheduler.trigger_manual_harvest(
+            harvest_type, source_ids
         )
-
-        # Check if any job is already running
-        async with async_session_factory() as db_check:
-            if await HarvestJobService.is_any_job_running(db_check):
-                return {
-                    "status": "conflict",
-                    "message": "A harvest job is already in progress.",
-                }
-
-        # Create job in database
-        async with async_session_factory() as db:
-            job = await HarvestJobService.create_harvest_job(
-                db, job_id, harvest_type, source_ids
+        if result["status"] == "already_running":
+            return {
+                "status": "conflict",
+                "message": "A harvest job is already in progress.",
+            }
+        if result["status"] != "queued":
+            raise HTTPException(
+                status_code=503,
+                detail=result.get("error") or "Harvester is not available",
             )
 
-        # Start harvest in background
-        background_tasks.add_task(
-            run_harvest_job,
-            job_id,
-            harvest_type,
-            source_ids,
-        )
-
         return {
             "status": "success",
-            "job_id": job_id,
+            "job_id": result["job_id"],
             "harvest_type": harvest_type,
             "message": "Harvest job initiated",
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to trigger harvest", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to trigger harvest")
-
-
-async def run_harvest_job(
-    job_id: str,
-    harvest_type: str,
-    source_ids: Optional[List[int]] = None,
-):
-    """Background task to run a harvest job using the real KnowledgeHarvester."""
-    try:
-        logger.info(
-            "Starting harvest job",
-            job_id=job_id,
-            harvest_type=harvest_type,
-            source_ids=source_ids,
-        )
-
-        # Update job status to running
-        async with async_session_factory() as db_async:
-            await HarvestJobService.update_harvest_job_status(
-                db_async, job_id, "running", progress=0.0
-            )
-
-        # Create agent context
-        context = AgentContext()
-
-        # Initialize harvester
-        harvester = KnowledgeHarvester(context)
-
-        # Execute harvest
-        logger.info(
-            "Executing harvest agent",
-            job_id=job_id,
-            harvest_type=harvest_type,
-        )
-
-        # Progress callback
-        async def on_progress(p: float):
-            logger.info("Reporting harvest progress", job_id=job_id, progress=p)
-            async with async_session_factory() as db_prog:
-                await HarvestJobService.update_harvest_job_status(
-                    db_prog, job_id, "running", progress=p
-                )
-
-        result = await harvester.execute(
-            context={},
-            input_data={"harvest_type": harvest_type},
-            on_progress=on_progress,
-        )
-
-        # Extract results
-        total_harvested = result.get("total_harvested", 0)
-        sources_harvested = result.get("sources_harvested", [])
-
-        logger.info(
-            "Harvest execution completed",
-            job_id=job_id,
-            total_harvested=total_harvested,
-            sources_harvested=sources_harvested,
-        )
-
-        # Update job in database with success
-        async with async_session_factory() as db_async:
-            await HarvestJobService.update_harvest_job_status(
-                db_async,
-                job_id,
-                "completed",
-                progress=100.0,
-                processed_sources=len(sources_harvested),
-                successful_harvests=total_harvested,
-                failed_harvests=0,
-                apis_harvested=total_harvested,
-            )
-
-        logger.info(
-            "Harvest job completed successfully",
-            job_id=job_id,
-            harvest_type=harvest_type,
-            total_harvested=total_harvested,
-        )
-
-    except Exception as e:
-        error_msg = str(e)
-        logger.error(
-            "Harvest job failed",
-            job_id=job_id,
-            harvest_type=harvest_type,
-            error=error_msg,
-            exc_info=True,
-        )
-
-        # Update job status to failed
-        try:
-            async with async_session_factory() as db_async:
-                await HarvestJobService.update_harvest_job_status(
-                    db_async, job_id, "failed", error_message=error_msg
-                )
-        except Exception as db_error:
-            logger.error(
-                "Failed to update harvest job status",
-                job_id=job_id,
-                error=str(db_error),
-            )
@@ -16,6 +16,7 @@ from app.agents.base import AgentContext
 from app.schemas.integration import DeploymentTarget, DeploymentConfig
 from app.schemas.discovery import DiscoveryRequest, DiscoveryResponse, DiscoveryResult
 from app.db.session import get_db
+from app.services.spec_store import spec_store
 
 logger = structlog.get_logger(__name__)
 
@@ -435,9 +436,11 @@ async def ingest_integration_specs(
         if ingest_result["status"] != "success":
             raise HTTPException(status_code=400, detail=ingest_result.get("error"))
 
-        # Update integration with specs
-        integration.source_api_spec = ingest_result["source_api_spec"]
-        integration.dest_api_spec = ingest_result["dest_api_spec"]
+        # Update integration with compact specs; the full ones go to the spec store
+        integration.source_api_spec = await spec_store.put(
+            ingest_result["source_api_spec"]
+        )
+        integration.dest_api_spec = await spec_store.put(ingest_result["dest_api_spec"])
         integration.status = IntegrationStatusEnum.MAPPING.value
         integration.updated_at = datetime.utcnow()
 
@@ -458,6 +461,7 @@ async def ingest_integration_specs(
                     ep.get("path")
                     for ep in ingest_result["dest_api_spec"].get("endpoints", [])
                 ],
+                "ingestion_timings": ingest_result.get("ingestion_timings"),
                 "next_step": "map",
                 "next_endpoint": f"/integrations/{integration_id}/map",
             },
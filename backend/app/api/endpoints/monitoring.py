@@ -144,3 +144,17 @@ async def get_monitoring_dashboard(
     except Exception as e:
         logger.error("Failed to fetch dashboard data", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/http-pools",
+    summary="Get outbound HTTP pool usage",
+    description="Returns connection pool and per-host occupancy of the shared outbound HTTP clients.",
+)
+async def get_http_pool_stats() -> Dict[str, Any]:
+    """
+    Snapshot of the shared HTTP client pools, for spotting saturation.
+    """
+    from app.core.http_clients import http_clients
+
+    return {"status": "success", "clients": http_clients.stats()}
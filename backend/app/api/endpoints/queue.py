@@ -11,4 +11,7 @@ async def get_status(
     request_id: str, current_user: Any = Depends(deps.get_current_user)
 ):
     """Get status of a background task."""
-    return await queue_service.get_status(request_id)
+    status = await queue_service.get_status(request_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Queue request not found")
+    return status
@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from pydantic import AnyHttpUrl, field_validator, ValidationInfo
 from pydantic_settings import BaseSettings
 import os
@@ -75,6 +75,14 @@ class Settings(BaseSettings):
     PINECONE_ENVIRONMENT: Optional[str] = None
     PINECONE_INDEX_NAME: str = "vitesse-knowledge"
 
+    # Knowledge Base Re-ranking (cross-encoder over over-fetched candidates)
+    KB_RERANK_ENABLED: bool = False
+    KB_RERANK_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    KB_RERANK_CANDIDATES: int = 30  # candidates fetched from the vector store
+    KB_RERANK_TOP_K: int = 4  # chunks kept for chat prompts
+    KB_RERANK_BATCH_SIZE: int = 16
+    KB_RERANK_CACHE_SIZE: int = 10000  # (query, chunk) scores kept in memory
+
     # LLM Configuration
     OPENAI_API_KEY: Optional[str] = None
     ANTHROPIC_API_KEY: Optional[str] = None
@@ -110,6 +118,64 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = str(ROOT_DIR / "uploads")
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
+    UPLOAD_COMPUTE_HASH: bool = True  # SHA-256 of uploads, computed while streaming
+
+    # Background Job Queue (document ingestion, re-vectorization)
+    JOB_WORKER_MODE: str = "inprocess"  # inprocess, external, disabled
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_INTERVAL: float = 2.0  # seconds between polls when queue is idle
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: int = 30  # base delay, doubled on each retry
+    JOB_HEARTBEAT_TIMEOUT: int = 300  # seconds before an in-progress job is reclaimed
+
+    # Persistent schedulers (harvests, drift monitor, email polling)
+    SCHEDULER_POLL_INTERVAL: float = 30.0  # seconds between due-task checks
+    SCHEDULER_LEASE_SECONDS: int = 300  # renewed while a task runs
+    HARVEST_SCHEDULE_CRON: Dict[str, str] = {}  # e.g. {"full": "0 2 * * 0"}
+    HARVEST_SCHEDULE_JITTER_SECONDS: int = 900
+
+    # Knowledge Harvesting
+    HARVEST_STAGE_CONCURRENCY: int = 4  # independent stages run at once
+    HARVEST_ITEM_CONCURRENCY: int = 8  # items in flight within a stage
+    HARVEST_UPSERT_CONCURRENCY: int = 2  # embedding/upsert batches in flight
+    HARVEST_HOST_CONCURRENCY: int = 4  # concurrent requests per remote host
+    HARVEST_HOST_MIN_INTERVAL: float = 0.2  # seconds between requests to a host
+    HARVEST_DEEP_SPECS_ENABLED: bool = False  # fetch and index full APIs.guru specs
+    HARVEST_DEEP_SPECS_MAX: int = 200  # specs fetched per harvest run
+    HARVEST_DEEP_SPECS_CATEGORIES: List[str] = [  # empty list means all categories
+        "financial",
+        "payment",
+        "ecommerce",
+    ]
+    HARVEST_CHECKPOINT_MAX_AGE_HOURS: int = 24  # older unfinished jobs start over
+    HARVEST_CHECKPOINT_STALE_SECONDS: int = 900  # "running" jobs silent this long died
+
+    # Ingestor spec cache (app/services/spec_cache.py)
+    SPEC_CACHE_ENABLED: bool = True
+    SPEC_CACHE_MEMORY_ENTRIES: int = 128  # specs kept in process
+    SPEC_CACHE_MAX_BODY_BYTES: int = 20 * 1024 * 1024  # larger bodies aren't kept
+    SPEC_CACHE_SYNTHESIZED_TTL_HOURS: int = 168  # name-only synthesis has no content
+    SPEC_PROBE_DEADLINE_SECONDS: float = 20.0  # for all candidate spec URLs together
+    SPEC_PROBE_GRACE_SECONDS: float = 2.0  # slower probes, once a spec/page is in
+
+    # Content-addressed full specs behind integrations (app/services/spec_store.py)
+    SPEC_STORE_MEMORY_ENTRIES: int = 32  # full specs and endpoint indexes in process
+
+    # Semantic field mapping (app/services/semantic/layer.py)
+    SEMANTIC_MAPPING_BATCH_SIZE: int = 15  # dest fields per LLM call; 1 = per field
+    SEMANTIC_MAPPING_CONCURRENCY: int = 4  # field groups mapped at once
+    SEMANTIC_PREMATCH_ENABLED: bool = True  # map obvious fields without the LLM
+    SEMANTIC_PREMATCH_THRESHOLD: float = 0.85  # pre-match confidence (0-1)
+    MAPPING_CACHE_ENABLED: bool = True  # reuse mappings (app/services/mapping_cache.py)
+    MAPPING_CACHE_MEMORY_ENTRIES: int = 256
+
+    # Shared outbound HTTP clients (app/core/http_clients.py)
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    HTTP_PER_HOST_CONCURRENCY: int = 10  # concurrent requests per remote host
+    HTTP_ENABLE_HTTP2: bool = True  # used when the h2 package is installed
 
     # Celery
     CELERY_BROKER_URL: Optional[str] = None
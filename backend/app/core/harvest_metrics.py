@@ -0,0 +1,219 @@
+"""
+Knowledge harvest instrumentation.
+
+Per-stage Prometheus metrics for knowledge harvests (fetch latency and
+bytes, parse time, embedding batch size and latency, upsert latency, dedup
+hits and throughput), registered in the Aether metrics registry.
+
+The harvest engine binds the running stage with :func:`harvest_stage`; code
+further down (fetcher, knowledge DB) records against whatever stage is bound
+and records nothing outside a harvest, so drift checks and searches do not
+skew the numbers.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from aether.observability.metrics import METRICS_REGISTRY
+from prometheus_client import Counter, Gauge, Histogram
+
+_current_stage: ContextVar[Optional[str]] = ContextVar("harvest_stage", default=None)
+
+_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0)
+
+HARVEST_STAGE_SECONDS = Histogram(
+    "vitesse_harvest_stage_duration_seconds",
+    "Wall time of a harvest stage",
+    labelnames=["stage", "status"],
+    buckets=(1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0),
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_ITEMS_TOTAL = Counter(
+    "vitesse_harvest_items_total",
+    "Items stored by harvest stages",
+    labelnames=["stage"],
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_ITEMS_PER_SECOND = Gauge(
+    "vitesse_harvest_items_per_second",
+    "Items stored per second in the last run of a harvest stage",
+    labelnames=["stage"],
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_DEDUP_CHECKS_TOTAL = Counter(
+    "vitesse_harvest_dedup_checks_total",
+    "Source change checks, by whether the source was unchanged (a dedup hit)",
+    labelnames=["stage", "result"],
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_FETCH_SECONDS = Histogram(
+    "vitesse_harvest_fetch_seconds",
+    "Latency of harvest HTTP fetches, including the body",
+    labelnames=["stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_FETCH_BYTES_TOTAL = Counter(
+    "vitesse_harvest_fetch_bytes_total",
+    "Response bytes downloaded by harvest fetches",
+    labelnames=["stage"],
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_PARSE_SECONDS = Histogram(
+    "vitesse_harvest_parse_seconds",
+    "Time spent decoding and extracting fetched documents",
+    labelnames=["stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_EMBED_BATCH_SIZE = Histogram(
+    "vitesse_harvest_embedding_batch_size",
+    "Texts per embedding call",
+    labelnames=["stage"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_EMBED_SECONDS = Histogram(
+    "vitesse_harvest_embedding_seconds",
+    "Latency of embedding calls",
+    labelnames=["stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY,
+)
+
+HARVEST_UPSERT_SECONDS = Histogram(
+    "vitesse_harvest_upsert_seconds",
+    "Latency of vector store upserts",
+    labelnames=["stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=METRICS_REGISTRY,
+)
+
+
+def current_harvest_stage() -> Optional[str]:
+    return _current_stage.get()
+
+
+@contextmanager
+def harvest_stage(name: str) -> Iterator[None]:
+    """Bind ``name`` as the running stage for this task and its children."""
+    token = _current_stage.set(name)
+    try:
+        yield
+    finally:
+        _current_stage.reset(token)
+
+
+@contextmanager
+def observe_seconds(histogram: Histogram) -> Iterator[None]:
+    """Time the block into ``histogram`` for the bound stage, if any."""
+    stage = _current_stage.get()
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        if stage is not None:
+            histogram.labels(stage).observe(time.monotonic() - started)
+
+
+def record_fetch(seconds: float, size: int) -> None:
+    stage = _current_stage.get()
+    if stage is None:
+        return
+    HARVEST_FETCH_SECONDS.labels(stage).observe(seconds)
+    HARVEST_FETCH_BYTES_TOTAL.labels(stage).inc(size)
+
+
+def record_embedding_batch(size: int, seconds: float) -> None:
+    stage = _current_stage.get()
+    if stage is None:
+        return
+    HARVEST_EMBED_BATCH_SIZE.labels(stage).observe(size)
+    HARVEST_EMBED_SECONDS.labels(stage).observe(seconds)
+
+
+def record_dedup_check(unchanged: bool) -> None:
+    stage = _current_stage.get()
+    if stage is None:
+        return
+    HARVEST_DEDUP_CHECKS_TOTAL.labels(
+        stage, "unchanged" if unchanged else "changed"
+    ).inc()
+
+
+def record_stage(stage: str, seconds: float, items: int, status: str) -> None:
+    HARVEST_STAGE_SECONDS.labels(stage, status).observe(seconds)
+    HARVEST_ITEMS_TOTAL.labels(stage).inc(items)
+    HARVEST_ITEMS_PER_SECOND.labels(stage).set(items / seconds if seconds > 0 else 0)
+
+
+def _samples(metric) -> Dict[str, Dict[str, float]]:
+    """``{stage: {sample_suffix: value}}`` for one metric, summed over other labels."""
+    values: Dict[str, Dict[str, float]] = {}
+    for family in metric.collect():
+        for sample in family.samples:
+            stage = sample.labels.get("stage")
+            if stage is None or "le" in sample.labels:
+                continue
+            suffix = sample.name[len(family.name) :]
+            if "result" in sample.labels:
+                suffix = f"_{sample.labels['result']}{suffix}"
+            per_stage = values.setdefault(stage, {})
+            per_stage[suffix] = per_stage.get(suffix, 0.0) + sample.value
+    return values
+
+
+def _mean(samples: Dict[str, float]) -> Optional[float]:
+    count = samples.get("_count", 0.0)
+    return round(samples.get("_sum", 0.0) / count, 4) if count else None
+
+
+def harvest_metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Per-stage summary of the harvest metrics since process start."""
+    stage_runs = _samples(HARVEST_STAGE_SECONDS)
+    items = _samples(HARVEST_ITEMS_TOTAL)
+    rates = _samples(HARVEST_ITEMS_PER_SECOND)
+    dedup = _samples(HARVEST_DEDUP_CHECKS_TOTAL)
+    fetches = _samples(HARVEST_FETCH_SECONDS)
+    fetch_bytes = _samples(HARVEST_FETCH_BYTES_TOTAL)
+    parses = _samples(HARVEST_PARSE_SECONDS)
+    batch_sizes = _samples(HARVEST_EMBED_BATCH_SIZE)
+    embeds = _samples(HARVEST_EMBED_SECONDS)
+    upserts = _samples(HARVEST_UPSERT_SECONDS)
+
+    stages = set().union(
+        stage_runs, items, dedup, fetches, parses, batch_sizes, upserts
+    )
+    snapshot = {}
+    for stage in sorted(stages):
+        hits = dedup.get(stage, {}).get("_unchanged_total", 0.0)
+        misses = dedup.get(stage, {}).get("_changed_total", 0.0)
+        snapshot[stage] = {
+            "runs": int(stage_runs.get(stage, {}).get("_count", 0)),
+            "avg_stage_seconds": _mean(stage_runs.get(stage, {})),
+            "items_stored": int(items.get(stage, {}).get("_total", 0)),
+            "last_items_per_second": round(rates.get(stage, {}).get("", 0.0), 2),
+            "dedup_checks": int(hits + misses),
+            "dedup_hit_ratio": (
+                round(hits / (hits + misses), 4) if hits + misses else None
+            ),
+            "fetches": int(fetches.get(stage, {}).get("_count", 0)),
+            "avg_fetch_seconds": _mean(fetches.get(stage, {})),
+            "fetch_bytes": int(fetch_bytes.get(stage, {}).get("_total", 0)),
+            "avg_parse_seconds": _mean(parses.get(stage, {})),
+            "embedding_batches": int(embeds.get(stage, {}).get("_count", 0)),
+            "avg_embedding_batch_size": _mean(batch_sizes.get(stage, {})),
+            "avg_embedding_seconds": _mean(embeds.get(stage, {})),
+            "avg_upsert_seconds": _mean(upserts.get(stage, {})),
+        }
+    return snapshot
@@ -0,0 +1,286 @@
+"""
+Shared outbound HTTP clients.
+
+One pooled ``httpx.AsyncClient`` per name, created in the application
+lifespan and closed on shutdown, so spec fetches, harvests and drift checks
+reuse keep-alive connections, TLS sessions and (where the server and the
+optional ``h2`` package allow) HTTP/2 multiplexing instead of opening a new
+client per call.
+
+Requests are additionally capped per host, and time spent waiting for a host
+slot, in-flight requests and pool occupancy are exported to the Aether
+Prometheus registry so saturation is visible.
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+import httpx
+import structlog
+from aether.observability.metrics import METRICS_REGISTRY
+from prometheus_client import Counter, Gauge, Histogram
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    HTTP2_AVAILABLE = False
+
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "vitesse_http_client_requests_total",
+    "Outbound HTTP requests made through the shared clients",
+    labelnames=["client", "host", "outcome"],
+    registry=METRICS_REGISTRY,
+)
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "vitesse_http_client_requests_in_flight",
+    "Outbound HTTP requests currently holding a per-host slot",
+    labelnames=["client", "host"],
+    registry=METRICS_REGISTRY,
+)
+
+HTTP_HOST_WAIT_SECONDS = Histogram(
+    "vitesse_http_client_host_wait_seconds",
+    "Time spent waiting for a per-host request slot",
+    labelnames=["client", "host"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+    registry=METRICS_REGISTRY,
+)
+
+HTTP_POOL_CONNECTIONS = Gauge(
+    "vitesse_http_client_pool_connections",
+    "Connections held by a shared client pool",
+    labelnames=["client", "state"],
+    registry=METRICS_REGISTRY,
+)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that frees the host slot when the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a pooled transport and caps concurrent requests per host.
+
+    A slot is held until the response body is closed, so streamed downloads
+    count against the cap for their whole duration.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        per_host: int,
+        name: str = "default",
+    ):
+        self._transport = transport
+        self.per_host = per_host
+        self.name = name
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.waiting: Dict[str, int] = defaultdict(int)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        started = time.monotonic()
+        self.waiting[host] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting[host] -= 1
+        HTTP_HOST_WAIT_SECONDS.labels(self.name, host).observe(
+            time.monotonic() - started
+        )
+
+        self.in_flight[host] += 1
+        HTTP_REQUESTS_IN_FLIGHT.labels(self.name, host).inc()
+        released = False
+
+        def _release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.in_flight[host] -= 1
+                HTTP_REQUESTS_IN_FLIGHT.labels(self.name, host).dec()
+                semaphore.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            # Includes cancellation while waiting on the inner transport
+            _release()
+            HTTP_REQUESTS_TOTAL.labels(self.name, host, "error").inc()
+            raise
+
+        HTTP_REQUESTS_TOTAL.labels(
+            self.name, host, f"{response.status_code // 100}xx"
+        ).inc()
+        if response.is_closed:
+            # Already fully buffered by the inner transport
+            _release()
+        else:
+            response.stream = _ReleasingStream(response.stream, _release)
+        return response
+
+    def pool_stats(self) -> Dict[str, int]:
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {"connections": len(connections), "idle": idle}
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+async def _close_on_loop_shutdown(name: str, client: httpx.AsyncClient) -> None:
+    """
+    Wait until cancelled, then close ``client``.
+
+    ``asyncio.run`` cancels every pending task before closing its loop, so a
+    client is closed on the loop that owns its connections even when nobody
+    calls ``aclose``.
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        if not client.is_closed:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Failed to close HTTP client", client=name, error=str(e))
+
+
+class HttpClientRegistry:
+    """Named, lazily created, shared ``httpx.AsyncClient`` instances."""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, HostLimitedTransport] = {}
+        self._loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._closers: Dict[str, asyncio.Task] = {}
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        http2 = settings.HTTP_ENABLE_HTTP2 and HTTP2_AVAILABLE
+        transport = HostLimitedTransport(
+            httpx.AsyncHTTPTransport(limits=limits, http2=http2),
+            per_host=settings.HTTP_PER_HOST_CONCURRENCY,
+            name=name,
+        )
+        self._transports[name] = transport
+        logger.info("Created shared HTTP client", client=name, http2=http2)
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=settings.HTTP_TIMEOUT,
+            follow_redirects=True,
+        )
+
+    def start(self, name: str = "default") -> httpx.AsyncClient:
+        """Create ``name`` eagerly (called from the application lifespan)."""
+        return self.get(name)
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        """
+        Return the shared client ``name``, creating it on first use.
+
+        Connections are bound to the event loop that opened them, so a client
+        created under another (e.g. a finished ``asyncio.run``) loop is
+        replaced rather than reused, and closed on its own loop.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        client = self._clients.get(name)
+        if client is None or client.is_closed or self._loops.get(name) is not loop:
+            if client is not None:
+                self._discard(name)
+            client = self._create(name)
+            self._clients[name] = client
+            self._loops[name] = loop
+            if loop is not None:
+                self._closers[name] = loop.create_task(
+                    _close_on_loop_shutdown(name, client)
+                )
+        return client
+
+    def _discard(self, name: str) -> None:
+        """Drop client ``name``, closing it on the loop it belongs to."""
+        self._clients.pop(name)
+        loop = self._loops.pop(name, None)
+        closer = self._closers.pop(name, None)
+        if closer is None or closer.done():
+            return
+        if loop.is_closed():
+            logger.warning("HTTP client left open by a closed event loop", client=name)
+        else:
+            # Thread-safe: the loop may be running in another thread
+            loop.call_soon_threadsafe(closer.cancel)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool and per-host occupancy for every client (also exported as gauges)."""
+        snapshot = {}
+        for name, transport in self._transports.items():
+            pool = transport.pool_stats()
+            HTTP_POOL_CONNECTIONS.labels(name, "idle").set(pool["idle"])
+            HTTP_POOL_CONNECTIONS.labels(name, "active").set(
+                pool["connections"] - pool["idle"]
+            )
+            snapshot[name] = {
+                **pool,
+                "max_connections": settings.HTTP_MAX_CONNECTIONS,
+                "per_host_limit": transport.per_host,
+                "in_flight": {h: n for h, n in transport.in_flight.items() if n},
+                "waiting": {h: n for h, n in transport.waiting.items() if n},
+            }
+        return snapshot
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        for name, client_loop in list(self._loops.items()):
+            if client_loop not in (loop, None):
+                self._discard(name)
+        for closer in self._closers.values():
+            closer.cancel()
+        self._closers.clear()
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Failed to close HTTP client", client=name, error=str(e))
+        self._clients.clear()
+        self._transports.clear()
+        self._loops.clear()
+
+
+http_clients = HttpClientRegistry()
@@ -0,0 +1,351 @@
+"""
+Conditional HTTP fetching.
+
+Remembers ``ETag`` / ``Last-Modified`` validators and a content hash per
+(scope, URL) in the database and sends ``If-None-Match`` /
+``If-Modified-Since`` on the next fetch. A ``304 Not Modified`` (or a 200
+whose body hashes to the stored value, for servers without validators) is
+reported as ``unchanged`` so callers can skip parsing entirely.
+
+Callers that need the content even when it has not changed can ask for the
+body to be kept (``keep_body=True``); a ``304`` then returns the stored body.
+"""
+
+import hashlib
+import json
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+import structlog
+from pydantic import BaseModel
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import undefer
+
+from app.core.config import settings
+from app.core.harvest_metrics import record_fetch
+from app.core.http_clients import http_clients
+from app.db.session import async_session_factory
+from app.models.http_cache import HttpCacheEntry
+
+logger = structlog.get_logger(__name__)
+
+
+def _timeout(timeout: Optional[float]):
+    return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+
+
+class FetchResult(BaseModel):
+    url: str
+    scope: str
+    status_code: int
+    not_modified: bool = False  # server answered 304
+    unchanged: bool = False  # 304, or same content hash as last time
+    content: Optional[bytes] = None
+    content_hash: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    meta: Dict[str, Any] = {}  # meta stored with the previous fetch
+
+    @property
+    def ok(self) -> bool:
+        return self.not_modified or 200 <= self.status_code < 300
+
+    def parse_json(self) -> Any:
+        return json.loads(self.content)
+
+    @property
+    def text(self) -> str:
+        return (self.content or b"").decode("utf-8", errors="replace")
+
+
+class StreamedFetch:
+    """
+    A conditional response whose body is consumed incrementally.
+
+    The body is hashed as it is read; once :meth:`iter_bytes` is exhausted,
+    :meth:`result` returns a :class:`FetchResult` (without ``content``) that
+    can be passed to :meth:`ConditionalFetcher.record`.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        url: str,
+        scope: str,
+        cached: Optional[HttpCacheEntry],
+    ):
+        self.response = response
+        self.url = url
+        self.scope = scope
+        self.cached = cached
+        self.status_code = response.status_code
+        self.not_modified = response.status_code == 304 and cached is not None
+        self.meta: Dict[str, Any] = (cached.meta or {}) if cached is not None else {}
+        self.content_length: Optional[int] = (
+            int(response.headers["Content-Length"])
+            if response.headers.get("Content-Length", "").isdigit()
+            else None
+        )
+        self.bytes_read = 0
+        self._digest = hashlib.sha256()
+        self._complete = False
+
+    async def iter_bytes(self) -> AsyncIterator[bytes]:
+        async for chunk in self.response.aiter_bytes():
+            self.bytes_read += len(chunk)
+            self._digest.update(chunk)
+            yield chunk
+        self._complete = True
+
+    @property
+    def validator(self) -> Optional[str]:
+        """ETag or Last-Modified of this response, identifying its version."""
+        return self.response.headers.get("ETag") or self.response.headers.get(
+            "Last-Modified"
+        )
+
+    @property
+    def fraction_read(self) -> Optional[float]:
+        if not self.content_length:
+            return None
+        return min(self.bytes_read / self.content_length, 1.0)
+
+    def result(self) -> FetchResult:
+        if self.not_modified:
+            return FetchResult(
+                url=self.url,
+                scope=self.scope,
+                status_code=304,
+                not_modified=True,
+                unchanged=True,
+                content_hash=self.cached.content_hash,
+                etag=self.cached.etag,
+                last_modified=self.cached.last_modified,
+                meta=self.meta,
+            )
+        if not self._complete:
+            raise RuntimeError("Response body has not been fully consumed")
+
+        content_hash = self._digest.hexdigest()
+        return FetchResult(
+            url=self.url,
+            scope=self.scope,
+            status_code=self.status_code,
+            unchanged=(
+                self.status_code == 200
+                and self.cached is not None
+                and self.cached.content_hash == content_hash
+            ),
+            content_hash=content_hash,
+            etag=self.response.headers.get("ETag"),
+            last_modified=self.response.headers.get("Last-Modified"),
+            meta=self.meta,
+        )
+
+
+class ConditionalFetcher:
+    """Issues conditional GETs using validators persisted per (scope, URL)."""
+
+    async def _load(
+        self, scope: str, url: str, with_body: bool = False
+    ) -> Optional[HttpCacheEntry]:
+        try:
+            async with async_session_factory() as db:
+                query = select(HttpCacheEntry).where(
+                    HttpCacheEntry.scope == scope, HttpCacheEntry.url == url
+                )
+                if with_body:
+                    query = query.options(undefer(HttpCacheEntry.body))
+                result = await db.execute(query)
+                return result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning("Failed to load HTTP validators", url=url, error=str(e))
+            return None
+
+    @staticmethod
+    def _conditional_headers(
+        cached: Optional[HttpCacheEntry], headers: Optional[Dict[str, str]]
+    ) -> Dict[str, str]:
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+        return request_headers
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        scope: str,
+        client: Optional[httpx.AsyncClient] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[StreamedFetch]:
+        """
+        Conditionally fetch ``url`` without buffering the body.
+
+        Uses the shared pooled client unless ``client`` is given; ``timeout``
+        defaults to that client's timeout.
+
+        Validators are never recorded automatically; call :meth:`record` with
+        ``streamed.result()`` once the body has been processed.
+        """
+        cached = await self._load(scope, url)
+        request_headers = self._conditional_headers(cached, headers)
+
+        client = client or http_clients.get()
+        started = time.monotonic()
+        async with client.stream(
+            "GET", url, headers=request_headers, timeout=_timeout(timeout)
+        ) as response:
+            streamed = StreamedFetch(response, url, scope, cached)
+            try:
+                yield streamed
+            finally:
+                record_fetch(time.monotonic() - started, streamed.bytes_read)
+
+    async def get(
+        self,
+        url: str,
+        scope: str,
+        client: Optional[httpx.AsyncClient] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        record: bool = True,
+        keep_body: bool = False,
+    ) -> FetchResult:
+        """
+        Fetch ``url`` conditionally, through the shared pooled client unless
+        ``client`` is given.
+
+        With ``record=False`` the new validators are not persisted until the
+        caller invokes :meth:`record`, so a consumer that fails half-way
+        through processing the content does not mark it as seen.
+
+        With ``keep_body=True`` the body is stored alongside the validators
+        and a ``304`` returns it as ``content``.
+        """
+        cached = await self._load(scope, url, with_body=keep_body)
+        if keep_body and cached is not None and cached.body is None:
+            # Nothing to serve on a 304, so ask for the full response
+            cached = None
+        request_headers = self._conditional_headers(cached, headers)
+
+        client = client or http_clients.get()
+        started = time.monotonic()
+        response = await client.get(
+            url, headers=request_headers, timeout=_timeout(timeout)
+        )
+        record_fetch(time.monotonic() - started, len(response.content))
+
+        previous_meta = (cached.meta or {}) if cached is not None else {}
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug("Conditional fetch not modified", url=url, scope=scope)
+            await self._touch(scope, url)
+            return FetchResult(
+                url=url,
+                scope=scope,
+                status_code=304,
+                not_modified=True,
+                unchanged=True,
+                content=cached.body if keep_body else None,
+                content_hash=cached.content_hash,
+                etag=cached.etag,
+                last_modified=cached.last_modified,
+                meta=previous_meta,
+            )
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        result = FetchResult(
+            url=url,
+            scope=scope,
+            status_code=response.status_code,
+            unchanged=(
+                response.status_code == 200
+                and cached is not None
+                and cached.content_hash == content_hash
+            ),
+            content=content,
+            content_hash=content_hash,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            meta=previous_meta,
+        )
+
+        if record and response.status_code == 200:
+            await self.record(result, keep_body=keep_body)
+        return result
+
+    async def record(
+        self,
+        result: FetchResult,
+        meta: Optional[Dict[str, Any]] = None,
+        keep_body: bool = False,
+    ) -> None:
+        """Persist the validators (and optionally the body) of a successful fetch."""
+        if result.not_modified and meta is None:
+            return
+
+        now = datetime.now(timezone.utc)
+        values = {
+            "scope": result.scope,
+            "url": result.url,
+            "etag": result.etag,
+            "last_modified": result.last_modified,
+            "content_hash": result.content_hash,
+            "content_length": len(result.content) if result.content else None,
+            "meta": meta if meta is not None else result.meta,
+            "fetched_at": now,
+            "checked_at": now,
+        }
+        if keep_body:
+            small_enough = (
+                result.content is not None
+                and len(result.content) <= settings.SPEC_CACHE_MAX_BODY_BYTES
+            )
+            values["body"] = result.content if small_enough else None
+        if result.not_modified:
+            # Only the derived meta changes; keep the stored validators
+            values = {
+                "scope": result.scope,
+                "url": result.url,
+                "meta": meta,
+                "checked_at": now,
+            }
+
+        try:
+            async with async_session_factory() as db:
+                stmt = insert(HttpCacheEntry).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_http_cache_entries_scope_url",
+                    set_={k: v for k, v in values.items() if k not in ("scope", "url")},
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            logger.warning(
+                "Failed to store HTTP validators", url=result.url, error=str(e)
+            )
+
+    async def _touch(self, scope: str, url: str) -> None:
+        try:
+            async with async_session_factory() as db:
+                await db.execute(
+                    update(HttpCacheEntry)
+                    .where(HttpCacheEntry.scope == scope, HttpCacheEntry.url == url)
+                    .values(checked_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+        except Exception as e:
+            logger.debug("Failed to touch HTTP validators", url=url, error=str(e))
+
+
+conditional_fetcher = ConditionalFetcher()
@@ -0,0 +1,160 @@
+"""
+Incremental parsing of large top-level JSON objects.
+
+``iter_object_items`` yields the ``(key, value)`` members of a top-level JSON
+object while the bytes are still arriving, holding roughly one member plus
+one network chunk in memory instead of the whole document. Members are
+decoded with the C-accelerated ``json`` scanner, so each one costs the same
+as a ``json.loads`` of that member.
+
+While a member is incomplete, more input is read until its pending text has
+doubled before decoding is retried, so a large member is rescanned a
+logarithmic number of times rather than once per chunk. Input that can no
+longer become valid JSON raises at once, and a member larger than
+``max_member_chars`` raises instead of buffering the rest of the stream.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Tuple
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+_NUMBER_CHARS = frozenset("-+.eE0123456789")
+
+# Largest single member buffered (characters)
+MAX_MEMBER_CHARS = 32 * 1024 * 1024
+
+
+class JSONStreamError(ValueError):
+    """Raised when the stream is not a well-formed top-level JSON object."""
+
+
+def _trailing_number_start(text: str) -> int:
+    """Start of the run of number characters at the end of ``text``."""
+    start = len(text)
+    while start > 0 and text[start - 1] in _NUMBER_CHARS:
+        start -= 1
+    return start
+
+
+def _may_complete(text: str, error: json.JSONDecodeError) -> bool:
+    """Whether ``error`` could go away once more text is appended."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    if error.msg.startswith("Invalid \\uXXXX escape"):
+        return len(text) - error.pos < 6
+    # A number cut at the buffer edge, e.g. "1." of "1.5" inside a list
+    start = _trailing_number_start(text)
+    if start <= error.pos < len(text) and text[start] in "-0123456789":
+        return True
+    rest = text[error.pos :]
+    return not rest.strip() or any(
+        literal.startswith(rest) and literal != rest for literal in _LITERALS
+    )
+
+
+async def iter_object_items(
+    chunks: AsyncIterator[bytes],
+    encoding: str = "utf-8",
+    max_member_chars: int = MAX_MEMBER_CHARS,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Yield ``(key, value)`` pairs of a streamed top-level JSON object."""
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunk_iter = chunks.__aiter__()
+    buffer = ""
+    pos = 0
+    eof = False
+    # open -> first_key -> key -> colon -> value -> sep -> key ... -> done
+    state = "open"
+    key = None
+
+    async def _read_more(min_chars: int = 1) -> None:
+        nonlocal buffer, pos, eof
+        parts = [buffer[pos:]]
+        added = 0
+        while added < min_chars and not eof:
+            try:
+                text = text_decoder.decode(await chunk_iter.__anext__())
+            except StopAsyncIteration:
+                text = text_decoder.decode(b"", final=True)
+                eof = True
+            parts.append(text)
+            added += len(text)
+        # Drop consumed text only when refilling, to avoid re-copying the
+        # buffer after every member
+        buffer, pos = "".join(parts), 0
+        if len(buffer) > max_member_chars:
+            raise JSONStreamError(f"JSON member exceeds {max_member_chars} characters")
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+
+        if state in ("key", "value"):
+            decoded = end = None
+            if pos < len(buffer):
+                try:
+                    decoded, end = _decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if eof or not _may_complete(buffer, e):
+                        raise JSONStreamError(f"Invalid JSON member: {e}") from e
+            # A scalar followed only by number characters up to the buffer
+            # edge may be cut short (e.g. "12" of "123" or "1" of "1.5");
+            # containers and strings are self-delimiting
+            complete = end is not None and (
+                eof
+                or isinstance(decoded, (dict, list, str))
+                or end < _trailing_number_start(buffer)
+            )
+            if not complete:
+                if eof:
+                    raise JSONStreamError("Unexpected end of JSON stream")
+                # Wait for the pending text to double before decoding again
+                await _read_more(max(1, len(buffer) - pos))
+                continue
+
+            pos = end
+            if state == "key":
+                if not isinstance(decoded, str):
+                    raise JSONStreamError("Object keys must be strings")
+                key, state = decoded, "colon"
+            else:
+                yield key, decoded
+                state = "sep"
+            continue
+
+        if pos >= len(buffer):
+            if eof:
+                if state == "done":
+                    return
+                raise JSONStreamError("Unexpected end of JSON stream")
+            await _read_more()
+            continue
+
+        char = buffer[pos]
+        pos += 1
+        if state == "open":
+            if char != "{":
+                raise JSONStreamError("Expected a top-level JSON object")
+            state = "first_key"
+        elif state == "first_key":
+            if char == "}":
+                state = "done"
+            else:
+                pos -= 1
+                state = "key"
+        elif state == "colon":
+            if char != ":":
+                raise JSONStreamError("Expected ':' after object key")
+            state = "value"
+        elif state == "sep":
+            if char == ",":
+                state = "key"
+            elif char == "}":
+                state = "done"
+            else:
+                raise JSONStreamError("Expected ',' or '}' between object members")
+        else:
+            raise JSONStreamError("Unexpected data after top-level object")
@@ -20,6 +20,13 @@ import json
 import os
 import hashlib
 import asyncio
+import time
+
+from app.core.harvest_metrics import (
+    HARVEST_UPSERT_SECONDS,
+    observe_seconds,
+    record_embedding_batch,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -94,6 +101,21 @@ class KnowledgeDB(ABC):
         """Update the state of a harvested source after processing."""
         pass
 
+    async def update_harvest_source_states(
+        self, states: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> int:
+        """
+        Update many ``(source_key, content_hash, metadata)`` states at once.
+        Returns how many were updated; backends may override to batch.
+        """
+        updated = 0
+        for source_key, content_hash, metadata in states:
+            if await self.update_harvest_source_state(
+                source_key, content_hash, metadata
+            ):
+                updated += 1
+        return updated
+
     @abstractmethod
     async def list_harvest_sources(
         self, source_type: Optional[str] = None
@@ -146,6 +168,7 @@ class QdrantKnowledge(KnowledgeDB):
         self.prefer_grpc = prefer_grpc
         self.client = None
         self.embedder = None
+        self._embedder_verified = False  # set once a test encode succeeded
         self._existing_collections: Set[str] = set()
         self._last_collection_refresh = 0
 
@@ -205,6 +228,7 @@ class QdrantKnowledge(KnowledgeDB):
                 embedder = SentenceTransformer(self.embedding_model)
 
             self.embedder = embedder
+            self._embedder_verified = False
 
             # Test embedder to ensure it works correctly
             test_texts = ["test", "hello world", "financial API integration"]
@@ -222,6 +246,7 @@ class QdrantKnowledge(KnowledgeDB):
                     f"expected shape (n, 384), got {test_embedding.shape}"
                 )
 
+            self._embedder_verified = True
             logger.info(
                 "Embedder initialized and tested",
                 embedding_model=self.embedding_model,
@@ -424,27 +449,33 @@ class QdrantKnowledge(KnowledgeDB):
                     logger.error("Failed to initialize embedder")
                     return []
 
-            # Test embedder with a simple text before batch encoding
-            try:
-                test_emb = self.embedder.encode(["test"], show_progress_bar=False)
-                if not hasattr(test_emb, "shape") or test_emb.shape[1] != 384:
-                    logger.error(
-                        "Embedder test failed: invalid embedding dimension",
-                        expected_dim=384,
-                        actual_shape=str(test_emb.shape)
-                        if hasattr(test_emb, "shape")
-                        else "no shape",
-                    )
+            # Test embedder with a simple text before the first batch encoding
+            if not self._embedder_verified:
+                try:
+                    test_emb = self.embedder.encode(["test"], show_progress_bar=False)
+                    if not hasattr(test_emb, "shape") or test_emb.shape[1] != 384:
+                        logger.error(
+                            "Embedder test failed: invalid embedding dimension",
+                            expected_dim=384,
+                            actual_shape=str(test_emb.shape)
+                            if hasattr(test_emb, "shape")
+                            else "no shape",
+                        )
+                        return []
+                    self._embedder_verified = True
+                except Exception as e:
+                    logger.error("Embedder test failed", error=str(e))
                     return []
-            except Exception as e:
-                logger.error("Embedder test failed", error=str(e))
-                return []
 
             # Generate embeddings (CPU intensive, run in thread)
             try:
+                encode_started = time.monotonic()
                 embeddings = await asyncio.to_thread(
                     self.embedder.encode, contents, show_progress_bar=False
                 )
+                record_embedding_batch(
+                    len(contents), time.monotonic() - encode_started
+                )
                 logger.info(
                     "Embeddings encoding completed",
                     collection=collection,
@@ -714,11 +745,12 @@ class QdrantKnowledge(KnowledgeDB):
                 )
 
             # Upload points to Qdrant (CPU intensive, run in thread)
-            await asyncio.to_thread(
-                self.client.upsert,
-                collection_name=collection,
-                points=points,
-            )
+            with observe_seconds(HARVEST_UPSERT_SECONDS):
+                await asyncio.to_thread(
+                    self.client.upsert,
+                    collection_name=collection,
+                    points=points,
+                )
 
             logger.debug(
                 "Documents added to Qdrant",
@@ -969,6 +1001,17 @@ class QdrantKnowledge(KnowledgeDB):
         metadata: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """Update the state of a harvested source after processing."""
+        updated = await self.update_harvest_source_states(
+            [(source_key, content_hash, metadata)]
+        )
+        return updated == 1
+
+    async def update_harvest_source_states(
+        self, states: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> int:
+        """Update many source states with one encode call and one upsert."""
+        if not states:
+            return 0
         if self.client is None or self.embedder is None:
             logger.warning("Initializing knowledge DB from update_harvest_source_state")
             await self.initialize()
@@ -982,64 +1025,67 @@ class QdrantKnowledge(KnowledgeDB):
         except Exception as e:
             logger.warning("Failed to ensure collection exists on update", error=str(e))
 
+        source_keys = [source_key for source_key, _, _ in states]
         try:
             from qdrant_client.http import models
 
-            # Generate a deterministic ID based on source_key
-            source_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, source_key))
-            int_id = int(uuid.UUID(source_id).int % (2**63))
-
-            # Prepare payload
-            payload = {
-                "source_key": source_key,
-                "content_hash": content_hash,
-                "last_processed": datetime.utcnow().isoformat(),
-            }
-            if metadata:
-                payload.update(metadata)
-
-            # Generate embedding for the source key (run in thread)
+            # Generate embeddings for the source keys (run in thread)
+            encode_started = time.monotonic()
             embeddings = await asyncio.to_thread(
-                self.embedder.encode, [source_key], show_progress_bar=False
+                self.embedder.encode, source_keys, show_progress_bar=False
             )
-            embedding = embeddings[0].tolist()
+            record_embedding_batch(len(source_keys), time.monotonic() - encode_started)
 
-            # Upsert the source state
-            point = models.PointStruct(
-                id=int_id,
-                vector=embedding,
-                payload=payload,
-            )
+            points = []
+            processed_at = datetime.utcnow().isoformat()
+            for (source_key, content_hash, metadata), embedding in zip(
+                states, embeddings
+            ):
+                # Generate a deterministic ID based on source_key
+                source_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, source_key))
+                payload = {
+                    "source_key": source_key,
+                    "content_hash": content_hash,
+                    "last_processed": processed_at,
+                }
+                if metadata:
+                    payload.update(metadata)
+                points.append(
+                    models.PointStruct(
+                        id=int(uuid.UUID(source_id).int % (2**63)),
+                        vector=embedding.tolist(),
+                        payload=payload,
+                    )
+                )
 
-            await asyncio.wait_for(
-                asyncio.to_thread(
-                    self.client.upsert,
-                    collection_name=HARVEST_SOURCES_COLLECTION,
-                    points=[point],
-                ),
-                timeout=30.0,
-            )
+            with observe_seconds(HARVEST_UPSERT_SECONDS):
+                await asyncio.wait_for(
+                    asyncio.to_thread(
+                        self.client.upsert,
+                        collection_name=HARVEST_SOURCES_COLLECTION,
+                        points=points,
+                    ),
+                    timeout=30.0,
+                )
 
-            logger.debug(
-                "Harvest source state updated",
-                source_key=source_key,
-                content_hash=content_hash[:8],
-            )
-            return True
+            logger.debug("Harvest source states updated", count=len(points))
+            return len(points)
 
         except asyncio.TimeoutError:
             logger.warning(
                 "Update harvest source state timed out",
-                source_key=source_key,
+                source_keys=source_keys[:5],
+                count=len(states),
             )
-            return False
+            return 0
         except Exception as e:
             logger.warning(
                 "Update harvest source state failed",
-                source_key=source_key,
+                source_keys=source_keys[:5],
+                count=len(states),
                 error=str(e)[:200],
             )
-            return False
+            return 0
 
     async def list_harvest_sources(
         self, source_type: Optional[str] = None
@@ -1200,6 +1246,13 @@ class KnowledgeDBManager:
             source_key, content_hash, metadata
         )
 
+    async def update_harvest_source_states(
+        self, states: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> int:
+        if self.db is None:
+            await self.initialize()
+        return await self.db.update_harvest_source_states(states)
+
     async def list_harvest_sources(
         self, source_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
@@ -1217,6 +1270,7 @@ FINANCIAL_STANDARDS_COLLECTION = "financial_standards"
 
 # Core integration collections
 API_SPECS_COLLECTION = "api_specifications"
+API_ENDPOINTS_COLLECTION = "api_endpoints"  # per-endpoint docs from deep harvest
 MAPPING_PATTERNS_COLLECTION = "mapping_patterns"
 TRANSFORMATION_RULES_COLLECTION = "transformation_rules"
 
@@ -0,0 +1,268 @@
+"""
+OpenAPI / Swagger document loading.
+
+``load_spec_document`` detects whether a document is JSON or YAML and parses
+it with the fastest parser available: ``orjson`` for JSON and libyaml's
+``CSafeLoader`` for YAML. Both packages are project dependencies. If
+``orjson`` is missing, the standard library ``json`` is used; a PyYAML build
+without libyaml falls back to the pure-Python ``SafeLoader``. Without
+PyYAML at all, YAML specs raise ``SpecFormatError`` (and the ingestor falls
+back to LLM synthesis).
+
+``RefResolver`` inlines local ``$ref`` pointers (``#/components/schemas/Pet``).
+Each reference is resolved once per nesting depth and memoized, so specs
+that reference the same schemas from thousands of operations stay cheap.
+Circular references, references nested deeper than ``max_depth`` and
+references that cannot be resolved are left as ``{"$ref": ...}`` stubs.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+from urllib.parse import unquote
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on installed extras
+    _json_loads = json.loads
+
+try:
+    import yaml
+
+    _YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    YAML_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    yaml = None
+    YAML_AVAILABLE = False
+
+HTTP_METHODS = ("get", "post", "put", "delete", "patch")
+
+# Nested $refs inlined below an operation before leaving stubs
+MAX_REF_DEPTH = 6
+
+# A top-level "openapi:" / "swagger:" key, possibly after comments or "---"
+_YAML_SPEC_RE = re.compile(r"^(openapi|swagger)\s*:", re.MULTILINE)
+
+
+class SpecFormatError(ValueError):
+    """Raised when a document is not a JSON or YAML API specification."""
+
+
+def detect_spec_format(content: Union[str, bytes]) -> Optional[str]:
+    """``"json"``, ``"yaml"`` or ``None`` (e.g. an HTML documentation page)."""
+    if isinstance(content, bytes):
+        content = content[:4096].decode("utf-8", errors="ignore")
+    head = content.lstrip()[:4096]
+    if head.startswith(("{", "[")):
+        return "json"
+    if _YAML_SPEC_RE.search(head):
+        return "yaml"
+    return None
+
+
+def load_spec_document(content: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse a JSON or YAML spec document into a dict."""
+    spec_format = detect_spec_format(content)
+    if spec_format == "json":
+        try:
+            document = _json_loads(content)
+        except ValueError as e:  # orjson's and json's decode errors
+            raise SpecFormatError(f"Invalid JSON spec: {e}") from e
+    elif spec_format == "yaml":
+        if not YAML_AVAILABLE:
+            raise SpecFormatError("YAML spec found but PyYAML is not installed")
+        try:
+            document = yaml.load(content, Loader=_YAMLLoader)
+        except yaml.YAMLError as e:
+            raise SpecFormatError(f"Invalid YAML spec: {e}") from e
+    else:
+        raise SpecFormatError("Document is neither a JSON nor a YAML spec")
+
+    if not isinstance(document, dict):
+        raise SpecFormatError("Spec document is not an object")
+    return document
+
+
+class RefResolver:
+    """Inlines local ``$ref`` pointers of one spec document."""
+
+    def __init__(self, document: Dict[str, Any], max_depth: int = MAX_REF_DEPTH):
+        self.document = document
+        self.max_depth = max_depth
+        self._memo: Dict[Tuple[str, int], Any] = {}
+        self._resolving: Set[str] = set()
+        self._cycles_cut = 0
+
+    def lookup(self, ref: str) -> Any:
+        """The node a local JSON pointer refers to; raises ``KeyError``."""
+        if not ref.startswith("#/"):
+            raise KeyError(ref)  # external references are not fetched
+        node: Any = self.document
+        for token in ref[2:].split("/"):
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict):
+                node = node[token]
+            elif isinstance(node, list):
+                node = node[int(token)]
+            else:
+                raise KeyError(ref)
+        return node
+
+    def resolve(self, node: Any, depth: int = 0) -> Any:
+        """
+        ``node`` with references inlined. Results are shared between callers
+        and must not be mutated.
+        """
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self._resolve_ref(ref, depth)
+            return {key: self.resolve(value, depth) for key, value in node.items()}
+        if isinstance(node, list):
+            return [self.resolve(item, depth) for item in node]
+        return node
+
+    def _resolve_ref(self, ref: str, depth: int) -> Any:
+        if ref in self._resolving:
+            self._cycles_cut += 1
+            return {"$ref": ref}
+        if depth >= self.max_depth:
+            return {"$ref": ref}
+        key = (ref, depth)
+        if key in self._memo:
+            return self._memo[key]
+        try:
+            target = self.lookup(ref)
+        except (KeyError, IndexError, ValueError):
+            return {"$ref": ref}
+
+        cycles_before = self._cycles_cut
+        self._resolving.add(ref)
+        try:
+            resolved = self.resolve(target, depth + 1)
+        finally:
+            self._resolving.discard(ref)
+        # A result with a cycle cut depends on the refs being resolved
+        # around it, so only context-free results are reused
+        if self._cycles_cut == cycles_before:
+            self._memo[key] = resolved
+        return resolved
+
+
+def _json_schema(content: Any) -> Optional[Dict[str, Any]]:
+    """Schema of the JSON media type in a ``content`` map."""
+    if not isinstance(content, dict):
+        return None
+    media = content.get("application/json")
+    if media is None:
+        media = next(
+            (value for key, value in content.items() if "json" in str(key)), None
+        )
+    if not isinstance(media, dict):
+        return None
+    return media.get("schema")
+
+
+class Operation:
+    """One operation of a spec, with references resolved."""
+
+    __slots__ = (
+        "path",
+        "method",
+        "description",
+        "parameters",
+        "request_schema",
+        "response_schema",
+        "auth_required",
+    )
+
+    def __init__(self, path: str, method: str, **fields: Any):
+        self.path = path
+        self.method = method
+        for name in self.__slots__[2:]:
+            setattr(self, name, fields.get(name))
+
+
+def iter_operations(
+    spec: Dict[str, Any], resolver: Optional[RefResolver] = None
+) -> Iterator[Operation]:
+    """
+    Yield the operations of an OpenAPI 3 or Swagger 2 document in one pass
+    over ``paths``. Path-level parameters are merged into each operation.
+    """
+    resolver = resolver or RefResolver(spec)
+    paths = spec.get("paths")
+    if not isinstance(paths, dict):
+        return
+    default_security = spec.get("security") or []
+
+    for path, path_item in paths.items():
+        path_item = resolver.resolve(path_item)
+        if not isinstance(path_item, dict):
+            continue
+        shared_parameters = path_item.get("parameters") or []
+
+        for method, operation in path_item.items():
+            if str(method).lower() not in HTTP_METHODS:
+                continue
+            if not isinstance(operation, dict):
+                continue
+
+            parameters: Dict[str, Any] = {}
+            request_schema = None
+            for param in [*shared_parameters, *(operation.get("parameters") or [])]:
+                if not isinstance(param, dict) or not param.get("name"):
+                    continue
+                param_in = param.get("in", "query")
+                if param_in == "body":  # Swagger 2
+                    request_schema = param.get("schema")
+                    continue
+                schema = param.get("schema")
+                param_type = (
+                    schema.get("type") if isinstance(schema, dict) else None
+                ) or param.get("type", "string")
+                parameters[param["name"]] = {
+                    "in": param_in,
+                    "required": param.get("required", False),
+                    "type": param_type,
+                }
+
+            request_body = operation.get("requestBody")
+            if isinstance(request_body, dict):
+                request_schema = _json_schema(request_body.get("content"))
+
+            response_schema = None
+            responses = operation.get("responses")
+            if isinstance(responses, dict):
+                ok = responses.get("200", responses.get(200))
+                if ok is None:
+                    ok = next(
+                        (
+                            value
+                            for code, value in responses.items()
+                            if str(code).startswith("2")
+                        ),
+                        None,
+                    )
+                if isinstance(ok, dict):
+                    response_schema = _json_schema(ok.get("content"))
+                    if response_schema is None:
+                        response_schema = ok.get("schema")  # Swagger 2
+
+            security = operation.get("security", default_security) or []
+            yield Operation(
+                path=path,
+                method=str(method).upper(),
+                description=operation.get("summary", "")
+                or operation.get("description", ""),
+                parameters=parameters,
+                request_schema=(
+                    request_schema if isinstance(request_schema, dict) else None
+                ),
+                response_schema=(
+                    response_schema if isinstance(response_schema, dict) else None
+                ),
+                auth_required=len(security) > 0,
+            )
@@ -0,0 +1,63 @@
+"""Chunked upload persistence without buffering whole files in memory."""
+
+import asyncio
+import hashlib
+import os
+from typing import Optional
+
+from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+
+class StoredUpload(BaseModel):
+    path: str
+    size: int
+    sha256: Optional[str] = None
+
+
+async def stream_upload_to_disk(
+    upload: UploadFile,
+    file_path: str,
+    compute_hash: bool = True,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    max_size: Optional[int] = None,
+) -> StoredUpload:
+    """
+    Copy an upload to disk chunk by chunk.
+
+    Only one chunk is held in memory at a time; the SHA-256 digest is
+    computed on the fly. An upload larger than ``max_size`` bytes is
+    rejected with 413 as soon as the limit is passed. A partially written
+    file is removed if the copy fails.
+    """
+    digest = hashlib.sha256() if compute_hash else None
+    size = 0
+
+    try:
+        with open(file_path, "wb") as buffer:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the {max_size} byte upload limit",
+                    )
+                if digest is not None:
+                    digest.update(chunk)
+                await asyncio.to_thread(buffer.write, chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
+        raise
+
+    return StoredUpload(
+        path=file_path,
+        size=size,
+        sha256=digest.hexdigest() if digest is not None else None,
+    )
@@ -18,3 +18,8 @@ from app.models.integration import (
     DeploymentLog,
 )  # noqa
 from app.models.mapping_feedback import MappingFeedback  # noqa
+from app.models.http_cache import HttpCacheEntry  # noqa
+from app.models.scheduled_task import ScheduledTask  # noqa
+from app.models.spec_cache import SpecCacheEntry  # noqa
+from app.models.spec_store import ApiSpecDocument  # noqa
+from app.models.mapping_cache import MappingCacheEntry  # noqa
@@ -8,6 +8,8 @@ from datetime import datetime
 import json
 import structlog
 
+from app.services.transform_compiler import generate_mapping_source
+
 logger = structlog.get_logger(__name__)
 
 
@@ -29,11 +31,15 @@ class ScriptGenerator:
         """
         Generate a standalone main.py script for the integration.
         Includes all configuration embedded directly/securely.
+        The mapping is compiled into the script's transform_record and
+        transform_batch functions.
         """
 
         # Serialize auth configs for embedding
         source_auth_json = json.dumps(source_auth_config)
         dest_auth_json = json.dumps(dest_auth_config)
+        mapping_literal = repr(mapping_json)
+        transform_source = generate_mapping_source(json.loads(mapping_json or "{}"))
 
         script_content = f'''"""
 Vitesse AI Integration: {source_api_name} -> {dest_api_name}
@@ -81,9 +87,14 @@ SOURCE_AUTH = {source_auth_json}
 DEST_AUTH = {dest_auth_json}
 
 # Logic Configuration
-MAPPING_CONFIG = {mapping_json}
+MAPPING_CONFIG = json.loads({mapping_literal})
 SYNC_INTERVAL = {sync_interval}
 
+# Pages at least this large are transformed column by column
+COLUMNAR_MIN_RECORDS = int(os.environ.get("COLUMNAR_MIN_RECORDS", "5000"))
+# Records transformed and pushed per batch
+PUSH_BATCH_SIZE = int(os.environ.get("PUSH_BATCH_SIZE", "1000"))
+
 # Global State
 is_running = True
 last_sync_time = None
@@ -197,34 +208,8 @@ async def push_data(client: httpx.AsyncClient, data: List[Dict[str, Any]]) -> Di
         logger.error(f"Push failed: {{str(e)}}")
         raise
 
-def transform_record(record: Dict[str, Any]) -> Dict[str, Any]:
-    """Apply transformation logic."""
-    output = {{}}
-    transformations = MAPPING_CONFIG.get("transformations", [])
-    
-    for t in transformations:
-        source_field = t.get("source_field")
-        dest_field = t.get("dest_field")
-        transform_type = t.get("transform_type", "direct")
-        
-        # Get value
-        val = record.get(source_field)
-        
-        # Apply Logic
-        if transform_type == "direct":
-            output[dest_field] = val
-        elif transform_type == "parse":
-            try:
-                output[dest_field] = float(val) if val is not None else 0
-            except:
-                output[dest_field] = 0
-        elif transform_type == "stringify":
-            output[dest_field] = str(val) if val is not None else ""
-        else:
-            output[dest_field] = val
-            
-    return output
-
+# --- Compiled Mapping ---
+{transform_source}
 # --- Core Sync Logic ---
 
 async def run_sync_cycle():
@@ -238,11 +223,18 @@ async def run_sync_cycle():
             source_data = await fetch_data(client)
             logger.info(f"Fetched {{len(source_data)}} records")
             
-            # 2. Transform
-            transformed_data = [transform_record(r) for r in source_data]
-            
-            # 3. Push
-            result = await push_data(client, transformed_data)
+            # 2. Transform and 3. Push, one batch at a time
+            transform = (
+                transform_columns
+                if len(source_data) >= COLUMNAR_MIN_RECORDS
+                else transform_batch
+            )
+            result = {{"synced": 0, "failed": 0}}
+            for start in range(0, len(source_data), PUSH_BATCH_SIZE):
+                transformed_data = transform(source_data[start:start + PUSH_BATCH_SIZE])
+                batch_result = await push_data(client, transformed_data)
+                result["synced"] += batch_result.get("synced", 0)
+                result["failed"] += batch_result.get("failed", 0)
             logger.info(f"Push result: {{result}}")
             
             # Update Stats
@@ -4,8 +4,11 @@ Generates containerized integration applications.
 """
 
 from typing import Dict, Any
+import json
 import structlog
 
+from app.services.transform_compiler import generate_mapping_source
+
 logger = structlog.get_logger(__name__)
 
 
@@ -74,6 +77,8 @@ CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]
         Generate main.py template for integration container.
         This is the runtime application that performs the integration.
         """
+        mapping_literal = repr(mapping_json)
+        transform_source = generate_mapping_source(json.loads(mapping_json or "{}"))
         main_py = f'''"""
 Vitesse AI Integration: {source_api_name} → {dest_api_name}
 Integration ID: {integration_id}
@@ -103,7 +108,7 @@ app = FastAPI(
 )
 
 # Load mapping configuration
-MAPPING_CONFIG = {mapping_json}
+MAPPING_CONFIG = json.loads({mapping_literal})
 
 # API Configuration
 SOURCE_API_URL = os.getenv("SOURCE_API_URL", "https://api.source.com")
@@ -114,6 +119,7 @@ DEST_API_KEY = os.getenv("DEST_API_KEY", "")
 # Sync configuration
 SYNC_INTERVAL = int(os.getenv("SYNC_INTERVAL_SECONDS", "3600"))
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "100"))
+COLUMNAR_MIN_RECORDS = int(os.getenv("COLUMNAR_MIN_RECORDS", "5000"))
 
 
 @app.get("/health")
@@ -149,15 +155,19 @@ async def trigger_sync():
         source_data = await fetch_from_source()
         logger.info("Fetched from source", records=len(source_data))
         
-        # Transform
-        transformed_data = await transform_data(source_data)
-        
-        # Push to destination
-        result = await push_to_destination(transformed_data)
+        # Transform and push to destination in batches
+        records_synced = 0
+        for start in range(0, len(source_data), BATCH_SIZE):
+            transformed_data = await transform_data(
+                source_data[start:start + BATCH_SIZE],
+                columnar=len(source_data) >= COLUMNAR_MIN_RECORDS,
+            )
+            await push_to_destination(transformed_data)
+            records_synced += len(transformed_data)
         
         return {{
             "status": "success",
-            "records_synced": len(transformed_data),
+            "records_synced": records_synced,
             "timestamp": datetime.utcnow().isoformat(),
         }}
     
@@ -175,33 +185,15 @@ async def fetch_from_source():
         return response.json()
 
 
-async def transform_data(source_data: list) -> list:
-    """Transform data according to mapping."""
-    transformed = []
-    
-    for record in source_data:
-        transformed_record = {{}}
-        
-        for transformation in MAPPING_CONFIG.get("transformations", []):
-            source_field = transformation["source_field"]
-            dest_field = transformation["dest_field"]
-            transform_type = transformation.get("transform_type", "direct")
-            
-            if source_field in record:
-                value = record[source_field]
-                
-                # Apply transformation
-                if transform_type == "direct":
-                    transformed_record[dest_field] = value
-                elif transform_type == "mapping":
-                    transformed_record[dest_field] = str(value)
-                elif transform_type == "custom":
-                    # Apply custom transformation
-                    transformed_record[dest_field] = process_custom(value, transformation)
-            
-            transformed.append(transformed_record)
-    
-    return transformed
+# Compiled mapping: transform_record / transform_batch / transform_columns
+{transform_source}
+
+
+async def transform_data(source_data: list, columnar: bool = False) -> list:
+    """Transform data according to mapping, column by column if columnar."""
+    if columnar:
+        return transform_columns(source_data)
+    return transform_batch(source_data)
 
 
 async def push_to_destination(data: list) -> dict:
@@ -221,12 +213,6 @@ async def push_to_destination(data: list) -> dict:
         return response.json()
 
 
-def process_custom(value: any, transformation: dict) -> any:
-    """Apply custom transformation logic."""
-    # This would contain generated custom logic
-    return value
-
-
 async def sync_worker():
     """Background sync worker."""
     while True:
@@ -257,6 +243,7 @@ if __name__ == "__main__":
         requirements = """fastapi>=0.128.0
 uvicorn>=0.40.0
 httpx>=0.28.0
+numpy>=1.26
 pydantic>=2.0
 structlog>=25.0.0
 python-dotenv>=1.0
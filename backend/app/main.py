@@ -27,6 +27,7 @@ from app.db.langfuse_seed import seed_langfuse_config
 from app.db.products_seed import seed_products
 from app.db.langfuse_seed import seed_langfuse_config
 from app.core.checkpoint import init_checkpointer, close_checkpointer
+from app.core.http_clients import http_clients
 from app.core.ratelimit import limiter
 from app.core.knowledge_db import initialize_knowledge_db
 from app.core.seed_data import seed_all, check_seed_status
@@ -46,6 +47,9 @@ async def lifespan(app: FastAPI):
 
     os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 
+    # Shared pooled HTTP clients for outbound fetches
+    http_clients.start()
+
     # Initialize persistent LangGraph checkpointer
     await init_checkpointer()
 
@@ -109,6 +113,16 @@ async def lifespan(app: FastAPI):
 
     asyncio.create_task(recovery_service.recover_interrupted_tasks())
 
+    # Start durable job workers (document ingestion) unless run out-of-process
+    from app.services.job_queue import job_worker_pool
+
+    if settings.JOB_WORKER_MODE == "inprocess":
+        job_worker_pool.start()
+    else:
+        logger.info(
+            "In-process job workers disabled", job_worker_mode=settings.JOB_WORKER_MODE
+        )
+
     # Start email scheduler
     from app.services.email_scheduler import start_email_scheduler
     from app.services.llm_config_service import llm_config_service
@@ -123,6 +137,7 @@ async def lifespan(app: FastAPI):
     # Initialize and start knowledge harvester scheduler
     from app.services.knowledge_harvester_scheduler import (
         initialize_harvester_scheduler,
+        knowledge_harvester_scheduler,
     )
 
     try:
@@ -142,7 +157,16 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("Shutting down Vitesse AI backend application")
+    await job_worker_pool.stop()
+
+    from app.services.email_scheduler import email_scheduler
+    from app.tasks.monitor import drift_monitor_scheduler
+
+    await email_scheduler.shutdown()
+    await drift_monitor_scheduler.shutdown()
+    await knowledge_harvester_scheduler.shutdown()
     await close_checkpointer()
+    await http_clients.aclose()
 
 
 def create_application() -> FastAPI:
@@ -16,3 +16,8 @@ from .harvest_collaboration_integration import (
     TransformationRule,
     IntegrationTestResult,
 )
+from .http_cache import HttpCacheEntry
+from .scheduled_task import ScheduledTask
+from .spec_cache import SpecCacheEntry
+from .spec_store import ApiSpecDocument
+from .mapping_cache import MappingCacheEntry
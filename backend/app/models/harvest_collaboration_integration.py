@@ -38,6 +38,8 @@ class HarvestJob(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     error_message = Column(Text, nullable=True)
     source_ids = Column(JSON, nullable=True)  # List of source IDs to harvest from
+    # Completed stages and per-stage cursors, so an interrupted job can resume
+    checkpoint = Column(JSON, nullable=True)
 
     # Relationships
     test_results = relationship(
@@ -0,0 +1,50 @@
+"""
+HTTP cache model.
+
+Stores HTTP validators (ETag / Last-Modified) and a content hash per
+(scope, URL) so repeated fetches can be made conditional. Consumers that
+need the content itself on a ``304`` (the ingestor's spec cache) also keep
+the response body.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    JSON,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class HttpCacheEntry(Base):
+    """Validators from the last successful fetch of a URL by one consumer."""
+
+    __tablename__ = "http_cache_entries"
+    __table_args__ = (
+        UniqueConstraint("scope", "url", name="uq_http_cache_entries_scope_url"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Consumers (harvester, drift monitor, ...) track validators independently,
+    # otherwise one consumer's fetch would hide a change from another
+    scope = Column(String(100), nullable=False, index=True)
+    url = Column(Text, nullable=False)
+    etag = Column(String(500), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    content_length = Column(Integer, nullable=True)
+    meta = Column(JSON, nullable=True)  # Facts derived from the content
+    # Only stored on request; deferred so validator lookups don't load it
+    body = deferred(Column(LargeBinary, nullable=True))
+    fetched_at = Column(DateTime(timezone=True), nullable=True)  # last 200
+    checked_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<HttpCacheEntry(scope='{self.scope}', url='{self.url}')>"
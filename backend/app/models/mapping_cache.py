@@ -0,0 +1,36 @@
+"""
+Mapping cache model.
+
+Stores the field transformations generated for a pair of schemas, keyed by a
+fingerprint of both flattened schemas, the user intent and the mapping
+version, so repeated integrations between the same endpoints skip the LLM.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, JSON, String
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class MappingCacheEntry(Base):
+    """Transformations generated for one schema pair and intent."""
+
+    __tablename__ = "mapping_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # sha256 of flattened schemas, normalized intent and mapping version
+    fingerprint = Column(String(64), nullable=False, unique=True, index=True)
+    # API names, for invalidation when either side drifts
+    source_api = Column(String(200), nullable=False, index=True)
+    dest_api = Column(String(200), nullable=False, index=True)
+    mapping_version = Column(String(64), nullable=False)
+    transformations = Column(JSON, nullable=False)
+    hit_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return (
+            f"<MappingCacheEntry(source_api='{self.source_api}', "
+            f"dest_api='{self.dest_api}')>"
+        )
@@ -9,6 +9,9 @@ from pgvector.sqlalchemy import Vector
 
 from app.db.session import Base
 
+# all-MiniLM-L6-v2, the SemanticLayer embedding model
+EMBEDDING_DIMENSIONS = 384
+
 
 class MappingFeedback(Base):
     """
@@ -41,10 +44,12 @@ class MappingFeedback(Base):
     user_corrected: Mapped[bool] = mapped_column(default=False)
     verification_success: Mapped[bool] = mapped_column(default=False)
 
-    # Vector embeddings for semantic search (Dimension 1536 for OpenAI embeddings)
+    # Vector embeddings for semantic search (all-MiniLM-L6-v2, 384 dimensions)
     # We embed 'name: description' for both source and dest
-    source_embedding: Mapped[Optional[Any]] = mapped_column(Vector(1536))
-    dest_embedding: Mapped[Optional[Any]] = mapped_column(Vector(1536))
+    source_embedding: Mapped[Optional[Any]] = mapped_column(
+        Vector(EMBEDDING_DIMENSIONS)
+    )
+    dest_embedding: Mapped[Optional[Any]] = mapped_column(Vector(EMBEDDING_DIMENSIONS))
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
@@ -12,6 +12,14 @@ class QueueStatus(str, enum.Enum):
     FAILED = "failed"
 
 
+class QueuePriority(int, enum.Enum):
+    """Job priorities - higher values are claimed first."""
+
+    LOW = -10
+    NORMAL = 0
+    HIGH = 10
+
+
 class QueueRequest(Base):
     __tablename__ = "queue_requests"
 
@@ -30,5 +38,16 @@ class QueueRequest(Base):
     result = Column(JSON, nullable=True)
     error = Column(String, nullable=True)
 
+    # Durable job queue fields (see app.services.job_queue)
+    job_type = Column(String, nullable=True, index=True)
+    priority = Column(Integer, default=QueuePriority.NORMAL.value, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    available_at = Column(DateTime, default=datetime.utcnow, index=True)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,46 @@
+"""
+Scheduled task model.
+
+Persists the schedule state of recurring background work (knowledge
+harvests, drift checks, email polling) so restarts do not re-trigger runs,
+and holds the lease that makes each run single-flight across replicas.
+"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class ScheduledTask(Base):
+    """Schedule, lease and run statistics of one recurring task."""
+
+    __tablename__ = "scheduled_tasks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False, unique=True, index=True)
+    # Tasks sharing a lock group never run concurrently (e.g. harvest types)
+    lock_group = Column(String(100), nullable=False, index=True)
+    schedule = Column(String(200), nullable=False)  # "cron:...", "every:<s>s", "manual"
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Lease held by the replica currently running the task
+    lease_owner = Column(String(200), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    last_started_at = Column(DateTime(timezone=True), nullable=True)
+    last_finished_at = Column(DateTime(timezone=True), nullable=True)
+    last_status = Column(String(20), nullable=True)  # success, failed
+    last_error = Column(Text, nullable=True)
+    last_duration_seconds = Column(Float, nullable=True)
+    avg_duration_seconds = Column(Float, nullable=True)
+    run_count = Column(Integer, default=0, nullable=False)
+    failure_count = Column(Integer, default=0, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<ScheduledTask(name='{self.name}', next_run_at={self.next_run_at})>"
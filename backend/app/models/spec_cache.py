@@ -0,0 +1,33 @@
+"""
+Spec cache model.
+
+Stores API specifications produced by the ingestor (parsed from OpenAPI or
+synthesized by the LLM), keyed by the hash of the source content, so the
+same API is not parsed or synthesized again for every integration.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, JSON, String
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class SpecCacheEntry(Base):
+    """One ingested APISpecification."""
+
+    __tablename__ = "spec_cache_entries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # sha256 of ingestor version, source kind, content hash and request inputs
+    cache_key = Column(String(64), nullable=False, unique=True, index=True)
+    content_hash = Column(String(64), nullable=False, index=True)
+    ingestor_version = Column(String(20), nullable=False)
+    source = Column(String(20), nullable=False)  # openapi, html, name
+    api_name = Column(String(200), nullable=True)
+    api_spec = Column(JSON, nullable=False)
+    hit_count = Column(Integer, nullable=False, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<SpecCacheEntry(api_name='{self.api_name}', source='{self.source}')>"
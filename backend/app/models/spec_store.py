@@ -0,0 +1,32 @@
+"""
+Spec store model.
+
+Full API specifications, stored once per distinct content and addressed by
+the sha256 of their canonical JSON. Integrations keep a compact copy of their
+source and destination specs that references a document here by hash.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, JSON, String
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class ApiSpecDocument(Base):
+    """One full APISpecification, shared by every integration that uses it."""
+
+    __tablename__ = "api_spec_documents"
+
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), nullable=False, unique=True, index=True)
+    api_name = Column(String(200), nullable=True)
+    endpoint_count = Column(Integer, nullable=False, server_default="0")
+    size_bytes = Column(Integer, nullable=False, server_default="0")
+    spec = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return (
+            f"<ApiSpecDocument(api_name='{self.api_name}', "
+            f"endpoints={self.endpoint_count})>"
+        )
@@ -24,10 +24,13 @@ class HarvestJobCreate(BaseModel):
     def validate_harvest_type(cls, v):
         valid_types = [
             "full",
+            "standards",
+            "patterns",
+            "incremental",
             "financial",
             "api_directory",
-            "documentation",
-            "code_repositories",
+            "marketplaces",
+            "github",
         ]
         if v not in valid_types:
             raise ValueError(f"harvest_type must be one of: {', '.join(valid_types)}")
@@ -59,9 +62,7 @@ class HarvestJobResponse(BaseModel):
 
     class Config:
         from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+        json_encoders = {datetime: lambda v: v.isoformat() if v else None}
 
 
 class HarvestJobList(BaseModel):
@@ -14,6 +14,7 @@ from app.db.session import get_db
 from app.services.llm_provider import LLMProviderService
 from app.services.knowledge_base import knowledge_base_manager
 from app.core.cache import cache_service
+from app.core.config import settings
 from app.models.chat import ChatSession as DBChatSession, ChatMessage as DBChatMessage
 from app.db.session import async_session_factory
 from sqlalchemy import select, desc
@@ -277,6 +278,9 @@ class ChatService:
         try:
             # Query knowledge base for relevant information
             kb_limit = 10 if session.session_type == "guide" else 3
+            if settings.KB_RERANK_ENABLED:
+                # Re-ranked chunks are precise enough to keep the prompt small
+                kb_limit = min(kb_limit, settings.KB_RERANK_TOP_K)
             kb_results = await self.knowledge_base.search_similar_documents(
                 query=user_message, limit=kb_limit
             )
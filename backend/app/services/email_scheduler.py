@@ -1,44 +1,45 @@
-import asyncio
 import structlog
 from app.services.email_service import email_service
 
 # from app.agents.definitions.email_agent import email_ingestion_agent
 from app.core.config import settings
+from app.services.scheduler import PersistentScheduler, ScheduledJob
 from app.services.settings_service import settings_service
 
 logger = structlog.get_logger(__name__)
 
 
-async def email_polling_loop():
-    """Background loop to poll email."""
-    logger.info("Email scheduler started.")
+def _poll_interval() -> float:
+    return float(settings_service.get_email_config().get("EMAIL_POLL_INTERVAL", 60))
 
-    while True:
-        interval = 60  # Default interval
-        try:
-            config = settings_service.get_email_config()
-            interval = config.get("EMAIL_POLL_INTERVAL", 60)
 
-            if config.get("EMAIL_ENABLED"):
-                logger.info("Checking for new emails...", interval=interval)
-                email_service.record_heartbeat()
-                emails = email_service.fetch_unread_emails()
-                if emails:
-                    logger.info(f"Picked up {len(emails)} new emails.")
-                    for email in emails:
-                        # Legacy email ingestion removed
-                        logger.info(
-                            "Email processing skipped - legacy agent removed",
-                            subject=email.get("subject"),
-                        )
-                logger.info(f"Sleeping for {interval}s...")
+async def poll_email_once():
+    """Fetch and process unread emails if email ingestion is enabled."""
+    config = settings_service.get_email_config()
 
-        except Exception as e:
-            logger.error("Error in email polling loop", error=str(e), traceback=True)
+    if config.get("EMAIL_ENABLED"):
+        logger.info(
+            "Checking for new emails...", interval=config.get("EMAIL_POLL_INTERVAL")
+        )
+        email_service.record_heartbeat()
+        emails = email_service.fetch_unread_emails()
+        if emails:
+            logger.info(f"Picked up {len(emails)} new emails.")
+            for email in emails:
+                # Legacy email ingestion removed
+                logger.info(
+                    "Email processing skipped - legacy agent removed",
+                    subject=email.get("subject"),
+                )
 
-        await asyncio.sleep(interval)
+
+# Single-flight across replicas so an inbox is never polled twice at once
+email_scheduler = PersistentScheduler("email", poll_interval=10)
+email_scheduler.register(
+    ScheduledJob("email:poll", poll_email_once, interval_seconds=_poll_interval)
+)
 
 
 def start_email_scheduler():
     """Start the email scheduler task."""
-    asyncio.create_task(email_polling_loop())
+    email_scheduler.start()
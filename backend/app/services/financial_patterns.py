@@ -0,0 +1,255 @@
+"""
+Keyword patterns for structured financial extraction, compiled once at import.
+
+Each document type maps field categories (revenue, assets, ...) to regex
+fragments. ``CategoryMatcher`` combines all fragments of a document type into
+a single alternation used as a prefilter, so a line or cell that mentions
+none of the keywords (the vast majority on multi-hundred-page returns) is
+scanned exactly once. Only lines that hit the prefilter are tested against
+the per-category alternations to find every matching category.
+"""
+
+import re
+from typing import Dict, List
+
+PDF_FIELD_PATTERNS: Dict[str, Dict[str, List[str]]] = {
+    "tax_return": {
+        "revenue": [
+            r"gross receipts",
+            r"total income",
+            r"gross revenue",
+            r"business income",
+            r"ordinary income",
+            r"rental income",
+        ],
+        "expenses": [
+            r"total expenses",
+            r"cost of goods sold",
+            r"cogs",
+            r"operating expenses",
+            r"business expenses",
+            r"deductions",
+        ],
+        "assets": [
+            r"total assets",
+            r"assets",
+            r"property.?plant.?equipment",
+            r"buildings",
+            r"land",
+            r"equipment",
+            r"machinery",
+        ],
+        "liabilities": [
+            r"total liabilities",
+            r"liabilities",
+            r"loans payable",
+            r"mortgages",
+            r"notes payable",
+            r"accounts payable",
+        ],
+        "equity": [
+            r"owner.?s equity",
+            r"retained earnings",
+            r"partner.?s capital",
+            r"stockholder.?s equity",
+            r"member.?s capital",
+        ],
+        "tax_year": [r"tax year", r"year ended", r"fiscal year"],
+        # Schedule L (Balance Sheet) specific patterns
+        "schedule_l_assets": [
+            r"schedule l",
+            r"balance sheet",
+            r"assets.*beginning",
+            r"assets.*end",
+            r"cash.*beginning",
+            r"cash.*end",
+        ],
+        "schedule_l_liabilities": [
+            r"liabilities.*beginning",
+            r"liabilities.*end",
+            r"loans.*beginning",
+            r"loans.*end",
+        ],
+        # Schedule M-1 (Reconciliation) specific patterns
+        "schedule_m1": [
+            r"schedule m-1",
+            r"reconciliation",
+            r"book.*tax",
+            r"net income.*book",
+            r"net income.*tax",
+        ],
+        # Schedule M-3 (for larger businesses) specific patterns
+        "schedule_m3": [
+            r"schedule m-3",
+            r"reconciliation.*financial",
+            r"financial.*reconciliation",
+        ],
+    },
+    "profit_loss": {
+        "revenue": [
+            r"total revenue",
+            r"gross sales",
+            r"net sales",
+            r"service revenue",
+            r"product revenue",
+            r"other income",
+        ],
+        "cogs": [
+            r"cost of goods sold",
+            r"cogs",
+            r"cost of sales",
+            r"direct costs",
+            r"product costs",
+        ],
+        "operating_expenses": [
+            r"operating expenses",
+            r"total expenses",
+            r"general.*admin",
+            r"g.?a.?expenses",
+            r"selling.*expenses",
+            r"admin.*expenses",
+        ],
+        "net_income": [
+            r"net income",
+            r"net profit",
+            r"profit before tax",
+            r"operating income",
+            r"ebit",
+            r"earnings before interest",
+        ],
+        "depreciation": [
+            r"depreciation",
+            r"amortization",
+            r"depreciation.*expense",
+        ],
+        "interest_expense": [
+            r"interest expense",
+            r"interest paid",
+            r"finance costs",
+        ],
+    },
+    "balance_sheet": {
+        "assets": [
+            r"total assets",
+            r"assets",
+            r"current assets",
+            r"fixed assets",
+            r"property.?plant.?equipment",
+            r"intangible assets",
+        ],
+        "liabilities": [
+            r"total liabilities",
+            r"liabilities",
+            r"current liabilities",
+            r"long.?term.*liabilities",
+            r"debt",
+            r"loans",
+        ],
+        "equity": [
+            r"total equity",
+            r"owner.?s equity",
+            r"stockholder.?s equity",
+            r"retained earnings",
+            r"capital",
+        ],
+        "cash": [r"cash.*equivalents", r"cash.*bank", r"cash.*balance"],
+    },
+    "rent_roll": {
+        "tenant_info": [
+            r"tenant",
+            r"lease",
+            r"rent",
+            r"occupant",
+            r"unit",
+        ],
+        "rental_income": [
+            r"rental income",
+            r"rent collected",
+            r"lease income",
+            r"monthly rent",
+            r"annual rent",
+        ],
+        "vacancy": [r"vacant", r"vacancy", r"empty", r"available"],
+    },
+}
+
+EXCEL_FIELD_PATTERNS: Dict[str, List[str]] = {
+    "revenue": [
+        r"gross revenue",
+        r"gross receipts",
+        r"total income",
+        r"business income",
+        r"rental income",
+        r"ordinary income",
+        r"sales",
+    ],
+    "expenses": [
+        r"total expenses",
+        r"cost of goods sold",
+        r"cogs",
+        r"operating expenses",
+        r"business expenses",
+        r"deductions",
+        r"salaries",
+        r"rent",
+        r"utilities",
+    ],
+    "assets": [
+        r"total assets",
+        r"assets",
+        r"property",
+        r"equipment",
+        r"machinery",
+        r"buildings",
+        r"land",
+        r"cash",
+        r"accounts receivable",
+    ],
+    "liabilities": [
+        r"total liabilities",
+        r"liabilities",
+        r"loans payable",
+        r"mortgages",
+        r"notes payable",
+        r"accounts payable",
+        r"debt",
+    ],
+    "equity": [
+        r"owner.?s equity",
+        r"retained earnings",
+        r"partner.?s capital",
+        r"stockholder.?s equity",
+        r"member.?s capital",
+    ],
+    "tax_year": [r"tax year", r"year ended", r"fiscal year"],
+}
+
+
+def _alternation(fragments: List[str]) -> "re.Pattern":
+    return re.compile("|".join(f"(?:{fragment})" for fragment in fragments))
+
+
+class CategoryMatcher:
+    """Finds every field category whose patterns occur in a piece of text."""
+
+    def __init__(self, field_patterns: Dict[str, List[str]]):
+        self._categories = [
+            (field, _alternation(fragments))
+            for field, fragments in field_patterns.items()
+        ]
+        all_fragments = [f for fragments in field_patterns.values() for f in fragments]
+        self._prefilter = _alternation(all_fragments) if all_fragments else None
+
+    def match(self, text: str) -> List[str]:
+        """Return matching categories in definition order (``text`` lowercased)."""
+        if self._prefilter is None or not self._prefilter.search(text):
+            return []
+        return [field for field, regex in self._categories if regex.search(text)]
+
+
+PDF_MATCHERS: Dict[str, CategoryMatcher] = {
+    doc_type: CategoryMatcher(field_patterns)
+    for doc_type, field_patterns in PDF_FIELD_PATTERNS.items()
+}
+EXCEL_MATCHER = CategoryMatcher(EXCEL_FIELD_PATTERNS)
+EMPTY_MATCHER = CategoryMatcher({})
@@ -3,10 +3,10 @@ Database services for harvest jobs, agent collaboration, and integrations.
 """
 
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, desc, and_, or_, select
+from sqlalchemy import func, desc, and_, or_, select, update
 
 from app.models.harvest_collaboration_integration import (
     HarvestJob,
@@ -120,7 +120,9 @@ class HarvestJobService:
 
         if status == "running" and not job.started_at:
             job.started_at = datetime.utcnow()
-        elif status in ["completed", "failed"] and not job.completed_at:
+        elif status == "running":
+            job.completed_at = None  # Resumed after an interruption
+        elif status in ["completed", "failed", "cancelled"] and not job.completed_at:
             job.completed_at = datetime.utcnow()
 
         await db.commit()
@@ -128,6 +130,77 @@ class HarvestJobService:
         return job
 
     @staticmethod
+    async def save_harvest_checkpoint(
+        db: AsyncSession, job_id: str, checkpoint: Optional[Dict[str, Any]]
+    ) -> None:
+        """Store (or clear, with None) the resumable state of a harvest job."""
+        await db.execute(
+            update(HarvestJob)
+            .where(HarvestJob.id == job_id)
+            .values(checkpoint=checkpoint)
+        )
+        await db.commit()
+
+    @staticmethod
+    async def fail_interrupted_harvest_jobs(db: AsyncSession) -> List[str]:
+        """
+        Mark every running or queued job failed and return their IDs.
+
+        Only call this while holding the harvest scheduler's lease: no other
+        harvest can be running then, so these jobs were left behind by a
+        process that died. Their checkpoints are kept, so they stay resumable.
+        """
+        result = await db.execute(
+            update(HarvestJob)
+            .where(HarvestJob.status.in_(["running", "queued"]))
+            .values(
+                status="failed",
+                error_message="Interrupted: the harvesting process stopped",
+                completed_at=datetime.utcnow(),
+            )
+            .returning(HarvestJob.id)
+        )
+        job_ids = list(result.scalars().all())
+        await db.commit()
+        return job_ids
+
+    @staticmethod
+    async def get_resumable_harvest_job(
+        db: AsyncSession,
+        harvest_type: str,
+        max_age: timedelta,
+        stale_after: timedelta,
+    ) -> Optional[HarvestJob]:
+        """
+        Return the latest job of ``harvest_type`` if it was interrupted with a
+        checkpoint: failed or cancelled, or still marked running although its
+        checkpoint has not been saved for ``stale_after`` (the process died).
+        """
+        result = await db.execute(
+            select(HarvestJob)
+            .where(HarvestJob.harvest_type == harvest_type)
+            .order_by(desc(HarvestJob.created_at))
+            .limit(1)
+        )
+        job = result.scalar_one_or_none()
+        if job is None or not job.checkpoint or job.status == "completed":
+            return None
+
+        now = datetime.now(timezone.utc)
+        created_at = job.created_at
+        if created_at is not None and created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        if created_at is not None and now - created_at > max_age:
+            return None
+
+        if job.status in ("running", "queued"):
+            saved_at = job.checkpoint.get("saved_at")
+            if not saved_at:
+                return None
+            if now - datetime.fromisoformat(saved_at) < stale_after:
+                return None  # Still being worked on
+        return job
+
     @staticmethod
     async def get_harvest_job_stats(db: AsyncSession) -> Dict[str, Any]:
         """Get harvest job statistics."""
@@ -18,6 +18,7 @@ from app.schemas.harvest_source import (
     HarvestTestResult,
 )
 from app.core.knowledge_db import get_knowledge_db
+from app.core.http_fetch import conditional_fetcher
 
 logger = structlog.get_logger(__name__)
 
@@ -138,50 +139,69 @@ class HarvestSourceService:
                 message="Harvest source not found",
             )
 
-        import httpx
         import time
 
         try:
             start_time = time.time()
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Add authentication headers if configured
-                headers = {}
-                if db_source.auth_type == "api_key" and db_source.auth_config:
-                    api_key = db_source.auth_config.get("api_key")
-                    header_name = db_source.auth_config.get("header_name", "X-API-Key")
-                    headers[header_name] = api_key
-
-                response = await client.get(db_source.url, headers=headers)
-                response_time = (time.time() - start_time) * 1000
-
-                if response.status_code == 200:
-                    # Try to parse as JSON to count APIs
-                    apis_found = None
-                    try:
-                        data = response.json()
-                        if isinstance(data, dict):
-                            # APIs.guru format
-                            apis_found = len(data)
-                        elif isinstance(data, list):
-                            apis_found = len(data)
-                    except:
-                        pass
-
-                    return HarvestTestResult(
-                        success=True,
-                        message=f"Successfully connected to {db_source.name}",
-                        response_time_ms=round(response_time, 2),
-                        status_code=response.status_code,
-                        apis_found=apis_found,
-                    )
-                else:
-                    return HarvestTestResult(
-                        success=False,
-                        message=f"HTTP {response.status_code}: {response.text[:200]}",
-                        response_time_ms=round(response_time, 2),
-                        status_code=response.status_code,
-                    )
+            # Add authentication headers if configured
+            headers = {}
+            if db_source.auth_type == "api_key" and db_source.auth_config:
+                api_key = db_source.auth_config.get("api_key")
+                header_name = db_source.auth_config.get("header_name", "X-API-Key")
+                headers[header_name] = api_key
+
+            # Conditional request: an unchanged source answers 304 without a body
+            fetched = await conditional_fetcher.get(
+                db_source.url,
+                scope=f"harvest_source_test:{source_id}",
+                headers=headers,
+                timeout=10.0,
+                record=False,
+            )
+            response_time = (time.time() - start_time) * 1000
+
+            if fetched.unchanged:
+                return HarvestTestResult(
+                    success=True,
+                    message=f"Successfully connected to {db_source.name} (not modified since last test)",
+                    response_time_ms=round(response_time, 2),
+                    status_code=fetched.status_code,
+                    apis_found=fetched.meta.get("apis_found"),
+                )
+
+            if fetched.status_code == 200:
+                # Try to parse as JSON to count APIs
+                apis_found = None
+                try:
+                    data = fetched.parse_json()
+                    if isinstance(data, dict):
+                        # APIs.guru format
+                        apis_found = len(data)
+                    elif isinstance(data, list):
+                        apis_found = len(data)
+                except:
+                    pass
+
+                await conditional_fetcher.record(
+                    fetched, meta={"apis_found": apis_found}
+                )
+
+                return HarvestTestResult(
+                    success=True,
+                    message=f"Successfully connected to {db_source.name}",
+                    response_time_ms=round(response_time, 2),
+                    status_code=fetched.status_code,
+                    apis_found=apis_found,
+                )
+            else:
+                body = (fetched.content or b"").decode("utf-8", errors="replace")
+                return HarvestTestResult(
+                    success=False,
+                    message=f"HTTP {fetched.status_code}: {body[:200]}",
+                    response_time_ms=round(response_time, 2),
+                    status_code=fetched.status_code,
+                )
 
         except Exception as e:
             return HarvestTestResult(
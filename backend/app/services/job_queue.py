@@ -0,0 +1,472 @@
+"""
+Durable Job Queue
+
+Persistent background job queue backed by the ``queue_requests`` table.
+Jobs survive process restarts, are claimed with ``FOR UPDATE SKIP LOCKED``
+so several workers (in-process or in a separate worker process) can share
+the queue, and are retried with exponential backoff.
+
+Handlers are registered per job type:
+
+    @register_job_handler("document.ingest")
+    async def ingest(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+        await ctx.report_progress(10, "extracting")
+        ...
+
+A job type can also register a failure hook, run in the queue's own
+transaction when a job is failed by the queue rather than by its handler
+(e.g. its worker was lost on the last attempt):
+
+    @register_job_failure_hook("document.ingest")
+    async def ingest_failed(db: AsyncSession, job: QueueRequest, error: str) -> None:
+        ...
+"""
+
+import asyncio
+import socket
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.queue_request import QueueRequest, QueueStatus, QueuePriority
+
+logger = structlog.get_logger(__name__)
+
+
+JobHandler = Callable[
+    ["JobContext", Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]
+]
+JobFailureHook = Callable[[AsyncSession, QueueRequest, str], Awaitable[None]]
+
+_job_handlers: Dict[str, JobHandler] = {}
+_job_failure_hooks: Dict[str, JobFailureHook] = {}
+
+# Modules that register job handlers on import
+HANDLER_MODULES = ["app.tasks.document_jobs"]
+
+
+def register_job_handler(job_type: str):
+    """Decorator registering an async handler for a job type."""
+
+    def decorator(func: JobHandler) -> JobHandler:
+        _job_handlers[job_type] = func
+        return func
+
+    return decorator
+
+
+def register_job_failure_hook(job_type: str):
+    """Decorator registering a hook run when the queue fails a job for good."""
+
+    def decorator(func: JobFailureHook) -> JobFailureHook:
+        _job_failure_hooks[job_type] = func
+        return func
+
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    return _job_handlers.get(job_type)
+
+
+def load_job_handlers() -> None:
+    """Import handler modules so their handlers are registered."""
+    import importlib
+
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+class JobContext:
+    """Per-execution context passed to job handlers."""
+
+    def __init__(
+        self,
+        queue: "JobQueueService",
+        job_id: str,
+        job_type: str,
+        attempt: int,
+        max_attempts: int,
+    ):
+        self.queue = queue
+        self.job_id = job_id
+        self.job_type = job_type
+        self.attempt = attempt
+        self.max_attempts = max_attempts
+
+    @property
+    def is_final_attempt(self) -> bool:
+        return self.attempt >= self.max_attempts
+
+    async def report_progress(
+        self, percentage: int, stage: Optional[str] = None
+    ) -> None:
+        """Persist progress (also refreshes the job heartbeat)."""
+        await self.queue.heartbeat(self.job_id, percentage=percentage, stage=stage)
+
+
+class JobQueueService:
+    """Enqueue, claim and settle durable jobs."""
+
+    def __init__(self):
+        self._wakeup = asyncio.Event()
+
+    def retry_delay(self, attempts: int) -> int:
+        """Exponential backoff delay (seconds) after the given number of attempts."""
+        return settings.JOB_RETRY_BACKOFF_SECONDS * (2 ** max(0, attempts - 1))
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = QueuePriority.NORMAL,
+        requestor_id: Optional[int] = None,
+        workflow_id: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+    ) -> QueueRequest:
+        """Persist a new pending job and wake idle in-process workers."""
+        now = datetime.utcnow()
+        job = QueueRequest(
+            id=str(uuid.uuid4()),
+            job_type=job_type,
+            workflow_id=workflow_id,
+            status=QueueStatus.PENDING,
+            priority=int(priority),
+            payload=payload,
+            requestor_id=requestor_id,
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+            available_at=now,
+            progress_percentage=0,
+            progress_stage="queued",
+            created_at=now,
+            updated_at=now,
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+
+        self._wakeup.set()
+        logger.info(
+            "Job enqueued",
+            job_id=job.id,
+            job_type=job_type,
+            priority=int(priority),
+            workflow_id=workflow_id,
+        )
+        return job
+
+    async def claim_next(self, worker_id: str) -> Optional[QueueRequest]:
+        """Atomically claim the highest-priority available job."""
+        now = datetime.utcnow()
+        async with async_session_factory() as db:
+            stmt = (
+                select(QueueRequest)
+                .where(
+                    QueueRequest.status == QueueStatus.PENDING,
+                    QueueRequest.job_type.isnot(None),
+                    QueueRequest.available_at <= now,
+                    QueueRequest.attempts < QueueRequest.max_attempts,
+                )
+                .order_by(QueueRequest.priority.desc(), QueueRequest.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(stmt)
+            job = result.scalars().first()
+            if job is None:
+                return None
+
+            job.status = QueueStatus.IN_PROGRESS
+            job.worker_id = worker_id
+            job.attempts = (job.attempts or 0) + 1
+            job.started_at = now
+            job.heartbeat_at = now
+            job.progress_stage = "started"
+            job.error = None
+            await db.commit()
+            await db.refresh(job)
+            return job
+
+    async def heartbeat(
+        self,
+        job_id: str,
+        percentage: Optional[int] = None,
+        stage: Optional[str] = None,
+    ) -> None:
+        values: Dict[str, Any] = {"heartbeat_at": datetime.utcnow()}
+        if percentage is not None:
+            values["progress_percentage"] = max(0, min(100, int(percentage)))
+        if stage is not None:
+            values["progress_stage"] = stage
+        try:
+            async with async_session_factory() as db:
+                await db.execute(
+                    update(QueueRequest)
+                    .where(QueueRequest.id == job_id)
+                    .values(**values)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning(
+                "Failed to record job heartbeat", job_id=job_id, error=str(e)
+            )
+
+    async def complete(
+        self, job_id: str, result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        now = datetime.utcnow()
+        async with async_session_factory() as db:
+            await db.execute(
+                update(QueueRequest)
+                .where(QueueRequest.id == job_id)
+                .values(
+                    status=QueueStatus.COMPLETED,
+                    result=result,
+                    progress_percentage=100,
+                    progress_stage="completed",
+                    completed_at=now,
+                    heartbeat_at=now,
+                )
+            )
+            await db.commit()
+
+    async def fail(self, job: QueueRequest, error: str) -> bool:
+        """
+        Record a failed attempt.
+
+        Returns True if the job was rescheduled for retry, False if it has
+        exhausted its attempts and is now FAILED.
+        """
+        now = datetime.utcnow()
+        retry = (job.attempts or 0) < (job.max_attempts or 1)
+        values: Dict[str, Any] = {"error": error[:2000], "heartbeat_at": now}
+        if retry:
+            delay = self.retry_delay(job.attempts or 1)
+            values.update(
+                status=QueueStatus.PENDING,
+                available_at=now + timedelta(seconds=delay),
+                progress_stage=f"retrying in {delay}s",
+                worker_id=None,
+            )
+        else:
+            values.update(
+                status=QueueStatus.FAILED,
+                progress_stage="failed",
+                completed_at=now,
+            )
+
+        async with async_session_factory() as db:
+            await db.execute(
+                update(QueueRequest).where(QueueRequest.id == job.id).values(**values)
+            )
+            await db.commit()
+        return retry
+
+    async def release(self, job_id: str) -> None:
+        """Return a job interrupted by shutdown to the queue without using an attempt."""
+        async with async_session_factory() as db:
+            await db.execute(
+                update(QueueRequest)
+                .where(
+                    QueueRequest.id == job_id,
+                    QueueRequest.status == QueueStatus.IN_PROGRESS,
+                )
+                .values(
+                    status=QueueStatus.PENDING,
+                    attempts=QueueRequest.attempts - 1,
+                    worker_id=None,
+                    available_at=datetime.utcnow(),
+                    progress_stage="requeued",
+                )
+            )
+            await db.commit()
+
+    async def requeue_stale(self) -> List[QueueRequest]:
+        """
+        Return in-progress jobs whose worker stopped heartbeating to the queue.
+
+        A lost worker counts as a failed attempt: the job is retried after
+        the usual backoff, or marked FAILED once its attempts are used up,
+        so a job that kills its worker is not reclaimed forever. The failure
+        hook of its job type runs in the same transaction.
+        """
+        load_job_handlers()
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_HEARTBEAT_TIMEOUT)
+        async with async_session_factory() as db:
+            stmt = (
+                select(QueueRequest)
+                .where(
+                    QueueRequest.status == QueueStatus.IN_PROGRESS,
+                    QueueRequest.job_type.isnot(None),
+                    QueueRequest.heartbeat_at < cutoff,
+                )
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(stmt)
+            stale_jobs = list(result.scalars().all())
+            now = datetime.utcnow()
+            requeued = []
+            for job in stale_jobs:
+                job.worker_id = None
+                job.error = "worker lost"
+                if (job.attempts or 0) >= (job.max_attempts or 1):
+                    job.status = QueueStatus.FAILED
+                    job.progress_stage = "failed"
+                    job.completed_at = now
+                    hook = _job_failure_hooks.get(job.job_type)
+                    if hook is not None:
+                        await hook(db, job, job.error)
+                    continue
+                delay = self.retry_delay(job.attempts or 1)
+                job.status = QueueStatus.PENDING
+                job.available_at = now + timedelta(seconds=delay)
+                job.progress_stage = f"recovered, retrying in {delay}s"
+                requeued.append(job)
+            await db.commit()
+
+        if stale_jobs:
+            self._wakeup.set()
+            logger.info(
+                "Recovered stale jobs",
+                requeued=len(requeued),
+                failed=len(stale_jobs) - len(requeued),
+            )
+        return requeued
+
+    async def wait_for_work(self, timeout: float) -> None:
+        """Sleep until a job is enqueued in this process or the timeout elapses."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wakeup.clear()
+
+
+class JobWorkerPool:
+    """Pool of async workers draining the durable job queue."""
+
+    def __init__(
+        self,
+        queue: JobQueueService,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        if self._running:
+            return
+        load_job_handlers()
+        self._running = True
+        self._tasks = [
+            asyncio.create_task(self._worker_loop(f"{self.worker_prefix}:{i}"))
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper_loop()))
+        logger.info(
+            "Job worker pool started",
+            concurrency=self.concurrency,
+            worker_prefix=self.worker_prefix,
+        )
+
+    async def stop(self) -> None:
+        if not self._running:
+            return
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Job worker pool stopped")
+
+    async def _reaper_loop(self) -> None:
+        """Periodically reclaim jobs abandoned by crashed workers."""
+        interval = max(30, settings.JOB_HEARTBEAT_TIMEOUT // 2)
+        while self._running:
+            try:
+                await self.queue.requeue_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Stale job reaper failed", error=str(e))
+            await asyncio.sleep(interval)
+
+    async def _worker_loop(self, worker_id: str) -> None:
+        while self._running:
+            try:
+                job = await self.queue.claim_next(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if "does not exist" in str(e) or "UndefinedTable" in str(e):
+                    logger.warning("Job queue table not ready", error=str(e))
+                else:
+                    logger.error(
+                        "Failed to claim job", worker_id=worker_id, error=str(e)
+                    )
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            if job is None:
+                await self.queue.wait_for_work(self.poll_interval)
+                continue
+
+            await self._run_job(job, worker_id)
+
+    async def _heartbeat_loop(self, job_id: str) -> None:
+        interval = max(5, settings.JOB_HEARTBEAT_TIMEOUT // 3)
+        while True:
+            await asyncio.sleep(interval)
+            await self.queue.heartbeat(job_id)
+
+    async def _run_job(self, job: QueueRequest, worker_id: str) -> None:
+        handler = get_job_handler(job.job_type)
+        log = logger.bind(job_id=job.id, job_type=job.job_type, attempt=job.attempts)
+
+        if handler is None:
+            log.error("No handler registered for job type")
+            job.max_attempts = job.attempts  # Not retryable
+            await self.queue.fail(job, f"No handler registered for {job.job_type}")
+            return
+
+        log.info("Job started", worker_id=worker_id)
+        ctx = JobContext(
+            self.queue, job.id, job.job_type, job.attempts, job.max_attempts
+        )
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job.id))
+        try:
+            result = await handler(ctx, job.payload or {})
+            await self.queue.complete(job.id, result)
+            log.info("Job completed")
+        except asyncio.CancelledError:
+            log.info("Job interrupted by shutdown, releasing")
+            await asyncio.shield(self.queue.release(job.id))
+            raise
+        except Exception as e:
+            retried = await self.queue.fail(job, str(e))
+            log.error("Job failed", error=str(e), will_retry=retried)
+        finally:
+            heartbeat.cancel()
+
+
+job_queue = JobQueueService()
+job_worker_pool = JobWorkerPool(job_queue)
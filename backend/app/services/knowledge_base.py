@@ -154,11 +154,33 @@ class KnowledgeBaseManager:
         query: str,
         limit: int = 10,
         filter_metadata: Union[Dict[str, Any], Callable[[Dict[str, Any]], bool]] = None,
+        rerank: Optional[bool] = None,
     ) -> List[Dict[str, Any]]:
-        """Search for similar documents without generating answers."""
-        return await get_vectorization_service().search_similar(
-            query=query, k=limit, filter_metadata=filter_metadata
+        """Search for similar documents without generating answers.
+
+        With re-ranking enabled, ``KB_RERANK_CANDIDATES`` chunks are fetched and
+        the best ``limit`` by cross-encoder score are returned.
+        """
+        if rerank is None:
+            rerank = settings.KB_RERANK_ENABLED
+
+        if not rerank:
+            return await get_vectorization_service().search_similar(
+                query=query, k=limit, filter_metadata=filter_metadata
+            )
+
+        candidates = await get_vectorization_service().search_similar(
+            query=query,
+            k=max(limit, settings.KB_RERANK_CANDIDATES),
+            filter_metadata=filter_metadata,
         )
+        try:
+            from app.services.reranker import get_reranker
+
+            return await get_reranker().rerank(query, candidates, top_k=limit)
+        except Exception as e:
+            logger.warning("Re-ranking failed, using vector search order", error=str(e))
+            return candidates[:limit]
 
     async def delete_document(self, document_id: str) -> bool:
         """Delete a document from the knowledge base."""
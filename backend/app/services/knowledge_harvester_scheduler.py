@@ -3,18 +3,26 @@ Knowledge Harvester Scheduler Service
 
 Manages continuous, background knowledge harvesting operations.
 Periodically discovers and indexes new API specifications, standards, and patterns.
+
+Schedule state lives in the ``scheduled_tasks`` table (see
+``app.services.scheduler``), so restarts do not re-run every harvest type and
+only one replica harvests at a time.
 """
 
 import asyncio
+import functools
 import structlog
 from typing import Optional
 from datetime import datetime, timedelta
 import uuid
 
+from app.agents.harvest_engine import HarvestCheckpoint
 from app.agents.knowledge_harvester import KnowledgeHarvester
 from app.agents.base import AgentContext
+from app.core.config import settings
 from app.db.session import async_session_factory
 from app.services.harvest_collaboration_integration import HarvestJobService
+from app.services.scheduler import PersistentScheduler, ScheduledJob
 
 logger = structlog.get_logger(__name__)
 
@@ -30,9 +38,15 @@ class KnowledgeHarvesterScheduler:
     - Track harvest job status and metrics
     """
 
+    # Priority order: when several types are due, the first one runs first
+    HARVEST_ORDER = ["full", "standards", "patterns", "incremental"]
+    # Single-stage types: only run when triggered, unless given a cron
+    MANUAL_TYPES = ["financial", "api_directory", "marketplaces", "github"]
+    HARVEST_TYPES = HARVEST_ORDER + MANUAL_TYPES
+    LOCK_GROUP = "knowledge_harvest"
+
     def __init__(self):
         self.harvester: Optional[KnowledgeHarvester] = None
-        self.is_running = False
 
         # Harvest schedule (configurable)
         self.harvest_interval_hours = 24  # Run every 24 hours
@@ -43,13 +57,47 @@ class KnowledgeHarvesterScheduler:
             "standards": 24 * 7,  # Regulatory standards weekly
         }
 
-        # Track last harvest times
-        self.last_harvest_times = {
-            "full": None,
-            "incremental": None,
-            "patterns": None,
-            "standards": None,
-        }
+        self.scheduler = PersistentScheduler("knowledge_harvester")
+        for harvest_type in self.HARVEST_TYPES:
+            self.scheduler.register(self._build_job(harvest_type))
+
+    def _build_job(self, harvest_type: str) -> ScheduledJob:
+        cron = settings.HARVEST_SCHEDULE_CRON.get(harvest_type)
+        manual = cron is None and harvest_type not in self.HARVEST_ORDER
+        return ScheduledJob(
+            name=f"knowledge_harvest:{harvest_type}",
+            run=functools.partial(self._run_harvest, harvest_type),
+            cron=cron,
+            # Read on every reschedule so edits from the API take effect
+            interval_seconds=(
+                None
+                if cron or manual
+                else lambda: self.harvest_schedule.get(harvest_type, 24) * 3600
+            ),
+            jitter_seconds=settings.HARVEST_SCHEDULE_JITTER_SECONDS,
+            lock_group=self.LOCK_GROUP,
+            run_immediately=True,
+            manual=manual,
+        )
+
+    async def _run_harvest(
+        self,
+        harvest_type: str,
+        source_ids: Optional[list] = None,
+        started: Optional[asyncio.Future] = None,
+    ):
+        """Scheduler entry point: run a harvest and raise if it failed."""
+        try:
+            result = await self._execute_harvest(harvest_type, source_ids, started)
+        finally:
+            if started is not None and not started.done():
+                started.set_exception(RuntimeError("Harvest job could not start"))
+        if result.get("status") != "success":
+            raise RuntimeError(result.get("error") or "Harvest failed")
+
+    @property
+    def is_running(self) -> bool:
+        return self.scheduler.is_running
 
     async def initialize(self):
         """Initialize the scheduler (called at startup)."""
@@ -73,63 +121,22 @@ class KnowledgeHarvesterScheduler:
             logger.warning("Knowledge Harvester Scheduler already running")
             return
 
-        self.is_running = True
-        asyncio.create_task(self._scheduler_loop())
+        self.scheduler.start()
         logger.info("Knowledge Harvester Scheduler started")
 
-    async def _scheduler_loop(self):
-        """Main scheduler loop that runs periodically."""
-        logger.info("Starting Knowledge Harvester scheduler loop")
-
-        while self.is_running:
-            try:
-                # Check if it's time to run harvest
-                should_run, harvest_type = self._check_schedule()
-
-                if should_run:
-                    logger.info("Running scheduled harvest", harvest_type=harvest_type)
-                    await self._execute_harvest(harvest_type)
-                    self.last_harvest_times[harvest_type] = datetime.utcnow()
-
-            except Exception as e:
-                logger.error("Error in scheduler loop", error=str(e))
-
-            # Sleep for 1 hour before checking again
-            await asyncio.sleep(3600)
-
-    def _check_schedule(self) -> tuple[bool, Optional[str]]:
-        """
-        Check if any harvest should run.
-
-        Returns:
-            Tuple of (should_run, harvest_type)
-        """
-        now = datetime.utcnow()
-
-        # Check in priority order: full, standards, patterns, incremental
-        check_order = ["full", "standards", "patterns", "incremental"]
-
-        for harvest_type in check_order:
-            last_run = self.last_harvest_times.get(harvest_type)
-            interval_hours = self.harvest_schedule.get(harvest_type, 24)
-
-            # If never run, run immediately
-            if last_run is None:
-                return True, harvest_type
-
-            # Check if interval has passed
-            time_since_last = now - last_run
-            if time_since_last >= timedelta(hours=interval_hours):
-                return True, harvest_type
-
-        return False, None
-
-    async def _execute_harvest(self, harvest_type: str) -> dict:
+    async def _execute_harvest(
+        self,
+        harvest_type: str,
+        source_ids: Optional[list] = None,
+        started: Optional[asyncio.Future] = None,
+    ) -> dict:
         """
         Execute a harvest job and track in database.
 
         Args:
             harvest_type: Type of harvest to execute (full, incremental, etc.)
+            source_ids: Optional list of specific sources, stored on a new job
+            started: Resolved with the job ID once the job is marked running
 
         Returns:
             Harvest result dictionary
@@ -142,19 +149,51 @@ class KnowledgeHarvesterScheduler:
         job_id = f"harvest-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
 
         try:
-            # Create job in database
+            # Resume an interrupted job of this type, or create a new one
             async with async_session_factory() as db:
-                await HarvestJobService.create_harvest_job(db, job_id, harvest_type)
+                # Runs under the harvest lease, so a job still marked running
+                # belongs to a process that died
+                interrupted = await HarvestJobService.fail_interrupted_harvest_jobs(db)
+                if interrupted:
+                    logger.warning(
+                        "Marked interrupted harvest jobs failed", job_ids=interrupted
+                    )
+                resumable = await HarvestJobService.get_resumable_harvest_job(
+                    db,
+                    harvest_type,
+                    max_age=timedelta(hours=settings.HARVEST_CHECKPOINT_MAX_AGE_HOURS),
+                    stale_after=timedelta(
+                        seconds=settings.HARVEST_CHECKPOINT_STALE_SECONDS
+                    ),
+                )
+                if resumable is not None:
+                    job_id = resumable.id
+                    checkpoint_state = resumable.checkpoint
+                else:
+                    await HarvestJobService.create_harvest_job(
+                        db, job_id, harvest_type, source_ids
+                    )
+                    checkpoint_state = None
                 await HarvestJobService.update_harvest_job_status(
                     db, job_id, "running", progress=0.0
                 )
+            if started is not None:
+                started.set_result(job_id)
 
             logger.info(
-                "Starting harvest job",
+                "Resuming harvest job" if checkpoint_state else "Starting harvest job",
                 job_id=job_id,
                 harvest_type=harvest_type,
             )
 
+            async def save_checkpoint(state: dict):
+                async with async_session_factory() as db_cp:
+                    await HarvestJobService.save_harvest_checkpoint(
+                        db_cp, job_id, state
+                    )
+
+            checkpoint = HarvestCheckpoint(checkpoint_state, save=save_checkpoint)
+
             # Progress callback
             async def on_progress(p: float):
                 logger.info("Reporting harvest progress", job_id=job_id, progress=p)
@@ -166,10 +205,41 @@ class KnowledgeHarvesterScheduler:
             # Execute harvest
             result = await self.harvester.execute(
                 context={},
-                input_data={"harvest_type": harvest_type},
+                input_data={"harvest_type": harvest_type, "checkpoint": checkpoint},
                 on_progress=on_progress,
             )
 
+            if result.get("status") != "success":
+                # Keep the checkpoint so the next run resumes the failed stages
+                failed_stages = result.get("failed_stages", [])
+                error_msg = result.get("error") or "Harvest failed"
+                logger.error(
+                    "Harvest job finished with errors",
+                    job_id=job_id,
+                    harvest_type=harvest_type,
+                    failed_stages=failed_stages,
+                    error=error_msg,
+                )
+                async with async_session_factory() as db:
+                    await HarvestJobService.update_harvest_job_status(
+                        db,
+                        job_id,
+                        "failed",
+                        processed_sources=result.get("total_harvested", 0),
+                        successful_harvests=result.get("total_harvested", 0),
+                        failed_harvests=len(failed_stages),
+                        apis_harvested=result.get("total_harvested", 0),
+                        error_message=error_msg,
+                    )
+                return {
+                    "status": "error",
+                    "job_id": job_id,
+                    "harvest_type": harvest_type,
+                    "error": error_msg,
+                    "failed_stages": failed_stages,
+                    "result": result,
+                }
+
             # Update job in database with results
             async with async_session_factory() as db:
                 await HarvestJobService.update_harvest_job_status(
@@ -182,6 +252,7 @@ class KnowledgeHarvesterScheduler:
                     failed_harvests=0,
                     apis_harvested=result.get("total_harvested", 0),
                 )
+                await HarvestJobService.save_harvest_checkpoint(db, job_id, None)
 
             logger.info(
                 "Harvest job completed",
@@ -198,6 +269,12 @@ class KnowledgeHarvesterScheduler:
                 "result": result,
             }
 
+        except asyncio.CancelledError:
+            # Shutdown or scheduler stop: keep the checkpoint for the next run
+            logger.info("Harvest job cancelled", job_id=job_id)
+            await asyncio.shield(self._mark_cancelled(job_id))
+            raise
+
         except Exception as e:
             error_msg = str(e)
             logger.error(
@@ -226,6 +303,15 @@ class KnowledgeHarvesterScheduler:
                 "error": error_msg,
             }
 
+    async def _mark_cancelled(self, job_id: str):
+        try:
+            async with async_session_factory() as db:
+                await HarvestJobService.update_harvest_job_status(
+                    db, job_id, "cancelled"
+                )
+        except Exception as e:
+            logger.error("Failed to update harvest job status", error=str(e))
+
     async def trigger_manual_harvest(
         self,
         harvest_type: str = "incremental",
@@ -234,47 +320,79 @@ class KnowledgeHarvesterScheduler:
         """
         Manually trigger a harvest job (called via API).
 
+        The harvest runs ahead of its schedule under the same lease as a
+        scheduled run, so it never overlaps another harvest on any replica.
+
         Args:
-            harvest_type: Type of harvest (full, incremental, financial, etc.)
+            harvest_type: Type of harvest, one of ``HARVEST_TYPES``
             source_ids: Optional list of specific sources to harvest from
 
         Returns:
-            Harvest job info
+            Harvest job info, with the ID of the started (or resumed) job
         """
         if not self.harvester:
             logger.error("Harvester not initialized")
             return {"status": "error", "error": "Harvester not initialized"}
 
+        if harvest_type not in self.HARVEST_TYPES:
+            return {
+                "status": "error",
+                "error": f"Unknown harvest type: {harvest_type}",
+            }
+
         logger.info(
             "Manual harvest triggered",
             harvest_type=harvest_type,
             source_ids=source_ids,
         )
 
-        # Execute in background without blocking
-        asyncio.create_task(self._execute_harvest(harvest_type))
+        # Runs in the background once the lease is taken
+        started = asyncio.get_running_loop().create_future()
+        triggered = await self.scheduler.trigger(
+            f"knowledge_harvest:{harvest_type}",
+            run=functools.partial(self._run_harvest, harvest_type, source_ids, started),
+        )
+        if not triggered:
+            return {
+                "status": "already_running",
+                "harvest_type": harvest_type,
+                "message": "A harvest is already running",
+            }
 
         return {
             "status": "queued",
+            "job_id": await started,
             "harvest_type": harvest_type,
             "message": "Harvest job queued for execution",
         }
 
     def stop(self):
         """Stop the scheduler."""
-        self.is_running = False
+        self.scheduler.stop()
         logger.info("Knowledge Harvester Scheduler stopped")
 
+    async def shutdown(self):
+        """Stop the scheduler and wait for it, releasing any held lease."""
+        await self.scheduler.shutdown()
+
     async def get_status(self) -> dict:
         """Get current scheduler status."""
+        try:
+            schedule_state = await self.scheduler.get_state()
+        except Exception as e:
+            logger.warning("Failed to load harvest schedule state", error=str(e))
+            schedule_state = []
+
+        by_type = {state["name"].split(":", 1)[1]: state for state in schedule_state}
         return {
             "is_running": self.is_running,
             "last_harvest_times": {
-                k: v.isoformat() if v else None
-                for k, v in self.last_harvest_times.items()
+                harvest_type: by_type.get(harvest_type, {}).get("last_finished_at")
+                for harvest_type in self.HARVEST_TYPES
             },
             "harvest_schedule": self.harvest_schedule,
             "harvester_initialized": self.harvester is not None,
+            "schedule_state": by_type,
         }
 
 
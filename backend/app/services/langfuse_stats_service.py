@@ -9,6 +9,7 @@ import structlog
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.http_clients import http_clients
 
 logger = structlog.get_logger(__name__)
 
@@ -48,82 +49,82 @@ class LangfuseStatsService:
 
             logger.info("Fetching LangFuse stats", hours=hours, agent_id=agent_id)
 
-            async with httpx.AsyncClient() as client:
-                # Fetch traces with optional metadata filter
-                url = f"{settings.LANGFUSE_HOST}/api/public/traces"
+            client = http_clients.get()
+            # Fetch traces with optional metadata filter
+            url = f"{settings.LANGFUSE_HOST}/api/public/traces"
 
-                headers = {
-                    "Authorization": f"Basic {settings.LANGFUSE_PUBLIC_KEY}",
-                    "Content-Type": "application/json",
-                }
+            headers = {
+                "Authorization": f"Basic {settings.LANGFUSE_PUBLIC_KEY}",
+                "Content-Type": "application/json",
+            }
 
-                response = await client.get(
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=10.0,
-                )
+            response = await client.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=10.0,
+            )
 
-                if response.status_code != 200:
-                    logger.warning(
-                        "LangFuse API error",
-                        status=response.status_code,
-                        error=response.text,
-                    )
-                    return {
-                        "error": f"LangFuse API error: {response.status_code}",
-                        "total_calls": 0,
-                    }
-
-                data = response.json()
-                traces = data.get("data", [])
-
-                # Filter by agent_id if specified
-                if agent_id:
-                    traces = [
-                        t
-                        for t in traces
-                        if t.get("metadata", {}).get("agent_id") == agent_id
-                    ]
-
-                # Aggregate statistics
-                total_calls = len(traces)
-                total_tokens = 0
-                models_used = {}
-                agents_used = {}
-
-                for trace in traces:
-                    # Count tokens
-                    observations = trace.get("observations", [])
-                    for obs in observations:
-                        if obs.get("type") == "llm":
-                            total_tokens += obs.get("usage", {}).get("total_tokens", 0)
-
-                    # Track models and agents
-                    metadata = trace.get("metadata", {})
-                    model = metadata.get("model", "unknown")
-                    agent = metadata.get("agent_id", "unknown")
-
-                    models_used[model] = models_used.get(model, 0) + 1
-                    agents_used[agent] = agents_used.get(agent, 0) + 1
-
-                logger.info(
-                    "LangFuse stats retrieved",
-                    total_calls=total_calls,
-                    total_tokens=total_tokens,
+            if response.status_code != 200:
+                logger.warning(
+                    "LangFuse API error",
+                    status=response.status_code,
+                    error=response.text,
                 )
-
                 return {
-                    "total_calls": total_calls,
-                    "total_tokens": total_tokens,
-                    "avg_tokens_per_call": (
-                        total_tokens // total_calls if total_calls > 0 else 0
-                    ),
-                    "models": models_used,
-                    "agents": agents_used,
-                    "time_range_hours": hours,
+                    "error": f"LangFuse API error: {response.status_code}",
+                    "total_calls": 0,
                 }
 
+            data = response.json()
+            traces = data.get("data", [])
+
+            # Filter by agent_id if specified
+            if agent_id:
+                traces = [
+                    t
+                    for t in traces
+                    if t.get("metadata", {}).get("agent_id") == agent_id
+                ]
+
+            # Aggregate statistics
+            total_calls = len(traces)
+            total_tokens = 0
+            models_used = {}
+            agents_used = {}
+
+            for trace in traces:
+                # Count tokens
+                observations = trace.get("observations", [])
+                for obs in observations:
+                    if obs.get("type") == "llm":
+                        total_tokens += obs.get("usage", {}).get("total_tokens", 0)
+
+                # Track models and agents
+                metadata = trace.get("metadata", {})
+                model = metadata.get("model", "unknown")
+                agent = metadata.get("agent_id", "unknown")
+
+                models_used[model] = models_used.get(model, 0) + 1
+                agents_used[agent] = agents_used.get(agent, 0) + 1
+
+            logger.info(
+                "LangFuse stats retrieved",
+                total_calls=total_calls,
+                total_tokens=total_tokens,
+            )
+
+            return {
+                "total_calls": total_calls,
+                "total_tokens": total_tokens,
+                "avg_tokens_per_call": (
+                    total_tokens // total_calls if total_calls > 0 else 0
+                ),
+                "models": models_used,
+                "agents": agents_used,
+                "time_range_hours": hours,
+            }
+
         except httpx.ConnectError:
             logger.error("Failed to connect to LangFuse", host=settings.LANGFUSE_HOST)
             return {
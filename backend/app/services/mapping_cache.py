@@ -0,0 +1,186 @@
+"""
+Mapping Cache
+
+Field transformations generated by the semantic layer, keyed by a
+fingerprint of what they were generated from: both flattened schemas, the
+normalized user intent and the mapping version (prompt version and
+pre-matcher settings, see ``mapping_version`` in
+``app/services/semantic/layer.py``). Creating another integration between
+the same endpoints with the same intent then reuses the mapping instead of
+running the LLM pipeline again.
+
+A changed schema changes the fingerprint, so stale entries are never hit;
+when the drift detector reports changes to an API, its entries are also
+deleted (:meth:`MappingCache.invalidate_api`) so they stop taking space.
+
+Entries live in the ``mapping_cache_entries`` table and in a small
+in-process LRU in front of it; the module-level :data:`mapping_cache` is
+shared by every mapper in the process.
+"""
+
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.mapping_cache import MappingCacheEntry
+from app.schemas.integration import DataTransformation
+
+logger = structlog.get_logger(__name__)
+
+
+def normalize_intent(user_intent: str) -> str:
+    """Case, whitespace and trailing punctuation do not change a mapping."""
+    return re.sub(r"\s+", " ", user_intent or "").strip().rstrip(".!").lower()
+
+
+def mapping_fingerprint(
+    source_fields: List[Dict[str, Any]],
+    dest_fields: List[Dict[str, Any]],
+    user_intent: str,
+    mapping_version: str,
+) -> str:
+    """sha256 of the canonical JSON of the mapping inputs."""
+    material = {
+        "source": sorted(source_fields, key=lambda field: field["name"]),
+        "dest": sorted(dest_fields, key=lambda field: field["name"]),
+        "intent": normalize_intent(user_intent),
+        "version": mapping_version,
+    }
+    payload = json.dumps(material, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MappingCache:
+    """Transformations by fingerprint, in memory and in the database."""
+
+    def __init__(self, max_memory_entries: Optional[int] = None):
+        self.max_memory_entries = (
+            max_memory_entries or settings.MAPPING_CACHE_MEMORY_ENTRIES
+        )
+        # fingerprint -> (source_api, dest_api, transformations as JSON)
+        self._memory: "OrderedDict[str, Tuple[str, str, List[dict]]]" = OrderedDict()
+
+    def _remember(
+        self, fingerprint: str, source_api: str, dest_api: str, data: List[dict]
+    ) -> None:
+        self._memory[fingerprint] = (source_api, dest_api, data)
+        self._memory.move_to_end(fingerprint)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _load(data: List[dict]) -> List[DataTransformation]:
+        return [DataTransformation.model_validate(item) for item in data]
+
+    async def get(self, fingerprint: str) -> Optional[List[DataTransformation]]:
+        cached = self._memory.get(fingerprint)
+        if cached is not None:
+            self._memory.move_to_end(fingerprint)
+            return self._load(cached[2])
+
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(MappingCacheEntry).where(
+                        MappingCacheEntry.fingerprint == fingerprint
+                    )
+                )
+                entry = result.scalar_one_or_none()
+                if entry is None:
+                    return None
+                await db.execute(
+                    update(MappingCacheEntry)
+                    .where(MappingCacheEntry.id == entry.id)
+                    .values(
+                        hit_count=MappingCacheEntry.hit_count + 1,
+                        last_used_at=datetime.now(timezone.utc),
+                    )
+                )
+                await db.commit()
+                source_api, dest_api = entry.source_api, entry.dest_api
+                data = entry.transformations
+        except Exception as e:
+            logger.warning("Mapping cache lookup failed", error=str(e))
+            return None
+
+        self._remember(fingerprint, source_api, dest_api, data)
+        return self._load(data)
+
+    async def put(
+        self,
+        fingerprint: str,
+        transformations: List[DataTransformation],
+        source_api: str,
+        dest_api: str,
+        mapping_version: str,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        data = [t.model_dump(mode="json") for t in transformations]
+        source_api, dest_api = (source_api or "")[:200], (dest_api or "")[:200]
+        self._remember(fingerprint, source_api, dest_api, data)
+
+        values = {
+            "fingerprint": fingerprint,
+            "source_api": source_api,
+            "dest_api": dest_api,
+            "mapping_version": mapping_version[:64],
+            "transformations": data,
+            "created_at": now,
+            "last_used_at": now,
+        }
+        try:
+            async with async_session_factory() as db:
+                stmt = insert(MappingCacheEntry).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["fingerprint"],
+                    set_={k: v for k, v in values.items() if k != "fingerprint"},
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            logger.warning("Failed to store mapping in cache", error=str(e))
+
+    async def invalidate_api(self, api_name: Optional[str]) -> None:
+        """Drop every mapping from or to ``api_name``."""
+        if not api_name:
+            return
+        api_name = api_name[:200]
+        for fingerprint, (source_api, dest_api, _) in list(self._memory.items()):
+            if api_name in (source_api, dest_api):
+                del self._memory[fingerprint]
+
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    delete(MappingCacheEntry).where(
+                        or_(
+                            MappingCacheEntry.source_api == api_name,
+                            MappingCacheEntry.dest_api == api_name,
+                        )
+                    )
+                )
+                await db.commit()
+            logger.info(
+                "Mapping cache invalidated",
+                api_name=api_name,
+                entries=result.rowcount,
+            )
+        except Exception as e:
+            logger.warning(
+                "Failed to invalidate mapping cache", api_name=api_name, error=str(e)
+            )
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+
+mapping_cache = MappingCache()
@@ -0,0 +1,137 @@
+"""
+Columnar metadata side index for FAISS pre-filtering.
+
+LangChain's FAISS wrapper applies metadata filters in Python *after* the
+nearest-neighbour search, over-fetching ``fetch_k`` candidates and dropping
+the ones that don't match. Selective filters therefore return fewer than
+``k`` results. This index keeps the commonly filtered metadata fields as
+integer-coded columns aligned with FAISS positions, turns a filter into an
+ID bitmap and hands it to FAISS as an ``IDSelector`` so that only matching
+vectors are scanned.
+"""
+
+from typing import Any, Dict, Hashable, List
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Metadata fields kept as columns; filters on any other key fall back to the
+# post-filtering path.
+INDEXED_FIELDS = ("doc_type", "product_id", "deployment_type", "document_id")
+
+# Absent or None values; a None filter value matches them, as in LangChain
+MISSING_CODE = -1
+# Unhashable values (lists, dicts) never equal a filter value
+UNHASHABLE_CODE = -2
+
+
+class MetadataFilterIndex:
+    """Integer-coded metadata columns aligned with FAISS vector positions."""
+
+    def __init__(self, fields: tuple = INDEXED_FIELDS):
+        self.fields = fields
+        self._vocab: Dict[str, Dict[Hashable, int]] = {f: {} for f in fields}
+        self._columns: Dict[str, np.ndarray] = {
+            f: np.empty(0, dtype=np.int32) for f in fields
+        }
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _encode(self, field: str, value: Any) -> int:
+        if value is None:
+            return MISSING_CODE
+        if not isinstance(value, Hashable):
+            return UNHASHABLE_CODE
+        vocab = self._vocab[field]
+        code = vocab.get(value)
+        if code is None:
+            code = len(vocab)
+            vocab[value] = code
+        return code
+
+    def append(self, metadatas: List[Dict[str, Any]]) -> None:
+        """Append metadata for vectors added at the end of the FAISS index."""
+        if not metadatas:
+            return
+        for field in self.fields:
+            codes = np.fromiter(
+                (self._encode(field, (m or {}).get(field)) for m in metadatas),
+                dtype=np.int32,
+                count=len(metadatas),
+            )
+            self._columns[field] = np.concatenate([self._columns[field], codes])
+        self._size += len(metadatas)
+
+    def rebuild(self, vector_store) -> None:
+        """Rebuild all columns from a LangChain FAISS store's docstore."""
+        self._vocab = {f: {} for f in self.fields}
+        self._columns = {f: np.empty(0, dtype=np.int32) for f in self.fields}
+        self._size = 0
+
+        metadatas = []
+        for position in range(vector_store.index.ntotal):
+            doc_id = vector_store.index_to_docstore_id.get(position)
+            doc = vector_store.docstore.search(doc_id) if doc_id else None
+            metadatas.append(getattr(doc, "metadata", None) or {})
+        self.append(metadatas)
+
+        logger.info("Rebuilt metadata filter index", vectors=self._size)
+
+    def supports(self, filter_metadata: Any) -> bool:
+        """Whether a filter can be answered from the columns alone."""
+        if not isinstance(filter_metadata, dict) or not filter_metadata:
+            return False
+        for key, value in filter_metadata.items():
+            if key not in self._columns:
+                return False
+            # Operator dicts ($eq, $gt, ...) are left to LangChain
+            if isinstance(value, dict):
+                return False
+        return True
+
+    def matching_ids(self, filter_metadata: Dict[str, Any]) -> np.ndarray:
+        """
+        Return FAISS positions whose metadata matches every filter key.
+        ``None`` matches vectors without the key, like LangChain's filter.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for field, expected in filter_metadata.items():
+            values = expected if isinstance(expected, list) else [expected]
+            vocab = self._vocab[field]
+            codes = [vocab[v] for v in values if isinstance(v, Hashable) and v in vocab]
+            if any(v is None for v in values):
+                codes.append(MISSING_CODE)
+            if not codes:
+                return np.empty(0, dtype=np.int64)
+            mask &= np.isin(self._columns[field], codes)
+        return np.flatnonzero(mask).astype(np.int64)
+
+
+def search_with_selector(
+    index, query_vector: np.ndarray, k: int, ids: np.ndarray
+) -> List[tuple]:
+    """
+    Run a FAISS search restricted to ``ids``.
+
+    Returns ``(position, distance)`` pairs in rank order; positions FAISS
+    couldn't fill (fewer matches than ``k``) are dropped.
+    """
+    import faiss
+
+    if ids.size == 0:
+        return []
+
+    selector = faiss.IDSelectorBatch(ids)
+    params = faiss.SearchParameters(sel=selector)
+    distances, positions = index.search(
+        query_vector, min(k, int(ids.size)), params=params
+    )
+    return [
+        (int(pos), float(dist))
+        for pos, dist in zip(positions[0], distances[0])
+        if pos != -1
+    ]
@@ -1,10 +1,39 @@
+from typing import Any, Dict, Optional
+
+from app.db.session import async_session_factory
 from app.services.base import CRUDBase
 from app.models.queue_request import QueueRequest
 from app.schemas.queue_request import QueueRequestCreate, QueueRequestUpdate
 
 
 class QueueService(CRUDBase[QueueRequest, QueueRequestCreate, QueueRequestUpdate]):
-    pass
+    async def get_status(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get status and progress of a queued job."""
+        async with async_session_factory() as db:
+            job = await self.get(db, request_id)
+            if not job:
+                return None
+
+            return {
+                "id": job.id,
+                "job_type": job.job_type,
+                "workflow_id": job.workflow_id,
+                "status": (
+                    job.status.value if hasattr(job.status, "value") else job.status
+                ),
+                "progress_stage": job.progress_stage,
+                "progress_percentage": job.progress_percentage or 0,
+                "priority": job.priority,
+                "attempts": job.attempts,
+                "max_attempts": job.max_attempts,
+                "error": job.error,
+                "result": job.result,
+                "created_at": job.created_at.isoformat() if job.created_at else None,
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "completed_at": (
+                    job.completed_at.isoformat() if job.completed_at else None
+                ),
+            }
 
 
 queue_service = QueueService(QueueRequest)
@@ -1,12 +1,10 @@
 import structlog
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import async_session_factory
-from app.models.queue_request import QueueRequest, QueueStatus
-
-# from app.agents.vitesse_orchestrator import VitesseOrchestrator
-from app.services.queue_service import queue_service
+from app.models.document import Document, ExtractionStatus
+from app.models.queue_request import QueueRequest, QueueStatus, QueuePriority
+from app.services.job_queue import job_queue
 
 logger = structlog.get_logger(__name__)
 
@@ -15,57 +13,20 @@ class RecoveryService:
     """Service to recover interrupted tasks on startup."""
 
     async def recover_interrupted_tasks(self):
-        """Find in-progress tasks and resume them."""
+        """Requeue jobs abandoned by crashed workers and re-ingest orphaned documents."""
         logger.info("Starting recovery of interrupted tasks")
 
         try:
-            async with async_session_factory() as db:
-                # Find tasks that are marked 'in_progress'
-                stmt = select(QueueRequest).where(
-                    QueueRequest.status == QueueStatus.IN_PROGRESS
-                )
-                result = await db.execute(stmt)
-                interrupted_tasks = result.scalars().all()
-
-                if not interrupted_tasks:
-                    logger.info("No interrupted tasks found")
-                    return
-
+            requeued = await job_queue.requeue_stale()
+            if requeued:
                 logger.info(
-                    f"Found {len(interrupted_tasks)} interrupted tasks to recover"
+                    f"Requeued {len(requeued)} interrupted jobs",
+                    job_ids=[job.id for job in requeued],
                 )
+            else:
+                logger.info("No interrupted tasks found")
 
-                for task in interrupted_tasks:
-                    try:
-                        logger.info(
-                            "Resuming interrupted task",
-                            task_id=task.id,
-                            deal_id=task.deal_id,
-                            stage=task.progress_stage,
-                        )
-
-                        # Trigger the background processing task
-                        # We import here to avoid circular dependencies
-                        from app.api.endpoints.queue import process_queue_request_task
-
-                        # Run it in an asyncio task so it doesn't block recovery of others
-                        import asyncio
-
-                        asyncio.create_task(process_queue_request_task(task.id))
-
-                        logger.info("Task recovery triggered", task_id=task.id)
-
-                    except Exception as e:
-                        logger.error(
-                            "Failed to trigger task recovery",
-                            task_id=task.id,
-                            error=str(e),
-                        )
-                        # Mark as failed so we don't loop forever
-                        await queue_service.update(
-                            db, db_obj=task, obj_in={"status": QueueStatus.FAILED}
-                        )
-                        await db.commit()
+            await self.recover_orphaned_documents()
         except Exception as e:
             # Check if this is a missing table error
             if "does not exist" in str(e) or "UndefinedTable" in str(e):
@@ -76,5 +37,61 @@ class RecoveryService:
             else:
                 logger.error("Error during task recovery", error=str(e))
 
+    async def recover_orphaned_documents(self) -> int:
+        """
+        Re-enqueue documents stuck in PROCESSING without a live job.
+
+        These are left behind when the API process died while running an
+        in-process ingestion (e.g. uploads made before the durable queue).
+        Any pending or running job on the document's workflow counts as
+        live, e.g. a re-vectorization, which deletes the old vectors itself.
+        """
+        from app.tasks.document_jobs import INGEST_DOCUMENT_JOB
+
+        async with async_session_factory() as db:
+            active_stmt = select(QueueRequest.workflow_id).where(
+                QueueRequest.workflow_id.like("document:%"),
+                QueueRequest.status.in_([QueueStatus.PENDING, QueueStatus.IN_PROGRESS]),
+            )
+            active_keys = set((await db.execute(active_stmt)).scalars().all())
+
+            stuck_stmt = select(Document).where(
+                Document.extraction_status == ExtractionStatus.PROCESSING
+            )
+            stuck_docs = (await db.execute(stuck_stmt)).scalars().all()
+
+            recovered = 0
+            for doc in stuck_docs:
+                workflow_id = f"document:{doc.id}"
+                if workflow_id in active_keys:
+                    continue
+
+                doc.extraction_status = ExtractionStatus.PENDING
+                await job_queue.enqueue(
+                    db,
+                    INGEST_DOCUMENT_JOB,
+                    payload={
+                        "document_id": doc.id,
+                        "file_path": doc.location,
+                        "file_type": doc.type,
+                        "metadata": {
+                            "original_filename": doc.name,
+                            "doc_type": doc.doc_type,
+                            "category": doc.category,
+                            "db_id": doc.id,
+                            "product_id": doc.product_id,
+                            "deployment_type": doc.deployment_type,
+                        },
+                    },
+                    priority=QueuePriority.LOW,
+                    requestor_id=doc.user_id,
+                    workflow_id=workflow_id,
+                )
+                recovered += 1
+
+        if recovered:
+            logger.info("Re-enqueued orphaned documents", count=recovered)
+        return recovered
+
 
 recovery_service = RecoveryService()
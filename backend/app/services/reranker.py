@@ -0,0 +1,119 @@
+"""
+Cross-encoder re-ranking for knowledge-base retrieval.
+
+The bi-encoder FAISS search is fast but coarse. When enabled, the knowledge
+base over-fetches candidates and this service scores each (query, chunk)
+pair with a small local cross-encoder, keeping only the best few chunks.
+Scores are cached per (query hash, chunk ID) so repeated or follow-up
+questions over the same chunks don't hit the model again.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class CrossEncoderReranker:
+    """Scores query/chunk pairs with a cross-encoder and keeps the top-k."""
+
+    def __init__(
+        self,
+        model_name: str = None,
+        batch_size: int = None,
+        cache_size: int = None,
+    ):
+        self.model_name = model_name or settings.KB_RERANK_MODEL
+        self.batch_size = batch_size or settings.KB_RERANK_BATCH_SIZE
+        self.cache_size = cache_size or settings.KB_RERANK_CACHE_SIZE
+        self._model = None
+        self._model_lock = asyncio.Lock()
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+
+    async def _get_model(self):
+        """Load the cross-encoder on first use (off the event loop)."""
+        if self._model is None:
+            async with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+
+                    logger.info("Loading cross-encoder", model=self.model_name)
+                    self._model = await asyncio.to_thread(
+                        CrossEncoder, self.model_name, cache_folder="/models"
+                    )
+        return self._model
+
+    @staticmethod
+    def _query_key(query: str) -> str:
+        return hashlib.sha256(query.strip().encode()).hexdigest()
+
+    @staticmethod
+    def _chunk_key(candidate: Dict[str, Any]) -> str:
+        # Chunk IDs are reused when a document is re-vectorized, so the content
+        # digest is part of the key to avoid serving scores for stale text
+        metadata = candidate.get("metadata") or {}
+        digest = hashlib.sha256(candidate.get("content", "").encode()).hexdigest()
+        return f"{metadata.get('chunk_id', '')}:{digest[:16]}"
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[float]:
+        score = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        return score
+
+    def _cache_set(self, key: Tuple[str, str], score: float) -> None:
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.cache_size:
+            self._scores.popitem(last=False)
+
+    async def rerank(
+        self, query: str, candidates: List[Dict[str, Any]], top_k: int
+    ) -> List[Dict[str, Any]]:
+        """Return the ``top_k`` candidates ordered by cross-encoder relevance."""
+        if not candidates:
+            return []
+
+        query_key = self._query_key(query)
+        keys = [(query_key, self._chunk_key(c)) for c in candidates]
+        scores: List[Optional[float]] = [self._cache_get(k) for k in keys]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            model = await self._get_model()
+            pairs = [(query, candidates[i].get("content", "")) for i in missing]
+            predicted = await asyncio.to_thread(
+                model.predict, pairs, batch_size=self.batch_size
+            )
+            for i, score in zip(missing, predicted):
+                scores[i] = float(score)
+                self._cache_set(keys[i], scores[i])
+
+        logger.debug(
+            "Re-ranked candidates",
+            candidates=len(candidates),
+            scored=len(missing),
+            cached=len(candidates) - len(missing),
+        )
+
+        ranked = sorted(zip(candidates, scores), key=lambda item: item[1], reverse=True)
+        return [
+            {**candidate, "rerank_score": score} for candidate, score in ranked[:top_k]
+        ]
+
+
+_reranker = None
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """Get or create the global re-ranker instance."""
+    global _reranker
+    if _reranker is None:
+        _reranker = CrossEncoderReranker()
+    return _reranker
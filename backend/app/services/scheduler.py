@@ -0,0 +1,422 @@
+"""
+Persistent Task Scheduler
+
+Runs recurring background tasks from schedule state stored in the
+``scheduled_tasks`` table, so a restart resumes the schedule instead of
+re-triggering every task, and several API replicas can run the same
+scheduler without duplicating work.
+
+A due task is claimed by taking a lease on its row. Claims within a lock
+group are serialised with a transaction-level Postgres advisory lock, and a
+task is only claimed while no other task in its group holds a live lease,
+so e.g. two harvest types never run at the same time anywhere. The lease is
+renewed while the task runs; if the replica dies it simply expires and
+another replica picks the task up.
+
+    scheduler = PersistentScheduler("drift_monitor")
+    scheduler.register(ScheduledJob("drift_check", run_drift_check, cron="0 * * * *"))
+    scheduler.start()
+"""
+
+import asyncio
+import os
+import random
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+
+import structlog
+from apscheduler.triggers.cron import CronTrigger
+from sqlalchemy import func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.scheduled_task import ScheduledTask
+
+logger = structlog.get_logger(__name__)
+
+
+class ScheduledJob:
+    """
+    A recurring task: a cron expression or an interval, plus jitter.
+
+    A ``manual`` job has no schedule: it only runs through
+    ``PersistentScheduler.trigger`` but still takes its lock group's lease.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[], Awaitable[Any]],
+        cron: Optional[str] = None,
+        interval_seconds: Union[float, Callable[[], float], None] = None,
+        jitter_seconds: float = 0.0,
+        lock_group: Optional[str] = None,
+        run_immediately: bool = False,
+        manual: bool = False,
+    ):
+        if manual:
+            if cron is not None or interval_seconds is not None:
+                raise ValueError("A manual job has no cron or interval_seconds")
+        elif (cron is None) == (interval_seconds is None):
+            raise ValueError("Specify exactly one of cron or interval_seconds")
+        self.name = name
+        self.run = run
+        self.cron = cron
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.lock_group = lock_group or name
+        # Only applies the first time the task is persisted
+        self.run_immediately = run_immediately
+        self.manual = manual
+        self._trigger = CronTrigger.from_crontab(cron, timezone="UTC") if cron else None
+
+    def _interval(self) -> float:
+        value = self.interval_seconds
+        return float(value() if callable(value) else value)
+
+    @property
+    def schedule(self) -> str:
+        if self.manual:
+            return "manual"
+        if self.cron:
+            return f"cron:{self.cron}"
+        return f"every:{self._interval():g}s"
+
+    def next_run_after(self, moment: datetime) -> datetime:
+        """Next fire time strictly after ``moment``, plus random jitter."""
+        if self.manual:
+            return moment  # never polled, see run_due
+        if self._trigger is not None:
+            next_run = self._trigger.get_next_fire_time(None, moment)
+            if next_run is not None and next_run <= moment:
+                next_run = self._trigger.get_next_fire_time(
+                    None, moment + timedelta(seconds=1)
+                )
+        else:
+            next_run = moment + timedelta(seconds=self._interval())
+        if self.jitter_seconds:
+            next_run += timedelta(seconds=random.uniform(0, self.jitter_seconds))
+        return next_run
+
+
+class PersistentScheduler:
+    """Claims and runs due jobs one at a time, using DB-backed leases."""
+
+    def __init__(
+        self,
+        name: str,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+    ):
+        self.name = name
+        self.poll_interval = poll_interval or settings.SCHEDULER_POLL_INTERVAL
+        self.lease_seconds = lease_seconds or settings.SCHEDULER_LEASE_SECONDS
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.jobs: Dict[str, ScheduledJob] = {}  # registration order = priority
+        self._task: Optional[asyncio.Task] = None
+        self._triggered: Set[asyncio.Task] = set()
+        self._synced_schedules: Dict[str, str] = {}
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def register(self, job: ScheduledJob) -> None:
+        self.jobs[job.name] = job
+
+    def start(self) -> None:
+        if self.is_running:
+            logger.warning("Scheduler already running", scheduler=self.name)
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info("Scheduler started", scheduler=self.name, owner=self.owner)
+
+    def stop(self) -> None:
+        """Stop polling; a task that is running is interrupted and its lease released."""
+        if self._task is not None:
+            self._task.cancel()
+        logger.info("Scheduler stopped", scheduler=self.name)
+
+    async def shutdown(self) -> None:
+        tasks = list(self._triggered)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                # Interval callables may change at runtime (e.g. edited in the UI)
+                if self._current_schedules() != self._synced_schedules:
+                    await self.sync()
+                await self.run_due()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if "does not exist" in str(e) or "UndefinedTable" in str(e):
+                    logger.warning("Scheduler table not ready", error=str(e))
+                else:
+                    logger.error(
+                        "Scheduler iteration failed", scheduler=self.name, error=str(e)
+                    )
+            await asyncio.sleep(self.poll_interval * random.uniform(0.9, 1.1))
+
+    def _current_schedules(self) -> Dict[str, str]:
+        return {name: job.schedule for name, job in self.jobs.items()}
+
+    async def sync(self) -> None:
+        """Create rows for new jobs and reschedule jobs whose schedule changed."""
+        now = datetime.now(timezone.utc)
+        schedules = self._current_schedules()
+        async with async_session_factory() as db:
+            for job in self.jobs.values():
+                stmt = insert(ScheduledTask).values(
+                    name=job.name,
+                    lock_group=job.lock_group,
+                    schedule=job.schedule,
+                    next_run_at=now if job.run_immediately else job.next_run_after(now),
+                    run_count=0,
+                    failure_count=0,
+                )
+                await db.execute(stmt.on_conflict_do_nothing(index_elements=["name"]))
+                changed = await db.execute(
+                    select(ScheduledTask.last_finished_at).where(
+                        ScheduledTask.name == job.name,
+                        ScheduledTask.schedule != job.schedule,
+                    )
+                )
+                row = changed.first()
+                if row is None:
+                    continue
+                # Measure the new schedule from the last run, not from now
+                next_run = job.next_run_after(row.last_finished_at or now)
+                await db.execute(
+                    update(ScheduledTask)
+                    .where(ScheduledTask.name == job.name)
+                    .values(
+                        schedule=job.schedule,
+                        lock_group=job.lock_group,
+                        next_run_at=next_run,
+                    )
+                )
+            await db.commit()
+        self._synced_schedules = schedules
+
+    async def run_due(self) -> int:
+        """Run every job that is due and claimable; returns how many ran."""
+        ran = 0
+        for job in list(self.jobs.values()):
+            if job.manual:
+                continue
+            if await self.claim(job):
+                await self._run(job)
+                ran += 1
+        return ran
+
+    async def trigger(
+        self, name: str, run: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> bool:
+        """
+        Run a registered job now, ahead of its schedule, in the background.
+
+        The job takes its lease like a scheduled run, so it still never
+        overlaps another job of its lock group; returns False when the group
+        is busy. ``run`` replaces the job's callable for this run only, e.g.
+        to pass arguments.
+        """
+        job = self.jobs[name]
+        await self.sync()
+        if not await self.claim(job, force=True):
+            return False
+        task = asyncio.create_task(self._run(job, run))
+        self._triggered.add(task)
+        task.add_done_callback(self._triggered.discard)
+        return True
+
+    async def claim(self, job: ScheduledJob, force: bool = False) -> bool:
+        """Take the lease on ``job`` if due (or ``force``) and its group is free."""
+        now = datetime.now(timezone.utc)
+        async with async_session_factory() as db:
+            # Serialises claims within the group until this transaction ends
+            await db.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:group))"),
+                {"group": f"scheduler:{job.lock_group}"},
+            )
+            busy = await db.execute(
+                select(func.count())
+                .select_from(ScheduledTask)
+                .where(
+                    ScheduledTask.lock_group == job.lock_group,
+                    ScheduledTask.lease_expires_at > now,
+                )
+            )
+            if busy.scalar_one():
+                await db.rollback()
+                return False
+
+            conditions = [
+                ScheduledTask.name == job.name,
+                or_(
+                    ScheduledTask.lease_expires_at.is_(None),
+                    ScheduledTask.lease_expires_at <= now,
+                ),
+            ]
+            if not force:
+                conditions.append(ScheduledTask.next_run_at <= now)
+            result = await db.execute(
+                update(ScheduledTask)
+                .where(*conditions)
+                .values(
+                    lease_owner=self.owner,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    last_started_at=now,
+                )
+                .returning(ScheduledTask.id)
+            )
+            claimed = result.first() is not None
+            await db.commit()
+        return claimed
+
+    async def _renew_lease(self, job: ScheduledJob) -> None:
+        interval = max(5, self.lease_seconds // 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with async_session_factory() as db:
+                    result = await db.execute(
+                        update(ScheduledTask)
+                        .where(
+                            ScheduledTask.name == job.name,
+                            ScheduledTask.lease_owner == self.owner,
+                        )
+                        .values(
+                            lease_expires_at=datetime.now(timezone.utc)
+                            + timedelta(seconds=self.lease_seconds)
+                        )
+                        .returning(ScheduledTask.id)
+                    )
+                    renewed = result.first() is not None
+                    await db.commit()
+                if not renewed:
+                    logger.warning("Scheduler lease lost", task=job.name)
+            except Exception as e:
+                logger.warning("Failed to renew lease", task=job.name, error=str(e))
+
+    async def _run(
+        self, job: ScheduledJob, run: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> None:
+        log = logger.bind(scheduler=self.name, task=job.name)
+        log.info("Scheduled task started")
+        started = time.monotonic()
+        renewer = asyncio.create_task(self._renew_lease(job))
+        error: Optional[str] = None
+        try:
+            await (run or job.run)()
+        except asyncio.CancelledError:
+            log.info("Scheduled task interrupted, releasing lease")
+            await asyncio.shield(self._release(job))
+            raise
+        except Exception as e:
+            error = str(e)
+            log.error("Scheduled task failed", error=error)
+        finally:
+            renewer.cancel()
+
+        duration = time.monotonic() - started
+        await self._finish(job, duration, error)
+        log.info(
+            "Scheduled task finished",
+            status="failed" if error else "success",
+            duration_seconds=round(duration, 2),
+        )
+
+    async def _finish(
+        self, job: ScheduledJob, duration: float, error: Optional[str]
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        runs = ScheduledTask.run_count + 1
+        async with async_session_factory() as db:
+            await db.execute(
+                update(ScheduledTask)
+                .where(
+                    ScheduledTask.name == job.name,
+                    ScheduledTask.lease_owner == self.owner,
+                )
+                .values(
+                    next_run_at=job.next_run_after(now),
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    last_finished_at=now,
+                    last_status="failed" if error else "success",
+                    last_error=error[:2000] if error else None,
+                    last_duration_seconds=duration,
+                    # Running mean over all runs
+                    avg_duration_seconds=func.coalesce(
+                        ScheduledTask.avg_duration_seconds, 0.0
+                    )
+                    + (
+                        duration
+                        - func.coalesce(ScheduledTask.avg_duration_seconds, 0.0)
+                    )
+                    / runs,
+                    run_count=runs,
+                    failure_count=ScheduledTask.failure_count + (1 if error else 0),
+                )
+            )
+            await db.commit()
+
+    async def _release(self, job: ScheduledJob) -> None:
+        """Give the lease back without consuming the run (it stays due)."""
+        try:
+            async with async_session_factory() as db:
+                await db.execute(
+                    update(ScheduledTask)
+                    .where(
+                        ScheduledTask.name == job.name,
+                        ScheduledTask.lease_owner == self.owner,
+                    )
+                    .values(lease_owner=None, lease_expires_at=None)
+                )
+                await db.commit()
+        except Exception as e:
+            logger.warning("Failed to release lease", task=job.name, error=str(e))
+
+    async def get_state(self) -> List[Dict[str, Any]]:
+        """Persisted schedule state of this scheduler's jobs."""
+        async with async_session_factory() as db:
+            result = await db.execute(
+                select(ScheduledTask).where(
+                    ScheduledTask.name.in_(list(self.jobs.keys()))
+                )
+            )
+            rows = {row.name: row for row in result.scalars().all()}
+
+        def _iso(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                "name": name,
+                "schedule": row.schedule,
+                "next_run_at": _iso(row.next_run_at),
+                "running": bool(row.lease_expires_at and row.lease_expires_at > now),
+                "lease_owner": row.lease_owner,
+                "last_started_at": _iso(row.last_started_at),
+                "last_finished_at": _iso(row.last_finished_at),
+                "last_status": row.last_status,
+                "last_error": row.last_error,
+                "last_duration_seconds": row.last_duration_seconds,
+                "avg_duration_seconds": row.avg_duration_seconds,
+                "run_count": row.run_count,
+                "failure_count": row.failure_count,
+            }
+            for name, row in rows.items()
+        ]
@@ -1,22 +1,93 @@
+import asyncio
 import logging
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import Integer, cast, column, desc, select, true, values
+from sqlalchemy.orm import aliased
 from pgvector.sqlalchemy import Vector
 from pydantic import BaseModel, Field
 
-from app.models.mapping_feedback import MappingFeedback
+from app.models.mapping_feedback import EMBEDDING_DIMENSIONS, MappingFeedback
 from app.schemas.integration import DataTransformation
 from app.core.config import settings
+from app.db.session import async_session_factory
 from app.services.llm_provider import LLMProviderService
+from app.services.semantic.prematch import PreMatcher
 
 # Use local HuggingFace embeddings (free, no API key needed)
 from langchain_huggingface import HuggingFaceEmbeddings
 
 logger = logging.getLogger(__name__)
 
+MAPPING_PROMPT_VERSION = "2026.02.1"
+
+
+class SemanticMappingProposal(BaseModel):
+    """Structured output from LLM for a single field mapping."""
+
+    source_field: str = Field(
+        ..., description="The name of the best matching source field"
+    )
+    transform_type: str = Field(
+        ...,
+        description="Type of transformation (direct, parse, stringify, etc.)",
+    )
+    confidence: int = Field(..., description="Confidence score between 0 and 100")
+    reasoning: str = Field(
+        ..., description="Explanation for why this mapping was chosen"
+    )
+
+
+class FieldMappingProposal(SemanticMappingProposal):
+    """One mapping of a batch, naming the destination field it is for."""
+
+    dest_field: str = Field(..., description="The destination field being mapped")
+
+
+class SemanticMappingBatch(BaseModel):
+    """Structured output from LLM for a group of destination fields."""
+
+    mappings: List[FieldMappingProposal] = Field(
+        default_factory=list,
+        description="One mapping per destination field in the group",
+    )
+
+
+def flatten_schema(schema: Dict[str, Any], prefix: str = "") -> List[Dict[str, Any]]:
+    """Flatten a nested JSON schema into a list of fields."""
+    fields = []
+    properties = schema.get("properties", {})
+
+    for key, value in properties.items():
+        field_name = f"{prefix}.{key}" if prefix else key
+
+        if value.get("type") == "object" and "properties" in value:
+            fields.extend(flatten_schema(value, prefix=field_name))
+        else:
+            fields.append(
+                {
+                    "name": field_name,
+                    "type": value.get("type", "string"),
+                    "description": value.get("description", ""),
+                }
+            )
+    return fields
+
+
+def mapping_version() -> str:
+    """
+    Identifies how mappings are produced; part of the mapping cache key.
+    Bump MAPPING_PROMPT_VERSION when the prompts or proposal schemas change.
+    """
+    prematch = (
+        f"prematch={settings.SEMANTIC_PREMATCH_THRESHOLD}"
+        if settings.SEMANTIC_PREMATCH_ENABLED
+        else "prematch=off"
+    )
+    return f"{MAPPING_PROMPT_VERSION}/{prematch}"
+
 
 class SemanticLayer:
     """
@@ -32,7 +103,22 @@ class SemanticLayer:
 
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate vector embedding for a text string."""
-        return await self.embeddings.aembed_query(text)
+        (vector,) = self._check_dimensions([await self.embeddings.aembed_query(text)])
+        return vector
+
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate vector embeddings for several texts in one model call."""
+        return self._check_dimensions(await self.embeddings.aembed_documents(texts))
+
+    @staticmethod
+    def _check_dimensions(vectors: List[List[float]]) -> List[List[float]]:
+        for vector in vectors:
+            if len(vector) != EMBEDDING_DIMENSIONS:
+                raise ValueError(
+                    f"Embedding has {len(vector)} dimensions, mapping_feedback "
+                    f"stores {EMBEDDING_DIMENSIONS}"
+                )
+        return vectors
 
     async def get_similar_mappings(
         self,
@@ -64,62 +150,172 @@ class SemanticLayer:
         result = await self.db.execute(stmt)
         return result.scalars().all()
 
+    async def get_similar_mappings_batch(
+        self,
+        dest_fields: List[Dict[str, Any]],
+        limit: int = 5,
+    ) -> List[List[MappingFeedback]]:
+        """
+        ``get_similar_mappings`` for many destination fields at once: one
+        embedding call and one query, a lateral join that takes the ``limit``
+        nearest past mappings for each field. Results follow ``dest_fields``.
+        """
+        if not dest_fields:
+            return []
+
+        query_vectors = await self._generate_embeddings(
+            [
+                f"{field['name']}: {field.get('description') or ''}"
+                for field in dest_fields
+            ]
+        )
+        queries = values(
+            column("position", Integer),
+            column("embedding", Vector(EMBEDDING_DIMENSIONS)),
+            name="queries",
+        ).data(list(enumerate(query_vectors)))
+        query_vector = cast(queries.c.embedding, Vector(EMBEDDING_DIMENSIONS))
+        distance = MappingFeedback.dest_embedding.cosine_distance(query_vector)
+
+        nearest = (
+            select(MappingFeedback, distance.label("distance"))
+            .where(MappingFeedback.dest_embedding.is_not(None))
+            .order_by(distance)
+            .limit(limit)
+            .lateral("nearest")
+        )
+        example = aliased(MappingFeedback, nearest)
+        stmt = (
+            select(queries.c.position, example)
+            .select_from(queries)
+            .join(nearest, true())
+            .order_by(queries.c.position, nearest.c.distance)
+        )
+
+        examples: List[List[MappingFeedback]] = [[] for _ in dest_fields]
+        result = await self.db.execute(stmt)
+        for position, feedback in result.all():
+            examples[position].append(feedback)
+        return examples
+
     async def map_schema(
         self,
         source_schema: Dict[str, Any],
         dest_schema: Dict[str, Any],
         user_intent: str,
+        batch_size: Optional[int] = None,
     ) -> List[DataTransformation]:
         """
         Main entry point for semantic mapping.
+
+        See :meth:`map_schema_with_status`, which also reports whether every
+        LLM call succeeded.
+        """
+        transformations, _ = await self.map_schema_with_status(
+            source_schema, dest_schema, user_intent, batch_size
+        )
+        return transformations
+
+    async def map_schema_with_status(
+        self,
+        source_schema: Dict[str, Any],
+        dest_schema: Dict[str, Any],
+        user_intent: str,
+        batch_size: Optional[int] = None,
+    ) -> Tuple[List[DataTransformation], bool]:
+        """
+        Map ``dest_schema`` from ``source_schema``; returns the mappings and
+        whether they are complete, i.e. no LLM call failed. Fields of a
+        failed group are left unmapped.
+
+        Fields with an obvious source field (same normalized name, compatible
+        type) are mapped by the pre-matcher without the LLM. The others are
+        mapped in groups of ``batch_size`` (default
+        ``SEMANTIC_MAPPING_BATCH_SIZE``), one structured LLM call per group,
+        with up to ``SEMANTIC_MAPPING_CONCURRENCY`` groups in flight. A
+        ``batch_size`` of 1 makes one call per field.
         """
         # 1. Flatten schemas for easier processing
         flat_source = self._flatten_schema(source_schema)
         flat_dest = self._flatten_schema(dest_schema)
-
-        transformations = []
-
-        for dest_field in flat_dest:
-            # 2. Retrieve relevant past mappings (few-shot examples)
-            examples = await self.get_similar_mappings(
-                source_field_name="",
-                source_field_desc="",
-                dest_field_name=dest_field["name"],
-                dest_field_desc=dest_field.get("description", ""),
-                limit=3,
+        if not flat_dest:
+            return [], True
+
+        # 2. Map obvious fields deterministically
+        prematched: Dict[int, DataTransformation] = {}
+        pending = list(range(len(flat_dest)))
+        if settings.SEMANTIC_PREMATCH_ENABLED:
+            prematcher = PreMatcher(
+                settings.SEMANTIC_PREMATCH_THRESHOLD, embeddings=self.embeddings
             )
-
-            # 3. Construct prompt & Call LLM
-            mapping = await self._propose_mapping(
-                dest_field, flat_source, user_intent, examples
+            prematched, pending = await prematcher.match(flat_source, flat_dest)
+            logger.info(
+                f"Pre-matched {len(prematched)}/{len(flat_dest)} fields, "
+                f"{len(pending)} left for the LLM"
             )
+        llm_fields = [flat_dest[i] for i in pending]
+
+        # 3. Retrieve relevant past mappings (few-shot examples) in one query.
+        # It uses the shared session, so it runs before the concurrent LLM calls.
+        examples = await self.get_similar_mappings_batch(llm_fields, limit=3)
+
+        # 4. Construct prompts & Call LLM, one call per group of fields
+        batch_size = max(1, batch_size or settings.SEMANTIC_MAPPING_BATCH_SIZE)
+        semaphore = asyncio.Semaphore(max(1, settings.SEMANTIC_MAPPING_CONCURRENCY))
+        # Single-field calls use the shared session, so they take turns
+        shared_db = asyncio.Lock()
+
+        failed_groups = 0
+
+        async def _map_group(start: int) -> List[Optional[DataTransformation]]:
+            nonlocal failed_groups
+            group = llm_fields[start : start + batch_size]
+            group_examples = examples[start : start + batch_size]
+            async with semaphore:
+                try:
+                    if len(group) == 1:
+                        async with shared_db:
+                            return [
+                                await self._propose_mapping(
+                                    group[0],
+                                    flat_source,
+                                    user_intent,
+                                    group_examples[0],
+                                )
+                            ]
+                    return await self._propose_mappings(
+                        group, flat_source, user_intent, group_examples
+                    )
+                except Exception as e:
+                    failed_groups += 1
+                    logger.error(
+                        f"LLM mapping failed for fields "
+                        f"{[f['name'] for f in group]}: {e}"
+                    )
+                    return []
+
+        groups = await asyncio.gather(
+            *(_map_group(start) for start in range(0, len(llm_fields), batch_size))
+        )
+        proposed = {
+            mapping.dest_field: mapping
+            for group in groups
+            for mapping in group
+            if mapping
+        }
 
+        transformations = []
+        for i, dest_field in enumerate(flat_dest):
+            mapping = prematched.get(i) or proposed.get(dest_field["name"])
             if mapping:
                 transformations.append(mapping)
-
-        return transformations
+        return transformations, failed_groups == 0
 
     def _flatten_schema(
         self, schema: Dict[str, Any], prefix: str = ""
     ) -> List[Dict[str, Any]]:
         """Helper to flatten nested JSON schemas into a list of fields."""
-        fields = []
-        properties = schema.get("properties", {})
-
-        for key, value in properties.items():
-            field_name = f"{prefix}.{key}" if prefix else key
-
-            if value.get("type") == "object" and "properties" in value:
-                fields.extend(self._flatten_schema(value, prefix=field_name))
-            else:
-                fields.append(
-                    {
-                        "name": field_name,
-                        "type": value.get("type", "string"),
-                        "description": value.get("description", ""),
-                    }
-                )
-        return fields
+        return flatten_schema(schema, prefix)
 
     async def _propose_mapping(
         self,
@@ -129,43 +325,11 @@ class SemanticLayer:
         examples: List[MappingFeedback],
     ) -> Optional[DataTransformation]:
         """
-        Use LLM to propose a single field mapping.
+        Use LLM to propose a single field mapping. LLM errors propagate.
         """
 
-        class SemanticMappingProposal(BaseModel):
-            """Structured output from LLM for a single field mapping."""
-
-            source_field: str = Field(
-                ..., description="The name of the best matching source field"
-            )
-            transform_type: str = Field(
-                ...,
-                description="Type of transformation (direct, parse, stringify, etc.)",
-            )
-            confidence: int = Field(
-                ..., description="Confidence score between 0 and 100"
-            )
-            reasoning: str = Field(
-                ..., description="Explanation for why this mapping was chosen"
-            )
-
-        # Format examples for the prompt
-        example_text = (
-            "\n".join(
-                [
-                    f"- Mapped '{m.source_field_name}' to '{m.dest_field_name}' (Logic: {m.transformation_logic})"
-                    for m in examples
-                ]
-            )
-            if examples
-            else "No specific past examples available."
-        )
-
-        # Flatten source fields for prompt to save tokens (name + type + desc)
-        source_field_list = [
-            f"{f['name']} ({f['type']}): {f.get('description', '')}"
-            for f in source_fields
-        ]
+        example_text = self._format_examples(examples)
+        source_field_list = self._format_source_fields(source_fields)
 
         prompt = f"""
         You are an expert data integration specialist.
@@ -191,34 +355,119 @@ class SemanticLayer:
         4. Provide reasoning.
         """
 
-        try:
-            # Create LLM instance (Using Analyst Agent profile for reasoning)
+        # Create LLM instance (Using Analyst Agent profile for reasoning)
+        llm = await LLMProviderService.create_llm(agent_id="Analyst Agent")
+
+        result = await LLMProviderService.invoke_structured_with_monitoring(
+            llm_instance=llm,
+            prompt=prompt,
+            schema=SemanticMappingProposal,
+            agent_id="Semantic Mapper",
+            operation_name="propose_field_mapping",
+            db=self.db,
+        )
+
+        return self._to_transformation(dest_field, result)
+
+    async def _propose_mappings(
+        self,
+        dest_fields: List[Dict[str, Any]],
+        source_fields: List[Dict[str, Any]],
+        user_intent: str,
+        examples: List[List[MappingFeedback]],
+    ) -> List[Optional[DataTransformation]]:
+        """
+        Use LLM to propose mappings for a group of destination fields in one
+        call. The source field list is sent once for the whole group. LLM
+        errors propagate.
+        """
+        dest_field_text = "\n".join(
+            f"""
+        - Name: {dest_field["name"]}
+          Type: {dest_field["type"]}
+          Description: {dest_field.get("description", "N/A")}
+          Past Relevant Mappings: {self._format_examples(field_examples)}"""
+            for dest_field, field_examples in zip(dest_fields, examples)
+        )
+        source_field_list = self._format_source_fields(source_fields)
+
+        prompt = f"""
+        You are an expert data integration specialist.
+        Map each of the Destination Fields to a field from the Source Schema based on semantic meaning.
+        
+        User Intent: {user_intent}
+        
+        Destination Fields:
+        {dest_field_text}
+        
+        Available Source Fields:
+        {json.dumps(source_field_list, indent=2)}
+        
+        Task:
+        For every destination field, return one mapping that:
+        1. Names the destination field exactly as listed.
+        2. Selects the best matching source field from the available list.
+        3. Determines the transformation type (e.g., 'direct', 'parse', 'stringify', 'format_date').
+        4. Assigns a confidence score (0-100). If no good match exists, set confidence low (<50).
+        5. Provides reasoning.
+        """
+
+        # A session of its own: groups run concurrently
+        async with async_session_factory() as db:
             llm = await LLMProviderService.create_llm(agent_id="Analyst Agent")
 
             result = await LLMProviderService.invoke_structured_with_monitoring(
                 llm_instance=llm,
                 prompt=prompt,
-                schema=SemanticMappingProposal,
+                schema=SemanticMappingBatch,
                 agent_id="Semantic Mapper",
-                operation_name="propose_field_mapping",
-                db=self.db,
+                operation_name="propose_field_mappings",
+                metadata={"dest_field_count": len(dest_fields)},
+                db=db,
             )
 
-            if result.confidence < 50:
-                return None
+        proposals = {proposal.dest_field: proposal for proposal in result.mappings}
+        return [
+            self._to_transformation(dest_field, proposals[dest_field["name"]])
+            for dest_field in dest_fields
+            if dest_field["name"] in proposals
+        ]
+
+    @staticmethod
+    def _format_examples(examples: List[MappingFeedback]) -> str:
+        """Past mappings as prompt lines."""
+        if not examples:
+            return "No specific past examples available."
+        return "\n".join(
+            [
+                f"- Mapped '{m.source_field_name}' to '{m.dest_field_name}' (Logic: {m.transformation_logic})"
+                for m in examples
+            ]
+        )
 
-            return DataTransformation(
-                source_field=result.source_field,
-                dest_field=dest_field["name"],
-                transform_type=result.transform_type,
-                transform_config={"reasoning": result.reasoning},
-                required=dest_field.get("required", False),
-            )
+    @staticmethod
+    def _format_source_fields(source_fields: List[Dict[str, Any]]) -> List[str]:
+        """Flatten source fields for prompt to save tokens (name + type + desc)."""
+        return [
+            f"{f['name']} ({f['type']}): {f.get('description', '')}"
+            for f in source_fields
+        ]
 
-        except Exception as e:
-            logger.error(f"LLM mapping failed for field {dest_field['name']}: {e}")
+    @staticmethod
+    def _to_transformation(
+        dest_field: Dict[str, Any], proposal: SemanticMappingProposal
+    ) -> Optional[DataTransformation]:
+        if proposal.confidence < 50:
             return None
 
+        return DataTransformation(
+            source_field=proposal.source_field,
+            dest_field=dest_field["name"],
+            transform_type=proposal.transform_type,
+            transform_config={"reasoning": proposal.reasoning},
+            required=dest_field.get("required", False),
+        )
+
     async def save_feedback(
         self,
         mapping: DataTransformation,
@@ -234,8 +483,7 @@ class SemanticLayer:
         source_context = f"{mapping.source_field}"
         dest_context = f"{mapping.dest_field}"
 
-        s_vec = await self._generate_embedding(source_context)
-        d_vec = await self._generate_embedding(dest_context)
+        s_vec, d_vec = await self._generate_embeddings([source_context, dest_context])
 
         feedback = MappingFeedback(
             source_field_name=mapping.source_field,
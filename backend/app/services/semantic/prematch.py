@@ -0,0 +1,215 @@
+"""
+Deterministic field pre-matching.
+
+Most destination fields of CRM and e-commerce mappings have an obvious
+source field (``email`` -> ``email``, ``createdAt`` -> ``created_at``).
+``PreMatcher`` scores every (destination, source) pair before the LLM is
+involved, combining:
+
+- normalized-name equality (case, ``_``/``-``/``.`` and camelCase ignored),
+- Jaccard similarity of the name tokens,
+- cosine similarity of the field embeddings (one matrix product),
+- compatibility of the JSON schema types, which scales the result.
+
+Destination fields whose best score clears the threshold, with no close
+runner-up, are mapped directly; only the rest go to the LLM.
+
+Field embeddings are cached by field text in :data:`field_embedding_cache`,
+shared across mapping runs, so each distinct field is embedded once.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.integration import DataTransformation
+
+logger = logging.getLogger(__name__)
+
+# Score weights; without embeddings the other two are rescaled to sum to 1
+NAME_WEIGHT = 0.45
+TOKEN_WEIGHT = 0.25
+EMBEDDING_WEIGHT = 0.30
+
+# The best source field must beat the runner-up by this much
+MIN_MARGIN = 0.05
+
+_TOKEN_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b|_)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+_NUMERIC_TYPES = {"integer", "number"}
+
+
+def name_tokens(name: str) -> List[str]:
+    """``"billing.postalCode"`` -> ``["billing", "postal", "code"]``."""
+    return [token.lower() for token in _TOKEN_RE.findall(name)]
+
+
+def normalize_name(name: str) -> str:
+    return "".join(name_tokens(name))
+
+
+def type_compatibility(source_type: Optional[str], dest_type: Optional[str]) -> float:
+    """How safely a ``source_type`` value maps directly to ``dest_type`` (0-1)."""
+    if not source_type or not dest_type or source_type == dest_type:
+        return 1.0
+    if source_type in _NUMERIC_TYPES and dest_type in _NUMERIC_TYPES:
+        return 0.9
+    if dest_type == "string":
+        return 0.7  # needs stringify
+    return 0.3
+
+
+def _field_text(field: Dict[str, Any]) -> str:
+    description = field.get("description") or ""
+    text = " ".join(name_tokens(field["name"]))
+    return f"{text}: {description}" if description else text
+
+
+class FieldEmbeddingCache:
+    """Unit-length field embeddings by field text, bounded LRU."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    async def matrix(self, embeddings: Any, texts: Sequence[str]) -> np.ndarray:
+        """
+        Rows of unit embeddings for ``texts``. Texts not cached yet are
+        embedded in one ``aembed_documents`` call.
+        """
+        missing = list(dict.fromkeys(t for t in texts if t not in self._vectors))
+        if missing:
+            vectors = np.asarray(
+                await embeddings.aembed_documents(missing), dtype=np.float32
+            )
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1.0, norms)
+            for text, vector in zip(missing, vectors):
+                self._vectors[text] = vector
+        rows = []
+        for text in texts:
+            self._vectors.move_to_end(text)
+            rows.append(self._vectors[text])
+        while len(self._vectors) > self.max_entries:
+            self._vectors.popitem(last=False)
+        return np.vstack(rows)
+
+    def clear(self) -> None:
+        self._vectors.clear()
+
+
+field_embedding_cache = FieldEmbeddingCache()
+
+
+class PreMatcher:
+    """Scores destination fields against source fields without the LLM."""
+
+    def __init__(
+        self,
+        threshold: float,
+        embeddings: Any = None,
+        cache: Optional[FieldEmbeddingCache] = None,
+    ):
+        self.threshold = threshold
+        self.embeddings = embeddings
+        self.cache = cache or field_embedding_cache
+
+    async def _cosine(
+        self, source_fields: List[Dict[str, Any]], dest_fields: List[Dict[str, Any]]
+    ) -> Optional[np.ndarray]:
+        if self.embeddings is None:
+            return None
+        try:
+            texts = [_field_text(f) for f in dest_fields + source_fields]
+            matrix = await self.cache.matrix(self.embeddings, texts)
+        except Exception as e:
+            logger.warning(f"Field embeddings unavailable for pre-matching: {e}")
+            return None
+        dest, source = matrix[: len(dest_fields)], matrix[len(dest_fields) :]
+        return np.clip(dest @ source.T, 0.0, 1.0)
+
+    async def score(
+        self, source_fields: List[Dict[str, Any]], dest_fields: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Confidence (0-1) of each dest field (rows) mapping to each source field."""
+        if not source_fields or not dest_fields:
+            return np.zeros((len(dest_fields), len(source_fields)), dtype=np.float32)
+
+        source_names = [normalize_name(f["name"]) for f in source_fields]
+        dest_names = [normalize_name(f["name"]) for f in dest_fields]
+        name_equal = (
+            np.asarray(dest_names, dtype=object)[:, None]
+            == np.asarray(source_names, dtype=object)[None, :]
+        ).astype(np.float32)
+
+        source_tokens = [set(name_tokens(f["name"])) for f in source_fields]
+        tokens = np.zeros_like(name_equal)
+        for i, dest_field in enumerate(dest_fields):
+            dest_tokens = set(name_tokens(dest_field["name"]))
+            for j, candidate in enumerate(source_tokens):
+                union = dest_tokens | candidate
+                if union:
+                    tokens[i, j] = len(dest_tokens & candidate) / len(union)
+
+        types = np.array(
+            [
+                [
+                    type_compatibility(s.get("type"), d.get("type"))
+                    for s in source_fields
+                ]
+                for d in dest_fields
+            ],
+            dtype=np.float32,
+        )
+
+        cosine = await self._cosine(source_fields, dest_fields)
+        if cosine is None:
+            total = NAME_WEIGHT + TOKEN_WEIGHT
+            similarity = (NAME_WEIGHT * name_equal + TOKEN_WEIGHT * tokens) / total
+        else:
+            similarity = (
+                NAME_WEIGHT * name_equal
+                + TOKEN_WEIGHT * tokens
+                + EMBEDDING_WEIGHT * cosine
+            )
+        return similarity * types
+
+    async def match(
+        self, source_fields: List[Dict[str, Any]], dest_fields: List[Dict[str, Any]]
+    ) -> Tuple[Dict[int, DataTransformation], List[int]]:
+        """
+        Direct mappings by destination field position, and the positions of
+        the fields left for the LLM.
+        """
+        scores = await self.score(source_fields, dest_fields)
+        matched: Dict[int, DataTransformation] = {}
+        ambiguous: List[int] = []
+
+        for i, dest_field in enumerate(dest_fields):
+            if scores.shape[1] == 0:
+                ambiguous.append(i)
+                continue
+            ranked = np.argsort(scores[i])[::-1]
+            best = float(scores[i, ranked[0]])
+            runner_up = float(scores[i, ranked[1]]) if len(ranked) > 1 else 0.0
+            if best < self.threshold or best - runner_up < MIN_MARGIN:
+                ambiguous.append(i)
+                continue
+
+            source_field = source_fields[ranked[0]]
+            matched[i] = DataTransformation(
+                source_field=source_field["name"],
+                dest_field=dest_field["name"],
+                transform_type="direct",
+                transform_config={
+                    "reasoning": "Deterministic name and type match",
+                    "confidence": round(best * 100),
+                    "matched_by": "prematch",
+                },
+                required=dest_field.get("required", False),
+            )
+
+        return matched, ambiguous
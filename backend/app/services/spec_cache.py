@@ -0,0 +1,153 @@
+"""
+Ingestor Spec Cache
+
+Second level of the ingestor's spec caching. The first level is the raw
+response body, kept with its HTTP validators by the conditional fetcher, so a
+re-ingest costs a ``304`` at most. This level keeps the finished
+``APISpecification`` (parsed from OpenAPI or synthesized by the LLM) keyed by
+the hash of that content, so the same API is not parsed or synthesized again
+for the next integration.
+
+Entries live in the ``spec_cache_entries`` table and in a small in-process
+LRU in front of it; the module-level :data:`spec_cache` is shared by every
+orchestrator and ingestor in the process.
+
+Keys include the ingestor version, so changing how specs are built (bump
+``INGESTOR_VERSION`` in ``app/agents/ingestor.py``) invalidates old entries.
+Specs never carry caller-provided credentials; the ingestor applies those
+after the lookup.
+"""
+
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.spec_cache import SpecCacheEntry
+from app.schemas.integration import APISpecification
+
+logger = structlog.get_logger(__name__)
+
+# Synthesized from the API name alone: nothing to hash, so entries expire
+NAME_SOURCE = "name"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+def spec_cache_key(
+    ingestor_version: str, content_sha256: str, api_url: str, api_name: str
+) -> str:
+    """
+    Key of the spec built from ``content_sha256``. The URL and name are part
+    of it because they end up in the spec and in LLM prompts.
+    """
+    material = "\n".join([ingestor_version, content_sha256, api_url, api_name])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SpecCache:
+    """APISpecifications by cache key, in memory and in the database."""
+
+    def __init__(self, max_memory_entries: Optional[int] = None):
+        self.max_memory_entries = (
+            max_memory_entries or settings.SPEC_CACHE_MEMORY_ENTRIES
+        )
+        # key -> (expires_at or None, spec as JSON)
+        self._memory: "OrderedDict[str, Tuple[Optional[datetime], dict]]" = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _expires_at(source: str, created_at: datetime) -> Optional[datetime]:
+        if source != NAME_SOURCE:
+            return None
+        return created_at + timedelta(hours=settings.SPEC_CACHE_SYNTHESIZED_TTL_HOURS)
+
+    def _remember(self, key: str, expires_at: Optional[datetime], spec: dict) -> None:
+        self._memory[key] = (expires_at, spec)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[APISpecification]:
+        now = datetime.now(timezone.utc)
+        cached = self._memory.get(key)
+        if cached is not None:
+            expires_at, spec = cached
+            if expires_at is None or expires_at > now:
+                self._memory.move_to_end(key)
+                return APISpecification.model_validate(spec)
+            del self._memory[key]
+
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(SpecCacheEntry).where(SpecCacheEntry.cache_key == key)
+                )
+                entry = result.scalar_one_or_none()
+                if entry is None:
+                    return None
+                expires_at = self._expires_at(entry.source, entry.created_at or now)
+                if expires_at is not None and expires_at <= now:
+                    return None
+                await db.execute(
+                    update(SpecCacheEntry)
+                    .where(SpecCacheEntry.id == entry.id)
+                    .values(hit_count=SpecCacheEntry.hit_count + 1, last_used_at=now)
+                )
+                await db.commit()
+                spec = entry.api_spec
+        except Exception as e:
+            logger.warning("Spec cache lookup failed", error=str(e))
+            return None
+
+        self._remember(key, expires_at, spec)
+        return APISpecification.model_validate(spec)
+
+    async def put(
+        self,
+        key: str,
+        api_spec: APISpecification,
+        content_sha256: str,
+        ingestor_version: str,
+        source: str,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        spec = api_spec.model_dump(mode="json")
+        self._remember(key, self._expires_at(source, now), spec)
+
+        values = {
+            "cache_key": key,
+            "content_hash": content_sha256,
+            "ingestor_version": ingestor_version,
+            "source": source,
+            "api_name": api_spec.api_name[:200],
+            "api_spec": spec,
+            "created_at": now,
+            "last_used_at": now,
+        }
+        try:
+            async with async_session_factory() as db:
+                stmt = insert(SpecCacheEntry).values(**values)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["cache_key"],
+                    set_={k: v for k, v in values.items() if k != "cache_key"},
+                )
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            logger.warning("Failed to store spec in cache", error=str(e))
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+
+spec_cache = SpecCache()
@@ -0,0 +1,228 @@
+"""
+Spec Store
+
+Integrations used to copy the full ingested ``APISpecification`` (every
+endpoint with its resolved schemas) into ``source_api_spec`` and
+``dest_api_spec``. For APIs with thousands of operations that made every
+integration row megabytes large, and every reader validated all endpoints
+into Pydantic models to look up one of them.
+
+The full spec now lives once in the ``api_spec_documents`` table, addressed
+by the sha256 of its canonical JSON. Integration rows keep a compact copy:
+the top-level fields, one ``{path, method, description, auth_required}``
+summary per endpoint and the ``spec_sha256`` of the full document. Readers
+that only list endpoints keep working on the compact copy; readers that need
+schemas call :meth:`SpecStore.expand` or :meth:`SpecStore.endpoint_index`.
+
+:class:`EndpointIndex` looks endpoints up by method and path and builds the
+``APIEndpoint`` model of an endpoint only when it is first asked for.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import async_session_factory
+from app.models.spec_store import ApiSpecDocument
+from app.schemas.integration import APIEndpoint
+
+logger = structlog.get_logger(__name__)
+
+# Endpoint fields kept in compact specs
+SUMMARY_FIELDS = ("path", "method", "description", "auth_required")
+
+
+def canonical_json(spec: Dict[str, Any]) -> bytes:
+    """Key-sorted, whitespace-free JSON; datetimes become ISO strings."""
+    return json.dumps(
+        spec, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def spec_digest(spec: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonical_json(spec)).hexdigest()
+
+
+def is_compact(spec: Any) -> bool:
+    return (
+        isinstance(spec, dict)
+        and spec.get("compact") is True
+        and bool(spec.get("spec_sha256"))
+    )
+
+
+def compact_spec(spec: Dict[str, Any], sha256: str) -> Dict[str, Any]:
+    """The copy of ``spec`` kept on integrations: endpoint summaries only."""
+    endpoints = [ep for ep in spec.get("endpoints") or [] if isinstance(ep, dict)]
+    compact = {key: value for key, value in spec.items() if key != "endpoints"}
+    compact["endpoints"] = [
+        {field: ep[field] for field in SUMMARY_FIELDS if field in ep}
+        for ep in endpoints
+    ]
+    compact["endpoint_count"] = len(endpoints)
+    compact["spec_sha256"] = sha256
+    compact["compact"] = True
+    return compact
+
+
+def _endpoint_key(endpoint: Any) -> Tuple[str, Any]:
+    if isinstance(endpoint, dict):
+        method, path = endpoint.get("method"), endpoint.get("path")
+    else:
+        method, path = getattr(endpoint, "method", None), getattr(
+            endpoint, "path", None
+        )
+    return str(method or "").upper(), path
+
+
+class EndpointIndex:
+    """
+    Endpoints of one spec by ``(METHOD, path)``. Entries stay raw dicts until
+    :meth:`get` builds and keeps their ``APIEndpoint`` model.
+    """
+
+    def __init__(self, endpoints: Iterable[Any]):
+        self._raw: Dict[Tuple[str, Any], Any] = {}
+        # path -> key of its first operation, for lookups without a method
+        self._by_path: Dict[Any, Tuple[str, Any]] = {}
+        self._models: Dict[Tuple[str, Any], APIEndpoint] = {}
+        for endpoint in endpoints:
+            key = _endpoint_key(endpoint)
+            self._raw.setdefault(key, endpoint)
+            self._by_path.setdefault(key[1], key)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def get(self, path: str, method: Optional[str] = None) -> Optional[APIEndpoint]:
+        """The endpoint at ``path``; its first operation when no method is given."""
+        key = (method.upper(), path) if method else self._by_path.get(path)
+        if key is None or key not in self._raw:
+            return None
+        model = self._models.get(key)
+        if model is None:
+            raw = self._raw[key]
+            model = (
+                raw if isinstance(raw, APIEndpoint) else APIEndpoint.model_validate(raw)
+            )
+            self._models[key] = model
+        return model
+
+
+class SpecStore:
+    """Full specs by sha256, in memory and in the database."""
+
+    def __init__(self, max_memory_entries: Optional[int] = None):
+        self.max_memory_entries = (
+            max_memory_entries or settings.SPEC_STORE_MEMORY_ENTRIES
+        )
+        # sha256 -> (full spec, its endpoint index once built)
+        self._memory: "OrderedDict[str, Tuple[dict, Optional[EndpointIndex]]]" = (
+            OrderedDict()
+        )
+
+    def _remember(
+        self, sha256: str, spec: dict, index: Optional[EndpointIndex] = None
+    ) -> None:
+        self._memory[sha256] = (spec, index)
+        self._memory.move_to_end(sha256)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def put(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store ``spec`` and return its compact copy. When the store cannot be
+        written, ``spec`` is returned unchanged so nothing is lost.
+        """
+        if is_compact(spec):
+            return spec
+        payload = canonical_json(spec)
+        sha256 = hashlib.sha256(payload).hexdigest()
+        document = json.loads(payload)
+        endpoint_count = len(document.get("endpoints") or [])
+
+        try:
+            async with async_session_factory() as db:
+                stmt = insert(ApiSpecDocument).values(
+                    sha256=sha256,
+                    api_name=str(document.get("api_name") or "")[:200],
+                    endpoint_count=endpoint_count,
+                    size_bytes=len(payload),
+                    spec=document,
+                )
+                await db.execute(stmt.on_conflict_do_nothing(index_elements=["sha256"]))
+                await db.commit()
+        except Exception as e:
+            logger.warning("Failed to store full API spec", error=str(e))
+            return document
+
+        self._remember(sha256, document)
+        logger.debug(
+            "API spec stored",
+            sha256=sha256,
+            endpoints=endpoint_count,
+            size_bytes=len(payload),
+        )
+        return compact_spec(document, sha256)
+
+    async def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        cached = self._memory.get(sha256)
+        if cached is not None:
+            self._memory.move_to_end(sha256)
+            return cached[0]
+
+        try:
+            async with async_session_factory() as db:
+                result = await db.execute(
+                    select(ApiSpecDocument.spec).where(ApiSpecDocument.sha256 == sha256)
+                )
+                spec = result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning("API spec lookup failed", sha256=sha256, error=str(e))
+            return None
+
+        if spec is not None:
+            self._remember(sha256, spec)
+        return spec
+
+    async def expand(self, spec: Any) -> Any:
+        """The full spec behind a compact one; anything else is returned as is."""
+        if not is_compact(spec):
+            return spec
+        full = await self.get(spec["spec_sha256"])
+        if full is None:
+            logger.warning(
+                "Full API spec missing, using endpoint summaries",
+                sha256=spec["spec_sha256"],
+            )
+            return spec
+        return full
+
+    async def endpoint_index(self, spec: Any) -> EndpointIndex:
+        """Index over the endpoints of ``spec`` (full, compact or a model)."""
+        if not isinstance(spec, dict):
+            return EndpointIndex(getattr(spec, "endpoints", None) or [])
+        if not is_compact(spec):
+            return EndpointIndex(spec.get("endpoints") or [])
+
+        sha256 = spec["spec_sha256"]
+        full = await self.get(sha256)
+        if full is None:
+            return EndpointIndex(spec.get("endpoints") or [])
+        _, index = self._memory.get(sha256, (full, None))
+        if index is None:
+            index = EndpointIndex(full.get("endpoints") or [])
+            self._remember(sha256, full, index)
+        return index
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+
+
+spec_store = SpecStore()
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any, Union, Callable
+from typing import List, Dict, Any, Union, Callable, Optional
+import numpy as np
 import structlog
 from pathlib import Path
 import base64
@@ -22,6 +23,8 @@ from langchain_community.vectorstores import FAISS
 # from pinecone import Pinecone - REMOVED
 
 from app.core.config import settings
+from app.services.financial_patterns import EMPTY_MATCHER, EXCEL_MATCHER, PDF_MATCHERS
+from app.services.metadata_filter_index import MetadataFilterIndex, search_with_selector
 
 logger = structlog.get_logger(__name__)
 
@@ -268,169 +271,7 @@ class DocumentProcessor:
                     "coordinate_mappings": {},
                 }
 
-                # Define comprehensive patterns for different document types and schedules
-                patterns = {
-                    "tax_return": {
-                        "revenue": [
-                            r"gross receipts",
-                            r"total income",
-                            r"gross revenue",
-                            r"business income",
-                            r"ordinary income",
-                            r"rental income",
-                        ],
-                        "expenses": [
-                            r"total expenses",
-                            r"cost of goods sold",
-                            r"cogs",
-                            r"operating expenses",
-                            r"business expenses",
-                            r"deductions",
-                        ],
-                        "assets": [
-                            r"total assets",
-                            r"assets",
-                            r"property.?plant.?equipment",
-                            r"buildings",
-                            r"land",
-                            r"equipment",
-                            r"machinery",
-                        ],
-                        "liabilities": [
-                            r"total liabilities",
-                            r"liabilities",
-                            r"loans payable",
-                            r"mortgages",
-                            r"notes payable",
-                            r"accounts payable",
-                        ],
-                        "equity": [
-                            r"owner.?s equity",
-                            r"retained earnings",
-                            r"partner.?s capital",
-                            r"stockholder.?s equity",
-                            r"member.?s capital",
-                        ],
-                        "tax_year": [r"tax year", r"year ended", r"fiscal year"],
-                        # Schedule L (Balance Sheet) specific patterns
-                        "schedule_l_assets": [
-                            r"schedule l",
-                            r"balance sheet",
-                            r"assets.*beginning",
-                            r"assets.*end",
-                            r"cash.*beginning",
-                            r"cash.*end",
-                        ],
-                        "schedule_l_liabilities": [
-                            r"liabilities.*beginning",
-                            r"liabilities.*end",
-                            r"loans.*beginning",
-                            r"loans.*end",
-                        ],
-                        # Schedule M-1 (Reconciliation) specific patterns
-                        "schedule_m1": [
-                            r"schedule m-1",
-                            r"reconciliation",
-                            r"book.*tax",
-                            r"net income.*book",
-                            r"net income.*tax",
-                        ],
-                        # Schedule M-3 (for larger businesses) specific patterns
-                        "schedule_m3": [
-                            r"schedule m-3",
-                            r"reconciliation.*financial",
-                            r"financial.*reconciliation",
-                        ],
-                    },
-                    "profit_loss": {
-                        "revenue": [
-                            r"total revenue",
-                            r"gross sales",
-                            r"net sales",
-                            r"service revenue",
-                            r"product revenue",
-                            r"other income",
-                        ],
-                        "cogs": [
-                            r"cost of goods sold",
-                            r"cogs",
-                            r"cost of sales",
-                            r"direct costs",
-                            r"product costs",
-                        ],
-                        "operating_expenses": [
-                            r"operating expenses",
-                            r"total expenses",
-                            r"general.*admin",
-                            r"g.?a.?expenses",
-                            r"selling.*expenses",
-                            r"admin.*expenses",
-                        ],
-                        "net_income": [
-                            r"net income",
-                            r"net profit",
-                            r"profit before tax",
-                            r"operating income",
-                            r"ebit",
-                            r"earnings before interest",
-                        ],
-                        "depreciation": [
-                            r"depreciation",
-                            r"amortization",
-                            r"depreciation.*expense",
-                        ],
-                        "interest_expense": [
-                            r"interest expense",
-                            r"interest paid",
-                            r"finance costs",
-                        ],
-                    },
-                    "balance_sheet": {
-                        "assets": [
-                            r"total assets",
-                            r"assets",
-                            r"current assets",
-                            r"fixed assets",
-                            r"property.?plant.?equipment",
-                            r"intangible assets",
-                        ],
-                        "liabilities": [
-                            r"total liabilities",
-                            r"liabilities",
-                            r"current liabilities",
-                            r"long.?term.*liabilities",
-                            r"debt",
-                            r"loans",
-                        ],
-                        "equity": [
-                            r"total equity",
-                            r"owner.?s equity",
-                            r"stockholder.?s equity",
-                            r"retained earnings",
-                            r"capital",
-                        ],
-                        "cash": [r"cash.*equivalents", r"cash.*bank", r"cash.*balance"],
-                    },
-                    "rent_roll": {
-                        "tenant_info": [
-                            r"tenant",
-                            r"lease",
-                            r"rent",
-                            r"occupant",
-                            r"unit",
-                        ],
-                        "rental_income": [
-                            r"rental income",
-                            r"rent collected",
-                            r"lease income",
-                            r"monthly rent",
-                            r"annual rent",
-                        ],
-                        "vacancy": [r"vacant", r"vacancy", r"empty", r"available"],
-                    },
-                }
-
-                doc_patterns = patterns.get(doc_type, {})
+                matcher = PDF_MATCHERS.get(doc_type, EMPTY_MATCHER)
 
                 def _convert_bbox(rect, page_height):
                     """Convert PyMuPDF [x0, y0, x1, y1] to [x, y_from_bottom, w, h] for frontend."""
@@ -468,31 +309,17 @@ class DocumentProcessor:
 
                                 if line_text.strip():
                                     # Check for financial data patterns at the LINE level for precision
-                                    for field_type, regexes in doc_patterns.items():
-                                        import re
-
-                                        for regex in regexes:
-                                            if re.search(regex, line_text.lower()):
-                                                if (
-                                                    field_type
-                                                    not in structured_data[
-                                                        "financial_data"
-                                                    ]
-                                                ):
-                                                    structured_data["financial_data"][
-                                                        field_type
-                                                    ] = []
-
-                                                # Use line_bbox for maximum precision
-                                                structured_data["financial_data"][
-                                                    field_type
-                                                ].append(
-                                                    {
-                                                        "text": line_text.strip(),
-                                                        "bbox": line_bbox,
-                                                        "page": page_num + 1,
-                                                    }
-                                                )
+                                    for field_type in matcher.match(line_text.lower()):
+                                        # Use line_bbox for maximum precision
+                                        structured_data["financial_data"].setdefault(
+                                            field_type, []
+                                        ).append(
+                                            {
+                                                "text": line_text.strip(),
+                                                "bbox": line_bbox,
+                                                "page": page_num + 1,
+                                            }
+                                        )
 
                             if block_text.strip():
                                 page_data["text_blocks"].append(
@@ -657,60 +484,6 @@ class DocumentProcessor:
             else:
                 raise ValueError("Unsupported Excel file format")
 
-            # Define patterns for financial data
-            patterns = {
-                "revenue": [
-                    r"gross revenue",
-                    r"gross receipts",
-                    r"total income",
-                    r"business income",
-                    r"rental income",
-                    r"ordinary income",
-                    r"sales",
-                ],
-                "expenses": [
-                    r"total expenses",
-                    r"cost of goods sold",
-                    r"cogs",
-                    r"operating expenses",
-                    r"business expenses",
-                    r"deductions",
-                    r"salaries",
-                    r"rent",
-                    r"utilities",
-                ],
-                "assets": [
-                    r"total assets",
-                    r"assets",
-                    r"property",
-                    r"equipment",
-                    r"machinery",
-                    r"buildings",
-                    r"land",
-                    r"cash",
-                    r"accounts receivable",
-                ],
-                "liabilities": [
-                    r"total liabilities",
-                    r"liabilities",
-                    r"loans payable",
-                    r"mortgages",
-                    r"notes payable",
-                    r"accounts payable",
-                    r"debt",
-                ],
-                "equity": [
-                    r"owner.?s equity",
-                    r"retained earnings",
-                    r"partner.?s capital",
-                    r"stockholder.?s equity",
-                    r"member.?s capital",
-                ],
-                "tax_year": [r"tax year", r"year ended", r"fiscal year"],
-            }
-
-            doc_patterns = patterns.get(doc_type, patterns)
-
             for sheet_idx, sheet in enumerate(sheets):
                 sheet_name = (
                     sheet.title if hasattr(sheet, "title") else f"Sheet{sheet_idx + 1}"
@@ -738,31 +511,22 @@ class DocumentProcessor:
                                 )
 
                                 # Check for financial data patterns
-                                for field_type, regexes in doc_patterns.items():
-                                    import re
-
-                                    for regex in regexes:
-                                        if re.search(regex, cell_text.lower()):
-                                            if (
-                                                field_type
-                                                not in structured_data["financial_data"]
-                                            ):
-                                                structured_data["financial_data"][
-                                                    field_type
-                                                ] = []
-                                            structured_data["financial_data"][
-                                                field_type
-                                            ].append(
-                                                {
-                                                    "text": cell_text,
-                                                    "coordinates": [
-                                                        row_idx,
-                                                        col_idx,
-                                                    ],  # [row, col] for Excel
-                                                    "sheet": sheet_idx,
-                                                    "field": field_type,
-                                                }
-                                            )
+                                for field_type in EXCEL_MATCHER.match(
+                                    cell_text.lower()
+                                ):
+                                    structured_data["financial_data"].setdefault(
+                                        field_type, []
+                                    ).append(
+                                        {
+                                            "text": cell_text,
+                                            "coordinates": [
+                                                row_idx,
+                                                col_idx,
+                                            ],  # [row, col] for Excel
+                                            "sheet": sheet_idx,
+                                            "field": field_type,
+                                        }
+                                    )
                 else:
                     # xlrd
                     for row_idx in range(sheet.nrows):
@@ -779,31 +543,22 @@ class DocumentProcessor:
                                 )
 
                                 # Check for financial data patterns
-                                for field_type, regexes in doc_patterns.items():
-                                    import re
-
-                                    for regex in regexes:
-                                        if re.search(regex, cell_text.lower()):
-                                            if (
-                                                field_type
-                                                not in structured_data["financial_data"]
-                                            ):
-                                                structured_data["financial_data"][
-                                                    field_type
-                                                ] = []
-                                            structured_data["financial_data"][
-                                                field_type
-                                            ].append(
-                                                {
-                                                    "text": cell_text,
-                                                    "coordinates": [
-                                                        row_idx + 1,
-                                                        col_idx + 1,
-                                                    ],  # [row, col] for Excel
-                                                    "sheet": sheet_idx,
-                                                    "field": field_type,
-                                                }
-                                            )
+                                for field_type in EXCEL_MATCHER.match(
+                                    cell_text.lower()
+                                ):
+                                    structured_data["financial_data"].setdefault(
+                                        field_type, []
+                                    ).append(
+                                        {
+                                            "text": cell_text,
+                                            "coordinates": [
+                                                row_idx + 1,
+                                                col_idx + 1,
+                                            ],  # [row, col] for Excel
+                                            "sheet": sheet_idx,
+                                            "field": field_type,
+                                        }
+                                    )
 
                 structured_data["sheets"].append(sheet_data)
 
@@ -876,6 +631,17 @@ class VectorizationService:
         self.document_processor = DocumentProcessor()
         self.embeddings = self._get_embeddings()
         self.vector_store = self._get_vector_store()
+        self._metadata_index: Optional[MetadataFilterIndex] = None
+
+    def _get_metadata_index(self) -> Optional[MetadataFilterIndex]:
+        """Return the metadata side index, rebuilding it if it is out of sync."""
+        index = getattr(self.vector_store, "index", None)
+        if index is None or not hasattr(self.vector_store, "index_to_docstore_id"):
+            return None
+        if self._metadata_index is None or len(self._metadata_index) != index.ntotal:
+            self._metadata_index = MetadataFilterIndex()
+            self._metadata_index.rebuild(self.vector_store)
+        return self._metadata_index
 
     def _get_embeddings(self):
         """Get embeddings model using local HuggingFace (free, no API key needed)."""
@@ -1004,7 +770,16 @@ class VectorizationService:
             # Add to vector store
             # FAISS
             # Use add_texts directly instead of merge_from for better reliability
+            ntotal_before = self.vector_store.index.ntotal
             self.vector_store.add_texts(chunks, metadatas=metadatas, ids=ids)
+            # New vectors are appended, so the side index can be extended in place
+            if (
+                self._metadata_index is not None
+                and len(self._metadata_index) == ntotal_before
+            ):
+                self._metadata_index.append(metadatas)
+            else:
+                self._metadata_index = None
 
             # Save FAISS index
             index_path = Path(settings.UPLOAD_DIR) / "faiss_index"
@@ -1058,20 +833,28 @@ class VectorizationService:
     ) -> List[Dict[str, Any]]:
         """Search for similar documents in the vector store."""
         try:
-            # FAISS with metadata filtering
-            # Note: FAISS in LangChain uses the 'filter' argument for metadata.
-            # We must ensure filter_metadata contains at least one common item if provided.
-            docs = self.vector_store.similarity_search(
-                query, k=k, filter=filter_metadata
+            metadata_index = (
+                self._get_metadata_index() if filter_metadata is not None else None
             )
+            if metadata_index is not None and metadata_index.supports(filter_metadata):
+                # Pre-filter inside the FAISS scan so selective filters still return k
+                docs_and_scores = self._search_prefiltered(
+                    query, k, filter_metadata, metadata_index
+                )
+            else:
+                # Callable or operator filters are applied by LangChain after the
+                # search (over-fetching fetch_k candidates)
+                docs_and_scores = self.vector_store.similarity_search_with_score(
+                    query, k=k, filter=filter_metadata
+                )
 
             results = []
-            for doc in docs:
+            for doc, score in docs_and_scores:
                 results.append(
                     {
                         "content": doc.page_content,
                         "metadata": doc.metadata,
-                        "score": getattr(doc, "score", None),
+                        "score": float(score),
                     }
                 )
 
@@ -1086,6 +869,31 @@ class VectorizationService:
             logger.error("Vector search failed", error=str(e), query=query[:100])
             return []
 
+    def _search_prefiltered(
+        self,
+        query: str,
+        k: int,
+        filter_metadata: Dict[str, Any],
+        metadata_index: MetadataFilterIndex,
+    ) -> List[tuple]:
+        """Search only the vectors whose metadata matches, via a FAISS IDSelector."""
+        import faiss
+
+        ids = metadata_index.matching_ids(filter_metadata)
+        vector = np.array([self.embeddings.embed_query(query)], dtype=np.float32)
+        if getattr(self.vector_store, "_normalize_L2", False):
+            faiss.normalize_L2(vector)
+
+        docs_and_scores = []
+        for position, distance in search_with_selector(
+            self.vector_store.index, vector, k, ids
+        ):
+            doc_id = self.vector_store.index_to_docstore_id[position]
+            docs_and_scores.append(
+                (self.vector_store.docstore.search(doc_id), distance)
+            )
+        return docs_and_scores
+
     async def delete_document(self, document_id: str, chunk_count: int = None) -> bool:
         """Delete document vectors from the store."""
         try:
@@ -1105,6 +913,8 @@ class VectorizationService:
 
             if hasattr(self.vector_store, "delete"):
                 result = self.vector_store.delete(ids_to_delete)
+                # Deletion renumbers FAISS positions; rebuild the side index lazily
+                self._metadata_index = None
                 logger.info("Deleted vectors", document_id=document_id, result=result)
                 # Save after deletion
                 index_path = Path(settings.UPLOAD_DIR) / "faiss_index"
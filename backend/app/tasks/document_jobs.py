@@ -0,0 +1,102 @@
+"""Job handlers for document ingestion and re-vectorization."""
+
+from typing import Any, Dict
+
+import structlog
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import async_session_factory
+from app.models.document import Document, ExtractionStatus
+from app.models.queue_request import QueueRequest
+from app.services.job_queue import (
+    JobContext,
+    register_job_failure_hook,
+    register_job_handler,
+)
+from app.services.knowledge_base import knowledge_base_manager
+
+logger = structlog.get_logger(__name__)
+
+INGEST_DOCUMENT_JOB = "document.ingest"
+REVECTORIZE_DOCUMENT_JOB = "document.revectorize"
+
+
+async def _set_document_failed(db: AsyncSession, document_id: str, error: str) -> None:
+    await db.execute(
+        update(Document)
+        .where(Document.id == document_id)
+        .values(
+            extraction_status=ExtractionStatus.FAILED.value,
+            extraction_error=error[:500],
+        )
+    )
+
+
+async def _mark_document_failed(document_id: str, error: str) -> None:
+    async with async_session_factory() as db:
+        await _set_document_failed(db, document_id, error)
+        await db.commit()
+
+
+@register_job_failure_hook(INGEST_DOCUMENT_JOB)
+@register_job_failure_hook(REVECTORIZE_DOCUMENT_JOB)
+async def document_job_failed(db: AsyncSession, job: QueueRequest, error: str) -> None:
+    """A document whose job the queue gave up on is no longer PROCESSING."""
+    document_id = (job.payload or {}).get("document_id")
+    if document_id:
+        await _set_document_failed(db, document_id, error)
+
+
+async def _settle(
+    ctx: JobContext, document_id: str, result: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Raise on failure so the queue can retry; mark FAILED on the final attempt."""
+    if result.get("success"):
+        return result
+
+    error = result.get("error") or "Document processing failed"
+    if ctx.is_final_attempt:
+        await _mark_document_failed(document_id, error)
+    raise RuntimeError(error)
+
+
+@register_job_handler(INGEST_DOCUMENT_JOB)
+async def ingest_document(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract, chunk and vectorize an uploaded document."""
+    document_id = payload["document_id"]
+    await ctx.report_progress(10, "extracting")
+
+    async with async_session_factory() as db:
+        result = await knowledge_base_manager.add_document(
+            file_path=payload["file_path"],
+            file_type=payload["file_type"],
+            document_id=document_id,
+            metadata=payload.get("metadata") or {},
+            db_session=db,
+        )
+
+    await ctx.report_progress(90, "indexed")
+    return await _settle(ctx, document_id, result)
+
+
+@register_job_handler(REVECTORIZE_DOCUMENT_JOB)
+async def revectorize_document(
+    ctx: JobContext, payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Delete and rebuild the vectors of an existing document."""
+    document_id = payload["document_id"]
+    await ctx.report_progress(10, "revectorizing")
+
+    async with async_session_factory() as db:
+        result = await knowledge_base_manager.revectorize_document(
+            document_id=document_id,
+            file_path=payload["file_path"],
+            file_type=payload["file_type"],
+            metadata=payload.get("metadata") or {},
+            chunk_count=payload.get("chunk_count"),
+            db_session=db,
+        )
+
+    await ctx.report_progress(90, "indexed")
+    return await _settle(ctx, document_id, result)
@@ -0,0 +1,46 @@
+"""
+Standalone job worker process.
+
+Runs the durable job queue worker pool outside the API process so that
+document ingestion does not compete with request handling:
+
+    JOB_WORKER_MODE=external uvicorn app.main:app ...   # API only enqueues
+    python -m app.tasks.worker                           # one or more workers
+"""
+
+import asyncio
+import signal
+
+import structlog
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.services.job_queue import job_queue, JobWorkerPool
+
+logger = structlog.get_logger(__name__)
+
+
+async def run_worker() -> None:
+    pool = JobWorkerPool(job_queue, concurrency=settings.JOB_WORKER_CONCURRENCY)
+
+    # Reclaim jobs left behind by crashed workers before accepting new ones
+    await job_queue.requeue_stale()
+    pool.start()
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    await stop_event.wait()
+    logger.info("Shutting down job worker")
+    await pool.stop()
+
+
+def main() -> None:
+    setup_logging()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from unittest.mock import AsyncMock
+
+from app.agents.harvest_engine import (
+    HarvestCheckpoint,
+    HarvestEngine,
+    HarvestStage,
+    HostRateLimiter,
+    bounded_map,
+)
+
+
+@pytest.mark.asyncio
+async def test_bounded_map_caps_concurrency_and_keeps_order():
+    in_flight = 0
+    peak = 0
+
+    async def worker(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if item == 3:
+            raise ValueError("bad item")
+        return item * 2
+
+    results = await bounded_map(range(10), worker, concurrency=3)
+
+    assert peak <= 3
+    assert results[:3] == [0, 2, 4]
+    assert isinstance(results[3], ValueError)
+    assert results[9] == 18
+
+
+@pytest.mark.asyncio
+async def test_engine_runs_stages_concurrently_and_aggregates_progress():
+    reported = []
+
+    async def on_progress(p):
+        reported.append(p)
+
+    async def slow_stage(progress):
+        await asyncio.sleep(0.05)
+        return [{"id": 1}]
+
+    async def failing_stage(progress):
+        await progress(0.5)
+        raise RuntimeError("boom")
+
+    stages = [
+        HarvestStage(name="a", run=slow_stage, collection="c1", weight=1.0),
+        HarvestStage(name="b", run=slow_stage, collection="c2", weight=1.0),
+        HarvestStage(name="c", run=failing_stage, collection="c3", weight=2.0),
+    ]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    outcomes = await HarvestEngine(stage_concurrency=3).run(stages, on_progress)
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.1  # both slow stages overlapped
+    assert [stage.name for stage, _ in outcomes] == ["a", "b", "c"]
+    assert outcomes[0][1] == [{"id": 1}]
+    assert isinstance(outcomes[2][1], RuntimeError)
+    assert reported == sorted(reported)
+    assert reported[-1] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_engine_skips_checkpointed_stages_and_records_completed_ones():
+    ran = []
+
+    def stage(name, fail=False):
+        async def run(progress):
+            ran.append(name)
+            if fail:
+                raise RuntimeError("boom")
+            return [{"id": name}]
+
+        return HarvestStage(name=name, run=run, collection="c")
+
+    save = AsyncMock()
+    checkpoint = HarvestCheckpoint(
+        {"completed_stages": ["a"], "stages": {"b": {"cursor": 3}}}, save=save
+    )
+    assert checkpoint.resumed
+
+    outcomes = await HarvestEngine().run(
+        [stage("a"), stage("b"), stage("c", fail=True)], checkpoint=checkpoint
+    )
+
+    assert sorted(ran) == ["b", "c"]
+    assert [s.name for s, _ in outcomes] == ["b", "c"]
+    assert checkpoint.is_stage_done("b") and not checkpoint.is_stage_done("c")
+    saved = save.await_args.args[0]
+    assert saved["completed_stages"] == ["a", "b"]
+    assert saved["stages"] == {} and "saved_at" in saved
+
+
+@pytest.mark.asyncio
+async def test_host_rate_limiter_spaces_requests_to_same_host():
+    limiter = HostRateLimiter(max_concurrency=2, min_interval=0.02)
+    loop = asyncio.get_running_loop()
+    starts = []
+
+    async def fetch(url):
+        async with limiter.limit(url):
+            starts.append(loop.time())
+
+    await asyncio.gather(*(fetch("https://api.example.com/x") for _ in range(3)))
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.018 for gap in gaps)
@@ -0,0 +1,107 @@
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.agents import ingestor as ingestor_module
+from app.agents.ingestor import VitesseIngestor
+
+SPEC = '{"openapi": "3.0.0", "paths": {}}'
+DOCS = "<html><body>Docs</body></html>"
+
+
+@pytest.fixture
+def fetch_env():
+    """Run fetches against a mock transport, without the spec cache."""
+    ingestor_module._spec_paths_by_host.clear()
+    routes = {}
+
+    async def handler(request):
+        route = routes.get(request.url.path)
+        if route is None:
+            return httpx.Response(404)
+        delay, body = route
+        await asyncio.sleep(delay)
+        return httpx.Response(200, text=body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch("app.agents.ingestor.http_clients") as http_clients, patch.object(
+        ingestor_module.settings, "SPEC_CACHE_ENABLED", False
+    ):
+        http_clients.get.return_value = client
+        yield VitesseIngestor(context=MagicMock(), agent_id="ingestor-test"), routes
+
+
+@pytest.mark.asyncio
+async def test_spec_beats_docs_page_and_its_path_is_tried_first_next_time(fetch_env):
+    ingestor, routes = fetch_env
+    routes["/docs"] = (0, DOCS)
+    routes["/docs/openapi.json"] = (0.05, SPEC)
+
+    assert await ingestor._fetch_spec("https://api.test/docs") == SPEC
+
+    candidates = ingestor._spec_candidates("https://api.test/other", None)
+    assert candidates[0] == "https://api.test/docs/openapi.json"
+
+
+@pytest.mark.asyncio
+async def test_docs_page_is_returned_when_no_candidate_serves_a_spec(fetch_env):
+    ingestor, routes = fetch_env
+    routes["/docs"] = (0, DOCS)
+
+    assert await ingestor._fetch_spec("https://api.test/docs") == DOCS
+
+
+@pytest.mark.asyncio
+async def test_docs_page_does_not_wait_out_the_deadline_for_slow_candidates(
+    fetch_env,
+):
+    ingestor, routes = fetch_env
+    routes["/docs"] = (0, DOCS)
+    routes["/docs/swagger.json"] = (30, SPEC)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with patch.object(
+        ingestor_module.settings, "SPEC_PROBE_DEADLINE_SECONDS", 20
+    ), patch.object(ingestor_module.settings, "SPEC_PROBE_GRACE_SECONDS", 0.1):
+        content = await ingestor._fetch_spec("https://api.test/docs")
+
+    assert content == DOCS
+    assert loop.time() - started < 1
+
+
+def test_remembered_spec_paths_are_bounded(monkeypatch):
+    ingestor_module._spec_paths_by_host.clear()
+    monkeypatch.setattr(ingestor_module, "SPEC_PATH_HOSTS_MAX", 2)
+
+    for host in ("a.test", "b.test", "c.test"):
+        ingestor_module._remember_spec_path(f"https://{host}/openapi.json")
+
+    assert list(ingestor_module._spec_paths_by_host) == ["b.test", "c.test"]
+
+
+@pytest.mark.asyncio
+async def test_stalled_candidate_is_cut_off_at_the_shared_deadline(fetch_env):
+    ingestor, routes = fetch_env
+    routes["/stalled.json"] = (30, SPEC)
+    routes["/docs/swagger.json"] = (0, SPEC)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with patch.object(ingestor_module.settings, "SPEC_PROBE_DEADLINE_SECONDS", 0.2):
+        content = await ingestor._fetch_spec(
+            "https://api.test/docs", spec_url="https://api.test/stalled.json"
+        )
+
+    assert content == SPEC
+    assert loop.time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_fails_with_details_when_nothing_answers(fetch_env):
+    ingestor, _ = fetch_env
+
+    with pytest.raises(Exception, match="Could not fetch data"):
+        await ingestor._fetch_spec("https://api.test/docs")
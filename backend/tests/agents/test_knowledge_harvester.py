@@ -0,0 +1,259 @@
+"""
+Unit tests for KnowledgeHarvester deep spec harvesting.
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.agents.harvest_engine import HarvestCheckpoint
+from app.agents.knowledge_harvester import HarvestRun, KnowledgeHarvester
+from app.core.http_fetch import FetchResult
+from app.core.knowledge_db import API_ENDPOINTS_COLLECTION
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pay", "version": "1"},
+    "paths": {
+        "/charges": {
+            "get": {"summary": "List charges"},
+            "post": {"summary": "Create charge"},
+        }
+    },
+}
+
+
+@pytest.fixture
+def harvester():
+    agent = KnowledgeHarvester(context=MagicMock(), agent_id="harvester-test")
+    agent.knowledge_db = MagicMock()
+    agent.knowledge_db.add_documents = AsyncMock(
+        side_effect=lambda collection, documents, ids: ids
+    )
+    agent.knowledge_db.delete_document = AsyncMock(return_value=True)
+    return agent
+
+
+def _entry(provider, categories, url=True):
+    return {
+        "api_name": provider,
+        "provider": provider,
+        "version": "1",
+        "categories": categories,
+        "openapi_url": f"https://specs.test/{provider}.json" if url else None,
+        "swagger_url": None,
+    }
+
+
+def test_deep_spec_targets_filter_categories_and_cap(harvester):
+    entries = [
+        _entry("a", ["payment"]),
+        _entry("b", ["media"]),
+        _entry("c", ["financial"], url=False),
+        _entry("d", ["Financial"]),
+        _entry("e", ["ecommerce"]),
+    ]
+    with patch("app.agents.knowledge_harvester.settings") as mock_settings:
+        mock_settings.HARVEST_DEEP_SPECS_CATEGORIES = ["financial", "payment"]
+        mock_settings.HARVEST_DEEP_SPECS_MAX = 2
+        targets = harvester._select_deep_spec_targets(entries)
+
+    assert [t["provider"] for t in targets] == ["a", "d"]
+    assert targets[0]["spec_url"] == "https://specs.test/a.json"
+
+
+@pytest.mark.asyncio
+async def test_spec_endpoints_are_indexed_and_stale_ones_removed(harvester):
+    target = {**_entry("pay", ["payment"]), "spec_url": "https://specs.test/pay.json"}
+    fetched = FetchResult(
+        url=target["spec_url"],
+        scope="harvest:deep_spec",
+        status_code=200,
+        content=json.dumps(SPEC).encode(),
+        meta={"endpoint_ids": ["old-endpoint"]},
+    )
+
+    with patch("app.agents.knowledge_harvester.conditional_fetcher") as fetcher:
+        fetcher.get = AsyncMock(return_value=fetched)
+        fetcher.record = AsyncMock()
+        result = await harvester._harvest_spec_document(target)
+
+    assert result["endpoints"] == 2
+    call = harvester.knowledge_db.add_documents.await_args
+    assert call.kwargs["collection"] == API_ENDPOINTS_COLLECTION
+    assert {d["method"] for d in call.kwargs["documents"]} == {"GET", "POST"}
+    harvester.knowledge_db.delete_document.assert_awaited_once_with(
+        API_ENDPOINTS_COLLECTION, "old-endpoint"
+    )
+    recorded_ids = fetcher.record.await_args.kwargs["meta"]["endpoint_ids"]
+    assert recorded_ids == call.kwargs["ids"]
+
+
+@pytest.mark.asyncio
+async def test_unmodified_spec_is_not_reindexed(harvester):
+    target = {**_entry("pay", ["payment"]), "spec_url": "https://specs.test/pay.json"}
+    fetched = FetchResult(
+        url=target["spec_url"],
+        scope="harvest:deep_spec",
+        status_code=304,
+        not_modified=True,
+        unchanged=True,
+    )
+
+    with patch("app.agents.knowledge_harvester.conditional_fetcher") as fetcher:
+        fetcher.get = AsyncMock(return_value=fetched)
+        fetcher.record = AsyncMock()
+        assert await harvester._harvest_spec_document(target) is None
+
+    harvester.knowledge_db.add_documents.assert_not_called()
+    fetcher.record.assert_not_called()
+
+
+def _directory_stream(directory, etag):
+    body = json.dumps(directory).encode()
+    fetched = MagicMock(not_modified=False, status_code=200, validator=etag)
+    fetched.fraction_read = None
+    fetched.meta = {}
+
+    async def iter_bytes():
+        yield body
+
+    fetched.iter_bytes = iter_bytes
+
+    @asynccontextmanager
+    async def stream(url, scope):
+        yield fetched
+
+    return stream
+
+
+def _directory(providers):
+    return {
+        p: {"1": {"info": {"title": p, "description": f"{p} API"}}} for p in providers
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "etag,expected",
+    [('"v1"', ["c", "d"]), ('"v2"', ["a", "b", "c", "d"])],
+    ids=["same-directory", "directory-changed"],
+)
+async def test_directory_harvest_resumes_after_checkpointed_providers(
+    harvester, etag, expected
+):
+    url = harvester.harvest_sources["api_directories"][0]
+    run = HarvestRun(
+        HarvestCheckpoint(
+            {
+                "stages": {
+                    "apis_guru": {
+                        "directories": {url: {"version": '"v1"', "provider_index": 2}}
+                    }
+                }
+            }
+        )
+    )
+    checked = []
+
+    async def changed(info):
+        checked.append(info["provider"])
+        return None
+
+    harvester._directory_api_changed = changed
+    with patch("app.agents.knowledge_harvester.conditional_fetcher") as fetcher:
+        fetcher.stream = _directory_stream(_directory(["a", "b", "c", "d"]), etag)
+        fetcher.record = AsyncMock()
+        await harvester._harvest_api_directory(run=run)
+
+    assert sorted(checked) == expected
+    cursor = run.checkpoint.get("apis_guru")["directories"][url]
+    assert cursor == {"version": etag, "provider_index": 4, "last_provider": "d"}
+    fetcher.record.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_directory_fetch_failure_fails_the_stage(harvester):
+    run = HarvestRun()
+    run.deep_spec_targets = asyncio.get_running_loop().create_future()
+    with patch("app.agents.knowledge_harvester.conditional_fetcher") as fetcher:
+        fetcher.stream = _directory_stream({}, '"v1"')
+        fetcher.record = AsyncMock()
+        with patch.object(
+            harvester, "rate_limiter", MagicMock(limit=MagicMock(side_effect=OSError))
+        ), pytest.raises(RuntimeError, match="API directories"):
+            await harvester._harvest_api_directory(run=run)
+
+    fetcher.record.assert_not_called()
+    # The deep spec stage is still released
+    assert run.deep_spec_targets.result() == []
+
+
+@pytest.mark.asyncio
+async def test_patterns_are_embedded_in_one_batch_with_per_item_states(harvester):
+    harvester.knowledge_db.get_harvest_source_state = AsyncMock(return_value=None)
+    harvester.knowledge_db.update_harvest_source_states = AsyncMock(return_value=4)
+    # The second document is rejected by the store
+    harvester.knowledge_db.add_documents = AsyncMock(
+        side_effect=lambda collection, documents, ids: ids[:1] + ids[2:]
+    )
+
+    harvested = await harvester._harvest_patterns()
+
+    harvester.knowledge_db.add_documents.assert_awaited_once()
+    documents = harvester.knowledge_db.add_documents.await_args.kwargs["documents"]
+    assert len(documents) == 4
+    assert len(harvested) == 3
+    assert "Pagination Handling" not in {h["pattern"] for h in harvested}
+
+    harvester.knowledge_db.update_harvest_source_states.assert_awaited_once()
+    states = harvester.knowledge_db.update_harvest_source_states.await_args.args[0]
+    # The rejected document gets no state, so it is retried next run
+    recorded = [key for key, _, _ in states]
+    assert len(recorded) == 3
+    assert "pattern:Pagination Handling" not in recorded
+
+
+@pytest.mark.asyncio
+async def test_failed_upsert_records_no_states(harvester):
+    harvester.knowledge_db.get_harvest_source_state = AsyncMock(return_value=None)
+    harvester.knowledge_db.update_harvest_source_states = AsyncMock(return_value=0)
+    # The Qdrant backend logs upsert errors and returns no ids
+    harvester.knowledge_db.add_documents = AsyncMock(return_value=[])
+
+    assert await harvester._harvest_patterns() == []
+
+    harvester.knowledge_db.update_harvest_source_states.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_overlapping_runs_keep_their_own_checkpoints(harvester):
+    harvester.knowledge_db.get_harvest_source_state = AsyncMock(return_value=None)
+    harvester.knowledge_db.update_harvest_source_states = AsyncMock(return_value=4)
+    resumed = HarvestRun(
+        HarvestCheckpoint({"completed_stages": ["regulatory_standards"]})
+    )
+    fresh = HarvestRun()
+
+    await asyncio.gather(
+        harvester._harvest_knowledge("standards", run=resumed),
+        harvester._harvest_knowledge("patterns", run=fresh),
+    )
+
+    assert fresh.checkpoint.state["completed_stages"] == ["integration_patterns"]
+    assert resumed.checkpoint.state["completed_stages"] == ["regulatory_standards"]
+
+
+@pytest.mark.asyncio
+async def test_total_skipped_unchanged_sums_stage_counts(harvester):
+    # Two of the four patterns are unchanged since the last run
+    harvester._should_process_source = AsyncMock(side_effect=[True, False] * 2)
+    harvester.knowledge_db.update_harvest_source_states = AsyncMock(return_value=2)
+
+    result = await harvester._harvest_knowledge("patterns", run=HarvestRun())
+
+    assert result["total_harvested"] == 2
+    assert result["total_skipped_unchanged"] == 2
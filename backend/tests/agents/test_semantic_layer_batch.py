@@ -0,0 +1,185 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.semantic.layer import (
+    FieldMappingProposal,
+    SemanticLayer,
+    SemanticMappingBatch,
+)
+
+SOURCE = {
+    "properties": {
+        "customer_name": {"type": "string", "description": "Full name"},
+        "customer_email": {"type": "string"},
+    }
+}
+
+
+def _dest(count):
+    return {"properties": {f"field_{i}": {"type": "string"} for i in range(count)}}
+
+
+@pytest.fixture
+def layer():
+    layer = SemanticLayer.__new__(SemanticLayer)
+    layer.db = AsyncMock()
+    layer.embeddings = None
+    layer.get_similar_mappings_batch = AsyncMock(
+        side_effect=lambda fields, limit: [[] for _ in fields]
+    )
+    return layer
+
+
+@pytest.fixture
+def llm_service():
+    with patch("app.services.semantic.layer.LLMProviderService") as service, patch(
+        "app.services.semantic.layer.async_session_factory"
+    ) as factory:
+        factory.return_value.__aenter__ = AsyncMock(return_value=MagicMock())
+        factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        service.create_llm = AsyncMock(return_value=MagicMock())
+        yield service
+
+
+def _batch_answer(in_flight, peak):
+    async def invoke(prompt, schema, **kwargs):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        fields = [
+            line.split("Name: ")[1].strip()
+            for line in prompt.splitlines()
+            if "Name: " in line
+        ]
+        return SemanticMappingBatch(
+            mappings=[
+                FieldMappingProposal(
+                    dest_field=name,
+                    source_field="customer_name",
+                    transform_type="direct",
+                    confidence=20 if name == "field_3" else 90,
+                    reasoning="match",
+                )
+                for name in fields
+            ]
+        )
+
+    return invoke
+
+
+@pytest.mark.asyncio
+async def test_fields_are_mapped_in_concurrent_groups(layer, llm_service):
+    in_flight, peak = [0], [0]
+    llm_service.invoke_structured_with_monitoring = AsyncMock(
+        side_effect=_batch_answer(in_flight, peak)
+    )
+
+    with patch.multiple(
+        "app.services.semantic.layer.settings",
+        SEMANTIC_MAPPING_BATCH_SIZE=4,
+        SEMANTIC_MAPPING_CONCURRENCY=2,
+    ):
+        transformations, complete = await layer.map_schema_with_status(
+            SOURCE, _dest(12), "Sync"
+        )
+
+    calls = llm_service.invoke_structured_with_monitoring.await_args_list
+    assert len(calls) == 3
+    assert all(call.kwargs["schema"] is SemanticMappingBatch for call in calls)
+    assert all(call.kwargs["prompt"].count("customer_email") == 1 for call in calls)
+    assert peak[0] == 2
+    # field_3 was proposed with low confidence; order follows the dest schema
+    assert [t.dest_field for t in transformations] == [
+        f"field_{i}" for i in range(12) if i != 3
+    ]
+    assert layer.get_similar_mappings_batch.await_count == 1
+    assert complete is True
+
+
+@pytest.mark.asyncio
+async def test_failed_group_and_missing_fields_are_left_unmapped(layer, llm_service):
+    answer = _batch_answer([0], [0])
+    attempts = []
+
+    async def invoke(prompt, schema, **kwargs):
+        attempts.append(prompt)
+        if len(attempts) == 1:
+            raise RuntimeError("LLM unavailable")
+        result = await answer(prompt, schema)
+        result.mappings = result.mappings[:1]  # the LLM skipped a field
+        return result
+
+    llm_service.invoke_structured_with_monitoring = AsyncMock(side_effect=invoke)
+
+    with patch.multiple(
+        "app.services.semantic.layer.settings",
+        SEMANTIC_MAPPING_BATCH_SIZE=2,
+        SEMANTIC_MAPPING_CONCURRENCY=1,
+    ):
+        transformations, complete = await layer.map_schema_with_status(
+            SOURCE, _dest(4), "Sync"
+        )
+
+    assert [t.dest_field for t in transformations] == ["field_2"]
+    assert complete is False
+
+
+@pytest.mark.asyncio
+async def test_batch_size_one_keeps_single_field_calls(layer, llm_service):
+    proposal = MagicMock(
+        source_field="customer_name",
+        transform_type="direct",
+        confidence=90,
+        reasoning="Name match",
+    )
+    llm_service.invoke_structured_with_monitoring = AsyncMock(return_value=proposal)
+
+    transformations = await layer.map_schema(SOURCE, _dest(3), "Sync", batch_size=1)
+
+    calls = llm_service.invoke_structured_with_monitoring.await_args_list
+    assert len(calls) == 3
+    assert {call.kwargs["operation_name"] for call in calls} == {
+        "propose_field_mapping"
+    }
+    assert all(call.kwargs["db"] is layer.db for call in calls)
+    assert len(transformations) == 3
+
+
+@pytest.mark.asyncio
+async def test_examples_for_all_fields_come_from_one_lateral_query():
+    from sqlalchemy.dialects import postgresql
+
+    layer = SemanticLayer.__new__(SemanticLayer)
+    layer.embeddings = MagicMock()
+    layer.embeddings.aembed_documents = AsyncMock(return_value=[[0.1] * 384] * 3)
+    first, second, third = MagicMock(), MagicMock(), MagicMock()
+    result = MagicMock()
+    result.all.return_value = [(0, first), (0, second), (2, third)]
+    layer.db = AsyncMock()
+    layer.db.execute = AsyncMock(return_value=result)
+
+    examples = await layer.get_similar_mappings_batch(
+        [{"name": "email"}, {"name": "phone"}, {"name": "city"}], limit=2
+    )
+
+    assert examples == [[first, second], [], [third]]
+    layer.embeddings.aembed_documents.assert_awaited_once()
+    (stmt,) = layer.db.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "JOIN LATERAL" in sql
+    assert "CAST(queries.embedding AS VECTOR(384))" in sql
+
+
+@pytest.mark.asyncio
+async def test_embeddings_of_the_wrong_size_are_rejected():
+    layer = SemanticLayer.__new__(SemanticLayer)
+    layer.embeddings = MagicMock()
+    layer.embeddings.aembed_documents = AsyncMock(return_value=[[0.1] * 1536])
+    layer.db = AsyncMock()
+
+    with pytest.raises(ValueError, match="1536 dimensions"):
+        await layer.get_similar_mappings_batch([{"name": "email"}])
+    layer.db.execute.assert_not_awaited()
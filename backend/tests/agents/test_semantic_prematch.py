@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.semantic.layer import SemanticLayer, SemanticMappingBatch
+from app.services.semantic.prematch import (
+    FieldEmbeddingCache,
+    PreMatcher,
+    name_tokens,
+    normalize_name,
+    type_compatibility,
+)
+
+SOURCE = [
+    {"name": "email", "type": "string"},
+    {"name": "created_at", "type": "string"},
+    {"name": "total_amount", "type": "integer"},
+    {"name": "customer.first_name", "type": "string"},
+    {"name": "customer.last_name", "type": "string"},
+]
+
+
+def _embeddings():
+    """Embeds a text as its letter counts, so equal names embed equally."""
+
+    def embed(texts):
+        vectors = np.zeros((len(texts), 26))
+        for row, text in enumerate(texts):
+            for char in text.lower():
+                if "a" <= char <= "z":
+                    vectors[row, ord(char) - 97] += 1
+        return vectors.tolist()
+
+    embeddings = MagicMock()
+    embeddings.aembed_documents = AsyncMock(side_effect=embed)
+    return embeddings
+
+
+def test_names_normalize_across_conventions():
+    assert name_tokens("billing.postalCode") == ["billing", "postal", "code"]
+    assert name_tokens("HTTPStatus_ID") == ["http", "status", "id"]
+    assert normalize_name("createdAt") == normalize_name("created_at") == "createdat"
+    assert type_compatibility("integer", "number") == 0.9
+    assert type_compatibility("integer", "string") < type_compatibility(None, "x")
+
+
+@pytest.mark.asyncio
+async def test_obvious_fields_are_matched_and_the_rest_left_for_the_llm():
+    dest = [
+        {"name": "email", "type": "string", "required": True},
+        {"name": "createdAt", "type": "string"},
+        {"name": "totalAmount", "type": "number"},
+        {"name": "totalAmountText", "type": "string"},
+        {"name": "full_name", "type": "string"},
+        {"name": "amount", "type": "object"},
+    ]
+    matcher = PreMatcher(0.85, embeddings=_embeddings(), cache=FieldEmbeddingCache())
+
+    matched, pending = await matcher.match(SOURCE, dest)
+
+    assert {i: t.source_field for i, t in matched.items()} == {
+        0: "email",
+        1: "created_at",
+        2: "total_amount",
+    }
+    assert matched[0].required is True
+    assert matched[0].transform_config["matched_by"] == "prematch"
+    assert pending == [3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_are_computed_once_per_field_text():
+    embeddings = _embeddings()
+    cache = FieldEmbeddingCache()
+    matcher = PreMatcher(0.85, embeddings=embeddings, cache=cache)
+
+    await matcher.match(SOURCE, [{"name": "email"}])
+    await matcher.match(SOURCE, [{"name": "email"}, {"name": "phone"}])
+
+    batches = [call.args[0] for call in embeddings.aembed_documents.await_args_list]
+    assert batches[1] == ["phone"]
+
+
+@pytest.mark.asyncio
+async def test_failed_embeddings_fall_back_to_names():
+    embeddings = MagicMock()
+    embeddings.aembed_documents = AsyncMock(side_effect=RuntimeError("no model"))
+    matcher = PreMatcher(0.85, embeddings=embeddings, cache=FieldEmbeddingCache())
+
+    matched, pending = await matcher.match(SOURCE, [{"name": "Email"}, {"name": "x"}])
+
+    assert matched[0].source_field == "email"
+    assert pending == [1]
+
+
+@pytest.mark.asyncio
+async def test_map_schema_sends_only_ambiguous_fields_to_the_llm():
+    layer = SemanticLayer.__new__(SemanticLayer)
+    layer.db = AsyncMock()
+    layer.embeddings = None
+    layer.get_similar_mappings_batch = AsyncMock(
+        side_effect=lambda fields, limit: [[] for _ in fields]
+    )
+    proposal = MagicMock(
+        source_field="customer.first_name",
+        transform_type="concat",
+        confidence=80,
+        reasoning="name parts",
+    )
+    source = {
+        "properties": {
+            "email": {"type": "string"},
+            "customer": {
+                "type": "object",
+                "properties": {"first_name": {"type": "string"}},
+            },
+        }
+    }
+    dest = {
+        "properties": {
+            "fullName": {"type": "string"},
+            "Email": {"type": "string"},
+        }
+    }
+
+    with patch("app.services.semantic.layer.LLMProviderService") as service:
+        service.create_llm = AsyncMock(return_value=MagicMock())
+        service.invoke_structured_with_monitoring = AsyncMock(return_value=proposal)
+        transformations = await layer.map_schema(source, dest, "Sync")
+
+    (call,) = service.invoke_structured_with_monitoring.await_args_list
+    assert call.kwargs["schema"] is not SemanticMappingBatch
+    assert "fullName" in call.kwargs["prompt"]
+    layer.get_similar_mappings_batch.assert_awaited_once()
+    assert [(t.dest_field, t.source_field) for t in transformations] == [
+        ("fullName", "customer.first_name"),
+        ("Email", "email"),
+    ]
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.agents.vitesse_orchestrator import VitesseOrchestrator
+
+
+def _orchestrator(ingest_api) -> VitesseOrchestrator:
+    orchestrator = VitesseOrchestrator.__new__(VitesseOrchestrator)
+    orchestrator._ingest_api = ingest_api
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_ingest_both_runs_sides_concurrently_and_reports_timings():
+    async def ingest_api(api_url, api_name, auth_details=None, spec_url=None):
+        await asyncio.sleep(0.05)
+        return {"status": "success", "api_spec": {"api_name": api_name}}
+
+    orchestrator = _orchestrator(ingest_api)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    ingested = await orchestrator._ingest_both(
+        source={"api_url": "https://a.example", "api_name": "A"},
+        dest={"api_url": "https://b.example", "api_name": "B"},
+    )
+    elapsed = loop.time() - started
+
+    assert elapsed < 0.09  # the two sides overlapped
+    assert ingested["source"]["api_spec"] == {"api_name": "A"}
+    assert ingested["dest"]["api_spec"] == {"api_name": "B"}
+    assert set(ingested["timings"]) == {"source", "dest"}
+    assert all(t >= 0.05 for t in ingested["timings"].values())
+
+
+@pytest.mark.asyncio
+async def test_ingest_both_cancels_the_other_side_when_one_fails():
+    cancelled = asyncio.Event()
+
+    async def ingest_api(api_url, api_name, auth_details=None, spec_url=None):
+        if api_name == "A":
+            await asyncio.sleep(0.01)
+            return {"status": "failed", "error": "spec not found"}
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return {"status": "success", "api_spec": {}}
+
+    orchestrator = _orchestrator(ingest_api)
+
+    with pytest.raises(Exception, match="Source API ingestion failed: spec not found"):
+        await asyncio.wait_for(
+            orchestrator._ingest_both(
+                source={"api_url": "https://a.example", "api_name": "A"},
+                dest={"api_url": "https://b.example", "api_name": "B"},
+            ),
+            timeout=1,
+        )
+    assert cancelled.is_set()
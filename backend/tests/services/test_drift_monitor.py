@@ -0,0 +1,104 @@
+import json
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.http_fetch import FetchResult
+from app.tasks import monitor
+
+STORED = {
+    "api_name": "shop",
+    "source_url": "https://shop.test/openapi.json",
+    "endpoints": [{"path": "/orders", "method": "GET"}],
+}
+LATEST = {"api_name": "shop", "endpoints": []}
+
+
+def _integration(integration_id):
+    integration = MagicMock()
+    integration.id = integration_id
+    integration.source_api_spec = STORED
+    return integration
+
+
+def _session(integrations):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = integrations
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_validators_are_recorded_per_integration_after_the_check():
+    async def get(url, scope, record):
+        assert record is False
+        return FetchResult(
+            url=url, scope=scope, status_code=200, content=json.dumps(LATEST).encode()
+        )
+
+    report = MagicMock(drift_type="none", severity="none")
+    with patch.object(
+        monitor,
+        "async_session_factory",
+        return_value=_session([_integration(1), _integration(2)]),
+    ), patch.object(monitor, "conditional_fetcher") as fetcher, patch.object(
+        monitor, "spec_store"
+    ) as store, patch.object(
+        monitor, "mapping_cache"
+    ) as cache, patch.object(
+        monitor, "SchemaDriftDetector"
+    ) as detector:
+        fetcher.get = AsyncMock(side_effect=get)
+        fetcher.record = AsyncMock()
+        store.expand = AsyncMock(side_effect=lambda spec: spec)
+        # The check fails for the first integration only
+        detector.return_value.detect_drift.side_effect = [
+            RuntimeError("bad spec"),
+            report,
+        ]
+
+        await monitor.check_integrations_for_drift()
+
+    scopes = [call.kwargs["scope"] for call in fetcher.get.await_args_list]
+    assert scopes == ["drift_monitor:1", "drift_monitor:2"]
+    recorded = [call.args[0].scope for call in fetcher.record.await_args_list]
+    assert recorded == ["drift_monitor:2"]
+
+
+@pytest.mark.asyncio
+async def test_validators_are_recorded_only_while_there_is_no_drift():
+    async def get(url, scope, record):
+        return FetchResult(
+            url=url, scope=scope, status_code=200, content=json.dumps(LATEST).encode()
+        )
+
+    reports = [
+        MagicMock(drift_type="non_breaking", severity="low"),
+        MagicMock(drift_type="none", severity="none"),
+    ]
+    with patch.object(
+        monitor,
+        "async_session_factory",
+        return_value=_session([_integration(1), _integration(2)]),
+    ), patch.object(monitor, "conditional_fetcher") as fetcher, patch.object(
+        monitor, "spec_store"
+    ) as store, patch.object(
+        monitor, "mapping_cache"
+    ) as cache, patch.object(
+        monitor, "SchemaDriftDetector"
+    ) as detector:
+        fetcher.get = AsyncMock(side_effect=get)
+        fetcher.record = AsyncMock()
+        store.expand = AsyncMock(side_effect=lambda spec: spec)
+        cache.invalidate_api = AsyncMock(return_value=0)
+        detector.return_value.detect_drift.side_effect = reports
+
+        await monitor.check_integrations_for_drift()
+
+    # The drifted integration is fetched in full again next time
+    recorded = [call.args[0].scope for call in fetcher.record.await_args_list]
+    assert recorded == ["drift_monitor:2"]
@@ -0,0 +1,26 @@
+from app.services.financial_patterns import (
+    EMPTY_MATCHER,
+    EXCEL_MATCHER,
+    PDF_MATCHERS,
+)
+
+
+def test_line_yields_every_matching_category_once():
+    matcher = PDF_MATCHERS["tax_return"]
+
+    # "total assets" and "assets ... end" both hit; each category is reported once
+    assert matcher.match("total assets at end of year") == [
+        "assets",
+        "schedule_l_assets",
+    ]
+
+
+def test_non_matching_text_returns_nothing():
+    assert PDF_MATCHERS["profit_loss"].match("page 12 of 340") == []
+    assert EMPTY_MATCHER.match("total revenue") == []
+
+
+def test_regex_fragments_are_preserved():
+    assert PDF_MATCHERS["balance_sheet"].match("owner's equity") == ["equity"]
+    assert EXCEL_MATCHER.match("stockholders equity") == ["equity"]
+    assert EXCEL_MATCHER.match("monthly rent") == ["expenses"]
@@ -0,0 +1,66 @@
+"""
+Unit tests for per-stage harvest metrics.
+"""
+
+import pytest
+
+from app.agents.harvest_engine import HarvestEngine, HarvestStage
+from app.core.harvest_metrics import (
+    HARVEST_PARSE_SECONDS,
+    current_harvest_stage,
+    harvest_metrics_snapshot,
+    harvest_stage,
+    observe_seconds,
+    record_dedup_check,
+    record_embedding_batch,
+    record_fetch,
+)
+
+
+def test_records_are_attributed_to_the_bound_stage_only():
+    # Outside a harvest nothing is recorded
+    record_fetch(1.0, 100)
+    record_dedup_check(unchanged=True)
+
+    with harvest_stage("metrics_test_stage"):
+        record_fetch(0.5, 1000)
+        record_fetch(1.5, 3000)
+        record_dedup_check(unchanged=True)
+        record_dedup_check(unchanged=True)
+        record_dedup_check(unchanged=True)
+        record_dedup_check(unchanged=False)
+        record_embedding_batch(10, 0.2)
+        record_embedding_batch(30, 0.4)
+        with observe_seconds(HARVEST_PARSE_SECONDS):
+            pass
+
+    snapshot = harvest_metrics_snapshot()
+    assert None not in snapshot
+    stage = snapshot["metrics_test_stage"]
+    assert stage["fetches"] == 2
+    assert stage["fetch_bytes"] == 4000
+    assert stage["avg_fetch_seconds"] == 1.0
+    assert stage["dedup_checks"] == 4
+    assert stage["dedup_hit_ratio"] == 0.75
+    assert stage["embedding_batches"] == 2
+    assert stage["avg_embedding_batch_size"] == 20
+    assert stage["avg_embedding_seconds"] == pytest.approx(0.3)
+    assert stage["avg_parse_seconds"] is not None
+    assert stage["runs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_engine_records_stage_runs_and_items():
+    seen_stage = {}
+
+    async def run_stage(progress):
+        seen_stage["name"] = current_harvest_stage()
+        return [{"id": i} for i in range(7)]
+
+    stage = HarvestStage("metrics_engine_stage", run_stage, collection="c")
+    await HarvestEngine(stage_concurrency=1).run([stage])
+
+    assert seen_stage["name"] == "metrics_engine_stage"
+    metrics = harvest_metrics_snapshot()["metrics_engine_stage"]
+    assert metrics["runs"] == 1
+    assert metrics["items_stored"] == 7
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from app.core.http_clients import HostLimitedTransport, HttpClientRegistry
+
+
+class _SlowTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def handle_async_request(self, request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return httpx.Response(200, content=b"ok")
+
+
+@pytest.mark.asyncio
+async def test_requests_are_capped_per_host():
+    inner = _SlowTransport()
+    transport = HostLimitedTransport(inner, per_host=2, name="test")
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(
+            *(client.get(f"https://a.test/{i}") for i in range(6)),
+            *(client.get(f"https://b.test/{i}") for i in range(2)),
+        )
+
+    # two hosts at two slots each
+    assert inner.peak <= 4
+    assert not any(transport.in_flight.values())
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_holds_slot_until_closed():
+    class _Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"x" * 10
+
+    transport = HostLimitedTransport(
+        httpx.MockTransport(lambda request: httpx.Response(200, stream=_Body())),
+        per_host=1,
+        name="test",
+    )
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", "https://a.test/big") as response:
+            assert transport.in_flight["a.test"] == 1
+            await response.aread()
+        assert transport.in_flight["a.test"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_releases_slot():
+    started = asyncio.Event()
+
+    async def hang(request):
+        started.set()
+        await asyncio.sleep(60)
+
+    inner = httpx.MockTransport(hang)
+    transport = HostLimitedTransport(inner, per_host=1, name="test")
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        task = asyncio.create_task(client.get("https://a.test/slow"))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert transport.in_flight["a.test"] == 0
+        inner.handler = lambda request: httpx.Response(200, content=b"ok")
+        response = await asyncio.wait_for(client.get("https://a.test/next"), 1)
+        assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_client_within_a_loop():
+    registry = HttpClientRegistry()
+    try:
+        first = registry.get()
+        assert registry.get() is first
+        assert "default" in registry.stats()
+    finally:
+        await registry.aclose()
+    assert registry.get() is not first
+    await registry.aclose()
+
+
+def test_client_is_closed_when_its_loop_finishes():
+    registry = HttpClientRegistry()
+
+    async def get():
+        return registry.get()
+
+    first = asyncio.run(get())
+    assert first.is_closed
+    second = asyncio.run(get())
+    assert second is not first
+    asyncio.run(registry.aclose())
+
+
+@pytest.mark.asyncio
+async def test_replaced_client_is_closed_on_its_own_loop():
+    registry = HttpClientRegistry()
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+
+    async def get():
+        return registry.get()
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(get(), other).result(1)
+        assert registry.get() is not old
+        for _ in range(100):
+            if old.is_closed:
+                break
+            await asyncio.sleep(0.01)
+        assert old.is_closed
+    finally:
+        await registry.aclose()
+        other.call_soon_threadsafe(other.stop)
+        thread.join(1)
+        other.close()
@@ -0,0 +1,113 @@
+import hashlib
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.http_fetch import ConditionalFetcher
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _cached(etag=None, last_modified=None, content_hash=None, meta=None):
+    entry = MagicMock()
+    entry.etag = etag
+    entry.last_modified = last_modified
+    entry.content_hash = content_hash
+    entry.meta = meta
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_sends_validators_and_skips_body_on_304():
+    seen_headers = {}
+
+    def handler(request):
+        seen_headers.update(request.headers)
+        return httpx.Response(304)
+
+    fetcher = ConditionalFetcher()
+    cached = _cached(etag='"v1"', last_modified="Mon, 01 Jan 2026 00:00:00 GMT")
+    cached.meta = {"api_count": 42}
+
+    with patch.object(fetcher, "_load", AsyncMock(return_value=cached)), patch.object(
+        fetcher, "_touch", AsyncMock()
+    ), patch.object(fetcher, "record", AsyncMock()) as record:
+        async with _client(handler) as client:
+            result = await fetcher.get("https://x.test/list.json", "t", client=client)
+
+    assert seen_headers["if-none-match"] == '"v1"'
+    assert seen_headers["if-modified-since"] == "Mon, 01 Jan 2026 00:00:00 GMT"
+    assert result.not_modified and result.unchanged
+    assert result.content is None
+    assert result.meta == {"api_count": 42}
+    record.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_new_content_is_returned_and_recorded():
+    body = b'{"a": 1}'
+
+    def handler(request):
+        assert "if-none-match" not in request.headers
+        return httpx.Response(200, content=body, headers={"ETag": '"v2"'})
+
+    fetcher = ConditionalFetcher()
+    with patch.object(fetcher, "_load", AsyncMock(return_value=None)), patch.object(
+        fetcher, "record", AsyncMock()
+    ) as record:
+        async with _client(handler) as client:
+            result = await fetcher.get("https://x.test/spec", "t", client=client)
+
+    assert not result.unchanged
+    assert result.parse_json() == {"a": 1}
+    assert result.etag == '"v2"'
+    record.assert_awaited_once_with(result, keep_body=False)
+
+
+@pytest.mark.asyncio
+async def test_identical_body_without_validators_is_unchanged():
+    body = b"same"
+
+    def handler(request):
+        return httpx.Response(200, content=body)
+
+    fetcher = ConditionalFetcher()
+    cached = _cached(content_hash=hashlib.sha256(body).hexdigest())
+    with patch.object(fetcher, "_load", AsyncMock(return_value=cached)), patch.object(
+        fetcher, "record", AsyncMock()
+    ) as record:
+        async with _client(handler) as client:
+            result = await fetcher.get(
+                "https://x.test/spec", "t", client=client, record=False
+            )
+
+    assert result.unchanged and not result.not_modified
+    record.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_hashes_body_and_defers_recording():
+    body = b'{"a": 1, "b": 2}'
+
+    def handler(request):
+        return httpx.Response(200, content=body, headers={"ETag": '"v3"'})
+
+    fetcher = ConditionalFetcher()
+    with patch.object(fetcher, "_load", AsyncMock(return_value=None)), patch.object(
+        fetcher, "record", AsyncMock()
+    ) as record:
+        async with _client(handler) as client:
+            async with fetcher.stream("https://x.test/big", "t", client=client) as f:
+                with pytest.raises(RuntimeError):
+                    f.result()
+                received = b"".join([chunk async for chunk in f.iter_bytes()])
+
+    result = f.result()
+    assert received == body
+    assert f.fraction_read == 1.0
+    assert result.content_hash == hashlib.sha256(body).hexdigest()
+    assert result.etag == '"v3"' and result.content is None
+    record.assert_not_called()
@@ -0,0 +1,116 @@
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.queue_request import QueueStatus
+from app.services.job_queue import (
+    JobQueueService,
+    JobWorkerPool,
+    register_job_failure_hook,
+    register_job_handler,
+)
+
+
+def _job(job_type, attempts=1, max_attempts=3):
+    job = MagicMock()
+    job.id = "job-1"
+    job.job_type = job_type
+    job.attempts = attempts
+    job.max_attempts = max_attempts
+    job.payload = {"document_id": "doc-1"}
+    return job
+
+
+def test_retry_delay_is_exponential():
+    queue = JobQueueService()
+    with patch("app.services.job_queue.settings") as mock_settings:
+        mock_settings.JOB_RETRY_BACKOFF_SECONDS = 10
+        assert queue.retry_delay(1) == 10
+        assert queue.retry_delay(2) == 20
+        assert queue.retry_delay(3) == 40
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_handler_and_completes():
+    handler = AsyncMock(return_value={"success": True})
+    register_job_handler("test.ok")(handler)
+
+    queue = MagicMock()
+    queue.complete = AsyncMock()
+    queue.fail = AsyncMock()
+    queue.heartbeat = AsyncMock()
+
+    pool = JobWorkerPool(queue, concurrency=1, poll_interval=0.01)
+    await pool._run_job(_job("test.ok"), "worker-0")
+
+    handler.assert_awaited_once()
+    ctx, payload = handler.await_args.args
+    assert ctx.job_id == "job-1"
+    assert payload == {"document_id": "doc-1"}
+    queue.complete.assert_awaited_once_with("job-1", {"success": True})
+    queue.fail.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_worker_records_failure_for_retry():
+    register_job_handler("test.boom")(AsyncMock(side_effect=RuntimeError("boom")))
+
+    queue = MagicMock()
+    queue.complete = AsyncMock()
+    queue.fail = AsyncMock(return_value=True)
+    queue.heartbeat = AsyncMock()
+
+    pool = JobWorkerPool(queue, concurrency=1, poll_interval=0.01)
+    job = _job("test.boom")
+    await pool._run_job(job, "worker-0")
+
+    queue.fail.assert_awaited_once_with(job, "boom")
+    queue.complete.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_type_is_not_retried():
+    queue = MagicMock()
+    queue.fail = AsyncMock(return_value=False)
+
+    pool = JobWorkerPool(queue, concurrency=1, poll_interval=0.01)
+    job = _job("test.missing", attempts=1, max_attempts=3)
+    await pool._run_job(job, "worker-0")
+
+    assert job.max_attempts == 1
+    queue.fail.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stale_jobs_are_retried_with_backoff_or_failed_when_exhausted():
+    retryable = _job("test.stale", attempts=1, max_attempts=3)
+    exhausted = _job("test.stale", attempts=3, max_attempts=3)
+    failed_hook = AsyncMock()
+    register_job_failure_hook("test.stale")(failed_hook)
+
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [retryable, exhausted]
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+    db.commit = AsyncMock()
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    queue = JobQueueService()
+    with patch(
+        "app.services.job_queue.async_session_factory", return_value=session
+    ), patch("app.services.job_queue.settings") as mock_settings:
+        mock_settings.JOB_HEARTBEAT_TIMEOUT = 60
+        mock_settings.JOB_RETRY_BACKOFF_SECONDS = 10
+        requeued = await queue.requeue_stale()
+
+    assert requeued == [retryable]
+    assert retryable.status == QueueStatus.PENDING
+    assert (retryable.available_at - datetime.utcnow()).total_seconds() > 5
+    assert exhausted.status == QueueStatus.FAILED
+    assert exhausted.error == "worker lost"
+    # e.g. the document is marked FAILED in the same transaction
+    failed_hook.assert_awaited_once_with(db, exhausted, "worker lost")
+    db.commit.assert_awaited_once()
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from app.core.json_stream import JSONStreamError, iter_object_items
+
+
+async def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+async def _collect(data: bytes, size: int):
+    return [item async for item in iter_object_items(_chunks(data, size))]
+
+
+DOCUMENT = {
+    "stripe.com": {"2020-08-27": {"info": {"title": "Stripé API"}, "n": [1, 2.5]}},
+    "count": 12345,
+    "flag": True,
+    "empty": {},
+    "nothing": None,
+    "text": "a, b: {c}",
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 10_000])
+async def test_yields_members_in_order_for_any_chunking(size):
+    data = json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode()
+
+    items = await _collect(data, size)
+
+    assert items == list(DOCUMENT.items())
+
+
+NESTED_NUMBERS = (
+    b'{"a": [1.5, -2, 3e-7, {"x": 1e3, "y": -0.25E+2}],'
+    b' "b": {"deep": [[10, 2.0], [-1E5]]}, "c": -12.75, "d": 7}'
+)
+
+
+async def _two_chunks(data: bytes, offset: int):
+    yield data[:offset]
+    yield data[offset:]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data",
+    [
+        json.dumps(DOCUMENT, ensure_ascii=False).encode(),
+        json.dumps(DOCUMENT, ensure_ascii=False, indent=2).encode(),
+        NESTED_NUMBERS,
+        b'{"a": [1.5]}',
+        b'{"a": {"x": 1e3}}',
+        b'{"a": [-1.5e-3, true, null]}',
+    ],
+)
+async def test_any_split_point_decodes_the_whole_document(data):
+    expected = list(json.loads(data).items())
+
+    for offset in range(len(data) + 1):
+        items = [item async for item in iter_object_items(_two_chunks(data, offset))]
+        assert items == expected, f"split at byte {offset}"
+
+
+@pytest.mark.asyncio
+async def test_empty_object_yields_nothing():
+    assert await _collect(b"  { }  ", 1) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data",
+    [b"[1, 2]", b'{"a": 1', b'{"a" 1}', b'{"a": 1 "b": 2}', b'{"a": 1} x', b"{1: 2}"],
+)
+async def test_malformed_input_raises(data):
+    with pytest.raises(JSONStreamError):
+        await _collect(data, 3)
+
+
+@pytest.mark.asyncio
+async def test_invalid_member_raises_without_reading_the_rest():
+    consumed = []
+
+    async def chunks():
+        yield b'{"a": x, "b": "'
+        while True:
+            consumed.append(1)
+            yield b"padding"
+
+    with pytest.raises(JSONStreamError):
+        async for _ in iter_object_items(chunks()):
+            pass
+
+    assert consumed == []
+
+
+@pytest.mark.asyncio
+async def test_oversized_member_raises():
+    data = json.dumps({"small": 1, "big": "x" * 5000}).encode()
+
+    items = []
+    with pytest.raises(JSONStreamError, match="exceeds"):
+        async for item in iter_object_items(_chunks(data, 100), max_member_chars=1000):
+            items.append(item)
+
+    assert items == [("small", 1)]
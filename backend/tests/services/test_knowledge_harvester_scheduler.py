@@ -0,0 +1,151 @@
+"""
+Unit tests for the knowledge harvester scheduler.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.agents.harvest_engine import HarvestCheckpoint
+from app.services import knowledge_harvester_scheduler as module
+from app.services.knowledge_harvester_scheduler import KnowledgeHarvesterScheduler
+
+
+def _session():
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=MagicMock())
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_harvest_with_failed_stages_keeps_checkpoint_and_fails_job():
+    scheduler = KnowledgeHarvesterScheduler()
+    scheduler.harvester = MagicMock()
+    scheduler.harvester.execute = AsyncMock(
+        return_value={
+            "status": "error",
+            "error": "HTTP 503",
+            "failed_stages": ["apis_guru"],
+            "total_harvested": 3,
+        }
+    )
+
+    with patch.object(
+        module, "async_session_factory", side_effect=lambda: _session()
+    ), patch.object(module, "HarvestJobService") as jobs:
+        jobs.fail_interrupted_harvest_jobs = AsyncMock(return_value=[])
+        jobs.get_resumable_harvest_job = AsyncMock(return_value=None)
+        jobs.create_harvest_job = AsyncMock()
+        jobs.update_harvest_job_status = AsyncMock()
+        jobs.save_harvest_checkpoint = AsyncMock()
+
+        result = await scheduler._execute_harvest("full")
+
+    assert result["status"] == "error"
+    assert result["failed_stages"] == ["apis_guru"]
+    statuses = [call.args[2] for call in jobs.update_harvest_job_status.await_args_list]
+    assert statuses == ["running", "failed"]
+    jobs.save_harvest_checkpoint.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_manual_trigger_reports_a_running_harvest():
+    scheduler = KnowledgeHarvesterScheduler()
+    scheduler.harvester = MagicMock()
+    scheduler.scheduler.trigger = AsyncMock(return_value=False)
+
+    result = await scheduler.trigger_manual_harvest("patterns")
+
+    assert result["status"] == "already_running"
+    scheduler.scheduler.trigger.assert_awaited_once()
+    assert scheduler.scheduler.trigger.await_args.args == (
+        "knowledge_harvest:patterns",
+    )
+
+
+@pytest.mark.asyncio
+async def test_manual_trigger_runs_unscheduled_types_and_returns_the_job():
+    scheduler = KnowledgeHarvesterScheduler()
+    assert scheduler.scheduler.jobs["knowledge_harvest:github"].manual
+    assert not scheduler.scheduler.jobs["knowledge_harvest:full"].manual
+
+    scheduler.harvester = MagicMock()
+    scheduler.harvester.execute = AsyncMock(
+        return_value={"status": "success", "total_harvested": 1}
+    )
+    runs = []
+
+    async def trigger(name, run=None):
+        runs.append(asyncio.create_task(run()))
+        return True
+
+    scheduler.scheduler.trigger = AsyncMock(side_effect=trigger)
+
+    with patch.object(
+        module, "async_session_factory", side_effect=lambda: _session()
+    ), patch.object(module, "HarvestJobService") as jobs:
+        jobs.fail_interrupted_harvest_jobs = AsyncMock(return_value=[])
+        jobs.get_resumable_harvest_job = AsyncMock(return_value=None)
+        jobs.create_harvest_job = AsyncMock()
+        jobs.update_harvest_job_status = AsyncMock()
+        jobs.save_harvest_checkpoint = AsyncMock()
+
+        result = await scheduler.trigger_manual_harvest("github", [7])
+        await asyncio.gather(*runs)
+
+    assert result["status"] == "queued"
+    assert scheduler.scheduler.trigger.await_args.args == ("knowledge_harvest:github",)
+    created = jobs.create_harvest_job.await_args.args
+    assert created[1:] == (result["job_id"], "github", [7])
+    input_data = scheduler.harvester.execute.await_args.kwargs["input_data"]
+    assert input_data["harvest_type"] == "github"
+    assert isinstance(input_data["checkpoint"], HarvestCheckpoint)
+
+
+@pytest.mark.asyncio
+async def test_manual_trigger_rejects_unknown_types():
+    scheduler = KnowledgeHarvesterScheduler()
+    scheduler.harvester = MagicMock()
+    scheduler.scheduler.trigger = AsyncMock()
+
+    result = await scheduler.trigger_manual_harvest("documentation")
+
+    assert result["status"] == "error"
+    scheduler.scheduler.trigger.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_harvest_fails_orphaned_jobs_and_resumes_from_their_checkpoint():
+    scheduler = KnowledgeHarvesterScheduler()
+    scheduler.harvester = MagicMock()
+    scheduler.harvester.execute = AsyncMock(
+        return_value={"status": "success", "total_harvested": 2}
+    )
+    calls = []
+    orphan = MagicMock(id="job-1", checkpoint={"completed_stages": ["apis_guru"]})
+
+    with patch.object(
+        module, "async_session_factory", side_effect=lambda: _session()
+    ), patch.object(module, "HarvestJobService") as jobs:
+        jobs.fail_interrupted_harvest_jobs = AsyncMock(
+            side_effect=lambda db: calls.append("fail") or ["job-1"]
+        )
+        jobs.get_resumable_harvest_job = AsyncMock(
+            side_effect=lambda *a, **kw: calls.append("resume") or orphan
+        )
+        jobs.create_harvest_job = AsyncMock()
+        jobs.update_harvest_job_status = AsyncMock()
+        jobs.save_harvest_checkpoint = AsyncMock()
+
+        result = await scheduler._execute_harvest("full")
+
+    assert calls == ["fail", "resume"]
+    assert result["job_id"] == "job-1"
+    jobs.create_harvest_job.assert_not_called()
+    checkpoint = scheduler.harvester.execute.await_args.kwargs["input_data"][
+        "checkpoint"
+    ]
+    assert isinstance(checkpoint, HarvestCheckpoint)
+    assert checkpoint.is_stage_done("apis_guru")
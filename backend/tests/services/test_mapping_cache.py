@@ -0,0 +1,99 @@
+"""
+Unit tests for the mapping cache.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.agents.mapper import VitesseMapper
+from app.schemas.integration import DataTransformation
+from app.services.mapping_cache import (
+    MappingCache,
+    mapping_fingerprint,
+    normalize_intent,
+)
+
+SOURCE = [{"name": "email", "type": "string", "description": ""}]
+DEST = [
+    {"name": "contact.email", "type": "string", "description": ""},
+    {"name": "name", "type": "string", "description": ""},
+]
+
+
+def _mapping(dest_field="contact.email"):
+    return [DataTransformation(source_field="email", dest_field=dest_field)]
+
+
+@pytest.fixture
+def no_db():
+    # The database level is best-effort; these tests exercise the memory level
+    with patch(
+        "app.services.mapping_cache.async_session_factory",
+        MagicMock(side_effect=RuntimeError("no database")),
+    ):
+        yield
+
+
+def test_fingerprint_ignores_field_order_and_intent_formatting():
+    key = mapping_fingerprint(SOURCE, DEST, "Sync contacts to CRM.", "v1")
+
+    assert normalize_intent("  Sync   contacts to CRM. ") == "sync contacts to crm"
+    assert key == mapping_fingerprint(SOURCE, DEST[::-1], "sync contacts to crm", "v1")
+    assert key != mapping_fingerprint(SOURCE, DEST[:1], "Sync contacts to CRM", "v1")
+    assert key != mapping_fingerprint(SOURCE, DEST, "Sync leads to CRM", "v1")
+    assert key != mapping_fingerprint(SOURCE, DEST, "Sync contacts to CRM", "v2")
+
+
+@pytest.mark.asyncio
+async def test_drift_on_either_side_invalidates_entries(no_db):
+    cache = MappingCache()
+    await cache.put("a", _mapping(), "Shopify", "Salesforce", "v1")
+    await cache.put("b", _mapping("name"), "Stripe", "HubSpot", "v1")
+
+    assert (await cache.get("a"))[0].dest_field == "contact.email"
+
+    await cache.invalidate_api("Salesforce")
+
+    assert await cache.get("a") is None
+    assert (await cache.get("b"))[0].dest_field == "name"
+
+
+@pytest.mark.asyncio
+async def test_mapper_reuses_mapping_for_the_same_schemas_and_intent(no_db):
+    mapper = VitesseMapper(context=MagicMock(), agent_id="mapper-test")
+    source_schema = {"properties": {"email": {"type": "string"}}}
+    dest_schema = {"properties": {"email": {"type": "string"}}}
+    layer = MagicMock()
+    layer.map_schema_with_status = AsyncMock(return_value=(_mapping("email"), True))
+
+    with patch("app.agents.mapper.mapping_cache", MappingCache()), patch(
+        "app.agents.mapper.SemanticLayer", return_value=layer
+    ) as semantic_layer, patch("app.agents.mapper.async_session_factory"):
+        first = await mapper._generate_transformations(
+            "Sync users", source_schema, dest_schema, "Shopify", "Salesforce"
+        )
+        second = await mapper._generate_transformations(
+            "sync users", source_schema, dest_schema, "Shopify", "Salesforce"
+        )
+
+    semantic_layer.assert_called_once()
+    assert first == second == _mapping("email")
+
+
+@pytest.mark.asyncio
+async def test_mapper_does_not_cache_incomplete_mappings(no_db):
+    mapper = VitesseMapper(context=MagicMock(), agent_id="mapper-test")
+    schema = {"properties": {"email": {"type": "string"}}}
+    layer = MagicMock()
+    # A group's LLM call failed, so the mapping is partial
+    layer.map_schema_with_status = AsyncMock(return_value=(_mapping("email"), False))
+
+    with patch("app.agents.mapper.mapping_cache", MappingCache()), patch(
+        "app.agents.mapper.SemanticLayer", return_value=layer
+    ) as semantic_layer, patch("app.agents.mapper.async_session_factory"):
+        for _ in range(2):
+            await mapper._generate_transformations(
+                "Sync users", schema, schema, "Shopify", "Salesforce"
+            )
+
+    assert semantic_layer.call_count == 2
@@ -0,0 +1,92 @@
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import FakeEmbeddings
+
+from app.services.metadata_filter_index import MetadataFilterIndex
+from app.services.vectorization import VectorizationService
+
+
+def _store():
+    texts = [f"chunk {i}" for i in range(40)]
+    metadatas = [
+        {
+            "document_id": f"doc-{i % 10}",
+            # Only two chunks belong to the selective product
+            "product_id": "rare" if i in (7, 31) else "common",
+            "doc_type": "pdf" if i % 2 else "docx",
+        }
+        for i in range(40)
+    ]
+    return FAISS.from_texts(texts, FakeEmbeddings(size=16), metadatas=metadatas)
+
+
+def test_matching_ids_intersects_columns():
+    store = _store()
+    index = MetadataFilterIndex()
+    index.rebuild(store)
+
+    assert len(index) == 40
+    assert list(index.matching_ids({"product_id": "rare"})) == [7, 31]
+    assert list(index.matching_ids({"product_id": "rare", "doc_type": "pdf"})) == [
+        7,
+        31,
+    ]
+    assert list(index.matching_ids({"product_id": "rare", "doc_type": "docx"})) == []
+    assert len(index.matching_ids({"document_id": ["doc-1", "doc-2"]})) == 8
+    assert list(index.matching_ids({"product_id": "unknown"})) == []
+
+
+def test_none_filter_matches_vectors_without_the_field():
+    index = MetadataFilterIndex()
+    index.append(
+        [
+            {"product_id": "p1"},
+            {},
+            {"product_id": None},
+            {"product_id": ["p1", "p2"]},
+        ]
+    )
+
+    assert list(index.matching_ids({"product_id": None})) == [1, 2]
+    assert list(index.matching_ids({"product_id": ["p1", None]})) == [0, 1, 2]
+
+
+def test_supports_only_indexed_equality_filters():
+    index = MetadataFilterIndex()
+    assert index.supports({"product_id": "p1", "doc_type": ["pdf", "docx"]})
+    assert not index.supports({"source": "x.pdf"})
+    assert not index.supports({"product_id": {"$ne": "p1"}})
+    assert not index.supports(lambda metadata: True)
+
+
+@pytest.mark.asyncio
+async def test_selective_filter_returns_all_matches():
+    service = VectorizationService.__new__(VectorizationService)
+    service.embeddings = FakeEmbeddings(size=16)
+    service.vector_store = _store()
+    service._metadata_index = None
+
+    results = await service.search_similar(
+        "anything", k=5, filter_metadata={"product_id": "rare"}
+    )
+
+    assert len(results) == 2
+    assert {r["metadata"]["product_id"] for r in results} == {"rare"}
+    assert all(isinstance(r["score"], float) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_filter_matching_more_than_k_returns_full_k():
+    service = VectorizationService.__new__(VectorizationService)
+    service.embeddings = FakeEmbeddings(size=16)
+    service.vector_store = _store()
+    service._metadata_index = None
+
+    # 20 of the 40 chunks match; post-filtering LangChain's default
+    # fetch_k=20 candidates would keep only about 10 of them
+    results = await service.search_similar(
+        "anything", k=15, filter_metadata={"doc_type": "pdf"}
+    )
+
+    assert len(results) == 15
+    assert {r["metadata"]["doc_type"] for r in results} == {"pdf"}
@@ -0,0 +1,190 @@
+import json
+import time
+
+import pytest
+
+from app.agents.ingestor import VitesseIngestor
+from app.core.openapi_loader import (
+    RefResolver,
+    SpecFormatError,
+    detect_spec_format,
+    iter_operations,
+    load_spec_document,
+)
+
+YAML_SPEC = """\
+# Payments API
+openapi: 3.0.0
+info:
+  title: Payments
+  version: "2.1"
+paths:
+  /charges:
+    get:
+      summary: List charges
+      responses:
+        200:
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/ChargeList'
+components:
+  schemas:
+    ChargeList:
+      type: array
+      items:
+        $ref: '#/components/schemas/Charge'
+    Charge:
+      type: object
+      properties:
+        amount: {type: integer}
+"""
+
+
+def test_detects_and_loads_json_and_yaml():
+    assert detect_spec_format(YAML_SPEC) == "yaml"
+    assert detect_spec_format(b'  {"openapi": "3.0.0"}') == "json"
+    assert detect_spec_format("<html><body>Docs</body></html>") is None
+
+    spec = load_spec_document(YAML_SPEC)
+    assert spec["info"]["version"] == "2.1"
+    assert load_spec_document(b'{"swagger": "2.0"}') == {"swagger": "2.0"}
+
+    with pytest.raises(SpecFormatError):
+        load_spec_document("<html></html>")
+    with pytest.raises(SpecFormatError):
+        load_spec_document('{"openapi": ')
+    with pytest.raises(SpecFormatError):
+        load_spec_document("[1, 2]")
+
+
+def test_yaml_spec_endpoints_have_resolved_schemas():
+    (operation,) = iter_operations(load_spec_document(YAML_SPEC))
+
+    assert (operation.path, operation.method) == ("/charges", "GET")
+    assert operation.response_schema == {
+        "type": "array",
+        "items": {"type": "object", "properties": {"amount": {"type": "integer"}}},
+    }
+
+
+def test_refs_are_memoized_and_cycles_left_as_stubs():
+    spec = {
+        "paths": {},
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "child": {"$ref": "#/components/schemas/Node"},
+                        "owner": {"$ref": "#/components/schemas/User"},
+                    },
+                },
+                "User": {"type": "object"},
+                "Path~Name": {"type": "string"},
+            }
+        },
+    }
+    resolver = RefResolver(spec)
+
+    node = resolver.resolve({"$ref": "#/components/schemas/Node"})
+    assert node["properties"]["child"] == {"$ref": "#/components/schemas/Node"}
+    assert node["properties"]["owner"] == {"type": "object"}
+
+    first = resolver.resolve({"$ref": "#/components/schemas/User"})
+    assert resolver.resolve({"$ref": "#/components/schemas/User"}) is first
+    assert resolver.resolve({"$ref": "#/components/schemas/Path~0Name"}) == {
+        "type": "string"
+    }
+    assert resolver.resolve({"$ref": "#/components/schemas/Missing"}) == {
+        "$ref": "#/components/schemas/Missing"
+    }
+
+
+def test_swagger2_body_parameters_and_path_level_parameters():
+    spec = {
+        "swagger": "2.0",
+        "security": [{"key": []}],
+        "paths": {
+            "/pets/{id}": {
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "type": "integer"}
+                ],
+                "put": {
+                    "parameters": [
+                        {
+                            "name": "pet",
+                            "in": "body",
+                            "schema": {"$ref": "#/definitions/Pet"},
+                        }
+                    ],
+                    "responses": {"201": {"schema": {"$ref": "#/definitions/Pet"}}},
+                },
+            }
+        },
+        "definitions": {"Pet": {"type": "object", "required": ["name"]}},
+    }
+
+    (operation,) = iter_operations(spec)
+
+    assert operation.parameters == {
+        "id": {"in": "path", "required": True, "type": "integer"}
+    }
+    assert operation.request_schema == {"type": "object", "required": ["name"]}
+    assert operation.response_schema == {"type": "object", "required": ["name"]}
+    assert operation.auth_required is True
+
+
+def test_large_spec_parses_and_extracts_quickly():
+    schemas = {
+        f"Object{i}": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "string"},
+                "parent": {"$ref": f"#/components/schemas/Object{max(i - 1, 0)}"},
+                "metadata": {"$ref": "#/components/schemas/Metadata"},
+            },
+        }
+        for i in range(300)
+    }
+    schemas["Metadata"] = {"type": "object", "additionalProperties": True}
+    paths = {
+        f"/v1/resource{i}/{{id}}": {
+            method: {
+                "summary": f"{method} resource {i}",
+                "parameters": [{"name": "id", "in": "path", "required": True}],
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": f"#/components/schemas/Object{i % 300}"}
+                        }
+                    }
+                },
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": f"#/components/schemas/Object{i % 300}"
+                                }
+                            }
+                        }
+                    }
+                },
+            }
+            for method in ("get", "post", "delete")
+        }
+        for i in range(1000)
+    }
+    content = json.dumps(
+        {"openapi": "3.0.0", "paths": paths, "components": {"schemas": schemas}}
+    )
+
+    started = time.perf_counter()
+    ingestor = VitesseIngestor.__new__(VitesseIngestor)
+    endpoints = ingestor._extract_endpoints(ingestor._parse_openapi_spec(content))
+    elapsed = time.perf_counter() - started
+
+    assert len(endpoints) == 3000
+    assert endpoints[0].response_schema["properties"]["metadata"]["type"] == "object"
+    assert elapsed < 2.0
@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.models.document import ExtractionStatus
+from app.services import recovery
+from app.services.recovery import RecoveryService
+
+
+def _result(rows):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+def _document(document_id):
+    doc = MagicMock()
+    doc.id = document_id
+    doc.extraction_status = ExtractionStatus.PROCESSING
+    return doc
+
+
+@pytest.mark.asyncio
+async def test_documents_with_any_live_job_are_not_reingested():
+    revectorizing, orphaned = _document("doc-1"), _document("doc-2")
+    db = MagicMock()
+    db.execute = AsyncMock(
+        side_effect=[
+            # a pending re-vectorization on doc-1's workflow
+            _result(["document:doc-1"]),
+            _result([revectorizing, orphaned]),
+        ]
+    )
+    session = MagicMock()
+    session.__aenter__ = AsyncMock(return_value=db)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    with patch.object(
+        recovery, "async_session_factory", return_value=session
+    ), patch.object(recovery, "job_queue") as queue:
+        queue.enqueue = AsyncMock()
+        assert await RecoveryService().recover_orphaned_documents() == 1
+
+    assert queue.enqueue.await_args.kwargs["workflow_id"] == "document:doc-2"
+    assert revectorizing.extraction_status == ExtractionStatus.PROCESSING
+    active_query = str(db.execute.await_args_list[0].args[0])
+    assert "job_type" not in active_query
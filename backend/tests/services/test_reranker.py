@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import MagicMock
+
+from app.services.reranker import CrossEncoderReranker
+
+
+def _candidates():
+    return [
+        {"content": "alpha", "metadata": {"chunk_id": "doc_chunk_0"}},
+        {"content": "beta", "metadata": {"chunk_id": "doc_chunk_1"}},
+        {"content": "gamma", "metadata": {"chunk_id": "doc_chunk_2"}},
+    ]
+
+
+def _reranker():
+    model = MagicMock()
+    relevance = {"alpha": 0.1, "beta": 0.9, "gamma": 0.5}
+    model.predict.side_effect = lambda pairs, batch_size: [
+        relevance[text] for _, text in pairs
+    ]
+    reranker = CrossEncoderReranker(model_name="fake", batch_size=8, cache_size=100)
+    reranker._model = model
+    return reranker, model
+
+
+@pytest.mark.asyncio
+async def test_rerank_orders_by_cross_encoder_score():
+    reranker, _ = _reranker()
+
+    results = await reranker.rerank("query", _candidates(), top_k=2)
+
+    assert [r["content"] for r in results] == ["beta", "gamma"]
+    assert results[0]["rerank_score"] == pytest.approx(0.9)
+
+
+@pytest.mark.asyncio
+async def test_rerank_scores_are_cached_per_query_and_chunk():
+    reranker, model = _reranker()
+
+    await reranker.rerank("query", _candidates(), top_k=2)
+    await reranker.rerank("query", _candidates(), top_k=2)
+    assert model.predict.call_count == 1
+
+    await reranker.rerank("another query", _candidates()[:1], top_k=1)
+    assert model.predict.call_count == 2
+    assert model.predict.call_args.args[0] == [("another query", "alpha")]
@@ -0,0 +1,134 @@
+"""
+Unit tests for the persistent scheduler.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.scheduler import PersistentScheduler, ScheduledJob
+
+NOW = datetime(2026, 2, 18, 10, 30, tzinfo=timezone.utc)
+
+
+async def _noop():
+    return None
+
+
+def test_cron_next_run_is_strictly_after_moment():
+    job = ScheduledJob("nightly", _noop, cron="0 2 * * *")
+
+    assert job.schedule == "cron:0 2 * * *"
+    assert job.next_run_after(NOW) == datetime(2026, 2, 19, 2, 0, tzinfo=timezone.utc)
+    on_the_dot = datetime(2026, 2, 19, 2, 0, tzinfo=timezone.utc)
+    assert job.next_run_after(on_the_dot) == on_the_dot + timedelta(days=1)
+
+
+def test_interval_is_read_on_each_call_and_jitter_is_bounded():
+    hours = {"value": 2}
+    job = ScheduledJob(
+        "harvest",
+        _noop,
+        interval_seconds=lambda: hours["value"] * 3600,
+        jitter_seconds=600,
+    )
+
+    for _ in range(50):
+        delay = job.next_run_after(NOW) - NOW
+        assert timedelta(hours=2) <= delay <= timedelta(hours=2, minutes=10)
+
+    hours["value"] = 4
+    assert job.schedule == "every:14400s"
+
+
+def test_job_requires_exactly_one_schedule():
+    with pytest.raises(ValueError):
+        ScheduledJob("bad", _noop)
+    with pytest.raises(ValueError):
+        ScheduledJob("bad", _noop, cron="* * * * *", interval_seconds=60)
+    with pytest.raises(ValueError):
+        ScheduledJob("bad", _noop, interval_seconds=60, manual=True)
+
+
+@pytest.mark.asyncio
+async def test_run_due_runs_claimed_jobs_in_order_and_records_failures():
+    ran = []
+
+    async def first():
+        ran.append("first")
+
+    async def second():
+        ran.append("second")
+        raise RuntimeError("boom")
+
+    async def third():
+        ran.append("third")
+
+    scheduler = PersistentScheduler("test", poll_interval=1, lease_seconds=60)
+    for name, run in (("first", first), ("second", second), ("third", third)):
+        scheduler.register(
+            ScheduledJob(name, run, interval_seconds=60, lock_group="group")
+        )
+
+    # "third" is not due (or its group is busy), so it is not claimed
+    scheduler.claim = AsyncMock(side_effect=[True, True, False])
+    scheduler._finish = AsyncMock()
+
+    assert await scheduler.run_due() == 2
+    assert ran == ["first", "second"]
+
+    finished = {
+        call.args[0].name: call.args[2] for call in scheduler._finish.await_args_list
+    }
+    assert finished == {"first": None, "second": "boom"}
+
+
+@pytest.mark.asyncio
+async def test_trigger_runs_job_under_its_lease_or_reports_busy():
+    ran = asyncio.Event()
+
+    async def harvest():
+        ran.set()
+
+    scheduler = PersistentScheduler("test", poll_interval=1, lease_seconds=60)
+    scheduler.register(ScheduledJob("harvest", harvest, interval_seconds=60))
+    scheduler.sync = AsyncMock()
+    scheduler._finish = AsyncMock()
+
+    scheduler.claim = AsyncMock(return_value=False)
+    assert await scheduler.trigger("harvest") is False
+    assert not ran.is_set()
+
+    scheduler.claim = AsyncMock(return_value=True)
+    assert await scheduler.trigger("harvest") is True
+    await asyncio.wait_for(ran.wait(), 1)
+    assert scheduler.claim.await_args.kwargs == {"force": True}
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_manual_jobs_only_run_when_triggered():
+    ran = asyncio.Event()
+
+    async def default():
+        raise AssertionError("the job's own callable must not run")
+
+    async def override():
+        ran.set()
+
+    scheduler = PersistentScheduler("test", poll_interval=1, lease_seconds=60)
+    scheduler.register(ScheduledJob("adhoc", default, manual=True))
+    scheduler.sync = AsyncMock()
+    scheduler._finish = AsyncMock()
+    scheduler.claim = AsyncMock(return_value=True)
+
+    assert scheduler.jobs["adhoc"].schedule == "manual"
+    assert await scheduler.run_due() == 0
+    scheduler.claim.assert_not_called()
+
+    assert await scheduler.trigger("adhoc", run=override) is True
+    await asyncio.wait_for(ran.wait(), 1)
+    await scheduler.shutdown()
+    assert scheduler._finish.await_args.args[2] is None
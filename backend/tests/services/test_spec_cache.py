@@ -0,0 +1,86 @@
+"""
+Unit tests for the ingestor spec cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.agents.ingestor import VitesseIngestor
+from app.schemas.integration import APIAuthType, APIEndpoint, APISpecification
+from app.services.spec_cache import (
+    NAME_SOURCE,
+    SpecCache,
+    content_hash,
+    spec_cache_key,
+)
+
+
+def _spec(name="Payments", auth_config=None):
+    return APISpecification(
+        source_url="https://payments.test/openapi.json",
+        api_name=name,
+        base_url="https://payments.test/v1",
+        auth_type=APIAuthType.NONE,
+        auth_config=auth_config or {},
+        endpoints=[APIEndpoint(path="/charges", method="GET")],
+    )
+
+
+@pytest.fixture
+def no_db():
+    # The database level is best-effort; these tests exercise the memory level
+    with patch(
+        "app.services.spec_cache.async_session_factory",
+        MagicMock(side_effect=RuntimeError("no database")),
+    ):
+        yield
+
+
+def test_key_depends_on_version_content_and_inputs():
+    digest = content_hash('{"openapi": "3.0.0"}')
+    key = spec_cache_key("1", digest, "https://a.test", "A")
+
+    assert key == spec_cache_key("1", digest, "https://a.test", "A")
+    assert key != spec_cache_key("2", digest, "https://a.test", "A")
+    assert key != spec_cache_key("1", content_hash("{}"), "https://a.test", "A")
+    assert key != spec_cache_key("1", digest, "https://b.test", "A")
+
+
+@pytest.mark.asyncio
+async def test_memory_level_is_lru_and_expires_name_synthesis(no_db):
+    cache = SpecCache(max_memory_entries=2)
+    await cache.put("a", _spec("A"), "h", "1", "openapi")
+    await cache.put("b", _spec("B"), "h", "1", "openapi")
+    assert (await cache.get("a")).api_name == "A"  # "a" is now most recent
+
+    await cache.put("c", _spec("C"), "h", "1", "openapi")
+    assert await cache.get("b") is None
+    assert (await cache.get("a")).endpoints[0].path == "/charges"
+
+    await cache.put("n", _spec("N"), "h", "1", NAME_SOURCE)
+    _, spec = cache._memory["n"]
+    cache._memory["n"] = (datetime.now(timezone.utc) - timedelta(seconds=1), spec)
+    assert await cache.get("n") is None
+
+
+@pytest.mark.asyncio
+async def test_ingestor_builds_once_and_never_caches_credentials(no_db):
+    ingestor = VitesseIngestor(context=MagicMock(), agent_id="ingestor-test")
+    build = AsyncMock(return_value=("openapi", _spec()))
+    credentials = {"type": "bearer", "token": "secret"}
+
+    with patch("app.agents.ingestor.spec_cache", SpecCache()) as cache:
+        first = await ingestor._cached_spec(
+            "{...}", "https://payments.test", "Payments", credentials, build
+        )
+        second = await ingestor._cached_spec(
+            "{...}", "https://payments.test", "Payments", {}, build
+        )
+
+    build.assert_awaited_once()
+    assert first.auth_type == APIAuthType.BEARER_TOKEN
+    assert first.auth_config == credentials
+    assert second.auth_type == APIAuthType.NONE
+    assert "secret" not in str(list(cache._memory.values()))
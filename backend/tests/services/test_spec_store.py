@@ -0,0 +1,126 @@
+"""
+Unit tests for the content-addressed spec store and endpoint index.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.schemas.integration import APIEndpoint
+from app.services.spec_store import (
+    EndpointIndex,
+    SpecStore,
+    compact_spec,
+    is_compact,
+    spec_digest,
+)
+
+
+def _spec(endpoint_count=3):
+    return {
+        "api_name": "Payments",
+        "source_url": "https://payments.test/openapi.json",
+        "base_url": "https://payments.test/v1",
+        "auth_type": "none",
+        "endpoints": [
+            {
+                "path": f"/items{i}",
+                "method": "GET",
+                "description": f"List items {i}",
+                "response_schema": {"type": "array"},
+            }
+            for i in range(endpoint_count)
+        ],
+    }
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch("app.services.spec_store.async_session_factory", factory):
+        yield session
+
+
+def test_digest_ignores_key_order():
+    spec = _spec()
+    reordered = dict(reversed(list(spec.items())))
+
+    assert spec_digest(spec) == spec_digest(reordered)
+    assert spec_digest(spec) != spec_digest(_spec(endpoint_count=4))
+
+
+def test_index_builds_models_on_demand_and_keeps_first_operation_per_path():
+    endpoints = [
+        {"path": "/charges", "method": "get", "response_schema": {"type": "array"}},
+        {"path": "/charges", "method": "POST", "request_schema": {"type": "object"}},
+        {"path": "/refunds", "method": "GET"},
+    ]
+    index = EndpointIndex(endpoints)
+
+    assert len(index) == 3
+    assert index._models == {}
+    assert index.get("/charges").method == "get"
+    assert index.get("/charges", "post").request_schema == {"type": "object"}
+    assert index.get("/charges", "DELETE") is None
+    assert index.get("/missing") is None
+    assert index.get("/charges") is index.get("/charges", "GET")
+    assert len(index._models) == 2
+
+    model = APIEndpoint(path="/x", method="GET")
+    assert EndpointIndex([model]).get("/x") is model
+
+
+@pytest.mark.asyncio
+async def test_put_returns_compact_copy_and_expand_restores_full_spec(db):
+    store = SpecStore()
+    full = _spec()
+
+    compact = await store.put(full)
+
+    assert is_compact(compact)
+    assert compact["spec_sha256"] == spec_digest(full)
+    assert compact["endpoint_count"] == 3
+    assert "response_schema" not in compact["endpoints"][0]
+    assert compact["endpoints"][0]["path"] == "/items0"
+    assert await store.put(compact) is compact
+    db.execute.assert_awaited_once()
+
+    assert await store.expand(compact) == full
+    assert await store.expand(full) is full
+    index = await store.endpoint_index(compact)
+    assert index.get("/items2").response_schema == {"type": "array"}
+    assert await store.endpoint_index(compact) is index
+
+
+@pytest.mark.asyncio
+async def test_full_spec_is_loaded_from_database_after_eviction(db):
+    store = SpecStore(max_memory_entries=1)
+    compact = await store.put(_spec())
+    await store.put(_spec(endpoint_count=1))
+    assert compact["spec_sha256"] not in store._memory
+
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = _spec()
+    db.execute.return_value = result
+
+    assert (await store.expand(compact))["endpoints"][1]["path"] == "/items1"
+    assert compact["spec_sha256"] in store._memory
+
+
+@pytest.mark.asyncio
+async def test_store_failures_keep_full_specs():
+    store = SpecStore()
+    with patch(
+        "app.services.spec_store.async_session_factory",
+        MagicMock(side_effect=RuntimeError("no database")),
+    ):
+        full = _spec()
+        assert await store.put(full) == full
+
+        orphan = compact_spec(full, "0" * 64)
+        assert await store.expand(orphan) is orphan
+        assert (await store.endpoint_index(orphan)).get("/items0").path == "/items0"
@@ -0,0 +1,159 @@
+import ast
+import json
+
+import pytest
+
+from app.deployer.script_generator import ScriptGenerator
+from app.deployer.templates import DockerfileGenerator
+from app.schemas.integration import DataTransformation, MappingLogic
+from app.services.transform_compiler import compile_mapping, generate_mapping_source
+
+MAPPING = {
+    "source_api": "shop",
+    "dest_api": "crm",
+    "source_endpoint": "/orders",
+    "dest_endpoint": "/deals",
+    "transformations": [
+        {"source_field": "id", "dest_field": "external_id"},
+        {"source_field": "customer.email", "dest_field": "contact.email"},
+        {
+            "source_field": "total",
+            "dest_field": "amount",
+            "transform_type": "parse",
+            "transform_config": {"decimal_places": 2},
+        },
+        {
+            "source_field": "paid",
+            "dest_field": "is_paid",
+            "transform_type": "parse_bool",
+            "default_value": False,
+        },
+        {
+            "source_field": "tags",
+            "dest_field": "labels",
+            "transform_type": "collect",
+        },
+        {
+            "source_field": "meta",
+            "dest_field": "notes",
+            "transform_type": "stringify",
+        },
+        {"source_field": "owner", "dest_field": "owner_id", "required": True},
+    ],
+}
+
+
+def test_compiled_mapping_transforms_nested_and_typed_fields():
+    compiled = compile_mapping(MAPPING)
+
+    record = {
+        "id": 7,
+        "customer": {"email": "a@b.test"},
+        "total": "19.999",
+        "paid": "yes",
+        "tags": "vip",
+        "meta": {"source": "web"},
+    }
+
+    assert compiled.transform_record(record) == {
+        "external_id": 7,
+        "contact": {"email": "a@b.test"},
+        "amount": 20.0,
+        "is_paid": True,
+        "labels": ["vip"],
+        "notes": '{"source":"web"}',
+        "owner_id": None,
+    }
+
+
+def test_missing_and_unparseable_values_follow_defaults():
+    compiled = compile_mapping(MappingLogic(**MAPPING))
+
+    (result,) = compiled.transform_batch(
+        [{"customer": "not-an-object", "total": "n/a", "paid": None}]
+    )
+
+    # parse failure without a default -> None; missing optional -> omitted
+    assert result == {"amount": None, "is_paid": False, "owner_id": None}
+
+
+def test_batch_matches_record_by_record_and_mapping_is_compiled_once():
+    compiled = compile_mapping(MAPPING)
+    records = [
+        {"id": i, "total": i, "customer": {"email": f"{i}@x"}} for i in range(50)
+    ]
+
+    assert compiled.transform_batch(records) == [
+        compiled.transform_record(r) for r in records
+    ]
+    assert compile_mapping(json.loads(json.dumps(MAPPING))) is compiled
+
+
+def _mixed_records(count):
+    return [
+        {
+            "id": i,
+            "customer": {"email": f"{i}@x"} if i % 4 else "unknown",
+            "total": [f"{i}.25", i, None, "n/a", True][i % 5],
+            "paid": ["Yes", " off ", "maybe", None, 1][i % 5],
+            "tags": ["a", ["b", "c"], None][i % 3],
+            "meta": [{"k": i}, i, None][i % 3],
+            "owner": None if i % 2 else f"u{i}",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("numpy_enabled", [True, False])
+def test_columnar_transform_matches_row_transform(numpy_enabled, monkeypatch):
+    compiled = compile_mapping(MAPPING)
+    if not numpy_enabled:
+        monkeypatch.setitem(compiled.transform_columns.__globals__, "_np", None)
+    records = _mixed_records(200)
+
+    clean = [{"id": i, "total": f"{i}.125", "paid": "TRUE"} for i in range(200)]
+
+    for batch in (records, clean, []):
+        assert compiled.transform_columns(batch) == compiled.transform_batch(batch)
+
+
+def test_field_names_are_embedded_as_literals():
+    hostile = "x'] = 1; import os  #"
+    mapping = {
+        "transformations": [
+            DataTransformation(source_field=hostile, dest_field="a\nb").model_dump()
+        ]
+    }
+
+    compiled = compile_mapping(mapping)
+
+    assert compiled.transform_record({hostile: 1}) == {"a\nb": 1}
+    assert compiled.transform_columns([{hostile: 1}]) == [{"a\nb": 1}]
+    assert "os" not in compiled.transform_record.__globals__
+
+
+def test_generated_scripts_embed_compiled_mapping_and_parse():
+    mapping_json = json.dumps({**MAPPING, "pre_sync_hook": None, "enabled": True})
+
+    script = ScriptGenerator.generate_integration_script(
+        integration_id="int-1",
+        source_api_name="Shop",
+        dest_api_name="CRM",
+        mapping_json=mapping_json,
+        source_api_url="https://shop.test",
+        dest_api_url="https://crm.test",
+        source_auth_config={},
+        dest_auth_config={},
+    )
+    app_template = DockerfileGenerator.generate_integration_app_template(
+        integration_id="int-1",
+        source_api_name="Shop",
+        dest_api_name="CRM",
+        mapping_json=mapping_json,
+    )
+
+    for source in (script, app_template):
+        ast.parse(source)
+        assert "def transform_batch(records):" in source
+        assert "def transform_columns(records):" in source
+        assert generate_mapping_source(MAPPING) in source
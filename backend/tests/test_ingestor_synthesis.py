@@ -5,6 +5,7 @@ Unit tests for VitesseIngestor functionality, specifically LLM synthesis.
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.agents.ingestor import VitesseIngestor
+from app.core.config import settings
 from app.schemas.integration import APISpecification, APIAuthType
 
 
@@ -13,6 +14,12 @@ def mock_context():
     return MagicMock()
 
 
+@pytest.fixture(autouse=True)
+def no_spec_cache(monkeypatch):
+    """Keep the ingestor off the spec cache and conditional fetcher (DB)."""
+    monkeypatch.setattr(settings, "SPEC_CACHE_ENABLED", False)
+
+
 @pytest.mark.asyncio
 async def test_ingestor_html_synthesis_fallback(mock_context):
     """Test that Ingestor falls back to LLM synthesis when JSON parsing encounters HTML."""
@@ -26,33 +33,33 @@ async def test_ingestor_html_synthesis_fallback(mock_context):
 
     # Mock structured output
     expected_spec = APISpecification(
-        source_url="http://api.example.com",
-        api_name="Example API",
-        base_url="http://api.example.com/v1",
+        source_url="https://api.acme-payments.test",
+        api_name="Acme Payments API",
+        base_url="https://api.acme-payments.test/v1",
         auth_type=APIAuthType.API_KEY,
         endpoints=[],
     )
 
     with (
         patch("app.agents.ingestor.LLMProviderService", new=mock_llm_service),
-        patch("app.agents.ingestor.httpx.AsyncClient") as mock_client_cls,
+        patch("app.agents.ingestor.http_clients") as mock_http_clients,
     ):
         # Mock HTTP response to be HTML (invalid JSON)
         mock_client = AsyncMock()
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html><body><h1>API Docs</h1></body></html>"
+        mock_response.content = mock_response.text.encode()
         mock_response.headers = {"content-type": "text/html"}
         mock_client.get.return_value = mock_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client_cls.return_value = mock_client
+        mock_http_clients.get.return_value = mock_client
 
         # Mock LLM Service
         mock_llm_service.create_llm.return_value = mock_llm_instance
         mock_llm_service.invoke_structured_with_monitoring.return_value = expected_spec
 
         # Execute
-        input_data = {"api_url": "http://api.example.com", "api_name": "Example API"}
+        input_data = {"api_url": "https://api.acme-payments.test", "api_name": "Acme Payments API"}
         result = await ingestor._execute(context={}, input_data=input_data)
 
         # Verify
@@ -79,7 +86,7 @@ async def test_ingestor_json_success(mock_context):
 
     with (
         patch("app.agents.ingestor.LLMProviderService") as mock_llm_service,
-        patch("app.agents.ingestor.httpx.AsyncClient") as mock_client_cls,
+        patch("app.agents.ingestor.http_clients") as mock_http_clients,
     ):
         # Mock HTTP response as valid Swagger JSON
         mock_client = AsyncMock()
@@ -88,9 +95,10 @@ async def test_ingestor_json_success(mock_context):
         mock_json_response.text = (
             '{"swagger": "2.0", "info": {"title": "Test API"}, "paths": {}}'
         )
+        mock_json_response.content = mock_json_response.text.encode()
+        mock_json_response.headers = {}
         mock_client.get.return_value = mock_json_response
-        mock_client.__aenter__.return_value = mock_client
-        mock_client_cls.return_value = mock_client
+        mock_http_clients.get.return_value = mock_client
 
         # Execute
         input_data = {
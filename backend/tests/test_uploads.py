@@ -0,0 +1,84 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.api.endpoints import documents
+from app.core.uploads import stream_upload_to_disk
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_writes_in_chunks_and_hashes(tmp_path):
+    body = b"0123456789" * 1000
+    upload = UploadFile(file=io.BytesIO(body), filename="data.csv")
+    dest = tmp_path / "data.csv"
+
+    stored = await stream_upload_to_disk(upload, str(dest), chunk_size=1024)
+
+    assert dest.read_bytes() == body
+    assert stored.size == len(body)
+    assert stored.sha256 == hashlib.sha256(body).hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_removes_partial_file_on_error(tmp_path):
+    class FailingFile(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() > 0:
+                raise IOError("connection reset")
+            return super().read(size)
+
+    upload = UploadFile(file=FailingFile(b"x" * 4096), filename="broken.bin")
+    dest = tmp_path / "broken.bin"
+
+    with pytest.raises(IOError):
+        await stream_upload_to_disk(upload, str(dest), chunk_size=1024)
+
+    assert not dest.exists()
+
+
+@pytest.mark.asyncio
+async def test_stream_upload_rejects_oversized_file_while_writing(tmp_path):
+    class CountingFile(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            CountingFile.reads += 1
+            return super().read(size)
+
+    upload = UploadFile(file=CountingFile(b"x" * 10 * 1024), filename="big.bin")
+    dest = tmp_path / "big.bin"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await stream_upload_to_disk(upload, str(dest), chunk_size=1024, max_size=2048)
+
+    assert exc_info.value.status_code == 413
+    assert CountingFile.reads == 3  # stopped at the first chunk over the limit
+    assert not dest.exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_removes_its_document_row(tmp_path):
+    db = MagicMock()
+    db.commit = AsyncMock()
+    db.refresh = AsyncMock()
+    db.rollback = AsyncMock()
+    db.delete = AsyncMock()
+    upload = UploadFile(file=io.BytesIO(b"data"), filename="report.pdf")
+
+    with patch.object(documents.settings, "UPLOAD_DIR", str(tmp_path)), patch.object(
+        documents,
+        "stream_upload_to_disk",
+        AsyncMock(side_effect=OSError("disk full")),
+    ), patch.object(documents, "job_queue") as queue:
+        with pytest.raises(OSError):
+            await documents._store_and_enqueue_upload(
+                upload, "vault", None, None, db, user_id=1
+            )
+
+    (document,) = db.add.call_args.args
+    db.delete.assert_awaited_once_with(document)
+    assert db.commit.await_count == 2
+    queue.enqueue.assert_not_called()